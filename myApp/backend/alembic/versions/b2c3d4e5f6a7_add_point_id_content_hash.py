@@ -0,0 +1,35 @@
+"""add content hash and embedding model to user vector point ids
+
+Revision ID: b2c3d4e5f6a7
+Revises: a7b8c9d0e1f2
+Create Date: 2026-03-02 10:15:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b2c3d4e5f6a7"
+down_revision: Union[str, Sequence[str], None] = "a7b8c9d0e1f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "user_vector_point_ids",
+        sa.Column("source_content_hash", sa.String(length=128), nullable=True),
+    )
+    op.add_column(
+        "user_vector_point_ids",
+        sa.Column("embedding_model", sa.String(length=128), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("user_vector_point_ids", "embedding_model")
+    op.drop_column("user_vector_point_ids", "source_content_hash")
@@ -0,0 +1,110 @@
+"""member-scoped group chat inbox
+
+Revision ID: b8c9d0e1f2a3
+Revises: f6a7b8c9d0e1
+Create Date: 2026-03-10 09:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b8c9d0e1f2a3"
+down_revision: Union[str, Sequence[str], None] = "f6a7b8c9d0e1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "group_matches",
+        sa.Column(
+            "accepted_member_count", sa.Integer(), nullable=False, server_default=sa.text("0")
+        ),
+    )
+    op.add_column(
+        "group_match_members",
+        sa.Column("inbox_activity_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+    # One-off backfill; `crud.group_chat.backfill_group_chat_activity` does the same.
+    op.execute(
+        """
+        UPDATE group_matches SET accepted_member_count = (
+            SELECT count(*) FROM group_match_members gm
+            WHERE gm.group_match_id = group_matches.id AND gm.status = 'accepted'
+        )
+        """
+    )
+    op.execute(
+        """
+        UPDATE group_match_members SET inbox_activity_at = (
+            SELECT coalesce(g.last_message_at, g.updated_at) FROM group_matches g
+            WHERE g.id = group_match_members.group_match_id
+        )
+        """
+    )
+    op.alter_column(
+        "group_match_members",
+        "inbox_activity_at",
+        existing_type=sa.DateTime(timezone=True),
+        nullable=False,
+        server_default=sa.text("now()"),
+    )
+    # Pointers to messages that no longer exist would block the foreign key.
+    op.execute(
+        """
+        UPDATE group_matches SET last_message_id = NULL
+        WHERE last_message_id IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM group_chat_messages m WHERE m.id = last_message_id)
+        """
+    )
+    op.create_foreign_key(
+        "fk_group_matches_last_message_id",
+        "group_matches",
+        "group_chat_messages",
+        ["last_message_id"],
+        ["id"],
+        ondelete="SET NULL",
+    )
+
+    op.drop_index("ix_group_matches_inbox_activity", table_name="group_matches")
+    op.drop_index("ix_group_match_members_inbox", table_name="group_match_members")
+    op.create_index(
+        "ix_group_match_members_inbox",
+        "group_match_members",
+        [
+            "user_id",
+            "status",
+            sa.text("inbox_activity_at DESC"),
+            sa.text("group_match_id DESC"),
+        ],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_group_match_members_inbox", table_name="group_match_members")
+    op.create_index(
+        "ix_group_match_members_inbox",
+        "group_match_members",
+        ["user_id", "status", "group_match_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_group_matches_inbox_activity",
+        "group_matches",
+        [
+            sa.text("coalesce(last_message_at, updated_at) DESC"),
+            sa.text("created_at DESC"),
+            sa.text("id DESC"),
+        ],
+        unique=False,
+    )
+    op.drop_constraint("fk_group_matches_last_message_id", "group_matches", type_="foreignkey")
+    op.drop_column("group_match_members", "inbox_activity_at")
+    op.drop_column("group_matches", "accepted_member_count")
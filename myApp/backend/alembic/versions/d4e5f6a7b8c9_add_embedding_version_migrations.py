@@ -0,0 +1,74 @@
+"""add embedding version migrations
+
+Revision ID: d4e5f6a7b8c9
+Revises: c3d4e5f6a7b8
+Create Date: 2026-03-05 10:15:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d4e5f6a7b8c9"
+down_revision: Union[str, Sequence[str], None] = "c3d4e5f6a7b8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "embedding_version_migrations",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("provider", sa.String(length=64), nullable=False),
+        sa.Column("source_version", sa.String(length=128), nullable=False),
+        sa.Column("source_collection", sa.String(length=128), nullable=False),
+        sa.Column("target_version", sa.String(length=128), nullable=False),
+        sa.Column("target_collection", sa.String(length=128), nullable=False),
+        sa.Column("target_dimension", sa.Integer(), nullable=True),
+        sa.Column("status", sa.String(length=32), nullable=False),
+        sa.Column("coverage_threshold", sa.Float(), nullable=False),
+        sa.Column("chunk_size", sa.Integer(), nullable=False),
+        sa.Column("max_users_per_second", sa.Float(), nullable=True),
+        sa.Column("cursor_user_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("passes", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("total_users", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("processed_users", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("embedded_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("skipped_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("failed_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("dropped_points", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("cut_over_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_embedding_version_migrations_status"),
+        "embedding_version_migrations",
+        ["status"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f("ix_embedding_version_migrations_status"), table_name="embedding_version_migrations"
+    )
+    op.drop_table("embedding_version_migrations")
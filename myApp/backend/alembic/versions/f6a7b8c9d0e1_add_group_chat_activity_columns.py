@@ -0,0 +1,88 @@
+"""add denormalized group chat activity columns
+
+Revision ID: f6a7b8c9d0e1
+Revises: e5f6a7b8c9d0
+Create Date: 2026-03-09 11:05:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f6a7b8c9d0e1"
+down_revision: Union[str, Sequence[str], None] = "e5f6a7b8c9d0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "group_matches", sa.Column("last_message_at", sa.DateTime(timezone=True), nullable=True)
+    )
+    op.add_column(
+        "group_matches", sa.Column("last_message_id", postgresql.UUID(as_uuid=True), nullable=True)
+    )
+    op.add_column(
+        "group_matches", sa.Column("last_message_preview", sa.String(length=120), nullable=True)
+    )
+    op.add_column(
+        "group_matches",
+        sa.Column("message_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+    )
+
+    # One-off backfill from existing messages.
+    op.execute(
+        """
+        UPDATE group_matches SET
+            message_count = (
+                SELECT count(*) FROM group_chat_messages m
+                WHERE m.group_match_id = group_matches.id
+            ),
+            last_message_at = (
+                SELECT m.created_at FROM group_chat_messages m
+                WHERE m.group_match_id = group_matches.id
+                ORDER BY m.created_at DESC, m.id DESC LIMIT 1
+            ),
+            last_message_id = (
+                SELECT m.id FROM group_chat_messages m
+                WHERE m.group_match_id = group_matches.id
+                ORDER BY m.created_at DESC, m.id DESC LIMIT 1
+            ),
+            last_message_preview = (
+                SELECT substr(m.body, 1, 120) FROM group_chat_messages m
+                WHERE m.group_match_id = group_matches.id
+                ORDER BY m.created_at DESC, m.id DESC LIMIT 1
+            )
+        """
+    )
+
+    op.create_index(
+        "ix_group_matches_inbox_activity",
+        "group_matches",
+        [
+            sa.text("coalesce(last_message_at, updated_at) DESC"),
+            sa.text("created_at DESC"),
+            sa.text("id DESC"),
+        ],
+        unique=False,
+    )
+    op.create_index(
+        "ix_group_match_members_inbox",
+        "group_match_members",
+        ["user_id", "status", "group_match_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_group_match_members_inbox", table_name="group_match_members")
+    op.drop_index("ix_group_matches_inbox_activity", table_name="group_matches")
+    op.drop_column("group_matches", "message_count")
+    op.drop_column("group_matches", "last_message_preview")
+    op.drop_column("group_matches", "last_message_id")
+    op.drop_column("group_matches", "last_message_at")
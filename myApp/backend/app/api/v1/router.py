@@ -1,8 +1,10 @@
 from fastapi import APIRouter
 
+from app.api.v1.routes.admin_embedding_migrations import router as admin_embedding_migrations_router
 from app.api.v1.routes.admin_embeddings import router as admin_embeddings_router
 from app.api.v1.routes.admin_hobbies import router as admin_hobbies_router
 from app.api.v1.routes.admin_group_matches import router as admin_group_matches_router
+from app.api.v1.routes.admin_preference_profiles import router as admin_preference_profiles_router
 from app.api.v1.routes.admin_vector import router as admin_vector_router
 from app.api.v1.routes.auth import router as auth_router
 from app.api.v1.routes.chats import router as chats_router
@@ -14,9 +16,11 @@ from app.api.v1.routes.me import router as me_router
 from app.api.v1.routes.restaurants import router as restaurants_router
 
 router = APIRouter()
+router.include_router(admin_embedding_migrations_router)
 router.include_router(admin_embeddings_router)
 router.include_router(admin_hobbies_router)
 router.include_router(admin_group_matches_router)
+router.include_router(admin_preference_profiles_router)
 router.include_router(admin_vector_router)
 router.include_router(auth_router)
 router.include_router(chats_router)
@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.core.deps import get_db, require_admin_key
+from app.crud.vector_index import get_embedding_version_migration
+from app.models.vector_index import EmbeddingVersionMigration
+from app.schemas.admin_embeddings import (
+    AdminEmbeddingMigrationCutoverRequest,
+    AdminEmbeddingMigrationRead,
+    AdminEmbeddingMigrationStartRequest,
+)
+from app.services.embedding_cache import cached_embedder
+from app.services.embedding_migration import (
+    ACTIVE_MIGRATION_STATUSES,
+    MIGRATION_STATUS_BACKFILLING,
+    MIGRATION_STATUS_CUT_OVER,
+    EmbeddingMigrationWorker,
+    build_target_adapter,
+    cancel_embedding_migration,
+    cut_over_embedding_migration,
+    drop_source_embeddings,
+    embedding_migration_progress,
+    embedding_migration_worker_running,
+    get_active_embedding_migration,
+    migration_source,
+    migration_target,
+    run_embedding_migration_chunk,
+    start_embedding_migration,
+    start_embedding_migration_worker,
+    stop_embedding_migration_worker,
+)
+from app.services.embeddings import EmbeddingProvider, build_embedder
+
+router = APIRouter(
+    prefix="/admin/embeddings/migrations",
+    tags=["admin-embeddings"],
+    dependencies=[Depends(require_admin_key)],
+)
+
+
+def _ensure_vectorai_enabled() -> None:
+    if not settings.vectorai_enabled:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="VECTORAI_ENABLED is false",
+        )
+
+
+def _get_migration_or_404(db: Session, migration_id: UUID) -> EmbeddingVersionMigration:
+    migration = get_embedding_version_migration(db, migration_id)
+    if migration is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Migration not found")
+    return migration
+
+
+def _migration_embedder(migration: EmbeddingVersionMigration) -> EmbeddingProvider:
+    if not migration.target_dimension:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Target dimension is required. Set VECTORAI_DIMENSION or target_dimension.",
+        )
+    return cached_embedder(
+        build_embedder(settings, dimension=migration.target_dimension), settings
+    )
+
+
+def _to_read(db: Session, migration: EmbeddingVersionMigration) -> AdminEmbeddingMigrationRead:
+    progress = embedding_migration_progress(db, migration)
+    return AdminEmbeddingMigrationRead(
+        id=migration.id,
+        status=migration.status,
+        provider=migration.provider,
+        source_version=migration.source_version,
+        source_collection=migration.source_collection,
+        target_version=migration.target_version,
+        target_collection=migration.target_collection,
+        target_dimension=migration.target_dimension,
+        coverage_threshold=migration.coverage_threshold,
+        chunk_size=migration.chunk_size,
+        max_users_per_second=migration.max_users_per_second,
+        passes=migration.passes,
+        total_users=migration.total_users,
+        covered_users=progress.covered_users,
+        coverage=progress.coverage,
+        processed_users=migration.processed_users,
+        embedded_count=migration.embedded_count,
+        skipped_count=migration.skipped_count,
+        failed_count=migration.failed_count,
+        dropped_points=migration.dropped_points,
+        elapsed_seconds=progress.elapsed_seconds,
+        users_per_second=progress.users_per_second,
+        eta_seconds=progress.eta_seconds,
+        worker_running=embedding_migration_worker_running(migration.id),
+        last_error=migration.last_error,
+        created_at=migration.created_at,
+        cut_over_at=migration.cut_over_at,
+        completed_at=migration.completed_at,
+    )
+
+
+def _start_worker(db: Session, migration: EmbeddingVersionMigration) -> None:
+    start_embedding_migration_worker(
+        EmbeddingMigrationWorker(
+            migration_id=migration.id,
+            session_factory=sessionmaker(bind=db.get_bind(), autocommit=False, autoflush=False),
+            adapter_factory=lambda session, target: build_target_adapter(
+                session, settings=settings, target=target
+            ),
+            embedder=_migration_embedder(migration),
+        )
+    )
+
+
+@router.post("", response_model=AdminEmbeddingMigrationRead, status_code=status.HTTP_201_CREATED)
+def admin_start_embedding_migration(
+    payload: AdminEmbeddingMigrationStartRequest,
+    db: Session = Depends(get_db),
+) -> AdminEmbeddingMigrationRead:
+    """Create the target collection and start backfilling it; reads stay on the source."""
+
+    _ensure_vectorai_enabled()
+    try:
+        migration = start_embedding_migration(
+            db,
+            settings=settings,
+            target_version=payload.target_version,
+            target_collection=payload.target_collection or payload.target_version,
+            target_dimension=payload.target_dimension,
+            coverage_threshold=payload.coverage_threshold,
+            chunk_size=payload.chunk_size,
+            max_users_per_second=payload.max_users_per_second,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
+
+    try:
+        target = migration_target(migration)
+        build_target_adapter(db, settings=settings, target=target).ensure_collection()
+    except ValueError as exc:
+        cancel_embedding_migration(db, migration)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    if payload.run_in_background:
+        _start_worker(db, migration)
+    return _to_read(db, migration)
+
+
+@router.get("/current", response_model=AdminEmbeddingMigrationRead)
+def admin_get_current_embedding_migration(
+    db: Session = Depends(get_db),
+) -> AdminEmbeddingMigrationRead:
+    migration = get_active_embedding_migration(db)
+    if migration is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No active migration")
+    return _to_read(db, migration)
+
+
+@router.get("/{migration_id}", response_model=AdminEmbeddingMigrationRead)
+def admin_get_embedding_migration(
+    migration_id: UUID,
+    db: Session = Depends(get_db),
+) -> AdminEmbeddingMigrationRead:
+    return _to_read(db, _get_migration_or_404(db, migration_id))
+
+
+@router.post("/{migration_id}/step", response_model=AdminEmbeddingMigrationRead)
+def admin_step_embedding_migration(
+    migration_id: UUID,
+    db: Session = Depends(get_db),
+) -> AdminEmbeddingMigrationRead:
+    """Backfill one chunk synchronously (cuts over automatically at the end of a pass)."""
+
+    _ensure_vectorai_enabled()
+    migration = _get_migration_or_404(db, migration_id)
+    run_embedding_migration_chunk(
+        db,
+        migration,
+        vector_store=build_target_adapter(
+            db, settings=settings, target=migration_target(migration)
+        ),
+        embedder=_migration_embedder(migration),
+    )
+    return _to_read(db, migration)
+
+
+@router.post("/{migration_id}/run", response_model=AdminEmbeddingMigrationRead)
+def admin_run_embedding_migration(
+    migration_id: UUID,
+    db: Session = Depends(get_db),
+) -> AdminEmbeddingMigrationRead:
+    """(Re)start the background worker, e.g. after a process restart."""
+
+    _ensure_vectorai_enabled()
+    migration = _get_migration_or_404(db, migration_id)
+    if migration.status not in ACTIVE_MIGRATION_STATUSES:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Migration is {migration.status}",
+        )
+    _start_worker(db, migration)
+    return _to_read(db, migration)
+
+
+@router.post("/{migration_id}/cutover", response_model=AdminEmbeddingMigrationRead)
+def admin_cut_over_embedding_migration(
+    migration_id: UUID,
+    payload: AdminEmbeddingMigrationCutoverRequest,
+    db: Session = Depends(get_db),
+) -> AdminEmbeddingMigrationRead:
+    """Switch reads to the target now, then optionally bulk-delete the source version's points."""
+
+    _ensure_vectorai_enabled()
+    migration = _get_migration_or_404(db, migration_id)
+    if migration.status == MIGRATION_STATUS_BACKFILLING:
+        stop_embedding_migration_worker()
+        try:
+            cut_over_embedding_migration(db, migration, force=payload.force)
+        except ValueError as exc:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
+    if payload.drop_source and migration.status == MIGRATION_STATUS_CUT_OVER:
+        drop_source_embeddings(
+            db,
+            migration,
+            vector_store=build_target_adapter(
+                db, settings=settings, target=migration_source(migration)
+            ),
+        )
+    return _to_read(db, migration)
+
+
+@router.post("/{migration_id}/cancel", response_model=AdminEmbeddingMigrationRead)
+def admin_cancel_embedding_migration(
+    migration_id: UUID,
+    db: Session = Depends(get_db),
+) -> AdminEmbeddingMigrationRead:
+    migration = _get_migration_or_404(db, migration_id)
+    stop_embedding_migration_worker()
+    try:
+        cancel_embedding_migration(db, migration)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
+    return _to_read(db, migration)
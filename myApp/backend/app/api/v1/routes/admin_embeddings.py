@@ -1,15 +1,19 @@
 from __future__ import annotations
 
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import replace
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
 from app.core.deps import get_db, require_admin_key
 from app.crud.user import get_user_by_email
-from app.crud.vector_index import get_user_vector_point_id
+from app.crud.vector_index import get_user_vector_point_id, list_user_vector_point_ids_for_users
 from app.models.user import User
 from app.schemas.admin_embeddings import (
     AdminEmbeddingUpsertBatchRequest,
@@ -18,12 +22,16 @@ from app.schemas.admin_embeddings import (
     AdminEmbeddingUpsertRequest,
     AdminEmbeddingUpsertResponse,
     AdminEmbeddingUpsertResultRead,
+    AdminEmbeddingUpsertStreamLine,
+    AdminEmbeddingUpsertStreamRequest,
 )
 from app.services.actian_vector_store import ActianVectorStoreAdapter, ActianVectorStoreConfig
+from app.services.embedding_cache import cached_embedder
+from app.services.embedding_migration import resolve_serving_embedding_target
 from app.services.embeddings import (
-    USER_PROFILE_EMBEDDING_VERSION,
-    FakeEmbedder,
-    upsert_user_profile_embeddings_batch,
+    EmbeddingProvider,
+    build_embedder,
+    sync_user_profile_embeddings_batch,
     upsert_user_profile_embedding,
 )
 
@@ -49,6 +57,19 @@ def _get_user_or_404(db: Session, user_id: UUID) -> User:
     return user
 
 
+def _write_target(
+    db: Session, payload: AdminEmbeddingUpsertRequest
+) -> tuple[ActianVectorStoreConfig, str]:
+    """Config and version to write to: the explicit version, else the currently served target."""
+
+    cfg = ActianVectorStoreConfig.from_settings(settings)
+    if payload.embedding_version:
+        return cfg, payload.embedding_version
+    target = resolve_serving_embedding_target(db, settings=settings)
+    cfg = replace(cfg, collection_name=target.collection_name, dimension=target.dimension)
+    return cfg, target.embedding_version
+
+
 def _fake_embedder_dimension(payload: AdminEmbeddingUpsertRequest, cfg: ActianVectorStoreConfig) -> int:
     dimension = payload.fake_dimension_override or cfg.dimension
     if dimension is None or dimension <= 0:
@@ -67,7 +88,7 @@ def _perform_upsert(
 ) -> AdminEmbeddingUpsertResponse:
     _ensure_vectorai_enabled()
 
-    cfg = ActianVectorStoreConfig.from_settings(settings)
+    cfg, embedding_version = _write_target(db, payload)
     adapter = ActianVectorStoreAdapter(db=db, config=cfg)
     if payload.ensure_collection:
         try:
@@ -76,8 +97,7 @@ def _perform_upsert(
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
     dimension = _fake_embedder_dimension(payload, cfg)
-    embedder = FakeEmbedder(dimension=dimension)
-    embedding_version = payload.embedding_version or USER_PROFILE_EMBEDDING_VERSION
+    embedder = build_embedder(settings, dimension=dimension)
 
     result = upsert_user_profile_embedding(
         db,
@@ -153,17 +173,150 @@ def _resolve_batch_users(db: Session, payload: AdminEmbeddingUpsertBatchRequest)
         users.sort(key=lambda u: (u.created_at, str(u.id)))
         return users
 
-    stmt = select(User)
+    stmt = _apply_batch_user_filters(select(User), payload)
+    stmt = stmt.order_by(User.created_at.asc(), User.id.asc())
+    if payload.limit is not None:
+        stmt = stmt.limit(payload.limit)
+    return list(db.scalars(stmt).all())
+
+
+def _apply_batch_user_filters(stmt, payload: AdminEmbeddingUpsertBatchRequest):
     if payload.only_discoverable:
         stmt = stmt.where(User.discoverable.is_(True))
     if payload.mode == "in_person":
         stmt = stmt.where(User.open_to_meetups.is_(True))
     elif payload.mode == "chat_only":
         stmt = stmt.where(User.open_to_meetups.is_(False))
-    stmt = stmt.order_by(User.created_at.asc(), User.id.asc())
-    if payload.limit is not None:
-        stmt = stmt.limit(payload.limit)
-    return list(db.scalars(stmt).all())
+    return stmt
+
+
+def _iter_filtered_user_chunks(
+    db: Session,
+    payload: AdminEmbeddingUpsertStreamRequest,
+) -> Iterator[list[tuple[UUID, str]]]:
+    """Keyset-paginate the filtered selection on the primary key.
+
+    Each chunk is a fresh bounded query, so memory stays flat and the per-chunk commits done by
+    the upsert pipeline can't invalidate an open cursor.
+    """
+
+    remaining = payload.limit
+    after: UUID | None = None
+    while remaining is None or remaining > 0:
+        stmt = _apply_batch_user_filters(select(User.id, User.email), payload)
+        if after is not None:
+            stmt = stmt.where(User.id > after)
+        size = payload.chunk_size if remaining is None else min(payload.chunk_size, remaining)
+        rows = db.execute(stmt.order_by(User.id.asc()).limit(size)).all()
+        if not rows:
+            return
+        yield [(row.id, row.email) for row in rows]
+        after = rows[-1].id
+        if remaining is not None:
+            remaining -= len(rows)
+        if len(rows) < size:
+            return
+
+
+def _ndjson(line: AdminEmbeddingUpsertStreamLine) -> bytes:
+    return (line.model_dump_json(exclude_none=True) + "\n").encode("utf-8")
+
+
+def _stream_batch_upsert(
+    *,
+    session_factory: sessionmaker,
+    payload: AdminEmbeddingUpsertStreamRequest,
+    cfg: ActianVectorStoreConfig,
+    embedder: EmbeddingProvider,
+    embedding_version: str,
+    explicit_users: list[tuple[UUID, str]] | None,
+) -> Iterator[bytes]:
+    started = time.perf_counter()
+    selected = embedded = skipped = failed = chunks = 0
+    db = session_factory()
+    try:
+        adapter = ActianVectorStoreAdapter(db=db, config=cfg)
+        if explicit_users is not None:
+            chunk_iter: Iterable[list[tuple[UUID, str]]] = (
+                explicit_users[start : start + payload.chunk_size]
+                for start in range(0, len(explicit_users), payload.chunk_size)
+            )
+        else:
+            chunk_iter = _iter_filtered_user_chunks(db, payload)
+
+        for rows in chunk_iter:
+            chunks += 1
+            selected += len(rows)
+            report = sync_user_profile_embeddings_batch(
+                db,
+                user_ids=[user_id for user_id, _email in rows],
+                vector_store=adapter,
+                embedder=embedder,
+                embedding_version=embedding_version,
+                skip_unchanged=payload.skip_unchanged,
+            )
+            results = {result.user_id: result for result in report.results}
+            errors = {failure.user_id: failure.error for failure in report.failures}
+            mappings = {
+                row.user_id: row
+                for row in list_user_vector_point_ids_for_users(
+                    db,
+                    user_ids=[user_id for user_id, _email in rows],
+                    provider=adapter.provider,
+                    embedding_version=embedding_version,
+                )
+            }
+            embedded += report.embedded_count
+            skipped += report.skipped_count
+            failed += report.failed_count
+
+            for user_id, email in rows:
+                mapping = mappings.get(user_id)
+                if user_id in errors:
+                    line_status, content_hash = "failed", None
+                elif user_id in results:
+                    line_status, content_hash = "embedded", results[user_id].source_content_hash
+                else:
+                    line_status = "skipped"
+                    content_hash = mapping.source_content_hash if mapping is not None else None
+                yield _ndjson(
+                    AdminEmbeddingUpsertStreamLine(
+                        type="result",
+                        chunk=chunks,
+                        user_id=user_id,
+                        email=email,
+                        status=line_status,
+                        point_id=(
+                            mapping.point_id
+                            if mapping is not None and line_status != "failed"
+                            else None
+                        ),
+                        source_content_hash=content_hash,
+                        error=errors.get(user_id),
+                    )
+                )
+            # Drop this chunk's ORM state so a whole-base run doesn't accumulate it.
+            db.expunge_all()
+
+        if payload.flush and embedded and hasattr(adapter, "flush"):
+            adapter.flush()
+        yield _ndjson(
+            AdminEmbeddingUpsertStreamLine(
+                type="summary",
+                selected_count=selected,
+                embedded_count=embedded,
+                skipped_count=skipped,
+                failed_count=failed,
+                chunks=chunks,
+                elapsed_ms=(time.perf_counter() - started) * 1000.0,
+            )
+        )
+    except Exception as exc:
+        # Headers are already sent; report the failure in-band and stop.
+        db.rollback()
+        yield _ndjson(AdminEmbeddingUpsertStreamLine(type="error", error=str(exc), chunks=chunks))
+    finally:
+        db.close()
 
 
 def _perform_batch_upsert(
@@ -172,7 +325,7 @@ def _perform_batch_upsert(
     payload: AdminEmbeddingUpsertBatchRequest,
 ) -> AdminEmbeddingUpsertBatchResponse:
     _ensure_vectorai_enabled()
-    cfg = ActianVectorStoreConfig.from_settings(settings)
+    cfg, embedding_version = _write_target(db, payload)
     adapter = ActianVectorStoreAdapter(db=db, config=cfg)
     if payload.ensure_collection:
         try:
@@ -182,30 +335,37 @@ def _perform_batch_upsert(
 
     users = _resolve_batch_users(db, payload)
     dimension = _fake_embedder_dimension(payload, cfg)
-    embedder = FakeEmbedder(dimension=dimension)
-    embedding_version = payload.embedding_version or USER_PROFILE_EMBEDDING_VERSION
+    embedder = cached_embedder(build_embedder(settings, dimension=dimension), settings)
 
-    results = upsert_user_profile_embeddings_batch(
+    report = sync_user_profile_embeddings_batch(
         db,
         user_ids=[u.id for u in users],
         vector_store=adapter,
         embedder=embedder,
         embedding_version=embedding_version,
+        skip_unchanged=payload.skip_unchanged,
     )
-    if payload.flush and hasattr(adapter, "flush"):
+    results = report.results
+    if payload.flush and results and hasattr(adapter, "flush"):
         adapter.flush()
 
     users_by_uuid = {u.id: u for u in users}
-    response_rows: list[AdminEmbeddingUpsertResponse] = []
-    warnings: list[str] = []
-    for result in results:
-        user = users_by_uuid[result.user_id]
-        point_mapping = get_user_vector_point_id(
+    mappings = {
+        (row.user_id, row.embedding_version): row
+        for row in list_user_vector_point_ids_for_users(
             db,
-            user_id=user.id,
+            user_ids=[result.user_id for result in results],
             provider=adapter.provider,
-            embedding_version=result.embedding_version,
         )
+    }
+    response_rows: list[AdminEmbeddingUpsertResponse] = []
+    warnings: list[str] = [
+        f"Embedding failed for {users_by_uuid[failure.user_id].email}: {failure.error}"
+        for failure in report.failures
+    ]
+    for result in results:
+        user = users_by_uuid[result.user_id]
+        point_mapping = mappings.get((user.id, result.embedding_version))
         row_warnings: list[str] = []
         if point_mapping is None:
             row_warnings.append("No point-id mapping row found after upsert")
@@ -233,6 +393,9 @@ def _perform_batch_upsert(
     return AdminEmbeddingUpsertBatchResponse(
         selected_count=len(users),
         upserted_count=len(response_rows),
+        embedded_count=report.embedded_count,
+        skipped_count=report.skipped_count,
+        failed_count=report.failed_count,
         provider=adapter.provider,
         collection_name=adapter.collection_name,
         embedding_version=embedding_version,
@@ -249,6 +412,41 @@ def admin_upsert_embeddings_batch(
     return _perform_batch_upsert(db=db, payload=payload)
 
 
+@router.post("/upsert-batch/stream", response_class=StreamingResponse)
+def admin_upsert_embeddings_batch_stream(
+    payload: AdminEmbeddingUpsertStreamRequest,
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    """Chunked batch upsert that streams one NDJSON line per user, then a summary line."""
+
+    _ensure_vectorai_enabled()
+    cfg, embedding_version = _write_target(db, payload)
+    if payload.ensure_collection:
+        try:
+            ActianVectorStoreAdapter(db=db, config=cfg).ensure_collection()
+        except ValueError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    dimension = _fake_embedder_dimension(payload, cfg)
+
+    # Explicit selections are bounded by the request body; resolve them up front so unknown
+    # users still fail with 404 before streaming starts.
+    explicit_users = None
+    if payload.user_ids or payload.emails:
+        explicit_users = [(user.id, user.email) for user in _resolve_batch_users(db, payload)]
+
+    return StreamingResponse(
+        _stream_batch_upsert(
+            session_factory=sessionmaker(bind=db.get_bind(), autocommit=False, autoflush=False),
+            payload=payload,
+            cfg=cfg,
+            embedder=cached_embedder(build_embedder(settings, dimension=dimension), settings),
+            embedding_version=embedding_version,
+            explicit_users=explicit_users,
+        ),
+        media_type="application/x-ndjson",
+    )
+
+
 @router.post("/users/by-email/upsert", response_model=AdminEmbeddingUpsertResponse)
 def admin_upsert_user_embedding_by_email(
     payload: AdminEmbeddingUpsertByEmailRequest,
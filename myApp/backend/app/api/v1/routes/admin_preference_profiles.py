@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.deps import get_db, require_admin_key
+from app.models.user import User
+from app.schemas.preference_profile import (
+    AdminPreferenceProfileBulkRequest,
+    AdminPreferenceProfileBulkResponse,
+    AdminPreferenceProfileRead,
+)
+from app.services.preference_profile_builder import PreferenceProfile, source_content_hash
+from app.services.preference_profile_cache import (
+    get_preference_profile,
+    get_preference_profiles_batch,
+)
+
+router = APIRouter(
+    prefix="/admin/preference-profiles",
+    tags=["admin-preference-profiles"],
+    dependencies=[Depends(require_admin_key)],
+)
+
+
+def _to_read(profile: PreferenceProfile) -> AdminPreferenceProfileRead:
+    return AdminPreferenceProfileRead(
+        user_id=profile.user_id,
+        profile_version=profile.embedding_version,
+        content_hash=source_content_hash(profile.text_for_embedding),
+        text_for_embedding=profile.text_for_embedding,
+        profile=profile.as_dict(),
+    )
+
+
+@router.get("/{user_id}", response_model=AdminPreferenceProfileRead)
+def admin_get_preference_profile(
+    user_id: UUID,
+    db: Session = Depends(get_db),
+) -> AdminPreferenceProfileRead:
+    try:
+        return _to_read(get_preference_profile(db, user_id))
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found") from exc
+
+
+@router.post("/bulk", response_model=AdminPreferenceProfileBulkResponse)
+def admin_bulk_preference_profiles(
+    payload: AdminPreferenceProfileBulkRequest,
+    db: Session = Depends(get_db),
+) -> AdminPreferenceProfileBulkResponse:
+    """Materialized profiles for many users; missing or invalidated ones are rebuilt on the way."""
+
+    requested = list(dict.fromkeys(payload.user_ids))
+    existing = set(db.scalars(select(User.id).where(User.id.in_(requested))))
+    found = [user_id for user_id in requested if user_id in existing]
+    profiles = get_preference_profiles_batch(db, found)
+    db.commit()
+    return AdminPreferenceProfileBulkResponse(
+        profiles=[_to_read(profile) for profile in profiles],
+        missing_user_ids=[user_id for user_id in requested if user_id not in existing],
+    )
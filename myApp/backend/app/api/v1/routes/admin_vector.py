@@ -4,18 +4,47 @@ import math
 import time
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.deps import get_db, require_admin_key
+from app.schemas.vector_benchmark import (
+    VectorBenchmarkLatencyRead,
+    VectorBenchmarkRequest,
+    VectorBenchmarkResponse,
+    VectorBenchmarkSearchRead,
+    VectorBenchmarkUpsertRead,
+)
 from app.schemas.vector_diagnostics import (
     VectorDiagnosticsCheck,
     VectorDiagnosticsConfigSnapshot,
     VectorDiagnosticsRequest,
     VectorDiagnosticsResponse,
 )
+from app.schemas.vector_reconciliation import (
+    VectorReconcileApplyRead,
+    VectorReconcileMappingFixRead,
+    VectorReconcileRequest,
+    VectorReconcileResponse,
+    VectorReconcileReupsertRead,
+)
 from app.services.actian_vector_store import ActianVectorStoreAdapter, ActianVectorStoreConfig
+from app.services.embedding_cache import cached_embedder
+from app.services.embeddings import build_embedder
+from app.services.vector_benchmark import (
+    BACKEND_ADAPTER,
+    LatencySummary,
+    VectorBenchmarkConfig,
+    build_benchmark_adapter,
+    run_vector_benchmark,
+)
+from app.services.vector_reconciliation import (
+    SCAN_MODE_SCROLL,
+    apply_reconciliation_plan,
+    build_reconciliation_plan,
+)
+from app.services.vector_resilience import BREAKER_CLOSED, BREAKER_OPEN
 
 router = APIRouter(
     prefix="/admin/vector",
@@ -126,6 +155,10 @@ def run_vector_diagnostics(
         supports_metadata_filtering=cfg.supports_metadata_filtering,
         batch_upsert_size=cfg.batch_upsert_size,
         request_timeout_seconds=cfg.request_timeout_seconds,
+        breaker_failure_threshold=cfg.breaker_failure_threshold,
+        breaker_reset_seconds=cfg.breaker_reset_seconds,
+        hedge_search=cfg.hedge_search,
+        hedge_delay_ms=cfg.hedge_delay_ms,
     )
 
     checks: dict[str, VectorDiagnosticsCheck] = {}
@@ -146,6 +179,21 @@ def run_vector_diagnostics(
 
     adapter = ActianVectorStoreAdapter(db=db, config=cfg)
 
+    guard = getattr(adapter, "guard", None)
+    if guard is not None:
+        # Snapshot before probing so the report shows the state live traffic has been seeing.
+        resilience = guard.snapshot()
+        breaker_state = resilience["breaker"]["state"]
+        checks["resilience"] = VectorDiagnosticsCheck(
+            ok=breaker_state != BREAKER_OPEN,
+            status=breaker_state,
+            data=resilience,
+        )
+        if breaker_state != BREAKER_CLOSED:
+            warnings.append(
+                f"Vector store circuit breaker is {breaker_state}; calls may fail fast."
+            )
+
     def _healthcheck_probe():
         healthy = adapter.healthcheck()
         return healthy, {"healthy": healthy}
@@ -378,3 +426,169 @@ def run_vector_diagnostics(
         checks=checks,
         warnings=warnings,
     )
+
+
+@router.post("/reconcile", response_model=VectorReconcileResponse)
+def run_vector_reconciliation(
+    payload: VectorReconcileRequest,
+    db: Session = Depends(get_db),
+) -> VectorReconcileResponse:
+    if not settings.vectorai_enabled:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="VECTORAI_ENABLED is false",
+        )
+
+    cfg = ActianVectorStoreConfig.from_settings(settings)
+    adapter = ActianVectorStoreAdapter(db=db, config=cfg)
+    plan = build_reconciliation_plan(
+        db,
+        adapter=adapter,
+        embedding_version=payload.embedding_version,
+        page_size=payload.page_size,
+    )
+
+    warnings: list[str] = []
+    if plan.scan_mode != SCAN_MODE_SCROLL:
+        warnings.append("Client has no scroll support; orphaned points were not scanned.")
+
+    applied = None
+    if payload.apply and not plan.is_clean:
+        dimension = payload.fake_dimension_override or cfg.dimension
+        if plan.reupserts and (dimension is None or dimension <= 0):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=(
+                    "Vector dimension is required. "
+                    "Set VECTORAI_DIMENSION or fake_dimension_override."
+                ),
+            )
+        result = apply_reconciliation_plan(
+            db,
+            adapter=adapter,
+            plan=plan,
+            embedder=cached_embedder(build_embedder(settings, dimension=dimension or 1), settings),
+        )
+        applied = VectorReconcileApplyRead(
+            deleted_orphans=result.deleted_orphans,
+            fixed_mappings=result.fixed_mappings,
+            reupserted=result.reupserted,
+        )
+
+    sample = payload.sample_size
+    return VectorReconcileResponse(
+        provider=plan.provider,
+        collection_name=plan.collection_name,
+        embedding_version=plan.embedding_version,
+        scan_mode=plan.scan_mode,
+        mapping_count=plan.mapping_count,
+        remote_count=plan.remote_count,
+        reupsert_count=len(plan.reupserts),
+        orphan_count=len(plan.orphan_point_ids),
+        mapping_fix_count=len(plan.mapping_fixes),
+        elapsed_ms=plan.elapsed_ms,
+        reupsert_sample=[
+            VectorReconcileReupsertRead(
+                user_id=item.user_id,
+                embedding_version=item.embedding_version,
+                reason=item.reason,
+            )
+            for item in plan.reupserts[:sample]
+        ],
+        orphan_point_id_sample=plan.orphan_point_ids[:sample],
+        mapping_fix_sample=[
+            VectorReconcileMappingFixRead(
+                point_id=fix.point_id,
+                user_id=fix.user_id,
+                embedding_version=fix.embedding_version,
+            )
+            for fix in plan.mapping_fixes[:sample]
+        ],
+        applied=applied,
+        warnings=warnings,
+    )
+
+
+def _latency_read(summary: LatencySummary) -> VectorBenchmarkLatencyRead:
+    return VectorBenchmarkLatencyRead(
+        count=summary.count,
+        mean_ms=summary.mean_ms,
+        p50_ms=summary.p50_ms,
+        p95_ms=summary.p95_ms,
+        p99_ms=summary.p99_ms,
+        max_ms=summary.max_ms,
+    )
+
+
+@router.post("/benchmark", response_model=VectorBenchmarkResponse)
+def run_vector_store_benchmark(
+    payload: VectorBenchmarkRequest,
+    db: Session = Depends(get_db),
+) -> VectorBenchmarkResponse:
+    if payload.backend == BACKEND_ADAPTER and not settings.vectorai_enabled:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="VECTORAI_ENABLED is false",
+        )
+
+    try:
+        adapter = build_benchmark_adapter(
+            db,
+            settings=settings,
+            backend=payload.backend,
+            dimension=payload.dimension,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    batch_sizes = tuple(payload.batch_sizes or (adapter.config.batch_upsert_size,))
+    report = run_vector_benchmark(
+        adapter,
+        VectorBenchmarkConfig(
+            dimension=adapter.config.dimension or 0,
+            num_points=payload.num_points,
+            batch_sizes=batch_sizes,
+            num_searches=payload.num_searches,
+            search_concurrency=payload.search_concurrency,
+            top_k=payload.top_k,
+            filter_queries=payload.filter_queries,
+            filter_shards=payload.filter_shards,
+            compute_recall=payload.compute_recall,
+            cleanup=payload.cleanup,
+            seed=payload.seed,
+        ),
+    )
+
+    return VectorBenchmarkResponse(
+        backend=payload.backend,
+        collection_name=adapter.collection_name,
+        dimension=report.dimension,
+        num_points=report.num_points,
+        upserts=[
+            VectorBenchmarkUpsertRead(
+                batch_size=item.batch_size,
+                points=item.points,
+                batches=item.batches,
+                elapsed_ms=item.elapsed_ms,
+                points_per_second=item.points_per_second,
+                batch_latency=_latency_read(item.batch_latency),
+            )
+            for item in report.upserts
+        ],
+        searches=[
+            VectorBenchmarkSearchRead(
+                label=item.label,
+                queries=item.queries,
+                concurrency=item.concurrency,
+                top_k=item.top_k,
+                errors=item.errors,
+                elapsed_ms=item.elapsed_ms,
+                queries_per_second=item.queries_per_second,
+                latency=_latency_read(item.latency),
+                recall_at_k=item.recall_at_k,
+            )
+            for item in report.searches
+        ],
+        cleanup_deleted=report.cleanup_deleted,
+        warnings=report.warnings,
+    )
@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 
 from app.core.deps import get_current_db_user, get_db
 from app.crud import group_chat as crud_group_chat
+from app.models.group_match import GroupMatch
 from app.models.user import User
 from app.schemas.group_chat import (
     GroupChatLastMessageRead,
@@ -28,19 +29,19 @@ def _message_read(message_obj, sender: User) -> GroupChatMessageRead:
     )
 
 
-def _chat_summary(db: Session, group) -> GroupChatSummaryRead:
-    venue = crud_group_chat.get_group_chat_venue(db, group.id)
-    last_message = crud_group_chat.get_latest_group_chat_message(db, group.id)
-    member_count = crud_group_chat.count_accepted_group_members(db, group.id)
-
+def _chat_summary(
+    group: GroupMatch,
+    last_message_sender_id: UUID | None,
+    member_count: int,
+    venue_name: str | None,
+) -> GroupChatSummaryRead:
     last_message_read = None
-    if last_message is not None:
-        preview = last_message.body[:120]
+    if group.last_message_id is not None and last_message_sender_id is not None:
         last_message_read = GroupChatLastMessageRead(
-            id=last_message.id,
-            sender_user_id=last_message.sender_user_id,
-            body_preview=preview,
-            created_at=last_message.created_at,
+            id=group.last_message_id,
+            sender_user_id=last_message_sender_id,
+            body_preview=group.last_message_preview or "",
+            created_at=group.last_message_at,
         )
 
     return GroupChatSummaryRead(
@@ -49,7 +50,7 @@ def _chat_summary(db: Session, group) -> GroupChatSummaryRead:
         group_match_mode=group.group_match_mode,
         chat_room_key=group.chat_room_key,
         member_count=member_count,
-        venue_name=venue.name_snapshot if venue is not None else None,
+        venue_name=venue_name,
         last_message=last_message_read,
         created_at=group.created_at,
         updated_at=group.updated_at,
@@ -63,9 +64,10 @@ def list_group_chats(
     current_user: User = Depends(get_current_db_user),
     db: Session = Depends(get_db),
 ) -> list[GroupChatSummaryRead]:
-    groups = crud_group_chat.list_user_group_chats(db, current_user.id, limit=limit, offset=offset)
-    groups = crud_group_chat.sort_groups_by_latest_activity(db, groups)
-    return [_chat_summary(db, group) for group in groups]
+    rows = crud_group_chat.list_user_group_chat_inbox(
+        db, current_user.id, limit=limit, offset=offset
+    )
+    return [_chat_summary(*row) for row in rows]
 
 
 @router.get("/{group_match_id}/messages", response_model=list[GroupChatMessageRead])
@@ -1,46 +1,165 @@
-from fastapi import APIRouter, Depends, Query
+import base64
+import binascii
+import json
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.core.deps import get_current_db_user, get_db
 from app.crud import social as crud_social
 from app.models.user import User
-from app.schemas.social import MatchRead, MatchSignals, UserPublicRead
+from app.schemas.social import MatchFeedStrategy, MatchRead, MatchSignals, UserPublicRead
+from app.services.geo import decode_geohash
+from app.services.hobby_index import hobby_index
+from app.services.match_feed import (
+    VectorMatch,
+    get_match_feed_page,
+    rank_match_candidates,
+    rank_vector_match_candidates,
+)
 
 router = APIRouter(prefix="/matches", tags=["matches"])
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MATCH_STRATEGY_HEADER = "X-Match-Strategy"
+MAX_MATCH_RADIUS_KM = 200.0
+
+MatchCursor = tuple[int, int, int, UUID]
+
+
+def _encode_cursor(key: MatchCursor) -> str:
+    score, overlap, same_hood, user_id = key
+    raw = json.dumps([score, overlap, same_hood, str(user_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> MatchCursor:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        score, overlap, same_hood, user_id = json.loads(raw)
+        return int(score), int(overlap), int(same_hood), UUID(user_id)
+    except (binascii.Error, ValueError, TypeError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        ) from exc
+
+
+def _feed_match_rows(
+    db: Session,
+    current_user: User,
+    *,
+    limit: int,
+    offset: int,
+    after: MatchCursor | None,
+) -> list[tuple[User, int, int, bool]]:
+    """Rank one page (cached feed or hobby index) and hydrate just that page's users."""
+
+    if settings.match_feed_cache_enabled:
+        matches = get_match_feed_page(
+            db,
+            current_user,
+            limit=limit,
+            offset=offset,
+            after=after,
+            feed_size=settings.match_feed_size,
+        )
+    else:
+        matches = rank_match_candidates(db, current_user, limit=offset + limit, after=after)
+        matches = matches[offset:]
+    users = crud_social.get_users_by_ids(db, [match.user_id for match in matches])
+    return [
+        (users[match.user_id], match.score, match.hobby_overlap, match.same_neighborhood)
+        for match in matches
+        if match.user_id in users
+    ]
+
+
+def _nearby_origin(current_user: User, *, radius_km: float) -> tuple[float, float, float]:
+    try:
+        latitude, longitude = decode_geohash(current_user.geohash or "")
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Set a valid geohash on your profile to filter matches by distance",
+        ) from exc
+    return latitude, longitude, radius_km
+
+
+def _vector_match_reads(matches: list[VectorMatch]) -> list[MatchRead]:
+    return [
+        MatchRead(
+            user=UserPublicRead.model_validate(match.user).model_copy(
+                update={"hobbies": list(match.hobbies)}
+            ),
+            score=match.score,
+            signals=MatchSignals(
+                same_neighborhood=match.same_neighborhood,
+                hobby_overlap_count=len(match.overlap_hobbies),
+                overlap_hobbies=match.overlap_hobbies,
+                vector_similarity=match.vector_similarity,
+            ),
+        )
+        for match in matches
+    ]
+
 
 @router.get("", response_model=list[MatchRead])
 def list_matches(
+    response: Response,
     limit: int = Query(default=20, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
+    cursor: str | None = Query(default=None),
+    strategy: MatchFeedStrategy = Query(default="heuristic"),
+    radius_km: float | None = Query(default=None, gt=0, le=MAX_MATCH_RADIUS_KM),
     current_user: User = Depends(get_current_db_user),
     db: Session = Depends(get_db),
 ) -> list[MatchRead]:
-    excluded_ids = {current_user.id}
-    excluded_ids |= crud_social.get_friend_ids(db, current_user.id)
-    excluded_ids |= crud_social.get_related_pending_request_user_ids(db, current_user.id)
+    """Best matches first. Pass the `X-Next-Cursor` response header back as `cursor` to page.
 
-    candidates = crud_social.list_discoverable_users_excluding(db, excluded_ids, limit=limit, offset=offset)
-    user_ids = [current_user.id, *[candidate.id for candidate in candidates]]
-    hobby_map = crud_social.get_user_hobby_codes_map(db, user_ids)
+    `strategy=vector` ranks by profile-embedding similarity blended with the hobby/neighborhood
+    signals and pages by `offset`. It falls back to the heuristic feed when vector search is
+    unavailable; `X-Match-Strategy` reports which one served the page. A cursor always continues
+    the heuristic feed it came from.
 
-    current_hobbies = set(hobby_map.get(current_user.id, []))
-    current_neighborhood = (current_user.neighborhood or "").strip().lower()
-    results: list[MatchRead] = []
+    `radius_km` keeps only users whose geohash is that close to the caller's and always uses the
+    heuristic ranking.
+    """
 
-    for candidate in candidates:
-        candidate_hobbies = hobby_map.get(candidate.id, [])
-        overlap_hobbies = sorted(current_hobbies.intersection(candidate_hobbies))
-        same_neighborhood = bool(
-            current_neighborhood
-            and candidate.neighborhood
-            and current_neighborhood == candidate.neighborhood.strip().lower()
+    near = None
+    if radius_km is not None:
+        near = _nearby_origin(current_user, radius_km=radius_km)
+    elif strategy == "vector" and cursor is None:
+        vector_matches = rank_vector_match_candidates(
+            db, current_user, limit=limit, offset=offset, settings=settings
         )
+        if vector_matches is not None:
+            response.headers[MATCH_STRATEGY_HEADER] = "vector"
+            return _vector_match_reads(vector_matches)
+    response.headers[MATCH_STRATEGY_HEADER] = "heuristic"
 
-        score = (1 if same_neighborhood else 0) + len(overlap_hobbies)
-        if score <= 0:
-            continue
+    after = _decode_cursor(cursor) if cursor else None
+    if near is None and (settings.match_feed_cache_enabled or hobby_index.ready):
+        feed_rows = _feed_match_rows(db, current_user, limit=limit, offset=offset, after=after)
+        hobby_map = crud_social.get_user_hobby_codes_map(
+            db, [current_user.id, *[candidate.id for candidate, *_ in feed_rows]]
+        )
+        current_hobbies = hobby_map.get(current_user.id, [])
+        rows = [(*row, hobby_map.get(row[0].id, [])) for row in feed_rows]
+    else:
+        # Ranking, exclusions and both sides' hobbies come back in one query.
+        current_hobbies, rows = crud_social.list_match_page(
+            db,
+            current_user,
+            limit=limit,
+            offset=offset,
+            after=after,
+            near=near,
+        )
 
+    results: list[MatchRead] = []
+    for candidate, score, overlap_count, same_neighborhood, candidate_hobbies in rows:
         results.append(
             MatchRead(
                 user=UserPublicRead.model_validate(candidate).model_copy(
@@ -49,19 +168,15 @@ def list_matches(
                 score=score,
                 signals=MatchSignals(
                     same_neighborhood=same_neighborhood,
-                    hobby_overlap_count=len(overlap_hobbies),
-                    overlap_hobbies=overlap_hobbies,
+                    hobby_overlap_count=overlap_count,
+                    overlap_hobbies=sorted(set(current_hobbies).intersection(candidate_hobbies)),
                 ),
             )
         )
 
-    results.sort(
-        key=lambda item: (
-            item.score,
-            item.signals.hobby_overlap_count,
-            1 if item.signals.same_neighborhood else 0,
-            item.user.id.hex,
-        ),
-        reverse=True,
-    )
+    if len(rows) == limit:
+        candidate, score, overlap_count, same_neighborhood, _hobbies = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = _encode_cursor(
+            (score, overlap_count, int(same_neighborhood), candidate.id)
+        )
     return results
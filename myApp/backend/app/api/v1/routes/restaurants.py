@@ -1,12 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_current_db_user, get_db
 from app.crud import restaurant as crud_restaurant
 from app.crud import restaurant_rating as crud_restaurant_rating
 from app.models.user import User
-from app.schemas.restaurant import RestaurantCreate, RestaurantRead
+from app.schemas.restaurant import RestaurantCreate, RestaurantNearbyRead, RestaurantRead
 from app.schemas.restaurant_rating import RestaurantRatingRead, RestaurantRatingUpsert
+from app.services.restaurant_spatial_index import find_nearby_restaurants
 
 router = APIRouter(prefix="/restaurants", tags=["restaurants"])
 
@@ -16,6 +17,28 @@ def list_restaurants(db: Session = Depends(get_db)) -> list[RestaurantRead]:
     return crud_restaurant.list_restaurants(db)
 
 
+@router.get("/nearby", response_model=list[RestaurantNearbyRead])
+def list_nearby_restaurants(
+    lat: float = Query(ge=-90, le=90),
+    lon: float = Query(ge=-180, le=180),
+    radius_km: float = Query(default=5.0, gt=0, le=100),
+    limit: int = Query(default=20, ge=1, le=100),
+    db: Session = Depends(get_db),
+) -> list[RestaurantNearbyRead]:
+    nearby = find_nearby_restaurants(
+        db, latitude=lat, longitude=lon, radius_km=radius_km, limit=limit
+    )
+    restaurants = crud_restaurant.get_restaurants_by_ids(db, [rid for rid, _distance in nearby])
+    return [
+        RestaurantNearbyRead(
+            **RestaurantRead.model_validate(restaurants[restaurant_id]).model_dump(),
+            distance_km=round(distance_km, 3),
+        )
+        for restaurant_id, distance_km in nearby
+        if restaurant_id in restaurants
+    ]
+
+
 @router.get("/{restaurant_id}", response_model=RestaurantRead)
 def get_restaurant(restaurant_id: int, db: Session = Depends(get_db)) -> RestaurantRead:
     restaurant = crud_restaurant.get_restaurant(db, restaurant_id)
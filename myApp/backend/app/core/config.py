@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -37,9 +38,52 @@ class Settings(BaseSettings):
     vectorai_dimension: int | None = None
     vectorai_supports_metadata_filtering: bool = False
     vectorai_batch_upsert_size: int = 100
+    vectorai_batch_delete_size: int = 500
     vectorai_request_timeout_seconds: float | None = None
+    vectorai_breaker_failure_threshold: int = 5
+    vectorai_breaker_reset_seconds: float = 30.0
+    vectorai_hedge_search: bool = False
+    vectorai_hedge_delay_ms: float = 50.0
     vectorai_probe_metadata_filtering_on_startup: bool = False
 
+    # Profile embedding provider: "fake" (hash-seeded test vectors) or "hashing" (feature-hashing
+    # TF-IDF, with idf weights saved by app.scripts.fit_hashing_embedder when a path is set).
+    embedding_provider: Literal["fake", "hashing"] = "fake"
+    embedding_hashing_idf_path: str | None = None
+
+    # Content-addressed embedding cache (in-memory LRU, optional mmap-backed disk tier).
+    embedding_cache_max_entries: int = 10_000
+    embedding_cache_dir: str | None = None
+
+    # Background re-embedding of users marked dirty by profile/hobby/rating writes.
+    embedding_refresh_worker_enabled: bool = False
+    embedding_refresh_interval_seconds: float = 5.0
+    embedding_refresh_debounce_seconds: float = 2.0
+    embedding_refresh_batch_size: int = 200
+    embedding_refresh_retry_seconds: float = 60.0
+    embedding_refresh_max_backoff_seconds: float = 300.0
+
+    # In-memory hobby/neighborhood inverted index for match retrieval, built at startup.
+    hobby_index_enabled: bool = False
+
+    # In-memory grid over restaurant coordinates for /restaurants/nearby, built at startup.
+    restaurant_spatial_index_enabled: bool = False
+
+    # Venue selection for generated in-person groups: restaurants searched around the members.
+    group_venue_search_radius_km: float = 5.0
+    group_venue_candidate_limit: int = 25
+
+    # Precomputed per-user match feeds (in-memory), invalidated by friend/profile/hobby writes.
+    match_feed_cache_enabled: bool = False
+    match_feed_size: int = 200
+    match_feed_ttl_seconds: float = 60.0
+    match_feed_max_entries: int = 10_000
+    # Background warmer that rebuilds feeds for users who opened /matches recently.
+    match_feed_warmer_enabled: bool = False
+    match_feed_warmer_interval_seconds: float = 15.0
+    match_feed_warm_recent_seconds: float = 900.0
+    match_feed_warmer_batch_size: int = 100
+
 
 @lru_cache
 def get_settings() -> Settings:
@@ -1,30 +1,65 @@
-from collections.abc import Sequence
+from datetime import datetime, timezone
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import Select, case, func, or_, select, update
 from sqlalchemy.orm import Session
 
+from app.crud.group_match import sync_accepted_member_counts, sync_member_inbox_activity
 from app.models.group_chat import GroupChatMessage
 from app.models.group_match import GroupMatch, GroupMatchMember, GroupMatchVenue
 from app.models.user import User
 
 CHAT_ENABLED_GROUP_STATUSES = ("confirmed", "scheduled", "completed")
+CHAT_PREVIEW_LENGTH = 120
 
 
-def list_user_group_chats(db: Session, user_id: UUID, *, limit: int, offset: int) -> list[GroupMatch]:
-    stmt = (
-        select(GroupMatch)
-        .join(GroupMatchMember, GroupMatchMember.group_match_id == GroupMatch.id)
+def _group_chat_inbox_stmt(user_id: UUID, *, limit: int, offset: int) -> Select:
+    return (
+        select(
+            GroupMatch,
+            GroupChatMessage.sender_user_id,
+            GroupMatch.accepted_member_count,
+            GroupMatchVenue.name_snapshot,
+        )
+        .select_from(GroupMatchMember)
+        .join(GroupMatch, GroupMatch.id == GroupMatchMember.group_match_id)
+        .outerjoin(GroupChatMessage, GroupChatMessage.id == GroupMatch.last_message_id)
+        .outerjoin(GroupMatchVenue, GroupMatchVenue.group_match_id == GroupMatch.id)
         .where(
             GroupMatchMember.user_id == user_id,
             GroupMatchMember.status == "accepted",
             GroupMatch.status.in_(CHAT_ENABLED_GROUP_STATUSES),
         )
-        .order_by(GroupMatch.updated_at.desc(), GroupMatch.created_at.desc())
+        .order_by(
+            GroupMatchMember.inbox_activity_at.desc(),
+            GroupMatchMember.group_match_id.desc(),
+        )
         .offset(offset)
         .limit(limit)
     )
-    return list(db.scalars(stmt).all())
+
+
+def list_user_group_chat_inbox(
+    db: Session,
+    user_id: UUID,
+    *,
+    limit: int,
+    offset: int,
+) -> list[tuple[GroupMatch, UUID | None, int, str | None]]:
+    """One inbox page as `(group, last_message_sender_id, accepted_member_count, venue_name)`.
+
+    The page is ordered by the caller's member rows (`inbox_activity_at`), so ordering before
+    `limit`/`offset` is read from `ix_group_match_members_inbox`. Member counts and the last
+    message come from denormalized `GroupMatch` columns; the venue and the last message's sender
+    are primary-key outer joins. Read-only.
+
+    Deleting the latest message (e.g. with its sender's account) sets `last_message_id` to NULL
+    through its foreign key, and the group shows no last message until
+    `backfill_group_chat_activity` recomputes it.
+    """
+
+    rows = db.execute(_group_chat_inbox_stmt(user_id, limit=limit, offset=offset)).all()
+    return [(row[0], row[1], int(row[2]), row[3]) for row in rows]
 
 
 def get_user_group_chat(db: Session, user_id: UUID, group_match_id: UUID) -> GroupMatch | None:
@@ -87,32 +122,67 @@ def create_group_chat_message(
     sender_user_id: UUID,
     body: str,
 ) -> GroupChatMessage:
+    sent_at = datetime.now(timezone.utc)
     message = GroupChatMessage(
         group_match_id=group_match_id,
         sender_user_id=sender_user_id,
         body=body,
+        created_at=sent_at,
     )
     db.add(message)
+    db.flush()
+    # Same transaction as the insert; a slower concurrent writer never moves the pointer back.
+    is_latest = or_(GroupMatch.last_message_at.is_(None), GroupMatch.last_message_at <= sent_at)
+    db.execute(
+        update(GroupMatch)
+        .where(GroupMatch.id == group_match_id)
+        .values(
+            message_count=GroupMatch.message_count + 1,
+            last_message_at=case((is_latest, sent_at), else_=GroupMatch.last_message_at),
+            last_message_id=case((is_latest, message.id), else_=GroupMatch.last_message_id),
+            last_message_preview=case(
+                (is_latest, body[:CHAT_PREVIEW_LENGTH]), else_=GroupMatch.last_message_preview
+            ),
+            # Chat activity is tracked by the columns above, not by the group's own update time.
+            updated_at=GroupMatch.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    sync_member_inbox_activity(db, [group_match_id])
     db.commit()
     db.refresh(message)
     return message
 
 
-def sort_groups_by_latest_activity(
-    db: Session,
-    groups: Sequence[GroupMatch],
-) -> list[GroupMatch]:
-    latest_map: dict[UUID, object] = {}
-    for group in groups:
-        latest = get_latest_group_chat_message(db, group.id)
-        latest_map[group.id] = latest.created_at if latest is not None else None
-
-    return sorted(
-        groups,
-        key=lambda group: (
-            latest_map.get(group.id) or group.updated_at or group.created_at,
-            group.created_at,
-            str(group.id),
-        ),
-        reverse=True,
+def backfill_group_chat_activity(db: Session, group_match_ids: list[UUID] | None = None) -> None:
+    """Recompute the denormalized inbox columns of some groups (all when None) and commit.
+
+    `last_message_*` and `message_count` are rebuilt from the messages with the same statement as
+    the migration that introduced them, followed by the accepted member counts and the member
+    rows' `inbox_activity_at`. Safe to rerun.
+    """
+
+    def _latest(column):
+        return (
+            select(column)
+            .where(GroupChatMessage.group_match_id == GroupMatch.id)
+            .order_by(GroupChatMessage.created_at.desc(), GroupChatMessage.id.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+
+    stmt = update(GroupMatch).values(
+        message_count=select(func.count())
+        .where(GroupChatMessage.group_match_id == GroupMatch.id)
+        .scalar_subquery(),
+        last_message_at=_latest(GroupChatMessage.created_at),
+        last_message_id=_latest(GroupChatMessage.id),
+        last_message_preview=_latest(func.substr(GroupChatMessage.body, 1, CHAT_PREVIEW_LENGTH)),
+        updated_at=GroupMatch.updated_at,
     )
+    if group_match_ids is not None:
+        stmt = stmt.where(GroupMatch.id.in_(group_match_ids))
+    db.execute(stmt.execution_options(synchronize_session=False))
+    sync_accepted_member_counts(db, group_match_ids)
+    sync_member_inbox_activity(db, group_match_ids)
+    db.commit()
@@ -2,7 +2,7 @@ from collections import Counter
 from datetime import datetime, timezone
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import func, select, update
 from sqlalchemy.orm import Session
 
 from app.models.group_match import GroupMatch, GroupMatchMember, GroupMatchVenue
@@ -112,11 +112,50 @@ def sync_group_match_status(db: Session, group: GroupMatch) -> GroupMatch:
     return group
 
 
+def sync_accepted_member_counts(db: Session, group_match_ids: list[UUID] | None = None) -> None:
+    """Recount `GroupMatch.accepted_member_count` for some groups (all when None), unflushed."""
+
+    stmt = update(GroupMatch).values(
+        accepted_member_count=select(func.count())
+        .where(
+            GroupMatchMember.group_match_id == GroupMatch.id,
+            GroupMatchMember.status == "accepted",
+        )
+        .scalar_subquery(),
+        # A recount is bookkeeping, not an update of the group itself.
+        updated_at=GroupMatch.updated_at,
+    )
+    if group_match_ids is not None:
+        stmt = stmt.where(GroupMatch.id.in_(group_match_ids))
+    db.execute(stmt.execution_options(synchronize_session=False))
+
+
+def sync_member_inbox_activity(db: Session, group_match_ids: list[UUID] | None = None) -> None:
+    """Copy each group's `coalesce(last_message_at, updated_at)` onto its member rows.
+
+    The inbox orders by `GroupMatchMember.inbox_activity_at`, so it is served from the
+    member-scoped `ix_group_match_members_inbox` index. Call after any group or chat write.
+    """
+
+    stmt = update(GroupMatchMember).values(
+        inbox_activity_at=select(func.coalesce(GroupMatch.last_message_at, GroupMatch.updated_at))
+        .where(GroupMatch.id == GroupMatchMember.group_match_id)
+        .scalar_subquery(),
+        updated_at=GroupMatchMember.updated_at,
+    )
+    if group_match_ids is not None:
+        stmt = stmt.where(GroupMatchMember.group_match_id.in_(group_match_ids))
+    db.execute(stmt.execution_options(synchronize_session=False))
+
+
 def commit_group_member_action(db: Session, group: GroupMatch, member: GroupMatchMember) -> tuple[GroupMatch, GroupMatchMember]:
     db.add(member)
     db.add(group)
     db.flush()
     sync_group_match_status(db, group)
+    db.flush()
+    sync_accepted_member_counts(db, [group.id])
+    sync_member_inbox_activity(db, [group.id])
     db.commit()
     db.refresh(group)
     db.refresh(member)
@@ -3,8 +3,12 @@ from uuid import UUID
 from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
 
+from app.crud.preference_profile import invalidate_user_preference_profiles
+from app.crud.vector_index import mark_users_embedding_dirty
 from app.models.hobby import HobbyCatalog, UserHobby
 from app.schemas.hobby import HobbyCreate
+from app.services.hobby_index import refresh_hobby_index_users
+from app.services.match_feed_cache import invalidate_match_feeds
 
 
 def _normalize_code(code: str) -> str:
@@ -94,7 +98,11 @@ def set_user_hobbies_by_codes(db: Session, user_id: UUID, hobby_codes: list[str]
     db.execute(delete(UserHobby).where(UserHobby.user_id == user_id))
 
     if not normalized:
+        mark_users_embedding_dirty(db, user_ids=[user_id], commit=False)
+        invalidate_user_preference_profiles(db, user_ids=[user_id], commit=False)
         db.commit()
+        refresh_hobby_index_users(db, [user_id])
+        invalidate_match_feeds([user_id])
         return []
 
     hobbies = get_hobbies_by_codes(db, normalized)
@@ -107,5 +115,9 @@ def set_user_hobbies_by_codes(db: Session, user_id: UUID, hobby_codes: list[str]
     for code in normalized:
         db.add(UserHobby(user_id=user_id, hobby_id=hobby_by_code[code].id))
 
+    mark_users_embedding_dirty(db, user_ids=[user_id], commit=False)
+    invalidate_user_preference_profiles(db, user_ids=[user_id], commit=False)
     db.commit()
+    refresh_hobby_index_users(db, [user_id])
+    invalidate_match_feeds([user_id])
     return normalized
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from uuid import UUID
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.crud.vector_index import dialect_insert
+from app.models.preference_profile import UserPreferenceProfile
+
+
+def list_user_preference_profiles(
+    db: Session,
+    *,
+    user_ids: list[UUID],
+) -> list[UserPreferenceProfile]:
+    if not user_ids:
+        return []
+    stmt = (
+        select(UserPreferenceProfile)
+        .where(UserPreferenceProfile.user_id.in_(user_ids))
+        .execution_options(populate_existing=True)
+    )
+    return list(db.scalars(stmt).all())
+
+
+def invalidate_user_preference_profiles(
+    db: Session,
+    *,
+    user_ids: list[UUID],
+    commit: bool = True,
+) -> None:
+    """Clear materialized profiles and bump their generation. One upsert statement.
+
+    Write paths call this with `commit=False` next to `mark_users_embedding_dirty`, so the
+    invalidation commits together with the profile change.
+    """
+
+    unique_ids = list(dict.fromkeys(user_ids))
+    if not unique_ids:
+        return
+    now = datetime.now(timezone.utc)
+    cleared = {"profile": None, "text_for_embedding": None, "content_hash": None}
+    insert = dialect_insert(db)
+    if insert is None:
+        for user_id in unique_ids:
+            row = db.get(UserPreferenceProfile, user_id)
+            if row is None:
+                db.add(
+                    UserPreferenceProfile(
+                        user_id=user_id, generation=1, invalidated_at=now, **cleared
+                    )
+                )
+            else:
+                row.generation += 1
+                row.invalidated_at = now
+                for field, value in cleared.items():
+                    setattr(row, field, value)
+    else:
+        stmt = insert(UserPreferenceProfile).values(
+            [
+                {"user_id": user_id, "generation": 1, "invalidated_at": now, **cleared}
+                for user_id in unique_ids
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[UserPreferenceProfile.user_id],
+            set_={
+                "generation": UserPreferenceProfile.generation + 1,
+                "invalidated_at": stmt.excluded.invalidated_at,
+                **cleared,
+            },
+        )
+        db.execute(stmt)
+    if commit:
+        db.commit()
+
+
+def store_user_preference_profiles(
+    db: Session,
+    *,
+    rows: list[dict],
+    generations: dict[UUID, int],
+    commit: bool = True,
+) -> int:
+    """Write freshly built profiles, skipping any invalidated since they were read.
+
+    `generations` holds the generation each existing row had when it was read; rows are only
+    updated while it still matches. Users without a row are inserted with `ON CONFLICT DO
+    NOTHING`, so a concurrent invalidation that created the row first wins. Returns rows stored.
+    """
+
+    stored = 0
+    missing: list[dict] = []
+    for row in rows:
+        generation = generations.get(row["user_id"])
+        if generation is None:
+            missing.append(row)
+            continue
+        result = db.execute(
+            update(UserPreferenceProfile)
+            .where(
+                UserPreferenceProfile.user_id == row["user_id"],
+                UserPreferenceProfile.generation == generation,
+            )
+            .values(**{key: value for key, value in row.items() if key != "user_id"})
+            .execution_options(synchronize_session=False)
+        )
+        stored += int(result.rowcount or 0)
+
+    if missing:
+        insert = dialect_insert(db)
+        if insert is None:
+            for row in missing:
+                if db.get(UserPreferenceProfile, row["user_id"]) is None:
+                    db.add(UserPreferenceProfile(generation=1, **row))
+                    stored += 1
+        else:
+            stmt = insert(UserPreferenceProfile).values(
+                [{"generation": 1, **row} for row in missing]
+            )
+            result = db.execute(
+                stmt.on_conflict_do_nothing(index_elements=[UserPreferenceProfile.user_id])
+            )
+            stored += int(result.rowcount or 0)
+    if commit:
+        db.commit()
+    return stored
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 
 from app.models.restaurant import Restaurant
 from app.schemas.restaurant import RestaurantCreate
+from app.services.restaurant_spatial_index import refresh_restaurant_spatial_index
 
 
 def list_restaurants(db: Session) -> list[Restaurant]:
@@ -15,6 +16,13 @@ def get_restaurant(db: Session, restaurant_id: int) -> Restaurant | None:
     return db.scalar(stmt)
 
 
+def get_restaurants_by_ids(db: Session, restaurant_ids: list[int]) -> dict[int, Restaurant]:
+    if not restaurant_ids:
+        return {}
+    stmt = select(Restaurant).where(Restaurant.id.in_(restaurant_ids))
+    return {restaurant.id: restaurant for restaurant in db.scalars(stmt).all()}
+
+
 def get_restaurant_by_name_and_address(
     db: Session, name: str, address: str | None
 ) -> Restaurant | None:
@@ -31,4 +39,5 @@ def create_restaurant(db: Session, restaurant_in: RestaurantCreate) -> Restauran
     db.add(restaurant)
     db.commit()
     db.refresh(restaurant)
+    refresh_restaurant_spatial_index(restaurant.id, restaurant.latitude, restaurant.longitude)
     return restaurant
@@ -3,6 +3,8 @@ from uuid import UUID
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.crud.preference_profile import invalidate_user_preference_profiles
+from app.crud.vector_index import mark_users_embedding_dirty
 from app.models.restaurant import Restaurant
 from app.models.restaurant_rating import RestaurantRating
 from app.schemas.restaurant_rating import RestaurantRatingUpsert
@@ -31,6 +33,8 @@ def upsert_restaurant_rating(
             **payload.model_dump(),
         )
         db.add(rating)
+        mark_users_embedding_dirty(db, user_ids=[user_id], commit=False)
+        invalidate_user_preference_profiles(db, user_ids=[user_id], commit=False)
         db.commit()
         db.refresh(rating)
         return rating, True
@@ -39,6 +43,8 @@ def upsert_restaurant_rating(
     for field, value in update_data.items():
         setattr(existing, field, value)
     db.add(existing)
+    mark_users_embedding_dirty(db, user_ids=[user_id], commit=False)
+    invalidate_user_preference_profiles(db, user_ids=[user_id], commit=False)
     db.commit()
     db.refresh(existing)
     return existing, False
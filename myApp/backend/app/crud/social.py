@@ -2,12 +2,26 @@ from collections import defaultdict
 from datetime import datetime, timezone
 from uuid import UUID
 
-from sqlalchemy import and_, or_, select
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    ColumnElement,
+    ScalarSelect,
+    Select,
+    and_,
+    case,
+    exists,
+    func,
+    literal,
+    or_,
+    select,
+    union_all,
+)
+from sqlalchemy.orm import Session, aliased
 
 from app.models.hobby import HobbyCatalog, UserHobby
 from app.models.social import FriendRequest, Friendship
 from app.models.user import User
+from app.services.geo import decode_geohash, geohash_prefix_ranges, haversine_km_many
+from app.services.match_feed_cache import invalidate_match_feeds
 
 
 def get_friend_request(db: Session, request_id: UUID) -> FriendRequest | None:
@@ -49,6 +63,9 @@ def create_friend_request(db: Session, requester_id: UUID, addressee_id: UUID) -
     db.add(friend_request)
     db.commit()
     db.refresh(friend_request)
+    invalidate_match_feeds(
+        [friend_request.requester_id, friend_request.addressee_id], listing_feeds=False
+    )
     return friend_request
 
 
@@ -58,6 +75,9 @@ def set_friend_request_status(db: Session, friend_request: FriendRequest, status
     db.add(friend_request)
     db.commit()
     db.refresh(friend_request)
+    invalidate_match_feeds(
+        [friend_request.requester_id, friend_request.addressee_id], listing_feeds=False
+    )
     return friend_request
 
 
@@ -67,6 +87,9 @@ def reopen_friend_request(db: Session, friend_request: FriendRequest) -> FriendR
     db.add(friend_request)
     db.commit()
     db.refresh(friend_request)
+    invalidate_match_feeds(
+        [friend_request.requester_id, friend_request.addressee_id], listing_feeds=False
+    )
     return friend_request
 
 
@@ -95,6 +118,9 @@ def accept_friend_request(db: Session, friend_request: FriendRequest) -> FriendR
 
     db.commit()
     db.refresh(friend_request)
+    invalidate_match_feeds(
+        [friend_request.requester_id, friend_request.addressee_id], listing_feeds=False
+    )
     return friend_request
 
 
@@ -128,37 +154,289 @@ def list_friends(db: Session, user_id: UUID) -> list[tuple[User, datetime]]:
     return [(row[0], row[1]) for row in db.execute(stmt).all()]
 
 
-def get_related_pending_request_user_ids(db: Session, user_id: UUID) -> set[UUID]:
-    stmt = select(FriendRequest.requester_id, FriendRequest.addressee_id).where(
-        FriendRequest.status == "pending",
-        or_(FriendRequest.requester_id == user_id, FriendRequest.addressee_id == user_id),
+def get_match_excluded_user_ids(db: Session, user_id: UUID) -> set[UUID]:
+    """Friends plus users with a pending request either way, in one round trip."""
+
+    stmt = union_all(
+        select(Friendship.friend_id).where(Friendship.user_id == user_id),
+        select(FriendRequest.addressee_id).where(
+            FriendRequest.requester_id == user_id, FriendRequest.status == "pending"
+        ),
+        select(FriendRequest.requester_id).where(
+            FriendRequest.addressee_id == user_id, FriendRequest.status == "pending"
+        ),
     )
-    excluded: set[UUID] = set()
-    for requester_id, addressee_id in db.execute(stmt).all():
-        if requester_id == user_id:
-            excluded.add(addressee_id)
-        else:
-            excluded.add(requester_id)
-    return excluded
+    return set(db.scalars(stmt).all())
 
 
-def get_friend_ids(db: Session, user_id: UUID) -> set[UUID]:
-    stmt = select(Friendship.friend_id).where(Friendship.user_id == user_id)
-    return set(db.scalars(stmt).all())
+def get_users_by_ids(db: Session, user_ids: list[UUID]) -> dict[UUID, User]:
+    if not user_ids:
+        return {}
+    return {user.id: user for user in db.scalars(select(User).where(User.id.in_(user_ids)))}
+
+
+def _geohash_within(latitude: float, longitude: float, radius_km: float) -> ColumnElement[bool]:
+    """Index range scans on `users.geohash` over the 3x3 cells covering a `radius_km` circle.
+
+    The cells over-cover the circle, so callers refine the rows with `haversine_km_many`.
+    """
+
+    cells = geohash_prefix_ranges(latitude, longitude, radius_km)
+    conditions = [
+        User.geohash >= low if high is None else and_(User.geohash >= low, User.geohash < high)
+        for low, high in cells
+    ]
+    # Users stored at a coarser precision than the search cells match one of their prefixes.
+    coarser = {low[:length] for low, _high in cells for length in range(1, len(low))}
+    if coarser:
+        conditions.append(User.geohash.in_(sorted(coarser)))
+    return and_(User.geohash.is_not(None), or_(*conditions))
+
+
+def _geohash_distances(
+    latitude: float, longitude: float, geohashes: list[str | None]
+) -> list[float | None]:
+    # Distance to each geohash cell center in one vectorized pass; None for undecodable hashes.
+    decoded: list[tuple[int, float, float]] = []
+    for position, geohash in enumerate(geohashes):
+        try:
+            lat, lon = decode_geohash(geohash or "")
+        except ValueError:
+            continue
+        decoded.append((position, lat, lon))
+    distances: list[float | None] = [None] * len(geohashes)
+    computed = haversine_km_many(
+        latitude, longitude, [lat for _p, lat, _l in decoded], [lon for _p, _la, lon in decoded]
+    )
+    for (position, _lat, _lon), distance in zip(decoded, computed, strict=True):
+        distances[position] = distance
+    return distances
 
 
-def list_discoverable_users_excluding(
+def get_nearby_user_distances(
     db: Session,
-    excluded_ids: set[UUID],
+    *,
+    latitude: float,
+    longitude: float,
+    radius_km: float,
+    exclude_user_id: UUID | None = None,
+) -> dict[UUID, float]:
+    """Users whose geohash cell center lies within `radius_km`, mapped to their distance in km.
+
+    Candidates come from indexed range scans on `users.geohash` over the 3x3 geohash cells around
+    the point; exact distances are then computed in one vectorized haversine pass.
+    """
+
+    stmt = select(User.id, User.geohash).where(_geohash_within(latitude, longitude, radius_km))
+    if exclude_user_id is not None:
+        stmt = stmt.where(User.id != exclude_user_id)
+    rows = db.execute(stmt).all()
+    distances = _geohash_distances(latitude, longitude, [geohash for _id, geohash in rows])
+    return {
+        user_id: distance
+        for (user_id, _geohash), distance in zip(rows, distances, strict=True)
+        if distance is not None and distance <= radius_km
+    }
+
+
+def _scored_match_candidates_stmt(
+    user: User,
     *,
     limit: int,
     offset: int,
-) -> list[User]:
-    stmt = select(User).where(User.discoverable.is_(True))
-    if excluded_ids:
-        stmt = stmt.where(User.id.notin_(list(excluded_ids)))
-    stmt = stmt.order_by(User.created_at.desc()).offset(offset).limit(limit)
-    return list(db.scalars(stmt).all())
+    after: tuple[int, int, int, UUID] | None,
+    near: tuple[float, float, float] | None,
+) -> Select:
+    mine = aliased(UserHobby)
+    theirs = aliased(UserHobby)
+    overlap_sq = (
+        select(theirs.user_id.label("user_id"), func.count().label("overlap"))
+        .join(mine, and_(mine.hobby_id == theirs.hobby_id, mine.user_id == user.id))
+        .where(theirs.user_id != user.id)
+        .group_by(theirs.user_id)
+        .subquery()
+    )
+
+    neighborhood = (user.neighborhood or "").strip().lower()
+    same_hood = (
+        case((func.lower(func.trim(User.neighborhood)) == neighborhood, 1), else_=0)
+        if neighborhood
+        else literal(0)
+    )
+    overlap = func.coalesce(overlap_sq.c.overlap, 0)
+    is_friend = exists().where(Friendship.user_id == user.id, Friendship.friend_id == User.id)
+    has_pending_request = exists().where(
+        FriendRequest.status == "pending",
+        or_(
+            and_(FriendRequest.requester_id == user.id, FriendRequest.addressee_id == User.id),
+            and_(FriendRequest.requester_id == User.id, FriendRequest.addressee_id == user.id),
+        ),
+    )
+    ranked = (
+        select(
+            User.id.label("user_id"),
+            (overlap + same_hood).label("score"),
+            overlap.label("overlap"),
+            same_hood.label("same_hood"),
+        )
+        .outerjoin(overlap_sq, overlap_sq.c.user_id == User.id)
+        .where(
+            User.discoverable.is_(True),
+            User.id != user.id,
+            ~is_friend,
+            ~has_pending_request,
+        )
+    )
+    if near is not None:
+        ranked = ranked.where(_geohash_within(*near))
+    ranked = ranked.subquery()
+
+    stmt = (
+        select(User, ranked.c.score, ranked.c.overlap, ranked.c.same_hood)
+        .join(ranked, ranked.c.user_id == User.id)
+        .where(ranked.c.score > 0)
+    )
+    if after is not None:
+        score, hobby_overlap, hood, last_id = after
+        stmt = stmt.where(
+            or_(
+                ranked.c.score < score,
+                and_(ranked.c.score == score, ranked.c.overlap < hobby_overlap),
+                and_(
+                    ranked.c.score == score,
+                    ranked.c.overlap == hobby_overlap,
+                    ranked.c.same_hood < hood,
+                ),
+                and_(
+                    ranked.c.score == score,
+                    ranked.c.overlap == hobby_overlap,
+                    ranked.c.same_hood == hood,
+                    User.id < last_id,
+                ),
+            )
+        )
+    return (
+        stmt.order_by(
+            ranked.c.score.desc(),
+            ranked.c.overlap.desc(),
+            ranked.c.same_hood.desc(),
+            User.id.desc(),
+        )
+        .offset(offset)
+        .limit(limit)
+    )
+
+
+def _match_page_rows(
+    db: Session,
+    user: User,
+    *,
+    limit: int,
+    offset: int,
+    after: tuple[int, int, int, UUID] | None,
+    near: tuple[float, float, float] | None,
+    extra_columns: tuple[ColumnElement, ...] = (),
+) -> list:
+    def _stmt(batch_limit: int, batch_offset: int, batch_after) -> Select:
+        stmt = _scored_match_candidates_stmt(
+            user, limit=batch_limit, offset=batch_offset, after=batch_after, near=near
+        )
+        return stmt.add_columns(*extra_columns) if extra_columns else stmt
+
+    if near is None:
+        return db.execute(_stmt(limit, offset, after)).all()
+
+    # The geohash ranges over-cover the circle: refine each batch by exact distance and keep
+    # reading keyset batches until the page is full or the candidates run out.
+    latitude, longitude, radius_km = near
+    rows: list = []
+    skip = offset
+    while True:
+        wanted = skip + limit - len(rows)
+        batch = db.execute(_stmt(2 * wanted, 0, after)).all()
+        distances = _geohash_distances(latitude, longitude, [row[0].geohash for row in batch])
+        for row, distance in zip(batch, distances, strict=True):
+            if distance is None or distance > radius_km:
+                continue
+            if skip:
+                skip -= 1
+                continue
+            rows.append(row)
+            if len(rows) == limit:
+                return rows
+        if len(batch) < 2 * wanted:
+            return rows
+        last = batch[-1]
+        after = (int(last[1]), int(last[2]), int(last[3]), last[0].id)
+
+
+def list_scored_match_candidates(
+    db: Session,
+    user: User,
+    *,
+    limit: int,
+    offset: int = 0,
+    after: tuple[int, int, int, UUID] | None = None,
+    near: tuple[float, float, float] | None = None,
+) -> list[tuple[User, int, int, bool]]:
+    """Discoverable users ranked by match score, as `(user, score, hobby_overlap, same_hood)`.
+
+    Score is shared hobby count (a `user_hobbies` self-join aggregate) plus 1 for the same
+    neighborhood; zero scores are dropped. Friends and users with a pending request either way are
+    removed with `NOT EXISTS` anti-joins, so the parameter count does not grow with the friend
+    list. Rows are ordered by `(score, overlap, same_hood, id)` descending and `after` is the last
+    key of the previous page, so every page is a full keyset page. `near` is a
+    `(latitude, longitude, radius_km)` circle: geohash range predicates narrow the candidate query
+    and only the rows read for the page are refined by exact distance.
+    """
+
+    rows = _match_page_rows(db, user, limit=limit, offset=offset, after=after, near=near)
+    return [(row[0], int(row[1]), int(row[2]), bool(row[3])) for row in rows]
+
+
+def _hobby_codes_subquery(user_id: ColumnElement[UUID] | UUID) -> ScalarSelect:
+    return (
+        select(func.aggregate_strings(HobbyCatalog.code, ","))
+        .select_from(UserHobby)
+        .join(HobbyCatalog, HobbyCatalog.id == UserHobby.hobby_id)
+        .where(UserHobby.user_id == user_id)
+        .scalar_subquery()
+    )
+
+
+def _split_codes(value: str | None) -> list[str]:
+    return sorted(value.split(",")) if value else []
+
+
+def list_match_page(
+    db: Session,
+    user: User,
+    *,
+    limit: int,
+    offset: int = 0,
+    after: tuple[int, int, int, UUID] | None = None,
+    near: tuple[float, float, float] | None = None,
+) -> tuple[list[str], list[tuple[User, int, int, bool, list[str]]]]:
+    """`list_scored_match_candidates` plus hobby codes, in a single query.
+
+    Returns the caller's hobby codes and `(user, score, hobby_overlap, same_hood, hobby_codes)`
+    rows. Both hobby lists are correlated aggregates on the candidate query, so a match page is
+    one round trip (plus a follow-up batch when `near` refinement leaves the page short).
+    """
+
+    rows = _match_page_rows(
+        db,
+        user,
+        limit=limit,
+        offset=offset,
+        after=after,
+        near=near,
+        extra_columns=(_hobby_codes_subquery(User.id), _hobby_codes_subquery(user.id)),
+    )
+    my_hobbies = _split_codes(rows[0][5]) if rows else []
+    return my_hobbies, [
+        (row[0], int(row[1]), int(row[2]), bool(row[3]), _split_codes(row[4])) for row in rows
+    ]
 
 
 def get_user_hobby_codes_map(db: Session, user_ids: list[UUID]) -> dict[UUID, list[str]]:
@@ -1,8 +1,12 @@
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.crud.preference_profile import invalidate_user_preference_profiles
+from app.crud.vector_index import mark_users_embedding_dirty
 from app.models.user import User
 from app.schemas.user import UserCreate, UserProfileCreate, UserProfileUpdate
+from app.services.hobby_index import refresh_hobby_index_users
+from app.services.match_feed_cache import invalidate_match_feeds
 
 
 def get_user_by_email(db: Session, email: str) -> User | None:
@@ -27,6 +31,7 @@ def create_user_profile(db: Session, profile_in: UserProfileCreate) -> User:
     db.add(user)
     db.commit()
     db.refresh(user)
+    refresh_hobby_index_users(db, [user.id])
     return user
 
 
@@ -35,8 +40,12 @@ def update_user_profile(db: Session, user: User, profile_in: UserProfileUpdate)
     for field, value in update_data.items():
         setattr(user, field, value)
     db.add(user)
+    mark_users_embedding_dirty(db, user_ids=[user.id], commit=False)
+    invalidate_user_preference_profiles(db, user_ids=[user.id], commit=False)
     db.commit()
     db.refresh(user)
+    refresh_hobby_index_users(db, [user.id])
+    invalidate_match_feeds([user.id])
     return user
 
 
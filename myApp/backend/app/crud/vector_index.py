@@ -1,11 +1,16 @@
 from __future__ import annotations
 
-from uuid import UUID
+from datetime import datetime, timedelta, timezone
+from uuid import UUID, uuid4
 
-from sqlalchemy import select
+from sqlalchemy import delete, func, or_, select, update
 from sqlalchemy.orm import Session
 
-from app.models.vector_index import UserVectorPointId
+from app.models.vector_index import (
+    EmbeddingDirtyUser,
+    EmbeddingVersionMigration,
+    UserVectorPointId,
+)
 
 
 def get_user_vector_point_id(
@@ -53,6 +58,136 @@ def list_user_vector_point_ids_for_user(
     return list(db.scalars(stmt).all())
 
 
+def list_user_vector_point_ids_for_users(
+    db: Session,
+    *,
+    user_ids: list[UUID],
+    provider: str,
+    collection_name: str | None = None,
+    embedding_version: str | None = None,
+) -> list[UserVectorPointId]:
+    if not user_ids:
+        return []
+    stmt = (
+        select(UserVectorPointId)
+        .where(UserVectorPointId.user_id.in_(user_ids))
+        .where(UserVectorPointId.provider == provider)
+    )
+    if collection_name is not None:
+        stmt = stmt.where(UserVectorPointId.collection_name == collection_name)
+    if embedding_version is not None:
+        stmt = stmt.where(UserVectorPointId.embedding_version == embedding_version)
+    stmt = stmt.order_by(UserVectorPointId.point_id.asc())
+    return list(db.scalars(stmt).all())
+
+
+def list_user_vector_point_ids_page(
+    db: Session,
+    *,
+    provider: str,
+    collection_name: str,
+    embedding_version: str | None = None,
+    after_point_id: int | None = None,
+    limit: int = 500,
+) -> list[UserVectorPointId]:
+    """Keyset page over a collection's mappings, ordered by point ID."""
+
+    stmt = (
+        select(UserVectorPointId)
+        .where(UserVectorPointId.provider == provider)
+        .where(UserVectorPointId.collection_name == collection_name)
+    )
+    if embedding_version is not None:
+        stmt = stmt.where(UserVectorPointId.embedding_version == embedding_version)
+    if after_point_id is not None:
+        stmt = stmt.where(UserVectorPointId.point_id > after_point_id)
+    stmt = stmt.order_by(UserVectorPointId.point_id.asc()).limit(limit)
+    return list(db.scalars(stmt).all())
+
+
+def list_user_vector_point_ids_for_version(
+    db: Session,
+    *,
+    provider: str,
+    collection_name: str,
+    embedding_version: str,
+    after_point_id: int | None = None,
+    limit: int = 500,
+) -> list[UserVectorPointId]:
+    return list_user_vector_point_ids_page(
+        db,
+        provider=provider,
+        collection_name=collection_name,
+        embedding_version=embedding_version,
+        after_point_id=after_point_id,
+        limit=limit,
+    )
+
+
+def count_user_vector_point_ids(
+    db: Session,
+    *,
+    provider: str,
+    collection_name: str,
+    embedding_version: str,
+) -> int:
+    stmt = (
+        select(func.count())
+        .select_from(UserVectorPointId)
+        .where(UserVectorPointId.provider == provider)
+        .where(UserVectorPointId.collection_name == collection_name)
+        .where(UserVectorPointId.embedding_version == embedding_version)
+    )
+    return int(db.scalar(stmt) or 0)
+
+
+def create_user_vector_point_ids_bulk(
+    db: Session,
+    *,
+    rows: list[dict],
+) -> int:
+    """Insert many mapping rows with one statement and commit, skipping rows that conflict.
+
+    Each dict carries the model's column values. A row conflicts when its (user, provider,
+    embedding version) or (provider, collection, point ID) is already mapped; the existing mapping
+    wins. Returns the number of rows inserted.
+    """
+
+    if not rows:
+        return 0
+    insert = dialect_insert(db)
+    if insert is not None:
+        stmt = insert(UserVectorPointId).values([{"id": uuid4(), **row} for row in rows])
+        result = db.execute(stmt.on_conflict_do_nothing())
+        db.commit()
+        return int(result.rowcount or 0)
+
+    taken_users: set[tuple] = set()
+    taken_points: set[tuple] = set()
+    for existing in db.scalars(
+        select(UserVectorPointId).where(
+            or_(
+                UserVectorPointId.user_id.in_([row["user_id"] for row in rows]),
+                UserVectorPointId.point_id.in_([row["point_id"] for row in rows]),
+            )
+        )
+    ):
+        taken_users.add((existing.user_id, existing.provider, existing.embedding_version))
+        taken_points.add((existing.provider, existing.collection_name, existing.point_id))
+    inserted = 0
+    for row in rows:
+        user_key = (row["user_id"], row["provider"], row["embedding_version"])
+        point_key = (row["provider"], row["collection_name"], row["point_id"])
+        if user_key in taken_users or point_key in taken_points:
+            continue
+        taken_users.add(user_key)
+        taken_points.add(point_key)
+        db.add(UserVectorPointId(**row))
+        inserted += 1
+    db.commit()
+    return inserted
+
+
 def create_user_vector_point_id(
     db: Session,
     *,
@@ -61,6 +196,9 @@ def create_user_vector_point_id(
     collection_name: str,
     embedding_version: str,
     point_id: int,
+    source_content_hash: str | None = None,
+    embedding_model: str | None = None,
+    vector_dimension: int | None = None,
 ) -> UserVectorPointId:
     row = UserVectorPointId(
         user_id=user_id,
@@ -68,6 +206,9 @@ def create_user_vector_point_id(
         collection_name=collection_name,
         embedding_version=embedding_version,
         point_id=point_id,
+        source_content_hash=source_content_hash,
+        embedding_model=embedding_model,
+        vector_dimension=vector_dimension,
     )
     db.add(row)
     db.commit()
@@ -81,11 +222,20 @@ def update_user_vector_point_id(
     *,
     collection_name: str | None = None,
     point_id: int | None = None,
+    source_content_hash: str | None = None,
+    embedding_model: str | None = None,
+    vector_dimension: int | None = None,
 ) -> UserVectorPointId:
     if collection_name is not None:
         row.collection_name = collection_name
     if point_id is not None:
         row.point_id = point_id
+    if source_content_hash is not None:
+        row.source_content_hash = source_content_hash
+    if embedding_model is not None:
+        row.embedding_model = embedding_model
+    if vector_dimension is not None:
+        row.vector_dimension = vector_dimension
     db.add(row)
     db.commit()
     db.refresh(row)
@@ -100,6 +250,9 @@ def upsert_user_vector_point_id(
     collection_name: str,
     embedding_version: str,
     point_id: int,
+    source_content_hash: str | None = None,
+    embedding_model: str | None = None,
+    vector_dimension: int | None = None,
 ) -> UserVectorPointId:
     existing = get_user_vector_point_id(
         db,
@@ -115,15 +268,77 @@ def upsert_user_vector_point_id(
             collection_name=collection_name,
             embedding_version=embedding_version,
             point_id=point_id,
+            source_content_hash=source_content_hash,
+            embedding_model=embedding_model,
+            vector_dimension=vector_dimension,
         )
     return update_user_vector_point_id(
         db,
         existing,
         collection_name=collection_name,
         point_id=point_id,
+        source_content_hash=source_content_hash,
+        embedding_model=embedding_model,
+        vector_dimension=vector_dimension,
     )
 
 
+def list_user_vector_point_ids_by_points(
+    db: Session,
+    *,
+    provider: str,
+    collection_name: str,
+    point_ids: list[int],
+) -> list[UserVectorPointId]:
+    if not point_ids:
+        return []
+    stmt = (
+        select(UserVectorPointId)
+        .where(UserVectorPointId.provider == provider)
+        .where(UserVectorPointId.collection_name == collection_name)
+        .where(UserVectorPointId.point_id.in_(point_ids))
+    )
+    return list(db.scalars(stmt).all())
+
+
+def upsert_user_vector_point_ids_bulk(
+    db: Session,
+    *,
+    provider: str,
+    embedding_version: str,
+    rows: list[dict],
+) -> int:
+    """Insert or update many mappings for one provider/version with one SELECT and one commit.
+
+    Each dict carries `user_id`, `collection_name`, `point_id` and optionally
+    `source_content_hash`/`embedding_model`/`vector_dimension`. Point-ID conflicts must be
+    resolved by the caller.
+    """
+
+    if not rows:
+        return 0
+    existing = {
+        row.user_id: row
+        for row in list_user_vector_point_ids_for_users(
+            db,
+            user_ids=[row["user_id"] for row in rows],
+            provider=provider,
+            embedding_version=embedding_version,
+        )
+    }
+    for values in rows:
+        row = existing.get(values["user_id"])
+        if row is None:
+            db.add(
+                UserVectorPointId(provider=provider, embedding_version=embedding_version, **values)
+            )
+            continue
+        for key, value in values.items():
+            setattr(row, key, value)
+    db.commit()
+    return len(rows)
+
+
 def delete_user_vector_point_id(
     db: Session,
     *,
@@ -143,3 +358,219 @@ def delete_user_vector_point_id(
     db.commit()
     return True
 
+
+def delete_user_vector_point_ids_by_points(
+    db: Session,
+    *,
+    provider: str,
+    collection_name: str,
+    point_ids: list[int],
+) -> int:
+    """Remove mapping rows for many points with a single `DELETE ... WHERE point_id IN (...)`."""
+
+    if not point_ids:
+        return 0
+    stmt = (
+        delete(UserVectorPointId)
+        .where(UserVectorPointId.provider == provider)
+        .where(UserVectorPointId.collection_name == collection_name)
+        .where(UserVectorPointId.point_id.in_(point_ids))
+    )
+    result = db.execute(stmt)
+    db.commit()
+    return int(result.rowcount or 0)
+
+
+def dialect_insert(db: Session):
+    """`insert` with `on_conflict_*` support for this bind's dialect, or None if unsupported."""
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert
+
+
+def mark_users_embedding_dirty(
+    db: Session,
+    *,
+    user_ids: list[UUID],
+    commit: bool = True,
+) -> None:
+    """Queue users for embedding refresh. One upsert statement; repeated marks coalesce.
+
+    Write paths call this with `commit=False` so the mark lands in the same transaction as the
+    profile change.
+    """
+
+    unique_ids = list(dict.fromkeys(user_ids))
+    if not unique_ids:
+        return
+    now = datetime.now(timezone.utc)
+    insert = dialect_insert(db)
+    if insert is None:
+        for user_id in unique_ids:
+            row = db.get(EmbeddingDirtyUser, user_id)
+            if row is None:
+                db.add(EmbeddingDirtyUser(user_id=user_id, marked_at=now, version=1, attempts=0))
+            else:
+                row.marked_at = now
+                row.version += 1
+    else:
+        stmt = insert(EmbeddingDirtyUser).values(
+            [
+                {"user_id": user_id, "marked_at": now, "version": 1, "attempts": 0}
+                for user_id in unique_ids
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[EmbeddingDirtyUser.user_id],
+            set_={
+                "marked_at": stmt.excluded.marked_at,
+                "version": EmbeddingDirtyUser.version + 1,
+            },
+        )
+        db.execute(stmt)
+    if commit:
+        db.commit()
+
+
+def list_ready_dirty_users(
+    db: Session,
+    *,
+    marked_before: datetime,
+    now: datetime,
+    limit: int,
+) -> list[EmbeddingDirtyUser]:
+    stmt = (
+        select(EmbeddingDirtyUser)
+        .where(EmbeddingDirtyUser.marked_at <= marked_before)
+        .where(
+            or_(
+                EmbeddingDirtyUser.next_attempt_at.is_(None),
+                EmbeddingDirtyUser.next_attempt_at <= now,
+            )
+        )
+        .order_by(EmbeddingDirtyUser.marked_at.asc())
+        .limit(limit)
+    )
+    return list(db.scalars(stmt).all())
+
+
+def count_dirty_users(db: Session) -> int:
+    return int(db.scalar(select(func.count()).select_from(EmbeddingDirtyUser)) or 0)
+
+
+def clear_dirty_users(db: Session, *, claimed: list[tuple[UUID, int]]) -> int:
+    """Delete claimed rows whose version is unchanged; rows re-marked meanwhile stay queued."""
+
+    if not claimed:
+        return 0
+    by_version: dict[int, list[UUID]] = {}
+    for user_id, version in claimed:
+        by_version.setdefault(version, []).append(user_id)
+    deleted = 0
+    for version, user_ids in by_version.items():
+        result = db.execute(
+            delete(EmbeddingDirtyUser)
+            .where(EmbeddingDirtyUser.user_id.in_(user_ids))
+            .where(EmbeddingDirtyUser.version == version)
+        )
+        deleted += int(result.rowcount or 0)
+    db.commit()
+    return deleted
+
+
+def record_dirty_user_failures(
+    db: Session,
+    *,
+    failures: dict[UUID, str],
+    retry_after: timedelta,
+) -> None:
+    if not failures:
+        return
+    now = datetime.now(timezone.utc)
+    for user_id, error in failures.items():
+        db.execute(
+            update(EmbeddingDirtyUser)
+            .where(EmbeddingDirtyUser.user_id == user_id)
+            .values(
+                attempts=EmbeddingDirtyUser.attempts + 1,
+                next_attempt_at=now + retry_after,
+                last_error=error[:1000],
+            )
+        )
+    db.commit()
+
+
+def get_embedding_version_migration(
+    db: Session, migration_id: UUID
+) -> EmbeddingVersionMigration | None:
+    return db.get(EmbeddingVersionMigration, migration_id)
+
+
+def get_latest_embedding_version_migration(
+    db: Session,
+    *,
+    provider: str,
+    statuses: tuple[str, ...],
+) -> EmbeddingVersionMigration | None:
+    stmt = (
+        select(EmbeddingVersionMigration)
+        .where(EmbeddingVersionMigration.provider == provider)
+        .where(EmbeddingVersionMigration.status.in_(statuses))
+        .order_by(EmbeddingVersionMigration.created_at.desc(), EmbeddingVersionMigration.id.desc())
+        .limit(1)
+    )
+    return db.scalar(stmt)
+
+
+def get_serving_embedding_version_migration(
+    db: Session,
+    *,
+    provider: str,
+    statuses: tuple[str, ...],
+) -> EmbeddingVersionMigration | None:
+    """Most recently cut-over migration; its target is what reads should use."""
+
+    stmt = (
+        select(EmbeddingVersionMigration)
+        .where(EmbeddingVersionMigration.provider == provider)
+        .where(EmbeddingVersionMigration.status.in_(statuses))
+        .where(EmbeddingVersionMigration.cut_over_at.is_not(None))
+        .order_by(EmbeddingVersionMigration.cut_over_at.desc())
+        .limit(1)
+    )
+    return db.scalar(stmt)
+
+
+def create_embedding_version_migration(db: Session, **values) -> EmbeddingVersionMigration:
+    row = EmbeddingVersionMigration(**values)
+    db.add(row)
+    db.commit()
+    db.refresh(row)
+    return row
+
+
+def transition_embedding_version_migration(
+    db: Session,
+    *,
+    migration_id: UUID,
+    from_status: str,
+    to_status: str,
+    **values,
+) -> bool:
+    """Compare-and-set the status in one UPDATE, so concurrent callers cannot both win."""
+
+    stmt = (
+        update(EmbeddingVersionMigration)
+        .where(EmbeddingVersionMigration.id == migration_id)
+        .where(EmbeddingVersionMigration.status == from_status)
+        .values(status=to_status, **values)
+    )
+    result = db.execute(stmt)
+    db.commit()
+    return bool(result.rowcount)
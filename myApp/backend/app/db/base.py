@@ -6,13 +6,14 @@ class Base(DeclarativeBase):
 
 
 # Import all models here so Alembic autogenerate can discover metadata.
-from app.models import (
-    group_chat,
-    group_match,
-    hobby,
-    restaurant,
-    restaurant_rating,
-    social,
-    user,
-    vector_index,
-)  # noqa: F401,E402
+from app.models import (  # noqa: E402
+    group_chat,  # noqa: F401
+    group_match,  # noqa: F401
+    hobby,  # noqa: F401
+    preference_profile,  # noqa: F401
+    restaurant,  # noqa: F401
+    restaurant_rating,  # noqa: F401
+    social,  # noqa: F401
+    user,  # noqa: F401
+    vector_index,  # noqa: F401
+)
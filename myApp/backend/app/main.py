@@ -1,3 +1,6 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -6,8 +9,87 @@ from app.api.router import api_router
 from app.core.config import settings
 
 
+def _build_embedding_refresh_worker():
+    from app.db.session import SessionLocal
+    from app.services.actian_vector_store import ActianVectorStoreAdapter, ActianVectorStoreConfig
+    from app.services.embedding_cache import cached_embedder
+    from app.services.embedding_migration import embedding_write_targets
+    from app.services.embedding_refresh import EmbeddingRefreshConfig, EmbeddingRefreshWorker
+    from app.services.embeddings import build_embedder
+
+    if settings.vectorai_dimension is None:
+        raise RuntimeError("EMBEDDING_REFRESH_WORKER_ENABLED requires VECTORAI_DIMENSION")
+    cfg = ActianVectorStoreConfig.from_settings(settings)
+    return EmbeddingRefreshWorker(
+        session_factory=SessionLocal,
+        vector_store_factory=lambda db: ActianVectorStoreAdapter(db=db, config=cfg),
+        embedder=cached_embedder(
+            build_embedder(settings, dimension=settings.vectorai_dimension), settings
+        ),
+        config=EmbeddingRefreshConfig.from_settings(settings),
+        # Follow cut-overs and dual-write into a version that is being backfilled.
+        targets_factory=lambda db: embedding_write_targets(db, settings=settings),
+    )
+
+
+def _build_hobby_index() -> None:
+    from app.db.session import SessionLocal
+    from app.services.hobby_index import build_hobby_index
+
+    with SessionLocal() as db:
+        build_hobby_index(db)
+
+
+def _build_restaurant_spatial_index() -> None:
+    from app.db.session import SessionLocal
+    from app.services.restaurant_spatial_index import build_restaurant_spatial_index
+
+    with SessionLocal() as db:
+        build_restaurant_spatial_index(db)
+
+
+def _build_match_feed_warmer():
+    from app.db.session import SessionLocal
+    from app.services.match_feed import MatchFeedWarmer, MatchFeedWarmerConfig
+
+    return MatchFeedWarmer(
+        session_factory=SessionLocal, config=MatchFeedWarmerConfig.from_settings(settings)
+    )
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    if settings.hobby_index_enabled:
+        _build_hobby_index()
+    if settings.restaurant_spatial_index_enabled:
+        _build_restaurant_spatial_index()
+    worker = None
+    if settings.embedding_refresh_worker_enabled and settings.vectorai_enabled:
+        worker = _build_embedding_refresh_worker()
+        worker.start()
+    warmer = None
+    if settings.match_feed_cache_enabled and settings.match_feed_warmer_enabled:
+        warmer = _build_match_feed_warmer()
+        warmer.start()
+    try:
+        yield
+    finally:
+        if warmer is not None:
+            warmer.stop()
+        if worker is not None:
+            worker.stop()
+        from app.services.embedding_migration import stop_embedding_migration_worker
+
+        stop_embedding_migration_worker()
+
+
 def create_app() -> FastAPI:
-    app = FastAPI(title=settings.app_name, debug=settings.app_debug, version="0.1.0")
+    app = FastAPI(
+        title=settings.app_name,
+        debug=settings.app_debug,
+        version="0.1.0",
+        lifespan=lifespan,
+    )
 
     app.add_middleware(
         CORSMiddleware,
@@ -7,12 +7,14 @@ from sqlalchemy import (
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     UniqueConstraint,
     Uuid,
     func,
+    text,
 )
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -74,6 +76,33 @@ class GroupMatch(Base):
     cancel_reason: Mapped[str | None] = mapped_column(Text, nullable=True)
     completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     cancelled_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Chat activity, maintained by `crud.group_chat.create_group_chat_message`.
+    last_message_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_message_id: Mapped[UUID | None] = mapped_column(
+        Uuid,
+        # Messages reference groups too, so this side of the cycle is added after both tables.
+        ForeignKey(
+            "group_chat_messages.id",
+            ondelete="SET NULL",
+            use_alter=True,
+            name="fk_group_matches_last_message_id",
+        ),
+        nullable=True,
+    )
+    last_message_preview: Mapped[str | None] = mapped_column(String(120), nullable=True)
+    message_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+    )
+    # Maintained by `crud.group_match.sync_accepted_member_counts`.
+    accepted_member_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
@@ -99,6 +128,14 @@ class GroupMatchMember(Base):
             "user_id",
             name="uq_group_match_members_group_user",
         ),
+        # Inbox order, read from the member rows alone.
+        Index(
+            "ix_group_match_members_inbox",
+            "user_id",
+            "status",
+            text("inbox_activity_at DESC"),
+            text("group_match_id DESC"),
+        ),
     )
 
     id: Mapped[UUID] = mapped_column(Uuid, primary_key=True, default=uuid4)
@@ -130,6 +167,11 @@ class GroupMatchMember(Base):
     responded_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     joined_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     left_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Copy of the group's `coalesce(last_message_at, updated_at)`, kept current by
+    # `crud.group_match.sync_member_inbox_activity`; rows default to their insert time.
+    inbox_activity_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
@@ -34,6 +34,7 @@ class UserHobby(Base):
         Uuid,
         ForeignKey("hobby_catalog.id", ondelete="CASCADE"),
         primary_key=True,
+        index=True,
     )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
@@ -0,0 +1,31 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import JSON, DateTime, ForeignKey, Integer, String, Text, Uuid
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class UserPreferenceProfile(Base):
+    """Materialized `PreferenceProfile` per user.
+
+    Profile, hobby and rating writes bump `generation` and clear `profile` in the same transaction;
+    readers rebuild cleared rows and only store the result if `generation` is still the one they
+    read, so a rebuild racing a write can never cache stale data.
+    """
+
+    __tablename__ = "user_preference_profiles"
+
+    user_id: Mapped[UUID] = mapped_column(
+        Uuid,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    generation: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    profile_version: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    profile: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    text_for_embedding: Mapped[str | None] = mapped_column(Text, nullable=True)
+    content_hash: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    built_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    invalidated_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -1,7 +1,18 @@
 from datetime import datetime
 from uuid import UUID, uuid4
 
-from sqlalchemy import BigInteger, DateTime, ForeignKey, String, Uuid, UniqueConstraint, func
+from sqlalchemy import (
+    BigInteger,
+    DateTime,
+    Float,
+    ForeignKey,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+    Uuid,
+    func,
+)
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -35,6 +46,10 @@ class UserVectorPointId(Base):
     collection_name: Mapped[str] = mapped_column(String(128), nullable=False, index=True)
     embedding_version: Mapped[str] = mapped_column(String(128), nullable=False, index=True)
     point_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    # Last successfully uploaded content; lets batch re-embeds skip unchanged profiles.
+    source_content_hash: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    embedding_model: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    vector_dimension: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
@@ -48,3 +63,69 @@ class UserVectorPointId(Base):
         nullable=False,
     )
 
+
+class EmbeddingDirtyUser(Base):
+    """Users whose profile changed since their embedding was last refreshed.
+
+    One row per user; repeated marks coalesce by bumping `marked_at` and `version`. The refresh
+    worker only deletes a row if `version` is unchanged since it claimed it.
+    """
+
+    __tablename__ = "embedding_dirty_users"
+
+    user_id: Mapped[UUID] = mapped_column(
+        Uuid,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    marked_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    next_attempt_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+
+class EmbeddingVersionMigration(Base):
+    """Backfill of a new embedding version into its own collection.
+
+    Reads keep using the source version until the row flips to `cut_over`; the latest cut-over
+    (or completed) migration decides which version/collection is served.
+    """
+
+    __tablename__ = "embedding_version_migrations"
+
+    id: Mapped[UUID] = mapped_column(Uuid, primary_key=True, default=uuid4)
+    provider: Mapped[str] = mapped_column(String(64), nullable=False)
+    source_version: Mapped[str] = mapped_column(String(128), nullable=False)
+    source_collection: Mapped[str] = mapped_column(String(128), nullable=False)
+    target_version: Mapped[str] = mapped_column(String(128), nullable=False)
+    target_collection: Mapped[str] = mapped_column(String(128), nullable=False)
+    target_dimension: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    status: Mapped[str] = mapped_column(String(32), nullable=False, index=True)
+    coverage_threshold: Mapped[float] = mapped_column(Float, nullable=False)
+    chunk_size: Mapped[int] = mapped_column(Integer, nullable=False)
+    max_users_per_second: Mapped[float | None] = mapped_column(Float, nullable=True)
+    # Keyset position of the current backfill pass.
+    cursor_user_id: Mapped[UUID | None] = mapped_column(Uuid, nullable=True)
+    passes: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_users: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    processed_users: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    embedded_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    skipped_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    failed_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    dropped_points: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+    cut_over_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from datetime import datetime
 from typing import Literal
 from uuid import UUID
 
@@ -23,6 +24,33 @@ class AdminEmbeddingUpsertBatchRequest(AdminEmbeddingUpsertRequest):
     mode: Literal["in_person", "chat_only"] | None = None
     only_discoverable: bool = True
     limit: int | None = Field(default=None, ge=1, le=1000)
+    # Skip users whose stored content hash and embedding model match the current profile.
+    skip_unchanged: bool = True
+
+
+class AdminEmbeddingUpsertStreamRequest(AdminEmbeddingUpsertBatchRequest):
+    # Streaming runs are meant for whole-base re-embeds, so the selection limit is uncapped.
+    limit: int | None = Field(default=None, ge=1)
+    chunk_size: int = Field(default=200, ge=1, le=5000)
+
+
+class AdminEmbeddingUpsertStreamLine(BaseModel):
+    """One NDJSON line of `/admin/embeddings/upsert-batch/stream`: result, summary or error."""
+
+    type: Literal["result", "summary", "error"]
+    user_id: UUID | None = None
+    email: str | None = None
+    status: Literal["embedded", "skipped", "failed"] | None = None
+    point_id: int | None = None
+    source_content_hash: str | None = None
+    error: str | None = None
+    chunk: int | None = None
+    selected_count: int | None = None
+    embedded_count: int | None = None
+    skipped_count: int | None = None
+    failed_count: int | None = None
+    chunks: int | None = None
+    elapsed_ms: float | None = None
 
 
 class AdminEmbeddingUpsertResultRead(BaseModel):
@@ -48,8 +76,59 @@ class AdminEmbeddingUpsertResponse(BaseModel):
 class AdminEmbeddingUpsertBatchResponse(BaseModel):
     selected_count: int
     upserted_count: int
+    embedded_count: int = 0
+    skipped_count: int = 0
+    failed_count: int = 0
     provider: str
     collection_name: str
     embedding_version: str
     results: list[AdminEmbeddingUpsertResponse] = Field(default_factory=list)
     warnings: list[str] = Field(default_factory=list)
+
+
+class AdminEmbeddingMigrationStartRequest(BaseModel):
+    target_version: str = Field(min_length=1, max_length=128)
+    # Defaults to the target version name.
+    target_collection: str | None = Field(default=None, min_length=1, max_length=128)
+    target_dimension: int | None = Field(default=None, gt=0)
+    coverage_threshold: float = Field(default=0.99, gt=0, le=1)
+    chunk_size: int = Field(default=200, ge=1, le=5000)
+    # Backfill pacing so the live vector server keeps headroom; null disables throttling.
+    max_users_per_second: float | None = Field(default=50.0, gt=0)
+    run_in_background: bool = True
+
+
+class AdminEmbeddingMigrationCutoverRequest(BaseModel):
+    force: bool = False
+    drop_source: bool = True
+
+
+class AdminEmbeddingMigrationRead(BaseModel):
+    id: UUID
+    status: str
+    provider: str
+    source_version: str
+    source_collection: str
+    target_version: str
+    target_collection: str
+    target_dimension: int | None = None
+    coverage_threshold: float
+    chunk_size: int
+    max_users_per_second: float | None = None
+    passes: int
+    total_users: int
+    covered_users: int
+    coverage: float
+    processed_users: int
+    embedded_count: int
+    skipped_count: int
+    failed_count: int
+    dropped_points: int
+    elapsed_seconds: float
+    users_per_second: float | None = None
+    eta_seconds: float | None = None
+    worker_running: bool = False
+    last_error: str | None = None
+    created_at: datetime
+    cut_over_at: datetime | None = None
+    completed_at: datetime | None = None
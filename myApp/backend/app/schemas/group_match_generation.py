@@ -14,6 +14,8 @@ class GroupMatchGenerateRequest(BaseModel):
     max_groups: int = Field(default=5, ge=1, le=100)
     target_group_size: int = Field(default=4, ge=2, le=8)
     same_neighborhood_preferred: bool = True
+    # in_person only: members must be within this distance (by geohash) of the group's anchor.
+    max_distance_km: float | None = Field(default=None, gt=0, le=200)
     dry_run: bool = False
 
 
@@ -28,6 +30,7 @@ class GroupMatchGeneratedGroupSummary(BaseModel):
     status: str
     member_ids: list[UUID]
     venue_name: str | None = None
+    venue_restaurant_id: int | None = None
     score_summary: GroupMatchGenerateScoreSummary
 
 
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class AdminPreferenceProfileBulkRequest(BaseModel):
+    user_ids: list[UUID] = Field(min_length=1, max_length=1000)
+
+
+class AdminPreferenceProfileRead(BaseModel):
+    user_id: UUID
+    profile_version: str
+    content_hash: str
+    text_for_embedding: str
+    profile: dict
+
+
+class AdminPreferenceProfileBulkResponse(BaseModel):
+    profiles: list[AdminPreferenceProfileRead] = Field(default_factory=list)
+    missing_user_ids: list[UUID] = Field(default_factory=list)
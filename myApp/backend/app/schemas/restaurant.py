@@ -20,3 +20,7 @@ class RestaurantRead(RestaurantBase):
 
     id: int
     created_at: datetime
+
+
+class RestaurantNearbyRead(RestaurantRead):
+    distance_km: float
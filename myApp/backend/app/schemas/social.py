@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Literal
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field
@@ -41,10 +42,15 @@ class FriendRead(BaseModel):
     friend_since: datetime
 
 
+MatchFeedStrategy = Literal["heuristic", "vector"]
+
+
 class MatchSignals(BaseModel):
     same_neighborhood: bool
     hobby_overlap_count: int
     overlap_hobbies: list[str] = Field(default_factory=list)
+    # Cosine similarity of profile embeddings; only set by the vector strategy.
+    vector_similarity: float | None = None
 
 
 class MatchRead(BaseModel):
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class VectorBenchmarkRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    backend: Literal["adapter", "in_process"] = "adapter"
+    dimension: int | None = Field(default=None, gt=0)
+    num_points: int = Field(default=1000, ge=1, le=200_000)
+    batch_sizes: list[int] | None = Field(default=None, min_length=1, max_length=10)
+    num_searches: int = Field(default=100, ge=1, le=20_000)
+    search_concurrency: int = Field(default=4, ge=1, le=64)
+    top_k: int = Field(default=10, ge=1, le=1000)
+    filter_queries: bool = False
+    filter_shards: int = Field(default=4, ge=1, le=1000)
+    compute_recall: bool = True
+    cleanup: bool = True
+    seed: int = 42
+
+
+class VectorBenchmarkLatencyRead(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    count: int
+    mean_ms: float | None
+    p50_ms: float | None
+    p95_ms: float | None
+    p99_ms: float | None
+    max_ms: float | None
+
+
+class VectorBenchmarkUpsertRead(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    batch_size: int
+    points: int
+    batches: int
+    elapsed_ms: float
+    points_per_second: float
+    batch_latency: VectorBenchmarkLatencyRead
+
+
+class VectorBenchmarkSearchRead(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    label: str
+    queries: int
+    concurrency: int
+    top_k: int
+    errors: int
+    elapsed_ms: float
+    queries_per_second: float
+    latency: VectorBenchmarkLatencyRead
+    recall_at_k: float | None
+
+
+class VectorBenchmarkResponse(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    backend: str
+    collection_name: str
+    dimension: int
+    num_points: int
+    upserts: list[VectorBenchmarkUpsertRead] = Field(default_factory=list)
+    searches: list[VectorBenchmarkSearchRead] = Field(default_factory=list)
+    cleanup_deleted: int
+    warnings: list[str] = Field(default_factory=list)
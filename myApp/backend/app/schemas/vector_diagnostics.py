@@ -37,6 +37,10 @@ class VectorDiagnosticsConfigSnapshot(BaseModel):
     supports_metadata_filtering: bool
     batch_upsert_size: int
     request_timeout_seconds: float | None
+    breaker_failure_threshold: int
+    breaker_reset_seconds: float
+    hedge_search: bool
+    hedge_delay_ms: float
 
 
 class VectorDiagnosticsResponse(BaseModel):
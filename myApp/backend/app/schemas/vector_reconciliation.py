@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class VectorReconcileRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    embedding_version: str | None = None
+    page_size: int = Field(default=1000, ge=1, le=10000)
+    apply: bool = False
+    fake_dimension_override: int | None = Field(default=None, gt=0)
+    sample_size: int = Field(default=20, ge=0, le=500)
+
+
+class VectorReconcileReupsertRead(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    user_id: str
+    embedding_version: str
+    reason: str
+
+
+class VectorReconcileMappingFixRead(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    point_id: int
+    user_id: str
+    embedding_version: str
+
+
+class VectorReconcileApplyRead(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    deleted_orphans: int
+    fixed_mappings: int
+    reupserted: int
+
+
+class VectorReconcileResponse(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    provider: str
+    collection_name: str
+    embedding_version: str | None
+    scan_mode: str
+    mapping_count: int
+    remote_count: int
+    reupsert_count: int
+    orphan_count: int
+    mapping_fix_count: int
+    elapsed_ms: float
+    reupsert_sample: list[VectorReconcileReupsertRead] = Field(default_factory=list)
+    orphan_point_id_sample: list[int] = Field(default_factory=list)
+    mapping_fix_sample: list[VectorReconcileMappingFixRead] = Field(default_factory=list)
+    applied: VectorReconcileApplyRead | None = None
+    warnings: list[str] = Field(default_factory=list)
@@ -1,9 +1,60 @@
 from __future__ import annotations
 
+from array import array
+from collections.abc import Sequence
 from datetime import datetime
-from typing import Literal
+from typing import Annotated, Any, Literal
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field, PlainSerializer, WithJsonSchema
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    np = None  # type: ignore[assignment]
+
+
+def coerce_float32_vector(value: Any) -> Any:
+    """Normalize vector input into a compact float32 buffer.
+
+    NumPy arrays are kept as contiguous float32 ndarrays; everything else becomes `array('f')`.
+    Conversion happens in C, so large vectors skip pydantic's per-element float validation.
+    """
+
+    if np is not None and isinstance(value, np.ndarray):
+        if value.ndim != 1:
+            raise ValueError("vector must be one-dimensional")
+        return np.ascontiguousarray(value, dtype=np.float32)
+    if isinstance(value, array):
+        return value if value.typecode == "f" else array("f", value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        raw = bytes(value)
+        if len(raw) % 4:
+            raise ValueError("vector byte buffer length must be a multiple of 4 (float32)")
+        buffer = array("f")
+        buffer.frombytes(raw)
+        return buffer
+    if isinstance(value, Sequence) and not isinstance(value, str):
+        try:
+            return array("f", value)
+        except TypeError as exc:
+            raise ValueError("vector must contain only numbers") from exc
+    raise ValueError("vector must be a list of floats, array('f'), float32 bytes, or ndarray")
+
+
+def vector_to_list(vector: Any) -> list[float]:
+    """Materialize a float32 vector as a plain list for SDKs/serializers that need one."""
+
+    if isinstance(vector, list):
+        return vector
+    return vector.tolist()
+
+
+Float32Vector = Annotated[
+    Any,
+    BeforeValidator(coerce_float32_vector),
+    PlainSerializer(vector_to_list, return_type=list[float]),
+    WithJsonSchema({"type": "array", "items": {"type": "number"}}),
+]
 
 
 class UserProfileVectorMetadata(BaseModel):
@@ -26,7 +77,7 @@ class UserProfileEmbeddingRecord(BaseModel):
     id: str
     entity_type: Literal["user_profile"] = "user_profile"
     user_id: str
-    vector: list[float]
+    vector: Float32Vector
     embedding_version: str
     embedding_model: str
     preference_profile_version: str
@@ -53,7 +104,7 @@ class UserProfileVectorQueryFilters(BaseModel):
 class UserProfileVectorQuery(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
-    query_vector: list[float]
+    query_vector: Float32Vector
     top_k: int = Field(default=10, gt=0)
     embedding_version: str
     filters: UserProfileVectorQueryFilters = Field(
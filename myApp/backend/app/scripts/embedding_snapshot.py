@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.actian_vector_store import ActianVectorStoreAdapter, ActianVectorStoreConfig
+from app.services.embedding_snapshot import (
+    DEFAULT_SNAPSHOT_CHUNK_SIZE,
+    export_embedding_snapshot,
+    import_embedding_snapshot,
+)
+from app.services.embeddings import USER_PROFILE_EMBEDDING_VERSION
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Export or import user profile embeddings as a columnar snapshot directory."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="Dump one embedding version to a snapshot")
+    export.add_argument("path", help="Snapshot directory to write")
+    export.add_argument("--embedding-version", default=USER_PROFILE_EMBEDDING_VERSION)
+    export.add_argument("--chunk-size", type=int, default=DEFAULT_SNAPSHOT_CHUNK_SIZE)
+
+    load = commands.add_parser("import", help="Load a snapshot into the configured collection")
+    load.add_argument("path", help="Snapshot directory to read")
+    load.add_argument(
+        "--chunk-size",
+        type=int,
+        default=None,
+        help="Points per batch_upsert (default: VECTORAI_BATCH_UPSERT_SIZE)",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if not settings.vectorai_enabled:
+        print("VECTORAI_ENABLED is false. Enable it to export or import embedding snapshots.")
+        return 2
+
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        adapter = ActianVectorStoreAdapter(
+            db=db, config=ActianVectorStoreConfig.from_settings(settings)
+        )
+        try:
+            if args.command == "export":
+                exported = export_embedding_snapshot(
+                    db,
+                    adapter,
+                    args.path,
+                    embedding_version=args.embedding_version,
+                    chunk_size=args.chunk_size,
+                )
+                output = {
+                    "path": exported.path,
+                    "count": exported.manifest.count,
+                    "dimension": exported.manifest.dimension,
+                    "missing_point_ids": exported.missing_point_ids,
+                }
+            else:
+                adapter.ensure_collection()
+                imported = import_embedding_snapshot(
+                    db, adapter, args.path, chunk_size=args.chunk_size
+                )
+                output = {
+                    "imported": imported.imported,
+                    "chunks": imported.chunks,
+                    "skipped_missing_users": imported.skipped_missing_users,
+                    "reassigned_point_ids": imported.reassigned_point_ids,
+                }
+        except ValueError as exc:
+            print(str(exc))
+            return 2
+
+    output = {
+        "command": args.command,
+        "collection_name": adapter.collection_name,
+        **output,
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+    }
+    print(json.dumps(output, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
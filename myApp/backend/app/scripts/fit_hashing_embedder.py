@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import argparse
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.user import User
+from app.services.hashing_embedder import HashingFeatureEmbedder
+from app.services.preference_profile_cache import get_preference_profile_embedding_inputs_batch
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Fit hashing-embedder idf weights over every user's preference profile text."
+    )
+    parser.add_argument(
+        "--output",
+        required=True,
+        help="JSON file to write; point EMBEDDING_HASHING_IDF_PATH at it",
+    )
+    parser.add_argument(
+        "--dimension", type=int, default=None, help="Defaults to VECTORAI_DIMENSION"
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    dimension = args.dimension or settings.vectorai_dimension
+    if not dimension or dimension <= 0:
+        print("Set --dimension or VECTORAI_DIMENSION to a positive integer.")
+        return 2
+
+    with SessionLocal() as db:
+        user_ids = list(db.scalars(select(User.id).order_by(User.id)))
+        texts = [
+            item.text_for_embedding
+            for item in get_preference_profile_embedding_inputs_batch(db, user_ids)
+        ]
+
+    embedder = HashingFeatureEmbedder(dimension=dimension).fit(texts)
+    embedder.save(args.output)
+    print(f"Fitted {embedder.model_name} over {len(texts)} profiles -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -8,6 +8,7 @@ from uuid import UUID
 from sqlalchemy import delete, select
 
 from app.core.config import settings
+from app.crud.group_chat import backfill_group_chat_activity
 from app.db.session import SessionLocal
 from app.models.group_chat import GroupChatMessage
 from app.models.group_match import GroupMatch, GroupMatchMember, GroupMatchVenue
@@ -276,6 +277,14 @@ def main() -> int:
         )
 
         db.commit()
+        # Members and messages were inserted directly, so fill the denormalized inbox columns.
+        backfill_group_chat_activity(
+            db,
+            group_match_ids=[
+                group.id
+                for group in (group_invited, group_chat_ready, group_leave, group_chat_only)
+            ],
+        )
 
         print(f"Target user: {target.email} ({target.id})")
         print(f"Removed existing demo groups: {removed_count}")
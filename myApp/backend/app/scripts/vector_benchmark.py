@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import argparse
+import json
+from dataclasses import asdict
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.vector_benchmark import (
+    BACKEND_ADAPTER,
+    BACKEND_IN_PROCESS,
+    VectorBenchmarkConfig,
+    build_benchmark_adapter,
+    run_vector_benchmark,
+)
+
+
+def _parse_batch_sizes(value: str) -> tuple[int, ...]:
+    try:
+        sizes = tuple(int(part) for part in value.split(",") if part.strip())
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"Invalid batch size list: {value!r}") from exc
+    if not sizes or any(size <= 0 for size in sizes):
+        raise argparse.ArgumentTypeError("Batch sizes must be positive integers")
+    return sizes
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark vector store upsert throughput, search latency and recall@k."
+    )
+    parser.add_argument(
+        "--backend",
+        choices=(BACKEND_ADAPTER, BACKEND_IN_PROCESS),
+        default=BACKEND_ADAPTER,
+        help=(
+            "'adapter' hits the configured Cortex server; "
+            "'in_process' uses an in-memory fake client"
+        ),
+    )
+    parser.add_argument(
+        "--dimension", type=int, default=None, help="Defaults to VECTORAI_DIMENSION"
+    )
+    parser.add_argument("--points", type=int, default=1000, help="Synthetic points to upsert")
+    parser.add_argument(
+        "--batch-sizes",
+        type=_parse_batch_sizes,
+        default=None,
+        help="Comma-separated upsert batch sizes to sweep (default: VECTORAI_BATCH_UPSERT_SIZE)",
+    )
+    parser.add_argument("--searches", type=int, default=100, help="Number of search queries")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent search workers")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--filter", action="store_true", help="Also run payload-filtered searches")
+    parser.add_argument("--filter-shards", type=int, default=4)
+    parser.add_argument(
+        "--no-recall", action="store_true", help="Skip the brute-force recall baseline"
+    )
+    parser.add_argument("--keep-points", action="store_true", help="Do not delete benchmark points")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+
+    if args.backend == BACKEND_ADAPTER and not settings.vectorai_enabled:
+        print("VECTORAI_ENABLED is false. Enable it or use --backend in_process.")
+        return 2
+
+    # The adapter only touches the session for point-id mappings, which the benchmark bypasses.
+    with SessionLocal() as db:
+        try:
+            adapter = build_benchmark_adapter(
+                db, settings=settings, backend=args.backend, dimension=args.dimension
+            )
+        except ValueError as exc:
+            print(str(exc))
+            return 2
+
+        report = run_vector_benchmark(
+            adapter,
+            VectorBenchmarkConfig(
+                dimension=adapter.config.dimension or 0,
+                num_points=args.points,
+                batch_sizes=args.batch_sizes or (adapter.config.batch_upsert_size,),
+                num_searches=args.searches,
+                search_concurrency=args.concurrency,
+                top_k=args.top_k,
+                filter_queries=args.filter,
+                filter_shards=args.filter_shards,
+                compute_recall=not args.no_recall,
+                cleanup=not args.keep_points,
+                seed=args.seed,
+            ),
+        )
+
+    output = {"backend": args.backend, "collection_name": adapter.collection_name, **asdict(report)}
+    print(json.dumps(output, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
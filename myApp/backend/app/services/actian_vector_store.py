@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any
@@ -10,9 +12,11 @@ from sqlalchemy.orm import Session
 
 from app.crud.vector_index import (
     delete_user_vector_point_id as delete_point_mapping,
+    delete_user_vector_point_ids_by_points,
     get_user_vector_point_id,
-    get_user_vector_point_id_by_point,
-    list_user_vector_point_ids_for_user,
+    list_user_vector_point_ids_for_users,
+    list_user_vector_point_ids_by_points,
+    list_user_vector_point_ids_for_version,
     upsert_user_vector_point_id,
 )
 from app.core.config import Settings
@@ -21,8 +25,14 @@ from app.schemas.vector_store import (
     UserProfileVectorMetadata,
     UserProfileVectorMatch,
     UserProfileVectorQuery,
+    vector_to_list,
 )
 from app.models.vector_index import UserVectorPointId
+from app.services.vector_resilience import (
+    VectorCallGuard,
+    VectorResilienceConfig,
+    get_vector_call_guard,
+)
 from app.services.vector_store import VectorStoreAdapter
 
 try:
@@ -33,6 +43,8 @@ except ImportError:  # pragma: no cover - optional dependency
 
 ACTIAN_PROVIDER = "actian"
 DEFAULT_ACTIAN_METRIC = "COSINE"
+# Worker count for per-point deletes when the SDK has no batch delete.
+FALLBACK_DELETE_WORKERS = 8
 
 
 @dataclass(frozen=True)
@@ -44,7 +56,26 @@ class ActianVectorStoreConfig:
     dimension: int | None = None
     supports_metadata_filtering: bool = False
     batch_upsert_size: int = 100
+    batch_delete_size: int = 500
     request_timeout_seconds: float | None = None
+    breaker_failure_threshold: int = 5
+    breaker_reset_seconds: float = 30.0
+    hedge_search: bool = False
+    hedge_delay_ms: float = 50.0
+
+    @property
+    def resilience(self) -> VectorResilienceConfig:
+        return VectorResilienceConfig(
+            request_timeout_seconds=self.request_timeout_seconds,
+            breaker_failure_threshold=self.breaker_failure_threshold,
+            breaker_reset_seconds=self.breaker_reset_seconds,
+            hedge_search=self.hedge_search,
+            hedge_delay_ms=self.hedge_delay_ms,
+        )
+
+    @property
+    def guard_key(self) -> tuple[str, str]:
+        return (self.address, self.collection_name)
 
     @classmethod
     def from_settings(cls, settings: Settings) -> "ActianVectorStoreConfig":
@@ -56,7 +87,12 @@ class ActianVectorStoreConfig:
             dimension=settings.vectorai_dimension,
             supports_metadata_filtering=settings.vectorai_supports_metadata_filtering,
             batch_upsert_size=settings.vectorai_batch_upsert_size,
+            batch_delete_size=settings.vectorai_batch_delete_size,
             request_timeout_seconds=settings.vectorai_request_timeout_seconds,
+            breaker_failure_threshold=settings.vectorai_breaker_failure_threshold,
+            breaker_reset_seconds=settings.vectorai_breaker_reset_seconds,
+            hedge_search=settings.vectorai_hedge_search,
+            hedge_delay_ms=settings.vectorai_hedge_delay_ms,
         )
 
 
@@ -68,6 +104,9 @@ class ActianVectorStoreAdapter(VectorStoreAdapter):
     - Metadata filtering support is feature-flagged until verified against the running server image.
     - The concrete Cortex SDK method calls are intentionally conservative and may need minor
       signature adjustments once we pin the SDK version in this repo.
+    - Remote calls go through a `VectorCallGuard` (deadline, circuit breaker, hedged search).
+      SDK-backed adapters share a process-wide guard per address/collection; adapters built with
+      an injected client only use one when it is passed explicitly.
     """
 
     def __init__(
@@ -76,11 +115,15 @@ class ActianVectorStoreAdapter(VectorStoreAdapter):
         db: Session,
         config: ActianVectorStoreConfig,
         client: Any | None = None,
+        guard: VectorCallGuard | None = None,
     ) -> None:
         self._db = db
         self._config = config
         self._client = client
         self._client_connected = client is not None
+        if guard is None and client is None:
+            guard = get_vector_call_guard(config.guard_key, config.resilience)
+        self._guard = guard
 
     @property
     def provider(self) -> str:
@@ -107,6 +150,24 @@ class ActianVectorStoreAdapter(VectorStoreAdapter):
             self._client_connected = True
         return self._client
 
+    @property
+    def guard(self) -> VectorCallGuard | None:
+        return self._guard
+
+    @property
+    def config(self) -> ActianVectorStoreConfig:
+        return self._config
+
+    def supports(self, method_name: str) -> bool:
+        """Whether the Cortex client exposes `method_name` (`scroll`, `batch_get`, ...)."""
+
+        return callable(getattr(self._require_client(), method_name, None))
+
+    def _invoke(self, operation: str, func: Any, *, hedge: bool = False) -> Any:
+        if self._guard is None:
+            return func()
+        return self._guard.call(operation, func, hedge=hedge)
+
     def _call_with_collection_fallback(self, method_name: str, /, *args: Any, **kwargs: Any) -> Any:
         """Call Cortex SDK methods across minor signature differences.
 
@@ -114,24 +175,34 @@ class ActianVectorStoreAdapter(VectorStoreAdapter):
         We try the direct call first, then retry with `collection_name`.
         """
 
+        # Searches are idempotent reads, so they may be hedged.
+        call = self._collection_call(method_name, *args, **kwargs)
+        return self._invoke(method_name, call, hedge=method_name == "search")
+
+    def _collection_call(
+        self, method_name: str, /, *args: Any, **kwargs: Any
+    ) -> Callable[[], Any]:
         client = self._require_client()
         method = getattr(client, method_name, None)
         if method is None:
             raise RuntimeError(f"Unsupported Cortex client: {method_name} not available")
 
-        try:
-            return method(*args, **kwargs)
-        except TypeError:
-            if "collection_name" in kwargs:
-                raise
-            return method(*args, collection_name=self.collection_name, **kwargs)
+        def _call() -> Any:
+            try:
+                return method(*args, **kwargs)
+            except TypeError:
+                if "collection_name" in kwargs:
+                    raise
+                return method(*args, collection_name=self.collection_name, **kwargs)
+
+        return _call
 
     def healthcheck(self) -> bool:
         client = self._require_client()
         try:
             # Prefer a lightweight operation. `list_collections()` is documented in examples/docs.
             if hasattr(client, "list_collections"):
-                client.list_collections()
+                self._invoke("list_collections", client.list_collections)
             elif hasattr(client, "get_collection_info"):
                 self._call_with_collection_fallback("get_collection_info")
             else:
@@ -190,13 +261,17 @@ class ActianVectorStoreAdapter(VectorStoreAdapter):
     def flush(self) -> None:
         client = self._require_client()
         if hasattr(client, "flush"):
-            try:
-                client.flush(self.collection_name)
-            except TypeError:
+
+            def _flush() -> None:
                 try:
-                    client.flush(collection_name=self.collection_name)
+                    client.flush(self.collection_name)
                 except TypeError:
-                    client.flush()
+                    try:
+                        client.flush(collection_name=self.collection_name)
+                    except TypeError:
+                        client.flush()
+
+            self._invoke("flush", _flush)
 
     def probe_metadata_filtering_support(self) -> bool:
         """Feature probe for SDK/server-side filtered search support.
@@ -281,6 +356,9 @@ class ActianVectorStoreAdapter(VectorStoreAdapter):
             collection_name=self.collection_name,
             embedding_version=record.embedding_version,
             point_id=point_id,
+            source_content_hash=record.source_content_hash,
+            embedding_model=record.embedding_model,
+            vector_dimension=len(record.vector),
         )
 
     def upsert_user_profile_embedding(self, record: UserProfileEmbeddingRecord) -> None:
@@ -304,7 +382,7 @@ class ActianVectorStoreAdapter(VectorStoreAdapter):
 
         # SDK docs indicate `upsert(id: int, vector: list[float], payload: dict | None = None)`
         self._call_with_collection_fallback(
-            "upsert", id=point_id, vector=record.vector, payload=payload
+            "upsert", id=point_id, vector=vector_to_list(record.vector), payload=payload
         )
         self._upsert_mapping(record, point_id)
 
@@ -318,9 +396,6 @@ class ActianVectorStoreAdapter(VectorStoreAdapter):
         if hasattr(client, "batch_upsert"):
             # Build points in the shape most SDKs use; adjust once the SDK is pinned.
             points: list[dict[str, Any]] = []
-            ids: list[int] = []
-            vectors: list[list[float]] = []
-            payloads: list[dict[str, Any]] = []
             next_new_point_id: int | None = None
             reserved_point_ids: dict[tuple[str, str], int] = {}
             for record in records:
@@ -358,48 +433,12 @@ class ActianVectorStoreAdapter(VectorStoreAdapter):
                 points.append(
                     {
                         "id": point_id,
-                        "vector": record.vector,
+                        "vector": vector_to_list(record.vector),
                         "payload": payload,
                     }
                 )
-                ids.append(point_id)
-                vectors.append(record.vector)
-                payloads.append(payload)
 
-            # SDK signatures vary in beta builds. Try known shapes, then fall back to single upserts.
-            batch_upsert_ok = False
-            try:
-                # Shape A: batch_upsert(points=[...])
-                self._call_with_collection_fallback("batch_upsert", points=points)
-                batch_upsert_ok = True
-            except TypeError:
-                try:
-                    # Shape B: batch_upsert([...])
-                    self._call_with_collection_fallback("batch_upsert", points)
-                    batch_upsert_ok = True
-                except TypeError:
-                    method = getattr(client, "batch_upsert")
-                    try:
-                        # Shape C: batch_upsert(collection_name=..., ids=..., vectors=..., payloads=...)
-                        method(
-                            collection_name=self.collection_name,
-                            ids=ids,
-                            vectors=vectors,
-                            payloads=payloads,
-                        )
-                        batch_upsert_ok = True
-                    except TypeError:
-                        try:
-                            # Shape D: batch_upsert(collection_name, ids, vectors, payloads)
-                            method(self.collection_name, ids, vectors, payloads)
-                            batch_upsert_ok = True
-                        except TypeError:
-                            try:
-                                # Shape E: batch_upsert(collection_name, ids, vectors)
-                                method(self.collection_name, ids, vectors)
-                                batch_upsert_ok = True
-                            except TypeError:
-                                batch_upsert_ok = False
+            batch_upsert_ok = self._try_batch_upsert(points)
 
             if not batch_upsert_ok:
                 for record in records:
@@ -413,6 +452,115 @@ class ActianVectorStoreAdapter(VectorStoreAdapter):
         for record in records:
             self.upsert_user_profile_embedding(record)
 
+    def _try_batch_upsert(self, points: list[dict[str, Any]]) -> bool:
+        """Send `{id, vector, payload}` points through whichever `batch_upsert` shape the SDK takes.
+
+        Returns False when no known signature matched, so callers can fall back to single upserts.
+        """
+
+        # SDK signatures vary in beta builds. Try known shapes, then fall back to single upserts.
+        try:
+            # Shape A: batch_upsert(points=[...])
+            self._call_with_collection_fallback("batch_upsert", points=points)
+            return True
+        except TypeError:
+            pass
+        try:
+            # Shape B: batch_upsert([...])
+            self._call_with_collection_fallback("batch_upsert", points)
+            return True
+        except TypeError:
+            pass
+
+        method = self._require_client().batch_upsert
+        ids = [point["id"] for point in points]
+        vectors = [point["vector"] for point in points]
+        payloads = [point.get("payload") for point in points]
+        try:
+            # Shape C: batch_upsert(collection_name=..., ids=..., vectors=..., payloads=...)
+            self._invoke(
+                "batch_upsert",
+                lambda: method(
+                    collection_name=self.collection_name,
+                    ids=ids,
+                    vectors=vectors,
+                    payloads=payloads,
+                ),
+            )
+            return True
+        except TypeError:
+            pass
+        try:
+            # Shape D: batch_upsert(collection_name, ids, vectors, payloads)
+            self._invoke(
+                "batch_upsert", lambda: method(self.collection_name, ids, vectors, payloads)
+            )
+            return True
+        except TypeError:
+            pass
+        try:
+            # Shape E: batch_upsert(collection_name, ids, vectors)
+            self._invoke("batch_upsert", lambda: method(self.collection_name, ids, vectors))
+            return True
+        except TypeError:
+            return False
+
+    def upsert_points(self, points: list[dict[str, Any]]) -> None:
+        """Write prebuilt `{id, vector, payload}` points as-is, without touching the mapping table.
+
+        Used by snapshot import, where point IDs and payloads come from the snapshot file.
+        """
+
+        if not points:
+            return
+        client = self._require_client()
+        if hasattr(client, "batch_upsert") and self._try_batch_upsert(points):
+            return
+        if not hasattr(client, "upsert"):
+            raise RuntimeError("Unsupported Cortex client: upsert not available")
+        for point in points:
+            self._call_with_collection_fallback(
+                "upsert", id=int(point["id"]), vector=point["vector"], payload=point.get("payload")
+            )
+
+    def scroll_points(self, *, offset: Any = None, limit: int, with_payload: bool = True) -> Any:
+        """One raw SDK `scroll` page, starting at `offset`; callers parse the response shape."""
+
+        return self._call_with_collection_fallback(
+            "scroll", offset=offset, limit=limit, with_payload=with_payload
+        )
+
+    def batch_get_points(self, point_ids: list[int], *, with_payload: bool = True) -> Any:
+        """Raw SDK `batch_get` response for `point_ids`; missing points are simply absent."""
+
+        return self._call_with_collection_fallback(
+            "batch_get", ids=point_ids, with_payload=with_payload
+        )
+
+    def search_points(
+        self,
+        query: list[float],
+        *,
+        top_k: int,
+        search_filter: Any = None,
+        with_payload: bool = False,
+    ) -> list[Any]:
+        """Raw SDK `search` results; `search_filter` is passed through as the SDK's `filter=`."""
+
+        search_kwargs: dict[str, Any] = {
+            "query": query,
+            "top_k": top_k,
+            "with_payload": with_payload,
+        }
+        if search_filter is not None:
+            search_kwargs["filter"] = search_filter
+        try:
+            return list(self._call_with_collection_fallback("search", **search_kwargs))
+        except TypeError:
+            # Older/newer SDK shape may use `vector=` instead of `query=`.
+            search_kwargs["vector"] = search_kwargs.pop("query")
+            return list(self._call_with_collection_fallback("search", **search_kwargs))
+
     def query_similar_user_profiles(
         self, query: UserProfileVectorQuery
     ) -> list[UserProfileVectorMatch]:
@@ -420,12 +568,6 @@ class ActianVectorStoreAdapter(VectorStoreAdapter):
         if not hasattr(client, "search"):
             raise RuntimeError("Unsupported Cortex client: search not available")
 
-        search_kwargs: dict[str, Any] = {
-            "query": query.query_vector,
-            "top_k": query.top_k,
-            "with_payload": query.include_metadata,
-        }
-
         # Metadata filtering is intentionally optional until verified on the exact server build.
         if self._config.supports_metadata_filtering and query.filters.model_dump(exclude_none=True):
             # Actian filter syntax to be finalized after a real smoke test against the target image.
@@ -434,13 +576,12 @@ class ActianVectorStoreAdapter(VectorStoreAdapter):
                 "Actian metadata filter translation is not enabled until server-side filter support is verified."
             )
 
-        try:
-            raw_results = self._call_with_collection_fallback("search", **search_kwargs)
-        except TypeError:
-            # Older/newer SDK shape may use `vector=` instead of `query=`.
-            search_kwargs["vector"] = search_kwargs.pop("query")
-            raw_results = self._call_with_collection_fallback("search", **search_kwargs)
-        matches: list[UserProfileVectorMatch] = []
+        raw_results = self.search_points(
+            vector_to_list(query.query_vector),
+            top_k=query.top_k,
+            with_payload=query.include_metadata,
+        )
+        parsed: list[tuple[Any, str | None, UserProfileVectorMetadata | None, Any]] = []
         for result in raw_results:
             result_dict: dict[str, Any] | None = None
             if isinstance(result, dict):
@@ -474,25 +615,35 @@ class ActianVectorStoreAdapter(VectorStoreAdapter):
                 if query.include_metadata and md is not None:
                     metadata = UserProfileVectorMetadata.model_validate(md)
 
-            if mapped_user_id is None and point_id is not None:
-                row = get_user_vector_point_id_by_point(
-                    self._db,
-                    provider=self.provider,
-                    collection_name=self.collection_name,
-                    point_id=int(point_id),
-                )
-                if row is None:
-                    continue
-                mapped_user_id = str(row.user_id)
+            score = getattr(result, "score", None)
+            if score is None and result_dict is not None:
+                score = result_dict.get("score", result_dict.get("distance"))
+            parsed.append((point_id, mapped_user_id, metadata, score))
+
+        # Hits without a payload (e.g. `with_payload=False`) are mapped back to users in one query.
+        unresolved = [
+            int(point_id)
+            for point_id, mapped_user_id, _metadata, _score in parsed
+            if mapped_user_id is None and point_id is not None
+        ]
+        users_by_point = {
+            row.point_id: str(row.user_id)
+            for row in list_user_vector_point_ids_by_points(
+                self._db,
+                provider=self.provider,
+                collection_name=self.collection_name,
+                point_ids=unresolved,
+            )
+        }
 
+        matches: list[UserProfileVectorMatch] = []
+        for point_id, mapped_user_id, metadata, score in parsed:
+            if mapped_user_id is None and point_id is not None:
+                mapped_user_id = users_by_point.get(int(point_id))
             if mapped_user_id is None:
                 continue
             if mapped_user_id in query.exclude_user_ids:
                 continue
-
-            score = getattr(result, "score", None)
-            if score is None and result_dict is not None:
-                score = result_dict.get("score", result_dict.get("distance"))
             matches.append(
                 UserProfileVectorMatch(
                     id=str(point_id) if point_id is not None else f"actian:{mapped_user_id}",
@@ -503,6 +654,46 @@ class ActianVectorStoreAdapter(VectorStoreAdapter):
             )
         return matches
 
+    def fetch_point(self, point_id: int) -> tuple[list[float], dict[str, Any] | None] | None:
+        """`(vector, payload)` for one point, or None if the collection does not have it.
+
+        Accepts both `get` result shapes: `(vector, payload)` tuples and
+        `{"vector": ..., "payload": ...}` dicts.
+        """
+
+        call = self._collection_call("get", id=int(point_id))
+
+        def _get() -> Any:
+            # A missing point is an answer, not a backend failure: keep it away from the breaker.
+            try:
+                return call()
+            except KeyError:
+                return None
+
+        result = self._invoke("get", _get)
+        if result is None:
+            return None
+        if isinstance(result, dict):
+            return list(result["vector"]), result.get("payload")
+        vector, payload = result
+        return list(vector), payload
+
+    def get_user_profile_vector(
+        self, *, user_id: str, embedding_version: str
+    ) -> list[float] | None:
+        """The user's stored profile vector for `embedding_version`, without re-embedding."""
+
+        row = get_user_vector_point_id(
+            self._db,
+            user_id=UUID(user_id),
+            provider=self.provider,
+            embedding_version=embedding_version,
+        )
+        if row is None:
+            return None
+        point = self.fetch_point(row.point_id)
+        return point[0] if point is not None else None
+
     def delete_user_profile_embedding(
         self, *, user_id: str, embedding_version: str
     ) -> bool:
@@ -527,26 +718,110 @@ class ActianVectorStoreAdapter(VectorStoreAdapter):
             embedding_version=embedding_version,
         )
 
-    def delete_user_profile_embeddings_for_user(self, *, user_id: str) -> int:
+    def _delete_points(self, point_ids: list[int]) -> None:
+        """Delete many points remotely, preferring the SDK batch delete.
+
+        Falls back to concurrent single-point deletes when `batch_delete` is missing or none of the
+        known signatures match.
+        """
+
+        if not point_ids:
+            return
         client = self._require_client()
-        deleted = 0
-        rows = list_user_vector_point_ids_for_user(
-            self._db, user_id=UUID(user_id), provider=self.provider
+        if hasattr(client, "batch_delete"):
+            try:
+                # Shape A: batch_delete(ids=[...])
+                self._call_with_collection_fallback("batch_delete", ids=point_ids)
+                return
+            except TypeError:
+                try:
+                    # Shape B: batch_delete(collection_name, ids)
+                    self._invoke(
+                        "batch_delete",
+                        lambda: client.batch_delete(self.collection_name, point_ids),
+                    )
+                    return
+                except TypeError:
+                    pass
+
+        if not hasattr(client, "delete"):
+            raise RuntimeError("Unsupported Cortex client: delete not available")
+        workers = max(1, min(FALLBACK_DELETE_WORKERS, len(point_ids)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # Consume the iterator so remote errors propagate to the caller.
+            list(
+                pool.map(
+                    lambda point_id: self._call_with_collection_fallback("delete", id=point_id),
+                    point_ids,
+                )
+            )
+
+    def delete_points(self, point_ids: list[int]) -> None:
+        """Delete points by ID in `batch_delete_size` chunks, without touching the mapping table."""
+
+        chunk_size = max(1, self._config.batch_delete_size)
+        for start in range(0, len(point_ids), chunk_size):
+            self._delete_points(point_ids[start : start + chunk_size])
+
+    def _delete_mapped_points(self, rows: list[UserVectorPointId]) -> int:
+        point_ids = [int(row.point_id) for row in rows]
+        self._delete_points(point_ids)
+        return delete_user_vector_point_ids_by_points(
+            self._db,
+            provider=self.provider,
+            collection_name=self.collection_name,
+            point_ids=point_ids,
         )
-        for row in rows:
-            if not hasattr(client, "delete"):
-                raise RuntimeError("Unsupported Cortex client: delete not available")
-            self._call_with_collection_fallback("delete", id=int(row.point_id))
-            ok = delete_point_mapping(
+
+    def delete_user_profile_embeddings_for_user(self, *, user_id: str) -> int:
+        """Purge every embedding version for one user in this adapter's collection.
+
+        Mappings the user has in other collections are left alone; purge those through an adapter
+        bound to that collection.
+        """
+
+        return self.delete_user_profile_embeddings_for_users(user_ids=[user_id])
+
+    def delete_user_profile_embeddings_for_users(self, *, user_ids: list[str]) -> int:
+        """Purge every embedding version for many users in this collection.
+
+        Works in chunks of `batch_delete_size` users: one mapping lookup, one remote batch delete
+        and one mapping `DELETE ... IN` per chunk.
+        """
+
+        unique_ids = list(dict.fromkeys(UUID(user_id) for user_id in user_ids))
+        chunk_size = max(1, self._config.batch_delete_size)
+        deleted = 0
+        for start in range(0, len(unique_ids), chunk_size):
+            rows = list_user_vector_point_ids_for_users(
                 self._db,
-                user_id=UUID(user_id),
+                user_ids=unique_ids[start : start + chunk_size],
                 provider=self.provider,
-                embedding_version=row.embedding_version,
+                collection_name=self.collection_name,
             )
-            if ok:
-                deleted += 1
+            deleted += self._delete_mapped_points(rows)
         return deleted
 
+    def delete_user_profile_embeddings_for_version(self, *, embedding_version: str) -> int:
+        """Purge all points of one embedding version from this collection, chunk by chunk."""
+
+        chunk_size = max(1, self._config.batch_delete_size)
+        deleted = 0
+        after_point_id: int | None = None
+        while True:
+            rows = list_user_vector_point_ids_for_version(
+                self._db,
+                provider=self.provider,
+                collection_name=self.collection_name,
+                embedding_version=embedding_version,
+                after_point_id=after_point_id,
+                limit=chunk_size,
+            )
+            if not rows:
+                return deleted
+            after_point_id = int(rows[-1].point_id)
+            deleted += self._delete_mapped_points(rows)
+
     @staticmethod
     def build_record(
         *,
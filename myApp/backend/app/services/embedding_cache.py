@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import re
+import threading
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.core.config import Settings
+from app.services.embeddings import EmbeddingProvider, embed_texts
+
+DEFAULT_CACHE_MAX_ENTRIES = 10_000
+
+CacheKey = tuple[str, int, str]
+
+
+def embedding_cache_key(model_name: str, dimension: int, text: str) -> CacheKey:
+    return (model_name, dimension, hashlib.sha256(text.encode("utf-8")).hexdigest())
+
+
+class DiskEmbeddingStore:
+    """Append-only on-disk vector store for one (model, dimension), read through `mmap`.
+
+    Layout: `vectors.f32` holds fixed-size float32 records, `keys.txt` one sha256 hex per line
+    (line number = record slot). A batch is validated before anything is written, and vectors are
+    written before keys. On load both files are cut back to the records that have a key, so a torn
+    write loses that batch but never shifts later keys onto the wrong records. Values round-trip
+    through float32, which is what records are stored as anyway.
+    """
+
+    def __init__(
+        self, directory: str | os.PathLike[str], *, model_name: str, dimension: int
+    ) -> None:
+        if dimension <= 0:
+            raise ValueError(f"Disk embedding cache needs a positive dimension, got {dimension}")
+        safe_model = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+        self._dir = Path(directory) / f"{safe_model}-{dimension}"
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._dimension = dimension
+        self._record_size = dimension * 4
+        self._vectors_path = self._dir / "vectors.f32"
+        self._keys_path = self._dir / "keys.txt"
+        self._lock = threading.Lock()
+        self._slots: dict[str, int] = {}
+        self._mmap: mmap.mmap | None = None
+        self._mapped_records = 0
+        self._load()
+
+    def _load(self) -> None:
+        self._vectors_path.touch(exist_ok=True)
+        self._keys_path.touch(exist_ok=True)
+        records = self._vectors_path.stat().st_size // self._record_size
+        keys: list[str] = []
+        with self._keys_path.open("r", encoding="ascii") as fh:
+            for line in fh:
+                key = line.strip()
+                if len(keys) >= records or len(key) != 64:
+                    break
+                keys.append(key)
+        # Drop records without a key and keys without a record left behind by a torn write, so
+        # the next batch's first slot lines up with the keys file again.
+        with self._vectors_path.open("r+b") as fh:
+            fh.truncate(len(keys) * self._record_size)
+        with self._keys_path.open("w", encoding="ascii") as fh:
+            fh.writelines(f"{key}\n" for key in keys)
+        self._slots = {key: slot for slot, key in enumerate(keys)}
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def _remap_locked(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        size = self._vectors_path.stat().st_size
+        self._mapped_records = size // self._record_size
+        if size:
+            with self._vectors_path.open("rb") as fh:
+                self._mmap = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def get(self, digest: str) -> list[float] | None:
+        with self._lock:
+            slot = self._slots.get(digest)
+            if slot is None:
+                return None
+            if slot >= self._mapped_records:
+                self._remap_locked()
+            assert self._mmap is not None
+            start = slot * self._record_size
+            values = array("f")
+            values.frombytes(self._mmap[start : start + self._record_size])
+            return values.tolist()
+
+    def put_many(self, items: list[tuple[str, list[float]]]) -> None:
+        with self._lock:
+            fresh = [(digest, vector) for digest, vector in items if digest not in self._slots]
+            fresh = list(dict(fresh).items())
+            if not fresh:
+                return
+            for _digest, vector in fresh:
+                if len(vector) != self._dimension:
+                    raise ValueError(
+                        f"Expected {self._dimension}-dim vector for disk cache, got {len(vector)}"
+                    )
+            payload = b"".join(array("f", vector).tobytes() for _digest, vector in fresh)
+            first_slot = self._vectors_path.stat().st_size // self._record_size
+            with self._vectors_path.open("ab") as fh:
+                fh.write(payload)
+            with self._keys_path.open("a", encoding="ascii") as fh:
+                fh.writelines(f"{digest}\n" for digest, _vector in fresh)
+            for offset, (digest, _vector) in enumerate(fresh):
+                self._slots[digest] = first_slot + offset
+
+    def close(self) -> None:
+        with self._lock:
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+                self._mapped_records = 0
+
+
+class EmbeddingCache:
+    """Content-addressed embedding cache: in-memory LRU with an optional on-disk tier.
+
+    Keys are (model_name, dimension, sha256(text)), so identical profile texts share a vector.
+    The in-memory tier holds float32 `array`s (a third of the size of boxed float lists) and hands
+    out fresh lists.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+        disk_dir: str | os.PathLike[str] | None = None,
+    ) -> None:
+        self._max_entries = max(0, max_entries)
+        self._disk_dir = disk_dir
+        self._lru: OrderedDict[CacheKey, array] = OrderedDict()
+        self._disk: dict[tuple[str, int], DiskEmbeddingStore] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _disk_store(self, model_name: str, dimension: int) -> DiskEmbeddingStore | None:
+        if self._disk_dir is None:
+            return None
+        with self._lock:
+            store = self._disk.get((model_name, dimension))
+            if store is None:
+                store = DiskEmbeddingStore(
+                    self._disk_dir, model_name=model_name, dimension=dimension
+                )
+                self._disk[(model_name, dimension)] = store
+            return store
+
+    def _remember_locked(self, key: CacheKey, vector: list[float]) -> None:
+        if self._max_entries == 0:
+            return
+        self._lru[key] = array("f", vector)
+        self._lru.move_to_end(key)
+        while len(self._lru) > self._max_entries:
+            self._lru.popitem(last=False)
+
+    def get(self, key: CacheKey) -> list[float] | None:
+        with self._lock:
+            cached = self._lru.get(key)
+            if cached is not None:
+                self._lru.move_to_end(key)
+                self.hits += 1
+                return cached.tolist()
+        store = self._disk_store(key[0], key[1])
+        vector = store.get(key[2]) if store is not None else None
+        with self._lock:
+            if vector is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember_locked(key, vector)
+            return vector
+
+    def put_many(self, items: list[tuple[CacheKey, list[float]]]) -> None:
+        if not items:
+            return
+        with self._lock:
+            for key, vector in items:
+                self._remember_locked(key, vector)
+        by_store: dict[tuple[str, int], list[tuple[str, list[float]]]] = {}
+        for (model_name, dimension, digest), vector in items:
+            by_store.setdefault((model_name, dimension), []).append((digest, vector))
+        for (model_name, dimension), entries in by_store.items():
+            store = self._disk_store(model_name, dimension)
+            if store is not None:
+                store.put_many(entries)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._lru), "hits": self.hits, "misses": self.misses}
+
+
+@dataclass(frozen=True)
+class CachedEmbedder:
+    """EmbeddingProvider wrapper that embeds each distinct text at most once per cache."""
+
+    embedder: EmbeddingProvider
+    cache: EmbeddingCache
+
+    def __post_init__(self) -> None:
+        if self.dimension <= 0:
+            raise ValueError("CachedEmbedder needs an embedder with a positive `dimension`")
+
+    @property
+    def model_name(self) -> str:
+        return self.embedder.model_name
+
+    @property
+    def dimension(self) -> int:
+        return int(getattr(self.embedder, "dimension", 0) or 0)
+
+    def embed_text(self, text: str) -> list[float]:
+        return self.embed_texts([text])[0]
+
+    def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        keys = [embedding_cache_key(self.model_name, self.dimension, text) for text in texts]
+        found: dict[CacheKey, list[float]] = {}
+        pending: dict[CacheKey, str] = {}
+        for key, text in zip(keys, texts, strict=True):
+            if key in found or key in pending:
+                continue
+            vector = self.cache.get(key)
+            if vector is None:
+                pending[key] = text
+            else:
+                found[key] = vector
+
+        if pending:
+            vectors = embed_texts(self.embedder, list(pending.values()))
+            fresh = list(zip(pending.keys(), vectors, strict=True))
+            self.cache.put_many(fresh)
+            found.update(fresh)
+        return [found[key] for key in keys]
+
+
+_shared_cache: EmbeddingCache | None = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_embedding_cache(settings: Settings) -> EmbeddingCache:
+    """Process-wide cache configured from settings (`EMBEDDING_CACHE_*`)."""
+
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = EmbeddingCache(
+                max_entries=settings.embedding_cache_max_entries,
+                disk_dir=settings.embedding_cache_dir,
+            )
+        return _shared_cache
+
+
+def cached_embedder(embedder: EmbeddingProvider, settings: Settings) -> EmbeddingProvider:
+    if settings.embedding_cache_max_entries <= 0 and not settings.embedding_cache_dir:
+        return embedder
+    return CachedEmbedder(embedder=embedder, cache=get_embedding_cache(settings))
+
+
+__all__ = [
+    "CachedEmbedder",
+    "DiskEmbeddingStore",
+    "EmbeddingCache",
+    "cached_embedder",
+    "embedding_cache_key",
+    "get_embedding_cache",
+]
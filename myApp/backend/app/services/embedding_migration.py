@@ -0,0 +1,515 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import Settings
+from app.crud.vector_index import (
+    count_user_vector_point_ids,
+    create_embedding_version_migration,
+    get_embedding_version_migration,
+    get_latest_embedding_version_migration,
+    get_serving_embedding_version_migration,
+    transition_embedding_version_migration,
+)
+from app.models.user import User
+from app.models.vector_index import EmbeddingVersionMigration
+from app.services.actian_vector_store import (
+    ACTIAN_PROVIDER,
+    ActianVectorStoreAdapter,
+    ActianVectorStoreConfig,
+)
+from app.services.embedding_refresh import EmbeddingWriteTarget
+from app.services.embeddings import (
+    USER_PROFILE_EMBEDDING_VERSION,
+    EmbeddingProvider,
+    sync_user_profile_embeddings_batch,
+)
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_STATUS_BACKFILLING = "backfilling"
+# Reads use the target; source points are still present until they are dropped.
+MIGRATION_STATUS_CUT_OVER = "cut_over"
+MIGRATION_STATUS_COMPLETED = "completed"
+MIGRATION_STATUS_FAILED = "failed"
+MIGRATION_STATUS_CANCELLED = "cancelled"
+ACTIVE_MIGRATION_STATUSES = (MIGRATION_STATUS_BACKFILLING, MIGRATION_STATUS_CUT_OVER)
+SERVING_MIGRATION_STATUSES = (MIGRATION_STATUS_CUT_OVER, MIGRATION_STATUS_COMPLETED)
+
+DEFAULT_COVERAGE_THRESHOLD = 0.99
+DEFAULT_MIGRATION_CHUNK_SIZE = 200
+# Full passes over the user table before a backfill that cannot reach its threshold gives up.
+MAX_BACKFILL_PASSES = 3
+
+
+@dataclass(frozen=True)
+class EmbeddingTarget:
+    embedding_version: str
+    collection_name: str
+    dimension: int | None
+
+
+@dataclass(frozen=True)
+class EmbeddingMigrationChunkResult:
+    processed: int
+    embedded: int
+    skipped: int
+    failed: int
+    status: str
+
+
+@dataclass(frozen=True)
+class EmbeddingMigrationProgress:
+    migration: EmbeddingVersionMigration
+    covered_users: int
+    coverage: float
+    elapsed_seconds: float
+    users_per_second: float | None
+    eta_seconds: float | None
+
+
+def default_embedding_target(settings: Settings) -> EmbeddingTarget:
+    return EmbeddingTarget(
+        embedding_version=USER_PROFILE_EMBEDDING_VERSION,
+        collection_name=settings.vectorai_collection_name,
+        dimension=settings.vectorai_dimension,
+    )
+
+
+def resolve_serving_embedding_target(db: Session, *, settings: Settings) -> EmbeddingTarget:
+    """Version/collection reads should use: the latest cut-over migration, else settings."""
+
+    migration = get_serving_embedding_version_migration(
+        db, provider=ACTIAN_PROVIDER, statuses=SERVING_MIGRATION_STATUSES
+    )
+    if migration is None:
+        return default_embedding_target(settings)
+    return EmbeddingTarget(
+        embedding_version=migration.target_version,
+        collection_name=migration.target_collection,
+        dimension=migration.target_dimension or settings.vectorai_dimension,
+    )
+
+
+def get_active_embedding_migration(db: Session) -> EmbeddingVersionMigration | None:
+    return get_latest_embedding_version_migration(
+        db, provider=ACTIAN_PROVIDER, statuses=ACTIVE_MIGRATION_STATUSES
+    )
+
+
+def build_target_adapter(
+    db: Session, *, settings: Settings, target: EmbeddingTarget
+) -> ActianVectorStoreAdapter:
+    cfg = ActianVectorStoreConfig.from_settings(settings)
+    cfg = replace(cfg, collection_name=target.collection_name, dimension=target.dimension)
+    return ActianVectorStoreAdapter(db=db, config=cfg)
+
+
+def migration_target(migration: EmbeddingVersionMigration) -> EmbeddingTarget:
+    return EmbeddingTarget(
+        embedding_version=migration.target_version,
+        collection_name=migration.target_collection,
+        dimension=migration.target_dimension,
+    )
+
+
+def migration_source(migration: EmbeddingVersionMigration) -> EmbeddingTarget:
+    return EmbeddingTarget(
+        embedding_version=migration.source_version,
+        collection_name=migration.source_collection,
+        dimension=None,
+    )
+
+
+def embedding_write_targets(
+    db: Session,
+    *,
+    settings: Settings,
+    adapter_factory: Callable[[Session, EmbeddingTarget], ActianVectorStoreAdapter] | None = None,
+) -> list[EmbeddingWriteTarget]:
+    """Serving target first, plus the backfilling migration target (dual write) if any."""
+
+    build = adapter_factory or (
+        lambda session, target: build_target_adapter(session, settings=settings, target=target)
+    )
+    serving = resolve_serving_embedding_target(db, settings=settings)
+    targets = [EmbeddingWriteTarget(build(db, serving), serving.embedding_version)]
+    migration = get_active_embedding_migration(db)
+    if migration is not None and migration.status == MIGRATION_STATUS_BACKFILLING:
+        shadow = migration_target(migration)
+        targets.append(EmbeddingWriteTarget(build(db, shadow), shadow.embedding_version))
+    return targets
+
+
+def start_embedding_migration(
+    db: Session,
+    *,
+    settings: Settings,
+    target_version: str,
+    target_collection: str,
+    target_dimension: int | None = None,
+    coverage_threshold: float = DEFAULT_COVERAGE_THRESHOLD,
+    chunk_size: int = DEFAULT_MIGRATION_CHUNK_SIZE,
+    max_users_per_second: float | None = None,
+) -> EmbeddingVersionMigration:
+    active = get_active_embedding_migration(db)
+    if active is not None:
+        raise ValueError(f"Embedding migration {active.id} is still {active.status}")
+    source = resolve_serving_embedding_target(db, settings=settings)
+    if target_version == source.embedding_version or target_collection == source.collection_name:
+        raise ValueError("Target version and collection must differ from the serving ones")
+    return create_embedding_version_migration(
+        db,
+        provider=ACTIAN_PROVIDER,
+        source_version=source.embedding_version,
+        source_collection=source.collection_name,
+        target_version=target_version,
+        target_collection=target_collection,
+        target_dimension=target_dimension or source.dimension,
+        status=MIGRATION_STATUS_BACKFILLING,
+        coverage_threshold=coverage_threshold,
+        chunk_size=max(1, chunk_size),
+        max_users_per_second=max_users_per_second,
+        total_users=int(db.scalar(select(func.count()).select_from(User)) or 0),
+    )
+
+
+def migration_coverage(db: Session, migration: EmbeddingVersionMigration) -> tuple[int, int]:
+    """(users with a target-version point, users in total)."""
+
+    covered = count_user_vector_point_ids(
+        db,
+        provider=migration.provider,
+        collection_name=migration.target_collection,
+        embedding_version=migration.target_version,
+    )
+    total = int(db.scalar(select(func.count()).select_from(User)) or 0)
+    return covered, total
+
+
+def _coverage_ratio(covered: int, total: int) -> float:
+    return 1.0 if total == 0 else covered / total
+
+
+def cut_over_embedding_migration(
+    db: Session, migration: EmbeddingVersionMigration, *, force: bool = False
+) -> EmbeddingVersionMigration:
+    """Atomically switch reads to the target version once coverage reaches the threshold."""
+
+    covered, total = migration_coverage(db, migration)
+    if not force and _coverage_ratio(covered, total) < migration.coverage_threshold:
+        raise ValueError(
+            f"Coverage {covered}/{total} is below the {migration.coverage_threshold:.2%} threshold"
+        )
+    switched = transition_embedding_version_migration(
+        db,
+        migration_id=migration.id,
+        from_status=MIGRATION_STATUS_BACKFILLING,
+        to_status=MIGRATION_STATUS_CUT_OVER,
+        cut_over_at=datetime.now(timezone.utc),
+        total_users=total,
+    )
+    db.refresh(migration)
+    if not switched:
+        raise ValueError(f"Embedding migration {migration.id} is {migration.status}")
+    return migration
+
+
+def drop_source_embeddings(
+    db: Session, migration: EmbeddingVersionMigration, *, vector_store: ActianVectorStoreAdapter
+) -> EmbeddingVersionMigration:
+    """Bulk-delete the source version's points and mappings after cut-over, then complete."""
+
+    if migration.status != MIGRATION_STATUS_CUT_OVER:
+        raise ValueError(f"Embedding migration {migration.id} is {migration.status}, not cut_over")
+    dropped = vector_store.delete_user_profile_embeddings_for_version(
+        embedding_version=migration.source_version
+    )
+    transition_embedding_version_migration(
+        db,
+        migration_id=migration.id,
+        from_status=MIGRATION_STATUS_CUT_OVER,
+        to_status=MIGRATION_STATUS_COMPLETED,
+        dropped_points=dropped,
+        completed_at=datetime.now(timezone.utc),
+    )
+    db.refresh(migration)
+    return migration
+
+
+def cancel_embedding_migration(
+    db: Session, migration: EmbeddingVersionMigration
+) -> EmbeddingVersionMigration:
+    if not transition_embedding_version_migration(
+        db,
+        migration_id=migration.id,
+        from_status=MIGRATION_STATUS_BACKFILLING,
+        to_status=MIGRATION_STATUS_CANCELLED,
+    ):
+        db.refresh(migration)
+        raise ValueError(f"Embedding migration {migration.id} is {migration.status}")
+    db.refresh(migration)
+    return migration
+
+
+def _finish_backfill_pass(db: Session, migration: EmbeddingVersionMigration) -> None:
+    covered, total = migration_coverage(db, migration)
+    if _coverage_ratio(covered, total) >= migration.coverage_threshold:
+        cut_over_embedding_migration(db, migration)
+        return
+    migration.passes += 1
+    migration.cursor_user_id = None
+    if migration.passes >= MAX_BACKFILL_PASSES:
+        migration.status = MIGRATION_STATUS_FAILED
+        migration.last_error = (
+            f"Coverage {covered}/{total} still below threshold after {migration.passes} passes"
+        )
+    db.commit()
+
+
+def run_embedding_migration_chunk(
+    db: Session,
+    migration: EmbeddingVersionMigration,
+    *,
+    vector_store: ActianVectorStoreAdapter,
+    embedder: EmbeddingProvider,
+) -> EmbeddingMigrationChunkResult:
+    """Backfill the next keyset chunk of users into the target; cut over at the end of a pass.
+
+    Later passes re-walk the table with unchanged profiles skipped, so they only retry failures
+    and pick up users created meanwhile.
+    """
+
+    if migration.status != MIGRATION_STATUS_BACKFILLING:
+        return EmbeddingMigrationChunkResult(0, 0, 0, 0, migration.status)
+
+    stmt = select(User.id).order_by(User.id.asc()).limit(migration.chunk_size)
+    if migration.cursor_user_id is not None:
+        stmt = stmt.where(User.id > migration.cursor_user_id)
+    user_ids = list(db.scalars(stmt).all())
+    if not user_ids:
+        _finish_backfill_pass(db, migration)
+        return EmbeddingMigrationChunkResult(0, 0, 0, 0, migration.status)
+
+    try:
+        report = sync_user_profile_embeddings_batch(
+            db,
+            user_ids=user_ids,
+            vector_store=vector_store,
+            embedder=embedder,
+            embedding_version=migration.target_version,
+        )
+    except Exception as exc:
+        db.rollback()
+        migration.last_error = str(exc)
+        db.commit()
+        raise
+
+    migration.cursor_user_id = user_ids[-1]
+    migration.processed_users += len(user_ids)
+    migration.embedded_count += report.embedded_count
+    migration.skipped_count += report.skipped_count
+    migration.failed_count += report.failed_count
+    db.commit()
+    if len(user_ids) < migration.chunk_size:
+        _finish_backfill_pass(db, migration)
+    return EmbeddingMigrationChunkResult(
+        processed=len(user_ids),
+        embedded=report.embedded_count,
+        skipped=report.skipped_count,
+        failed=report.failed_count,
+        status=migration.status,
+    )
+
+
+def embedding_migration_progress(
+    db: Session, migration: EmbeddingVersionMigration, *, now: datetime | None = None
+) -> EmbeddingMigrationProgress:
+    covered, total = migration_coverage(db, migration)
+    now = now or datetime.now(timezone.utc)
+    started = migration.created_at
+    if started.tzinfo is None:
+        started = started.replace(tzinfo=timezone.utc)
+    elapsed = max(0.0, (now - started).total_seconds())
+    rate: float | None = None
+    if elapsed > 0 and migration.processed_users:
+        rate = migration.processed_users / elapsed
+    eta: float | None = None
+    if migration.status == MIGRATION_STATUS_BACKFILLING and rate:
+        eta = max(0, total - covered) / rate
+    return EmbeddingMigrationProgress(
+        migration=migration,
+        covered_users=covered,
+        coverage=_coverage_ratio(covered, total),
+        elapsed_seconds=elapsed,
+        users_per_second=rate,
+        eta_seconds=eta,
+    )
+
+
+class EmbeddingMigrationWorker:
+    """Daemon thread that drives one migration: throttled backfill, cut-over, source drop.
+
+    Chunks are paced to `max_users_per_second` so the backfill cannot crowd out live traffic on
+    the vector server. Errors back off exponentially like the refresh worker.
+    """
+
+    def __init__(
+        self,
+        *,
+        migration_id: UUID,
+        session_factory: Callable[[], Session],
+        adapter_factory: Callable[[Session, EmbeddingTarget], ActianVectorStoreAdapter],
+        embedder: EmbeddingProvider,
+        idle_seconds: float = 1.0,
+        max_backoff_seconds: float = 300.0,
+    ) -> None:
+        self.migration_id = migration_id
+        self._session_factory = session_factory
+        self._adapter_factory = adapter_factory
+        self._embedder = embedder
+        self._idle_seconds = idle_seconds
+        self._max_backoff_seconds = max_backoff_seconds
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._consecutive_errors = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def run_once(self) -> tuple[str, float]:
+        """Advance the migration one step; returns (status, seconds to wait before the next)."""
+
+        with self._session_factory() as db:
+            migration = get_embedding_version_migration(db, self.migration_id)
+            if migration is None:
+                return MIGRATION_STATUS_CANCELLED, 0.0
+            if migration.status == MIGRATION_STATUS_CUT_OVER:
+                drop_source_embeddings(
+                    db,
+                    migration,
+                    vector_store=self._adapter_factory(db, migration_source(migration)),
+                )
+                return migration.status, 0.0
+            if migration.status != MIGRATION_STATUS_BACKFILLING:
+                return migration.status, 0.0
+
+            started = time.perf_counter()
+            result = run_embedding_migration_chunk(
+                db,
+                migration,
+                vector_store=self._adapter_factory(db, migration_target(migration)),
+                embedder=self._embedder,
+            )
+            elapsed = time.perf_counter() - started
+            if result.processed == 0:
+                return result.status, 0.0
+            if not migration.max_users_per_second:
+                return result.status, 0.0
+            budget = result.processed / migration.max_users_per_second
+            return result.status, max(0.0, budget - elapsed)
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                status, delay = self.run_once()
+                self._consecutive_errors = 0
+            except Exception:
+                self._consecutive_errors += 1
+                logger.exception(
+                    "Embedding migration %s step failed (consecutive errors: %d)",
+                    self.migration_id,
+                    self._consecutive_errors,
+                )
+                backoff = self._idle_seconds * (2 ** min(self._consecutive_errors, 16))
+                self._stop.wait(min(self._max_backoff_seconds, backoff))
+                continue
+            if status not in ACTIVE_MIGRATION_STATUSES:
+                return
+            self._stop.wait(delay)
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._loop, name=f"embedding-migration-{self.migration_id}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 10.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+_migration_worker: EmbeddingMigrationWorker | None = None
+_migration_worker_lock = threading.Lock()
+
+
+def start_embedding_migration_worker(worker: EmbeddingMigrationWorker) -> EmbeddingMigrationWorker:
+    """Run `worker` as the process's single migration worker, replacing any previous one."""
+
+    global _migration_worker
+    with _migration_worker_lock:
+        if _migration_worker is not None:
+            _migration_worker.stop()
+        _migration_worker = worker
+        worker.start()
+        return worker
+
+
+def embedding_migration_worker_running(migration_id: UUID) -> bool:
+    with _migration_worker_lock:
+        worker = _migration_worker
+    return worker is not None and worker.migration_id == migration_id and worker.running
+
+
+def stop_embedding_migration_worker() -> None:
+    global _migration_worker
+    with _migration_worker_lock:
+        if _migration_worker is not None:
+            _migration_worker.stop()
+            _migration_worker = None
+
+
+__all__ = [
+    "ACTIVE_MIGRATION_STATUSES",
+    "EmbeddingMigrationChunkResult",
+    "EmbeddingMigrationProgress",
+    "EmbeddingMigrationWorker",
+    "EmbeddingTarget",
+    "MIGRATION_STATUS_BACKFILLING",
+    "MIGRATION_STATUS_CANCELLED",
+    "MIGRATION_STATUS_COMPLETED",
+    "MIGRATION_STATUS_CUT_OVER",
+    "MIGRATION_STATUS_FAILED",
+    "build_target_adapter",
+    "cancel_embedding_migration",
+    "cut_over_embedding_migration",
+    "default_embedding_target",
+    "drop_source_embeddings",
+    "embedding_migration_progress",
+    "embedding_migration_worker_running",
+    "embedding_write_targets",
+    "get_active_embedding_migration",
+    "migration_coverage",
+    "migration_source",
+    "migration_target",
+    "resolve_serving_embedding_target",
+    "run_embedding_migration_chunk",
+    "start_embedding_migration",
+    "start_embedding_migration_worker",
+    "stop_embedding_migration_worker",
+]
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.orm import Session
+
+from app.core.config import Settings
+from app.crud.vector_index import (
+    clear_dirty_users,
+    list_ready_dirty_users,
+    record_dirty_user_failures,
+)
+from app.services.embeddings import (
+    USER_PROFILE_EMBEDDING_VERSION,
+    EmbeddingProvider,
+    sync_user_profile_embeddings_batch,
+)
+from app.services.vector_store import VectorStoreAdapter
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class EmbeddingRefreshConfig:
+    interval_seconds: float = 5.0
+    # A user is only picked up once they have been quiet this long, so bursts of edits coalesce.
+    debounce_seconds: float = 2.0
+    batch_size: int = 200
+    # Per-user retry delay after an embedding failure.
+    retry_seconds: float = 60.0
+    # Cap for the worker-wide exponential backoff on vector store errors.
+    max_backoff_seconds: float = 300.0
+    embedding_version: str = USER_PROFILE_EMBEDDING_VERSION
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> EmbeddingRefreshConfig:
+        return cls(
+            interval_seconds=settings.embedding_refresh_interval_seconds,
+            debounce_seconds=settings.embedding_refresh_debounce_seconds,
+            batch_size=settings.embedding_refresh_batch_size,
+            retry_seconds=settings.embedding_refresh_retry_seconds,
+            max_backoff_seconds=settings.embedding_refresh_max_backoff_seconds,
+        )
+
+
+@dataclass(frozen=True)
+class EmbeddingWriteTarget:
+    vector_store: VectorStoreAdapter
+    embedding_version: str
+
+
+@dataclass(frozen=True)
+class EmbeddingRefreshResult:
+    claimed: int
+    embedded: int
+    skipped: int
+    failed: int
+    cleared: int
+
+
+def refresh_dirty_user_embeddings(
+    db: Session,
+    *,
+    vector_store: VectorStoreAdapter,
+    embedder: EmbeddingProvider,
+    config: EmbeddingRefreshConfig,
+    now: datetime | None = None,
+    shadow_targets: Sequence[EmbeddingWriteTarget] = (),
+) -> EmbeddingRefreshResult:
+    """Drain one batch of debounced dirty users through the incremental batch pipeline.
+
+    `shadow_targets` receive the same users under their own version (e.g. an embedding version
+    migration being backfilled), so edits made mid-backfill are not lost at cut-over. A user is
+    only cleared once every target took them. Vector store errors propagate and leave the batch
+    queued for the next attempt.
+    """
+
+    now = now or datetime.now(timezone.utc)
+    rows = list_ready_dirty_users(
+        db,
+        marked_before=now - timedelta(seconds=config.debounce_seconds),
+        now=now,
+        limit=max(1, config.batch_size),
+    )
+    if not rows:
+        return EmbeddingRefreshResult(claimed=0, embedded=0, skipped=0, failed=0, cleared=0)
+
+    claimed = [(row.user_id, row.version) for row in rows]
+    report = sync_user_profile_embeddings_batch(
+        db,
+        user_ids=[user_id for user_id, _version in claimed],
+        vector_store=vector_store,
+        embedder=embedder,
+        embedding_version=config.embedding_version,
+    )
+
+    failed = {failure.user_id: failure.error for failure in report.failures}
+    for target in shadow_targets:
+        shadow_report = sync_user_profile_embeddings_batch(
+            db,
+            user_ids=[user_id for user_id, _version in claimed if user_id not in failed],
+            vector_store=target.vector_store,
+            embedder=embedder,
+            embedding_version=target.embedding_version,
+        )
+        for failure in shadow_report.failures:
+            failed.setdefault(failure.user_id, failure.error)
+    cleared = clear_dirty_users(
+        db,
+        claimed=[(user_id, version) for user_id, version in claimed if user_id not in failed],
+    )
+    record_dirty_user_failures(
+        db, failures=failed, retry_after=timedelta(seconds=config.retry_seconds)
+    )
+    return EmbeddingRefreshResult(
+        claimed=len(claimed),
+        embedded=report.embedded_count,
+        skipped=report.skipped_count,
+        failed=report.failed_count,
+        cleared=cleared,
+    )
+
+
+class EmbeddingRefreshWorker:
+    """Daemon thread that periodically drains `embedding_dirty_users`.
+
+    A full batch is followed immediately by the next one. Errors (typically the vector store being
+    down or the circuit breaker open) back off exponentially up to `max_backoff_seconds`.
+    """
+
+    def __init__(
+        self,
+        *,
+        session_factory: Callable[[], Session],
+        vector_store_factory: Callable[[Session], VectorStoreAdapter],
+        embedder: EmbeddingProvider,
+        config: EmbeddingRefreshConfig,
+        targets_factory: Callable[[Session], list[EmbeddingWriteTarget]] | None = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self._vector_store_factory = vector_store_factory
+        # When set, re-resolved every batch: the first target is primary, the rest are shadows.
+        self._targets_factory = targets_factory
+        self._embedder = embedder
+        self._config = config
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._consecutive_errors = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def run_once(self) -> EmbeddingRefreshResult:
+        with self._session_factory() as db:
+            if self._targets_factory is None:
+                return refresh_dirty_user_embeddings(
+                    db,
+                    vector_store=self._vector_store_factory(db),
+                    embedder=self._embedder,
+                    config=self._config,
+                )
+            primary, *shadows = self._targets_factory(db)
+            return refresh_dirty_user_embeddings(
+                db,
+                vector_store=primary.vector_store,
+                embedder=self._embedder,
+                config=replace(self._config, embedding_version=primary.embedding_version),
+                shadow_targets=shadows,
+            )
+
+    def next_delay_seconds(self, result: EmbeddingRefreshResult | None) -> float:
+        if result is None:
+            backoff = self._config.interval_seconds * (2 ** min(self._consecutive_errors, 16))
+            return min(self._config.max_backoff_seconds, backoff)
+        if result.claimed >= self._config.batch_size:
+            return 0.0
+        return self._config.interval_seconds
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            result: EmbeddingRefreshResult | None
+            try:
+                result = self.run_once()
+                self._consecutive_errors = 0
+            except Exception:
+                self._consecutive_errors += 1
+                logger.exception(
+                    "Embedding refresh batch failed (consecutive errors: %d)",
+                    self._consecutive_errors,
+                )
+                result = None
+            self._stop.wait(self.next_delay_seconds(result))
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="embedding-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 10.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+__all__ = [
+    "EmbeddingRefreshConfig",
+    "EmbeddingRefreshResult",
+    "EmbeddingRefreshWorker",
+    "EmbeddingWriteTarget",
+    "refresh_dirty_user_embeddings",
+]
@@ -0,0 +1,506 @@
+from __future__ import annotations
+
+import ast
+import json
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, BinaryIO
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.crud.vector_index import (
+    list_user_vector_point_ids_by_points,
+    list_user_vector_point_ids_for_users,
+    list_user_vector_point_ids_for_version,
+    upsert_user_vector_point_ids_bulk,
+)
+from app.models.user import User
+from app.services.actian_vector_store import ActianVectorStoreAdapter
+
+SNAPSHOT_FORMAT = "user-profile-embedding-snapshot"
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_MANIFEST = "manifest.json"
+# Worker count for per-point vector reads during export; the SDK has no pinned bulk read.
+EXPORT_FETCH_WORKERS = 8
+DEFAULT_SNAPSHOT_CHUNK_SIZE = 500
+
+_NPY_MAGIC = b"\x93NUMPY"
+# Fixed header slot so the shape can be patched in once the row count is known.
+_NPY_PREFIX_BYTES = 128
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+def _npy_header(descr: str, shape: tuple[int, ...]) -> bytes:
+    header = repr({"descr": descr, "fortran_order": False, "shape": shape}).encode("latin1")
+    room = _NPY_PREFIX_BYTES - len(_NPY_MAGIC) - 4
+    if len(header) + 1 > room:
+        raise ValueError(f"npy header too long for shape {shape}")
+    header = header.ljust(room - 1) + b"\n"
+    return _NPY_MAGIC + b"\x01\x00" + struct.pack("<H", len(header)) + header
+
+
+def _le_bytes(values: array) -> bytes:
+    if not _LITTLE_ENDIAN:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_le_bytes(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if not _LITTLE_ENDIAN:
+        values.byteswap()
+    return values
+
+
+class _NpyWriter:
+    """Streams rows into a `.npy` file; the header is written on close, once the shape is known."""
+
+    def __init__(self, path: Path, descr: str) -> None:
+        self._descr = descr
+        self._fh: BinaryIO = path.open("wb")
+        self._fh.write(b"\0" * _NPY_PREFIX_BYTES)
+        self.rows = 0
+
+    def write(self, data: bytes, rows: int) -> None:
+        self._fh.write(data)
+        self.rows += rows
+
+    def close(self, row_shape: tuple[int, ...] = ()) -> None:
+        self._fh.seek(0)
+        self._fh.write(_npy_header(self._descr, (self.rows, *row_shape)))
+        self._fh.close()
+
+
+class _StringColumnWriter:
+    """Arrow-style variable-length column: `<name>.offsets.npy` (int64, n+1) over `<name>.bin`."""
+
+    def __init__(self, directory: Path, name: str) -> None:
+        self._offsets = _NpyWriter(directory / f"{name}.offsets.npy", "<i8")
+        self._data = (directory / f"{name}.bin").open("wb")
+        self._end = 0
+        self._offsets.write(_le_bytes(array("q", [0])), 0)
+
+    def write(self, values: list[str | None]) -> None:
+        ends = array("q")
+        for value in values:
+            encoded = (value or "").encode("utf-8")
+            self._data.write(encoded)
+            self._end += len(encoded)
+            ends.append(self._end)
+        self._offsets.write(_le_bytes(ends), len(values))
+
+    def close(self) -> None:
+        self._data.close()
+        # The leading 0 makes the offsets array one longer than the row count.
+        self._offsets.rows += 1
+        self._offsets.close()
+
+
+class _NpyColumn:
+    """Read-only, memory-mapped view over a C-ordered `.npy` file (format 1.0 or 2.0)."""
+
+    def __init__(self, path: Path) -> None:
+        with path.open("rb") as fh:
+            self._mmap = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:6] != _NPY_MAGIC:
+            raise ValueError(f"Not an .npy file: {path}")
+        major = self._mmap[6]
+        if major == 1:
+            (header_len,) = struct.unpack("<H", self._mmap[8:10])
+            start = 10
+        else:
+            (header_len,) = struct.unpack("<I", self._mmap[8:12])
+            start = 12
+        header = ast.literal_eval(self._mmap[start : start + header_len].decode("latin1"))
+        if header.get("fortran_order"):
+            raise ValueError(f"Fortran-ordered arrays are not supported: {path}")
+        self.descr: str = header["descr"]
+        self.shape: tuple[int, ...] = tuple(header["shape"])
+        self._data_offset = start + header_len
+        self._row_size = int(self.descr[2:])
+        for extent in self.shape[1:]:
+            self._row_size *= extent
+
+    def __len__(self) -> int:
+        return self.shape[0] if self.shape else 0
+
+    def rows(self, start: int, stop: int) -> bytes:
+        begin = self._data_offset + start * self._row_size
+        return self._mmap[begin : self._data_offset + stop * self._row_size]
+
+    def close(self) -> None:
+        self._mmap.close()
+
+
+class _StringColumn:
+    def __init__(self, directory: Path, name: str) -> None:
+        self._offsets = _NpyColumn(directory / f"{name}.offsets.npy")
+        with (directory / f"{name}.bin").open("rb") as fh:
+            size = fh.seek(0, 2)
+            self._data = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+
+    def rows(self, start: int, stop: int) -> list[str]:
+        offsets = _from_le_bytes("q", self._offsets.rows(start, stop + 1))
+        if self._data is None:
+            return ["" for _ in range(stop - start)]
+        return [
+            self._data[offsets[i] : offsets[i + 1]].decode("utf-8") for i in range(len(offsets) - 1)
+        ]
+
+    def close(self) -> None:
+        self._offsets.close()
+        if self._data is not None:
+            self._data.close()
+
+
+@dataclass(frozen=True)
+class EmbeddingSnapshotManifest:
+    provider: str
+    collection_name: str
+    embedding_version: str
+    dimension: int
+    count: int
+    created_at: str
+    format: str = SNAPSHOT_FORMAT
+    format_version: int = SNAPSHOT_FORMAT_VERSION
+
+
+@dataclass(frozen=True)
+class EmbeddingSnapshotRow:
+    user_id: UUID
+    point_id: int
+    vector: list[float]
+    source_content_hash: str | None
+    embedding_model: str | None
+    payload: dict[str, Any] | None
+
+
+@dataclass(frozen=True)
+class EmbeddingSnapshotExportResult:
+    path: str
+    manifest: EmbeddingSnapshotManifest
+    # Mapped points the vector store no longer had; they are left out of the snapshot.
+    missing_point_ids: list[int]
+
+
+@dataclass(frozen=True)
+class EmbeddingSnapshotImportResult:
+    imported: int
+    chunks: int
+    # Snapshot rows whose user does not exist in this database.
+    skipped_missing_users: int
+    # Rows written under a different point ID than the snapshot's (existing mapping or conflict).
+    reassigned_point_ids: int
+
+
+class EmbeddingSnapshotReader:
+    """Memory-mapped snapshot directory; `iter_chunks` never materializes more than one chunk."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        manifest_path = self.path / SNAPSHOT_MANIFEST
+        if not manifest_path.exists():
+            raise ValueError(f"Snapshot manifest missing (incomplete export?): {manifest_path}")
+        raw = json.loads(manifest_path.read_text(encoding="utf-8"))
+        fmt, fmt_version = raw.get("format"), raw.get("format_version")
+        if fmt != SNAPSHOT_FORMAT or fmt_version != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot format: {fmt!r} v{fmt_version!r}")
+        self.manifest = EmbeddingSnapshotManifest(**raw)
+        self._vectors = _NpyColumn(self.path / "vectors.npy")
+        self._point_ids = _NpyColumn(self.path / "point_ids.npy")
+        self._user_ids = _NpyColumn(self.path / "user_ids.npy")
+        self._hashes = _StringColumn(self.path, "content_hashes")
+        self._models = _StringColumn(self.path, "embedding_models")
+        self._payloads = _StringColumn(self.path, "payloads")
+        count = self.manifest.count
+        if {len(self._vectors), len(self._point_ids), len(self._user_ids)} != {count}:
+            raise ValueError("Snapshot columns disagree with the manifest row count")
+        if count and self._vectors.shape[1:] != (self.manifest.dimension,):
+            raise ValueError("Snapshot vector width disagrees with the manifest dimension")
+
+    def __enter__(self) -> EmbeddingSnapshotReader:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    def max_point_id(self) -> int | None:
+        point_ids = _from_le_bytes("q", self._point_ids.rows(0, self.manifest.count))
+        return max(point_ids) if point_ids else None
+
+    def iter_chunks(self, chunk_size: int) -> Iterator[list[EmbeddingSnapshotRow]]:
+        count = self.manifest.count
+        dimension = self.manifest.dimension
+        for start in range(0, count, max(1, chunk_size)):
+            stop = min(count, start + chunk_size)
+            flat = _from_le_bytes("f", self._vectors.rows(start, stop))
+            point_ids = _from_le_bytes("q", self._point_ids.rows(start, stop))
+            user_ids = self._user_ids.rows(start, stop)
+            hashes = self._hashes.rows(start, stop)
+            models = self._models.rows(start, stop)
+            payloads = self._payloads.rows(start, stop)
+            yield [
+                EmbeddingSnapshotRow(
+                    user_id=UUID(bytes=user_ids[i * 16 : (i + 1) * 16]),
+                    point_id=int(point_ids[i]),
+                    vector=flat[i * dimension : (i + 1) * dimension].tolist(),
+                    source_content_hash=hashes[i] or None,
+                    embedding_model=models[i] or None,
+                    payload=json.loads(payloads[i]) if payloads[i] else None,
+                )
+                for i in range(stop - start)
+            ]
+
+    def close(self) -> None:
+        for column in (self._vectors, self._point_ids, self._user_ids):
+            column.close()
+        for strings in (self._hashes, self._models, self._payloads):
+            strings.close()
+
+
+def export_embedding_snapshot(
+    db: Session,
+    adapter: ActianVectorStoreAdapter,
+    path: str | Path,
+    *,
+    embedding_version: str,
+    chunk_size: int = DEFAULT_SNAPSHOT_CHUNK_SIZE,
+) -> EmbeddingSnapshotExportResult:
+    """Write every `embedding_version` vector in the adapter's collection to a snapshot directory.
+
+    Layout: `vectors.npy` (float32 n x d), `point_ids.npy` (int64), `user_ids.npy` (16-byte UUIDs)
+    and offset-encoded string columns for content hashes, models and JSON payloads. The `.npy`
+    files load with `numpy.load(..., mmap_mode="r")`. The manifest is written last, so a partial
+    export is never importable.
+    """
+
+    target = Path(path)
+    target.mkdir(parents=True, exist_ok=True)
+    (target / SNAPSHOT_MANIFEST).unlink(missing_ok=True)
+
+    vectors = _NpyWriter(target / "vectors.npy", "<f4")
+    point_ids = _NpyWriter(target / "point_ids.npy", "<i8")
+    user_ids = _NpyWriter(target / "user_ids.npy", "|S16")
+    hashes = _StringColumnWriter(target, "content_hashes")
+    models = _StringColumnWriter(target, "embedding_models")
+    payloads = _StringColumnWriter(target, "payloads")
+    dimension = adapter._config.dimension
+    missing: list[int] = []
+
+    with ThreadPoolExecutor(max_workers=EXPORT_FETCH_WORKERS) as pool:
+        after: int | None = None
+        while True:
+            rows = list_user_vector_point_ids_for_version(
+                db,
+                provider=adapter.provider,
+                collection_name=adapter.collection_name,
+                embedding_version=embedding_version,
+                after_point_id=after,
+                limit=chunk_size,
+            )
+            if not rows:
+                break
+            after = int(rows[-1].point_id)
+            fetched = list(pool.map(lambda row: adapter.fetch_point(int(row.point_id)), rows))
+
+            flat = array("f")
+            chunk_point_ids = array("q")
+            chunk_user_ids: list[bytes] = []
+            chunk_hashes: list[str | None] = []
+            chunk_models: list[str | None] = []
+            chunk_payloads: list[str | None] = []
+            for row, point in zip(rows, fetched, strict=True):
+                if point is None:
+                    missing.append(int(row.point_id))
+                    continue
+                vector, payload = point
+                if dimension is None:
+                    dimension = len(vector)
+                if len(vector) != dimension:
+                    raise ValueError(
+                        f"Point {row.point_id} has dimension {len(vector)}, expected {dimension}"
+                    )
+                flat.extend(vector)
+                chunk_point_ids.append(int(row.point_id))
+                chunk_user_ids.append(row.user_id.bytes)
+                chunk_hashes.append(row.source_content_hash)
+                chunk_models.append(row.embedding_model)
+                chunk_payloads.append(
+                    None if payload is None else json.dumps(payload, separators=(",", ":"))
+                )
+
+            vectors.write(_le_bytes(flat), len(chunk_point_ids))
+            point_ids.write(_le_bytes(chunk_point_ids), len(chunk_point_ids))
+            user_ids.write(b"".join(chunk_user_ids), len(chunk_user_ids))
+            hashes.write(chunk_hashes)
+            models.write(chunk_models)
+            payloads.write(chunk_payloads)
+            if len(rows) < chunk_size:
+                break
+
+    count = point_ids.rows
+    dimension = dimension or 0
+    vectors.close((dimension,))
+    point_ids.close()
+    user_ids.close()
+    for column in (hashes, models, payloads):
+        column.close()
+
+    manifest = EmbeddingSnapshotManifest(
+        provider=adapter.provider,
+        collection_name=adapter.collection_name,
+        embedding_version=embedding_version,
+        dimension=dimension,
+        count=count,
+        created_at=datetime.now(timezone.utc).isoformat(),
+    )
+    manifest_json = json.dumps(asdict(manifest), indent=2)
+    (target / SNAPSHOT_MANIFEST).write_text(manifest_json, encoding="utf-8")
+    return EmbeddingSnapshotExportResult(
+        path=str(target), manifest=manifest, missing_point_ids=missing
+    )
+
+
+def _resolve_import_point_ids(
+    db: Session,
+    adapter: ActianVectorStoreAdapter,
+    rows: list[EmbeddingSnapshotRow],
+    *,
+    embedding_version: str,
+    next_free: int,
+) -> tuple[list[int], int]:
+    """Keep each user's existing point in the target collection, else the snapshot's point ID
+    unless another user holds it there, else allocate a fresh one."""
+
+    existing = {
+        row.user_id: int(row.point_id)
+        for row in list_user_vector_point_ids_for_users(
+            db,
+            user_ids=[row.user_id for row in rows],
+            provider=adapter.provider,
+            collection_name=adapter.collection_name,
+            embedding_version=embedding_version,
+        )
+    }
+    holders = {
+        int(row.point_id): row.user_id
+        for row in list_user_vector_point_ids_by_points(
+            db,
+            provider=adapter.provider,
+            collection_name=adapter.collection_name,
+            point_ids=[row.point_id for row in rows],
+        )
+    }
+    resolved: list[int] = []
+    for row in rows:
+        point_id = existing.get(row.user_id)
+        if point_id is None:
+            holder = holders.get(row.point_id)
+            if holder is None or holder == row.user_id:
+                point_id = row.point_id
+            else:
+                point_id = next_free
+                next_free += 1
+        resolved.append(point_id)
+    return resolved, next_free
+
+
+def import_embedding_snapshot(
+    db: Session,
+    adapter: ActianVectorStoreAdapter,
+    path: str | Path,
+    *,
+    chunk_size: int | None = None,
+) -> EmbeddingSnapshotImportResult:
+    """Stream a snapshot into the adapter's collection via `batch_upsert` and the mapping table.
+
+    Vectors go in as stored, so no profile build or embedding call is needed. Mappings are
+    written per chunk under the adapter's collection with the snapshot's content hash and model,
+    so later incremental re-embeds skip unchanged users.
+    """
+
+    size = max(1, chunk_size or adapter._config.batch_upsert_size)
+    imported = skipped = reassigned = chunks = 0
+    with EmbeddingSnapshotReader(path) as reader:
+        manifest = reader.manifest
+        expected = adapter._config.dimension
+        if expected and manifest.count and expected != manifest.dimension:
+            raise ValueError(
+                f"Snapshot dimension {manifest.dimension} does not match collection dimension "
+                f"{expected}"
+            )
+        snapshot_max = reader.max_point_id()
+        next_free = max(adapter._next_point_id(), (snapshot_max or 0) + 1)
+
+        for rows in reader.iter_chunks(size):
+            chunk_user_ids = [row.user_id for row in rows]
+            known = set(db.scalars(select(User.id).where(User.id.in_(chunk_user_ids))))
+            present = [row for row in rows if row.user_id in known]
+            skipped += len(rows) - len(present)
+            if not present:
+                continue
+            point_ids, next_free = _resolve_import_point_ids(
+                db,
+                adapter,
+                present,
+                embedding_version=manifest.embedding_version,
+                next_free=next_free,
+            )
+            adapter.upsert_points(
+                [
+                    {"id": point_id, "vector": row.vector, "payload": row.payload}
+                    for row, point_id in zip(present, point_ids, strict=True)
+                ]
+            )
+            upsert_user_vector_point_ids_bulk(
+                db,
+                provider=adapter.provider,
+                embedding_version=manifest.embedding_version,
+                rows=[
+                    {
+                        "user_id": row.user_id,
+                        "collection_name": adapter.collection_name,
+                        "point_id": point_id,
+                        "source_content_hash": row.source_content_hash,
+                        "embedding_model": row.embedding_model,
+                        "vector_dimension": manifest.dimension,
+                    }
+                    for row, point_id in zip(present, point_ids, strict=True)
+                ],
+            )
+            reassigned += sum(
+                1
+                for row, point_id in zip(present, point_ids, strict=True)
+                if point_id != row.point_id
+            )
+            imported += len(present)
+            chunks += 1
+    adapter.flush()
+    return EmbeddingSnapshotImportResult(
+        imported=imported,
+        chunks=chunks,
+        skipped_missing_users=skipped,
+        reassigned_point_ids=reassigned,
+    )
+
+
+__all__ = [
+    "EmbeddingSnapshotExportResult",
+    "EmbeddingSnapshotImportResult",
+    "EmbeddingSnapshotManifest",
+    "EmbeddingSnapshotReader",
+    "EmbeddingSnapshotRow",
+    "export_embedding_snapshot",
+    "import_embedding_snapshot",
+]
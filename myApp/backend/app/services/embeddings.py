@@ -1,21 +1,35 @@
 from __future__ import annotations
 
 import hashlib
-from dataclasses import dataclass
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Protocol
 from uuid import UUID
 
 from sqlalchemy.orm import Session
 
-from app.schemas.vector_store import UserProfileEmbeddingRecord, UserProfileVectorMetadata
+from app.core.config import Settings
+from app.crud.vector_index import list_user_vector_point_ids_for_users
+from app.schemas.vector_store import (
+    UserProfileEmbeddingRecord,
+    UserProfileVectorMetadata,
+    coerce_float32_vector,
+)
+from app.services.hashing_embedder import load_hashing_embedder
 from app.services.preference_profile_builder import (
     PREFERENCE_PROFILE_EMBEDDING_VERSION,
-    PreferenceProfile,
-    build_preference_profile,
+    PreferenceProfileEmbeddingInput,
+    source_content_hash,
 )
+from app.services.preference_profile_cache import get_preference_profile_embedding_inputs_batch
 from app.services.vector_store import VectorStoreAdapter, user_profile_embedding_record_id
 
+try:
+    import numpy as np  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    np = None  # type: ignore[assignment]
 
 USER_PROFILE_EMBEDDING_VERSION = "user_profile_embed_v1"
 FAKE_EMBEDDING_MODEL = "fake-deterministic-embedding-v1"
@@ -28,6 +42,44 @@ class EmbeddingProvider(Protocol):
         ...
 
 
+class BatchEmbeddingProvider(EmbeddingProvider, Protocol):
+    def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        ...
+
+
+# Thread count for the `embed_texts` fallback on providers that only embed one text at a time.
+DEFAULT_EMBED_WORKERS = 8
+
+
+def embed_texts(
+    embedder: EmbeddingProvider,
+    texts: list[str],
+    *,
+    max_workers: int = DEFAULT_EMBED_WORKERS,
+) -> list[list[float]]:
+    """Embed many texts, using the provider's `embed_texts` when it has one.
+
+    Providers with only `embed_text` are fanned out over a thread pool (network-bound providers
+    release the GIL while waiting). Output order matches `texts`.
+    """
+
+    if not texts:
+        return []
+    batch = getattr(embedder, "embed_texts", None)
+    if batch is not None:
+        return list(batch(texts))
+    workers = max(1, min(max_workers, len(texts)))
+    if workers == 1:
+        return [embedder.embed_text(text) for text in texts]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(embedder.embed_text, texts))
+
+
+# 8 big-endian uint32 words per SHA-256 digest.
+_FAKE_WORDS_PER_DIGEST = 8
+_FAKE_DIGEST_WORDS = struct.Struct(">8I")
+
+
 @dataclass(frozen=True)
 class FakeEmbedder:
     """Deterministic fake embedder for pipeline development and tests.
@@ -38,26 +90,53 @@ class FakeEmbedder:
     dimension: int = 16
     model_name: str = FAKE_EMBEDDING_MODEL
 
+    def _digests(self, text: str) -> bytes:
+        # sha256(seed + counter) for counter = 0..n; hash the seed once and copy the state.
+        base = hashlib.sha256(text.encode("utf-8"))
+        blocks = -(-self.dimension // _FAKE_WORDS_PER_DIGEST)
+        parts: list[bytes] = []
+        for counter in range(blocks):
+            h = base.copy()
+            h.update(counter.to_bytes(4, "big"))
+            parts.append(h.digest())
+        return b"".join(parts)
+
     def embed_text(self, text: str) -> list[float]:
         if self.dimension <= 0:
             raise ValueError("FakeEmbedder dimension must be > 0")
 
-        seed = text.encode("utf-8")
+        raw = self._digests(text)
         floats: list[float] = []
-        counter = 0
-        while len(floats) < self.dimension:
-            digest = hashlib.sha256(seed + counter.to_bytes(4, "big")).digest()
-            counter += 1
-            for i in range(0, len(digest), 4):
-                chunk = digest[i : i + 4]
-                if len(chunk) < 4:
-                    continue
-                value = int.from_bytes(chunk, "big", signed=False)
+        for offset in range(0, len(raw), _FAKE_DIGEST_WORDS.size):
+            for value in _FAKE_DIGEST_WORDS.unpack_from(raw, offset):
                 # Map into [-1.0, 1.0] deterministically.
                 floats.append((value / 0xFFFFFFFF) * 2.0 - 1.0)
-                if len(floats) >= self.dimension:
-                    break
-        return floats
+        return floats[: self.dimension]
+
+    def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        if self.dimension <= 0:
+            raise ValueError("FakeEmbedder dimension must be > 0")
+        if np is None:
+            return [self.embed_text(text) for text in texts]
+        if not texts:
+            return []
+
+        # Hashing stays per text; the uint32 -> float mapping runs once over the whole batch and
+        # produces the same float64 values as `embed_text`.
+        words = np.frombuffer(b"".join(self._digests(text) for text in texts), dtype=">u4")
+        matrix = words.reshape(len(texts), -1)[:, : self.dimension].astype(np.float64)
+        matrix /= 0xFFFFFFFF
+        matrix *= 2.0
+        matrix -= 1.0
+        return matrix.tolist()
+
+
+def build_embedder(settings: Settings, *, dimension: int) -> EmbeddingProvider:
+    """The embedder selected by `EMBEDDING_PROVIDER`, producing `dimension`-sized vectors."""
+
+    if settings.embedding_provider == "hashing":
+        return load_hashing_embedder(settings.embedding_hashing_idf_path, dimension=dimension)
+    return FakeEmbedder(dimension=dimension)
 
 
 @dataclass(frozen=True)
@@ -71,22 +150,45 @@ class UserProfileEmbeddingUpsertResult:
     vector_dimension: int
 
 
-def source_content_hash(text: str) -> str:
-    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
-    return f"sha256:{digest}"
+@dataclass(frozen=True)
+class UserProfileEmbeddingFailure:
+    user_id: UUID
+    error: str
+
+
+@dataclass
+class UserProfileEmbeddingBatchReport:
+    results: list[UserProfileEmbeddingUpsertResult] = field(default_factory=list)
+    skipped_user_ids: list[UUID] = field(default_factory=list)
+    failures: list[UserProfileEmbeddingFailure] = field(default_factory=list)
+
+    @property
+    def embedded_count(self) -> int:
+        return len(self.results)
+
+    @property
+    def skipped_count(self) -> int:
+        return len(self.skipped_user_ids)
+
+    @property
+    def failed_count(self) -> int:
+        return len(self.failures)
 
 
-def _vector_metadata_from_profile(profile: PreferenceProfile) -> UserProfileVectorMetadata:
-    return UserProfileVectorMetadata(
+def _vector_metadata_from_profile(
+    profile: PreferenceProfileEmbeddingInput,
+) -> UserProfileVectorMetadata:
+    # Profile fields are already normalized by the builder, so skip re-validation.
+    return UserProfileVectorMetadata.model_construct(
         discoverable=profile.metadata.discoverable,
         open_to_meetups=profile.metadata.open_to_meetups,
         neighborhood=profile.metadata.neighborhood,
         geohash=profile.metadata.geohash,
         budget_min=profile.metadata.budget_min,
         budget_max=profile.metadata.budget_max,
-        hobbies=profile.features.hobbies,
-        diet_tags=profile.features.diet_tags,
-        vibe_tags=profile.features.vibe_tags,
+        hobbies=profile.hobbies,
+        diet_tags=profile.diet_tags,
+        vibe_tags=profile.vibe_tags,
     )
 
 
@@ -97,19 +199,34 @@ def build_user_profile_embedding_record(
     embedder: EmbeddingProvider,
     embedding_version: str = USER_PROFILE_EMBEDDING_VERSION,
 ) -> UserProfileEmbeddingRecord:
-    profile = build_preference_profile(db, user_id)
-    text = profile.text_for_embedding
-    vector = embedder.embed_text(text)
-    now = datetime.now(timezone.utc)
+    [profile] = get_preference_profile_embedding_inputs_batch(db, [user_id])
+    return _embedding_record_from_profile(
+        profile,
+        vector=embedder.embed_text(profile.text_for_embedding),
+        embedding_model=embedder.model_name,
+        embedding_version=embedding_version,
+        now=datetime.now(timezone.utc),
+    )
+
 
-    return UserProfileEmbeddingRecord(
+def _embedding_record_from_profile(
+    profile: PreferenceProfileEmbeddingInput,
+    *,
+    vector: list[float],
+    embedding_model: str,
+    embedding_version: str,
+    now: datetime,
+) -> UserProfileEmbeddingRecord:
+    # Internally built record: every field is produced by trusted code, so use `model_construct`
+    # and only coerce the vector into its compact float32 form.
+    return UserProfileEmbeddingRecord.model_construct(
         id=user_profile_embedding_record_id(profile.user_id, embedding_version),
         user_id=str(profile.user_id),
-        vector=vector,
+        vector=coerce_float32_vector(vector),
         embedding_version=embedding_version,
-        embedding_model=embedder.model_name,
+        embedding_model=embedding_model,
         preference_profile_version=profile.embedding_version,
-        source_content_hash=source_content_hash(text),
+        source_content_hash=profile.content_hash,
         metadata=_vector_metadata_from_profile(profile),
         created_at=now,
         updated_at=now,
@@ -150,43 +267,150 @@ def upsert_user_profile_embeddings_batch(
     embedder: EmbeddingProvider,
     embedding_version: str = USER_PROFILE_EMBEDDING_VERSION,
 ) -> list[UserProfileEmbeddingUpsertResult]:
-    records: list[UserProfileEmbeddingRecord] = []
-    for user_id in user_ids:
-        records.append(
-            build_user_profile_embedding_record(
-                db,
-                user_id=user_id,
-                embedder=embedder,
-                embedding_version=embedding_version,
-            )
+    now = datetime.now(timezone.utc)
+    profiles = get_preference_profile_embedding_inputs_batch(db, user_ids)
+    vectors = embed_texts(embedder, [profile.text_for_embedding for profile in profiles])
+    records = [
+        _embedding_record_from_profile(
+            profile,
+            vector=vector,
+            embedding_model=embedder.model_name,
+            embedding_version=embedding_version,
+            now=now,
         )
+        for profile, vector in zip(profiles, vectors, strict=True)
+    ]
 
     if records:
         vector_store.upsert_user_profile_embeddings(records)
 
-    return [
-        UserProfileEmbeddingUpsertResult(
-            user_id=UUID(record.user_id),
-            record_id=record.id,
-            embedding_version=record.embedding_version,
-            embedding_model=record.embedding_model,
-            preference_profile_version=record.preference_profile_version,
-            source_content_hash=record.source_content_hash,
-            vector_dimension=len(record.vector),
+    return [_upsert_result_from_record(record) for record in records]
+
+
+def _upsert_result_from_record(
+    record: UserProfileEmbeddingRecord,
+) -> UserProfileEmbeddingUpsertResult:
+    return UserProfileEmbeddingUpsertResult(
+        user_id=UUID(record.user_id),
+        record_id=record.id,
+        embedding_version=record.embedding_version,
+        embedding_model=record.embedding_model,
+        preference_profile_version=record.preference_profile_version,
+        source_content_hash=record.source_content_hash,
+        vector_dimension=len(record.vector),
+    )
+
+
+def _stored_content_state(
+    db: Session,
+    *,
+    vector_store: VectorStoreAdapter,
+    user_ids: list[UUID],
+    embedding_version: str,
+) -> dict[UUID, tuple[str | None, str | None, int | None]]:
+    provider = getattr(vector_store, "provider", None)
+    if provider is None:
+        return {}
+    rows = list_user_vector_point_ids_for_users(
+        db,
+        user_ids=user_ids,
+        provider=provider,
+        collection_name=getattr(vector_store, "collection_name", None),
+        embedding_version=embedding_version,
+    )
+    return {
+        row.user_id: (row.source_content_hash, row.embedding_model, row.vector_dimension)
+        for row in rows
+    }
+
+
+def sync_user_profile_embeddings_batch(
+    db: Session,
+    *,
+    user_ids: list[UUID],
+    vector_store: VectorStoreAdapter,
+    embedder: EmbeddingProvider,
+    embedding_version: str = USER_PROFILE_EMBEDDING_VERSION,
+    skip_unchanged: bool = True,
+) -> UserProfileEmbeddingBatchReport:
+    """Incremental variant of `upsert_user_profile_embeddings_batch`.
+
+    Profile text is built first; users whose stored mapping already has the same content hash,
+    embedding model and vector dimension are skipped without embedding or uploading. Per-user
+    embedding errors are collected in the report instead of aborting the batch. Remote upsert
+    errors still propagate.
+    """
+
+    report = UserProfileEmbeddingBatchReport()
+    profiles = get_preference_profile_embedding_inputs_batch(db, list(dict.fromkeys(user_ids)))
+    stored = (
+        _stored_content_state(
+            db,
+            vector_store=vector_store,
+            user_ids=[profile.user_id for profile in profiles],
+            embedding_version=embedding_version,
         )
-        for record in records
+        if skip_unchanged
+        else {}
+    )
+
+    # Dimension is part of the key: the same model name can be configured at another size.
+    signature = (embedder.model_name, getattr(embedder, "dimension", None))
+    pending: list[PreferenceProfileEmbeddingInput] = []
+    for profile in profiles:
+        if stored.get(profile.user_id) == (profile.content_hash, *signature):
+            report.skipped_user_ids.append(profile.user_id)
+        else:
+            pending.append(profile)
+
+    embedded: list[tuple[PreferenceProfileEmbeddingInput, list[float]]] = []
+    try:
+        vectors = embed_texts(embedder, [profile.text_for_embedding for profile in pending])
+        embedded = list(zip(pending, vectors, strict=True))
+    except Exception:
+        # Retry one by one so a single bad input doesn't fail the whole batch.
+        for profile in pending:
+            try:
+                embedded.append((profile, embedder.embed_text(profile.text_for_embedding)))
+            except Exception as exc:
+                report.failures.append(
+                    UserProfileEmbeddingFailure(user_id=profile.user_id, error=str(exc))
+                )
+
+    now = datetime.now(timezone.utc)
+    records = [
+        _embedding_record_from_profile(
+            profile,
+            vector=vector,
+            embedding_model=embedder.model_name,
+            embedding_version=embedding_version,
+            now=now,
+        )
+        for profile, vector in embedded
     ]
 
+    if records:
+        vector_store.upsert_user_profile_embeddings(records)
+    report.results = [_upsert_result_from_record(record) for record in records]
+    return report
+
 
 __all__ = [
+    "BatchEmbeddingProvider",
+    "DEFAULT_EMBED_WORKERS",
     "EmbeddingProvider",
     "FakeEmbedder",
     "FAKE_EMBEDDING_MODEL",
     "PREFERENCE_PROFILE_EMBEDDING_VERSION",
     "USER_PROFILE_EMBEDDING_VERSION",
+    "UserProfileEmbeddingBatchReport",
+    "UserProfileEmbeddingFailure",
     "UserProfileEmbeddingUpsertResult",
+    "build_embedder",
     "build_user_profile_embedding_record",
+    "embed_texts",
     "source_content_hash",
+    "sync_user_profile_embeddings_batch",
     "upsert_user_profile_embedding",
     "upsert_user_profile_embeddings_batch",
 ]
@@ -1,10 +1,199 @@
-from math import asin, cos, radians, sin, sqrt
+from __future__ import annotations
+
+from collections.abc import Sequence
+from math import asin, atan2, cos, degrees, radians, sin, sqrt
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    np = None  # type: ignore[assignment]
+
+EARTH_RADIUS_KM = 6371.0
+# Shortest length of one degree of latitude (at the equator), so cell heights are never overstated.
+_KM_PER_DEGREE_LAT = 110.574
+_KM_PER_DEGREE_LON_EQUATOR = 111.320
+_MAX_GEOHASH_PRECISION = 12
+
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+_GEOHASH_INDEX = {char: index for index, char in enumerate(GEOHASH_ALPHABET)}
 
 
 def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    earth_radius_km = 6371.0
     d_lat = radians(lat2 - lat1)
     d_lon = radians(lon2 - lon1)
     a = sin(d_lat / 2) ** 2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(d_lon / 2) ** 2
     c = 2 * asin(sqrt(a))
-    return earth_radius_km * c
+    return EARTH_RADIUS_KM * c
+
+
+def haversine_km_many(
+    lat: float, lon: float, lats: Sequence[float], lons: Sequence[float]
+) -> list[float]:
+    """Distances from one point to many, in a single vectorized pass when NumPy is available."""
+
+    if np is None:
+        return [haversine_km(lat, lon, lat2, lon2) for lat2, lon2 in zip(lats, lons, strict=True)]
+    lat_r = np.radians(np.asarray(lats, dtype=np.float64))
+    lon_r = np.radians(np.asarray(lons, dtype=np.float64))
+    origin_lat = radians(lat)
+    a = (
+        np.sin((lat_r - origin_lat) / 2) ** 2
+        + cos(origin_lat) * np.cos(lat_r) * np.sin((lon_r - radians(lon)) / 2) ** 2
+    )
+    return (2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))).tolist()
+
+
+def spherical_centroid(points: Sequence[tuple[float, float]]) -> tuple[float, float]:
+    """Center of `(latitude, longitude)` points via their mean unit vector (antimeridian-safe)."""
+
+    if not points:
+        raise ValueError("Cannot take the centroid of no points")
+    x = y = z = 0.0
+    for latitude, longitude in points:
+        lat_r, lon_r = radians(latitude), radians(longitude)
+        x += cos(lat_r) * cos(lon_r)
+        y += cos(lat_r) * sin(lon_r)
+        z += sin(lat_r)
+    return degrees(atan2(z, sqrt(x * x + y * y))), degrees(atan2(y, x))
+
+
+def encode_geohash(latitude: float, longitude: float, precision: int = 9) -> str:
+    if not -90.0 <= latitude <= 90.0 or not -180.0 <= longitude <= 180.0:
+        raise ValueError(f"Invalid coordinates: ({latitude}, {longitude})")
+    if not 1 <= precision <= _MAX_GEOHASH_PRECISION:
+        raise ValueError(f"Geohash precision must be between 1 and {_MAX_GEOHASH_PRECISION}")
+    lat_lo, lat_hi = -90.0, 90.0
+    lon_lo, lon_hi = -180.0, 180.0
+    chars: list[str] = []
+    bits = 0
+    value = 0
+    even = True  # Bits alternate longitude, latitude, starting with longitude.
+    while len(chars) < precision:
+        if even:
+            mid = (lon_lo + lon_hi) / 2
+            if longitude >= mid:
+                value = (value << 1) | 1
+                lon_lo = mid
+            else:
+                value <<= 1
+                lon_hi = mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if latitude >= mid:
+                value = (value << 1) | 1
+                lat_lo = mid
+            else:
+                value <<= 1
+                lat_hi = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(GEOHASH_ALPHABET[value])
+            bits = 0
+            value = 0
+    return "".join(chars)
+
+
+def geohash_bounds(geohash: str) -> tuple[float, float, float, float]:
+    """`(lat_min, lat_max, lon_min, lon_max)` of a geohash cell."""
+
+    if not geohash:
+        raise ValueError("Geohash must not be empty")
+    lat_lo, lat_hi = -90.0, 90.0
+    lon_lo, lon_hi = -180.0, 180.0
+    even = True
+    for char in geohash.lower():
+        index = _GEOHASH_INDEX.get(char)
+        if index is None:
+            raise ValueError(f"Invalid geohash character {char!r} in {geohash!r}")
+        for shift in range(4, -1, -1):
+            bit = (index >> shift) & 1
+            if even:
+                mid = (lon_lo + lon_hi) / 2
+                lon_lo, lon_hi = (mid, lon_hi) if bit else (lon_lo, mid)
+            else:
+                mid = (lat_lo + lat_hi) / 2
+                lat_lo, lat_hi = (mid, lat_hi) if bit else (lat_lo, mid)
+            even = not even
+    return lat_lo, lat_hi, lon_lo, lon_hi
+
+
+def decode_geohash(geohash: str) -> tuple[float, float]:
+    """Center `(latitude, longitude)` of a geohash cell."""
+
+    lat_lo, lat_hi, lon_lo, lon_hi = geohash_bounds(geohash)
+    return (lat_lo + lat_hi) / 2, (lon_lo + lon_hi) / 2
+
+
+def geohash_neighbors(geohash: str) -> list[str]:
+    """The (up to) eight cells around `geohash` at the same precision; none past the poles."""
+
+    lat_lo, lat_hi, lon_lo, lon_hi = geohash_bounds(geohash)
+    height, width = lat_hi - lat_lo, lon_hi - lon_lo
+    center_lat, center_lon = (lat_lo + lat_hi) / 2, (lon_lo + lon_hi) / 2
+    neighbors: list[str] = []
+    for d_lat in (1, 0, -1):
+        lat = center_lat + d_lat * height
+        if not -90.0 < lat < 90.0:
+            continue
+        for d_lon in (-1, 0, 1):
+            if d_lat == 0 and d_lon == 0:
+                continue
+            lon = (center_lon + d_lon * width + 180.0) % 360.0 - 180.0
+            cell = encode_geohash(lat, lon, len(geohash))
+            if cell != geohash and cell not in neighbors:
+                neighbors.append(cell)
+    return neighbors
+
+
+def _cell_size_km(precision: int, latitude: float) -> tuple[float, float]:
+    lon_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    height = 180.0 / (1 << lat_bits) * _KM_PER_DEGREE_LAT
+    width = 360.0 / (1 << lon_bits) * _KM_PER_DEGREE_LON_EQUATOR * cos(radians(latitude))
+    return height, width
+
+
+def geohash_precision_for_radius(latitude: float, radius_km: float) -> int:
+    """Longest precision whose cells are at least `radius_km` on each side near `latitude`.
+
+    With such cells the 3x3 block around the center cell covers the whole search circle. Returns 0
+    when even single-character cells are too small, which means "scan everything".
+    """
+
+    # Cells are narrowest on the poleward edge of the circle.
+    edge_latitude = min(90.0, abs(latitude) + radius_km / _KM_PER_DEGREE_LAT)
+    for precision in range(_MAX_GEOHASH_PRECISION, 0, -1):
+        height, width = _cell_size_km(precision, edge_latitude)
+        if height >= radius_km and width >= radius_km:
+            return precision
+    return 0
+
+
+def _prefix_upper_bound(prefix: str) -> str | None:
+    # Smallest string above every string that starts with `prefix`, in geohash alphabet order.
+    chars = list(prefix)
+    while chars:
+        index = _GEOHASH_INDEX[chars[-1]]
+        if index + 1 < len(GEOHASH_ALPHABET):
+            chars[-1] = GEOHASH_ALPHABET[index + 1]
+            return "".join(chars)
+        chars.pop()
+    return None
+
+
+def geohash_prefix_ranges(
+    latitude: float, longitude: float, radius_km: float
+) -> list[tuple[str, str | None]]:
+    """Half-open `[low, high)` geohash ranges (3x3 cells) covering a `radius_km` circle.
+
+    Each range is one index range scan, `geohash >= low AND geohash < high`; `high` is None when
+    the range is open-ended. The ranges over-cover, so callers refine with `haversine_km`.
+    """
+
+    precision = geohash_precision_for_radius(latitude, radius_km)
+    if precision == 0:
+        return [("", None)]
+    center = encode_geohash(latitude, longitude, precision)
+    cells = sorted({center, *geohash_neighbors(center)})
+    return [(cell, _prefix_upper_bound(cell)) for cell in cells]
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from collections import Counter
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from itertools import combinations
 from uuid import UUID
 
@@ -9,7 +9,9 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.crud import restaurant as crud_restaurant
 from app.crud import social as crud_social
+from app.crud.group_match import sync_member_inbox_activity
 from app.models.group_match import GroupMatch, GroupMatchMember, GroupMatchVenue
 from app.models.restaurant import Restaurant
 from app.models.restaurant_rating import RestaurantRating
@@ -22,14 +24,29 @@ from app.schemas.group_match_generation import (
 )
 from app.schemas.vector_store import UserProfileVectorQuery
 from app.services.actian_vector_store import ActianVectorStoreAdapter, ActianVectorStoreConfig
-from app.services.embeddings import (
-    USER_PROFILE_EMBEDDING_VERSION,
-    FakeEmbedder,
-    build_user_profile_embedding_record,
-)
+from app.services.embedding_cache import cached_embedder
+from app.services.embedding_migration import resolve_serving_embedding_target
+from app.services.embeddings import build_embedder, build_user_profile_embedding_record
+from app.services.geo import decode_geohash, haversine_km_many, spherical_centroid
+from app.services.hobby_index import hobby_bitsets, hobby_index
+from app.services.restaurant_spatial_index import restaurant_index_for_regions
 
 ACTIVE_GROUP_STATUSES = ("forming", "confirmed", "scheduled")
 ACTIVE_MEMBER_STATUSES = ("invited", "accepted")
+# One point of venue affinity (a member who likes the cuisine) is worth this much extra travel.
+VENUE_KM_PER_AFFINITY_POINT = 2.0
+
+
+@dataclass(frozen=True)
+class ProposedVenue:
+    restaurant_id: int
+    name: str
+    address: str | None
+    latitude: float
+    longitude: float
+    max_travel_km: float
+    liked_by_members: int
+    cuisine_matches: int
 
 
 @dataclass
@@ -40,6 +57,7 @@ class ProposedGroup:
     mode: str
     score_summary: GroupMatchGenerateScoreSummary
     group_match_id: UUID | None = None
+    venue: ProposedVenue | None = None
 
 
 @dataclass(frozen=True)
@@ -52,8 +70,17 @@ def _normalized_neighborhood(value: str | None) -> str:
     return (value or "").strip().lower()
 
 
-def _pair_overlap_count(hobbies_a: set[str], hobbies_b: set[str]) -> int:
-    return len(hobbies_a.intersection(hobbies_b))
+def _pair_overlap_count(hobbies_a: int, hobbies_b: int) -> int:
+    # Hobby sets are bitsets, so overlap is a single AND + popcount.
+    return (hobbies_a & hobbies_b).bit_count()
+
+
+def _get_user_hobby_bits(db: Session, user_ids: list[UUID]) -> dict[UUID, int]:
+    if hobby_index.ready:
+        bits = {user_id: hobby_index.hobby_bits(user_id) for user_id in user_ids}
+        if all(value is not None for value in bits.values()):
+            return bits  # type: ignore[return-value]
+    return hobby_bitsets(crud_social.get_user_hobby_codes_map(db, user_ids))
 
 
 def _pair_rating_affinity_score(left: UserRatingSignals, right: UserRatingSignals) -> int:
@@ -106,11 +133,11 @@ def _candidate_score(
     candidate: User,
     current_group: list[User],
     *,
-    hobby_map: dict[UUID, list[str]],
+    hobby_bits: dict[UUID, int],
     rating_signal_map: dict[UUID, UserRatingSignals],
     same_neighborhood_preferred: bool,
 ) -> tuple[int, int, int, int]:
-    candidate_hobbies = set(hobby_map.get(candidate.id, []))
+    candidate_hobbies = hobby_bits.get(candidate.id, 0)
     candidate_rating_signals = rating_signal_map.get(
         candidate.id,
         UserRatingSignals(frozenset(), frozenset()),
@@ -119,7 +146,7 @@ def _candidate_score(
     same_neighborhood_pairs = 0
     rating_affinity_total = 0
     for member in current_group:
-        member_hobbies = set(hobby_map.get(member.id, []))
+        member_hobbies = hobby_bits.get(member.id, 0)
         pair_overlap_total += _pair_overlap_count(candidate_hobbies, member_hobbies)
         member_rating_signals = rating_signal_map.get(
             member.id,
@@ -152,17 +179,23 @@ def _vector_hybrid_anchor_similarity_scores(
         return {}
 
     try:
-        cfg = ActianVectorStoreConfig.from_settings(settings)
-        dimension = cfg.dimension
+        # Follows embedding version migrations: reads switch only at cut-over.
+        target = resolve_serving_embedding_target(db, settings=settings)
+        dimension = target.dimension
         if dimension is None or dimension <= 0:
             return {}
+        cfg = replace(
+            ActianVectorStoreConfig.from_settings(settings),
+            collection_name=target.collection_name,
+            dimension=dimension,
+        )
 
-        embedder = FakeEmbedder(dimension=dimension)
+        embedder = cached_embedder(build_embedder(settings, dimension=dimension), settings)
         anchor_record = build_user_profile_embedding_record(
             db,
             user_id=anchor.id,
             embedder=embedder,
-            embedding_version=USER_PROFILE_EMBEDDING_VERSION,
+            embedding_version=target.embedding_version,
         )
         adapter = ActianVectorStoreAdapter(db=db, config=cfg)
         candidate_ids = {str(c.id) for c in candidate_pool}
@@ -170,7 +203,7 @@ def _vector_hybrid_anchor_similarity_scores(
             UserProfileVectorQuery(
                 query_vector=anchor_record.vector,
                 top_k=max(20, min(200, len(candidate_pool) * 3)),
-                embedding_version=USER_PROFILE_EMBEDDING_VERSION,
+                embedding_version=target.embedding_version,
                 exclude_user_ids=[str(anchor.id)],
             )
         )
@@ -190,13 +223,13 @@ def _vector_hybrid_anchor_similarity_scores(
 def _group_score_summary(
     users: list[User],
     *,
-    hobby_map: dict[UUID, list[str]],
+    hobby_bits: dict[UUID, int],
 ) -> GroupMatchGenerateScoreSummary:
     overlaps: list[int] = []
     same_neighborhood_pairs = 0
     for left, right in combinations(users, 2):
-        left_hobbies = set(hobby_map.get(left.id, []))
-        right_hobbies = set(hobby_map.get(right.id, []))
+        left_hobbies = hobby_bits.get(left.id, 0)
+        right_hobbies = hobby_bits.get(right.id, 0)
         overlaps.append(_pair_overlap_count(left_hobbies, right_hobbies))
         if _normalized_neighborhood(left.neighborhood) and (
             _normalized_neighborhood(left.neighborhood) == _normalized_neighborhood(right.neighborhood)
@@ -232,7 +265,8 @@ def _eligible_users_for_mode(db: Session, mode: str) -> list[User]:
     return list(db.scalars(stmt).all())
 
 
-def _choose_venue_name(group_users: list[User], *, mode: str) -> str | None:
+def _fallback_venue_name(group_users: list[User], *, mode: str) -> str | None:
+    # Used when no member has a location or no restaurant is close enough to them.
     if mode == "chat_only":
         return None
     neighborhoods = [u.neighborhood for u in group_users if (u.neighborhood or "").strip()]
@@ -241,22 +275,155 @@ def _choose_venue_name(group_users: list[User], *, mode: str) -> str | None:
     return "Proximity Meetup Spot"
 
 
+def _member_locations(group_users: list[User]) -> list[tuple[float, float]]:
+    locations: list[tuple[float, float]] = []
+    for user in group_users:
+        try:
+            locations.append(decode_geohash(user.geohash or ""))
+        except ValueError:
+            continue
+    return locations
+
+
+def _score_venue(
+    restaurant: Restaurant,
+    *,
+    member_locations: list[tuple[float, float]],
+    member_signals: list[UserRatingSignals],
+) -> ProposedVenue:
+    travel_km = haversine_km_many(
+        restaurant.latitude,
+        restaurant.longitude,
+        [lat for lat, _lon in member_locations],
+        [lon for _lat, lon in member_locations],
+    )
+    cuisine = (restaurant.cuisine or "").strip().lower()
+    return ProposedVenue(
+        restaurant_id=restaurant.id,
+        name=restaurant.name,
+        address=restaurant.address,
+        latitude=restaurant.latitude,
+        longitude=restaurant.longitude,
+        max_travel_km=round(max(travel_km), 3),
+        liked_by_members=sum(restaurant.id in s.liked_restaurant_ids for s in member_signals),
+        cuisine_matches=sum(bool(cuisine) and cuisine in s.liked_cuisines for s in member_signals),
+    )
+
+
+def _venue_rank(venue: ProposedVenue) -> tuple[float, float, int]:
+    # Liked restaurants count double, like in `_pair_rating_affinity_score`.
+    affinity = 2 * venue.liked_by_members + venue.cuisine_matches
+    return (
+        affinity - venue.max_travel_km / VENUE_KM_PER_AFFINITY_POINT,
+        -venue.max_travel_km,
+        -venue.restaurant_id,
+    )
+
+
+def _choose_venues(
+    db: Session,
+    proposed: list[ProposedGroup],
+    *,
+    users_by_id: dict[UUID, User],
+    rating_signal_map: dict[UUID, UserRatingSignals],
+) -> None:
+    """Pick a nearby restaurant for every in-person group that has located members.
+
+    Candidates are the restaurants closest to the members' centroid, searched out to the venue
+    radius or the group's own spread, whichever is larger. They are ranked by the group's rating
+    signals (members who liked the restaurant or its cuisine) against the farthest member's travel
+    distance. The spatial lookups for the whole run share one index and the candidate rows are
+    hydrated with one query.
+    """
+
+    searches: list[tuple[ProposedGroup, list[tuple[float, float]], float, float, float]] = []
+    for item in proposed:
+        if item.mode != "in_person":
+            continue
+        locations = _member_locations([users_by_id[user_id] for user_id in item.member_ids])
+        if not locations:
+            continue
+        latitude, longitude = spherical_centroid(locations)
+        spread_km = max(
+            haversine_km_many(
+                latitude, longitude, [lat for lat, _ in locations], [lon for _, lon in locations]
+            )
+        )
+        radius_km = max(settings.group_venue_search_radius_km, spread_km)
+        searches.append((item, locations, latitude, longitude, radius_km))
+    if not searches:
+        return
+
+    index = restaurant_index_for_regions(
+        db, [(latitude, longitude, radius) for _, _, latitude, longitude, radius in searches]
+    )
+    candidate_ids = [
+        [
+            restaurant_id
+            for restaurant_id, _distance in index.nearest(
+                latitude,
+                longitude,
+                limit=settings.group_venue_candidate_limit,
+                radius_km=radius_km,
+            )
+        ]
+        for _item, _locations, latitude, longitude, radius_km in searches
+    ]
+    restaurants = crud_restaurant.get_restaurants_by_ids(
+        db, sorted({rid for ids in candidate_ids for rid in ids})
+    )
+
+    for (item, locations, *_), ids in zip(searches, candidate_ids, strict=True):
+        member_signals = [
+            rating_signal_map.get(user_id, UserRatingSignals(frozenset(), frozenset()))
+            for user_id in item.member_ids
+        ]
+        venues = [
+            _score_venue(
+                restaurants[rid], member_locations=locations, member_signals=member_signals
+            )
+            for rid in ids
+            if rid in restaurants
+        ]
+        if venues:
+            item.venue = max(venues, key=_venue_rank)
+            item.venue_name = item.venue.name
+
+
+def _nearby_user_ids(db: Session, anchor: User, *, radius_km: float) -> set[UUID]:
+    try:
+        latitude, longitude = decode_geohash(anchor.geohash or "")
+    except ValueError:
+        return set()
+    return set(
+        crud_social.get_nearby_user_distances(
+            db, latitude=latitude, longitude=longitude, radius_km=radius_km
+        )
+    )
+
+
 def _propose_groups(
     db: Session,
     users: list[User],
     *,
     request: GroupMatchGenerateRequest,
-    hobby_map: dict[UUID, list[str]],
+    hobby_bits: dict[UUID, int],
     rating_signal_map: dict[UUID, UserRatingSignals],
 ) -> tuple[list[ProposedGroup], int]:
     target_size = request.target_group_size
     remaining = list(users)
     proposed: list[ProposedGroup] = []
 
+    proximity = request.mode == "in_person" and request.max_distance_km is not None
+    skipped_anchors: list[User] = []
+
     while remaining and len(proposed) < request.max_groups:
         anchor = remaining[0]
         group_members = [anchor]
         candidate_pool = remaining[1:]
+        if proximity:
+            nearby = _nearby_user_ids(db, anchor, radius_km=request.max_distance_km)
+            candidate_pool = [c for c in [*candidate_pool, *skipped_anchors] if c.id in nearby]
         vector_score_map = (
             _vector_hybrid_anchor_similarity_scores(db, anchor=anchor, candidate_pool=candidate_pool)
             if request.strategy == "vector_hybrid"
@@ -270,7 +437,7 @@ def _propose_groups(
                     *_candidate_score(
                         c,
                         group_members,
-                        hobby_map=hobby_map,
+                        hobby_bits=hobby_bits,
                         rating_signal_map=rating_signal_map,
                         same_neighborhood_preferred=request.same_neighborhood_preferred,
                     ),
@@ -282,14 +449,19 @@ def _propose_groups(
             group_members.append(best)
 
         if len(group_members) < target_size:
-            # Not enough users left to form another full group.
-            break
+            if not proximity:
+                # Not enough users left to form another full group.
+                break
+            # Not enough users near this anchor; they may still join a later anchor's group.
+            skipped_anchors.append(anchor)
+            remaining = remaining[1:]
+            continue
 
-        summary = _group_score_summary(group_members, hobby_map=hobby_map)
+        summary = _group_score_summary(group_members, hobby_bits=hobby_bits)
         proposed.append(
             ProposedGroup(
                 member_ids=[u.id for u in group_members],
-                venue_name=_choose_venue_name(group_members, mode=request.mode),
+                venue_name=_fallback_venue_name(group_members, mode=request.mode),
                 status="forming",
                 mode=request.mode,
                 score_summary=summary,
@@ -297,8 +469,9 @@ def _propose_groups(
         )
         assigned_ids = {u.id for u in group_members}
         remaining = [u for u in remaining if u.id not in assigned_ids]
+        skipped_anchors = [u for u in skipped_anchors if u.id not in assigned_ids]
 
-    return proposed, len(remaining)
+    return proposed, len(remaining) + len(skipped_anchors)
 
 
 def _persist_proposed_groups(
@@ -325,7 +498,25 @@ def _persist_proposed_groups(
                 )
             )
 
-        if item.venue_name is not None:
+        if item.venue is not None:
+            db.add(
+                GroupMatchVenue(
+                    group_match_id=group.id,
+                    venue_kind="restaurant",
+                    source="internal_restaurants",
+                    restaurant_id=item.venue.restaurant_id,
+                    name_snapshot=item.venue.name,
+                    address_snapshot=item.venue.address,
+                    latitude=item.venue.latitude,
+                    longitude=item.venue.longitude,
+                    metadata_json={
+                        "max_travel_km": item.venue.max_travel_km,
+                        "liked_by_members": item.venue.liked_by_members,
+                        "cuisine_matches": item.venue.cuisine_matches,
+                    },
+                )
+            )
+        elif item.venue_name is not None:
             db.add(
                 GroupMatchVenue(
                     group_match_id=group.id,
@@ -337,6 +528,9 @@ def _persist_proposed_groups(
 
         item.group_match_id = group.id
 
+    # New invites sort into their members' inboxes by the group's creation time.
+    db.flush()
+    sync_member_inbox_activity(db, [item.group_match_id for item in proposed])
     db.commit()
 
 
@@ -349,14 +543,20 @@ def generate_group_matches(db: Session, request: GroupMatchGenerateRequest) -> G
     active_group_user_ids = _active_grouped_user_ids(db)
 
     eligible_pool = [user for user in all_discoverable_in_mode if user.id not in active_group_user_ids]
-    hobby_map = crud_social.get_user_hobby_codes_map(db, [u.id for u in eligible_pool])
+    hobby_bits = _get_user_hobby_bits(db, [u.id for u in eligible_pool])
     rating_signal_map = _get_user_rating_signal_map(db, [u.id for u in eligible_pool])
 
     proposed, unassigned_from_pool = _propose_groups(
         db,
         eligible_pool,
         request=request,
-        hobby_map=hobby_map,
+        hobby_bits=hobby_bits,
+        rating_signal_map=rating_signal_map,
+    )
+    _choose_venues(
+        db,
+        proposed,
+        users_by_id={u.id: u for u in eligible_pool},
         rating_signal_map=rating_signal_map,
     )
 
@@ -381,6 +581,7 @@ def generate_group_matches(db: Session, request: GroupMatchGenerateRequest) -> G
             status=item.status,
             member_ids=item.member_ids,
             venue_name=item.venue_name,
+            venue_restaurant_id=item.venue.restaurant_id if item.venue is not None else None,
             score_summary=item.score_summary,
         )
         for item in proposed
@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import re
+import struct
+from array import array
+from collections import Counter
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from pathlib import Path
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    np = None  # type: ignore[assignment]
+
+HASHING_EMBEDDING_MODEL = "hashing-tfidf-v1"
+DEFAULT_HASHING_DIMENSION = 256
+# Budget ranges are tokenized as the 10-unit bands they cover, so overlapping ranges share tokens.
+BUDGET_BAND_WIDTH = 10
+MAX_BUDGET_BANDS = 20
+
+# `text_for_embedding` line key -> token prefix. List-valued lines are comma separated.
+_LIST_FIELDS = {
+    "hobbies": "hobby",
+    "diet_tags": "diet",
+    "vibe_tags": "vibe",
+    "liked_cuisines": "liked_cuisine",
+    "disliked_cuisines": "disliked_cuisine",
+    "liked_restaurants": "liked_restaurant",
+    "disliked_restaurants": "disliked_restaurant",
+}
+_SCALAR_FIELDS = {
+    "meetup_mode_preference": "meetup",
+    "neighborhood": "neighborhood",
+}
+_EMPTY_VALUES = {"", "none", "unknown", "unspecified"}
+_WORD_RE = re.compile(r"[a-z0-9_]+")
+_BUDGET_RE = re.compile(r"^(\d+)-(\d+)$")
+
+
+def _budget_tokens(value: str) -> list[str]:
+    match = _BUDGET_RE.match(value)
+    if match is None:
+        return []
+    low, high = sorted((int(match.group(1)), int(match.group(2))))
+    first, last = low // BUDGET_BAND_WIDTH, high // BUDGET_BAND_WIDTH
+    last = min(last, first + MAX_BUDGET_BANDS - 1)
+    return [f"budget={band * BUDGET_BAND_WIDTH}" for band in range(first, last + 1)]
+
+
+def tokenize_profile_text(text: str) -> list[str]:
+    """Split a preference profile's `text_for_embedding` into `field=value` feature tokens.
+
+    Lines that are not profile fields (header, rating summary) are ignored. Text with no profile
+    fields at all falls back to lowercase word tokens so arbitrary queries still encode.
+    """
+
+    tokens: list[str] = []
+    recognized = False
+    for line in text.splitlines():
+        key, sep, raw_value = line.partition(":")
+        if not sep:
+            continue
+        key = key.strip()
+        value = raw_value.strip().lower()
+        if key in _LIST_FIELDS:
+            recognized = True
+            prefix = _LIST_FIELDS[key]
+            tokens.extend(
+                f"{prefix}={item}"
+                for item in (part.strip() for part in value.split(","))
+                if item not in _EMPTY_VALUES
+            )
+        elif key in _SCALAR_FIELDS:
+            recognized = True
+            if value not in _EMPTY_VALUES:
+                tokens.append(f"{_SCALAR_FIELDS[key]}={value}")
+        elif key == "budget_range":
+            recognized = True
+            tokens.extend(_budget_tokens(value))
+    if not recognized:
+        tokens = [f"word={word}" for word in _WORD_RE.findall(text.lower())]
+    return tokens
+
+
+@lru_cache(maxsize=65_536)
+def _hash_token(token: str, dimension: int) -> tuple[int, float]:
+    # Signed hashing trick: collisions cancel out in expectation instead of always adding up.
+    value = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+    return value % dimension, -1.0 if value >> 63 else 1.0
+
+
+@dataclass(frozen=True)
+class SparseVector:
+    """Sorted, duplicate-free `indices` with matching `values`."""
+
+    indices: tuple[int, ...]
+    values: tuple[float, ...]
+
+    def dot(self, other: SparseVector) -> float:
+        total = 0.0
+        i = j = 0
+        while i < len(self.indices) and j < len(other.indices):
+            left, right = self.indices[i], other.indices[j]
+            if left == right:
+                total += self.values[i] * other.values[j]
+                i += 1
+                j += 1
+            elif left < right:
+                i += 1
+            else:
+                j += 1
+        return total
+
+    def to_dense(self, dimension: int) -> list[float]:
+        dense = [0.0] * dimension
+        for index, value in zip(self.indices, self.values, strict=True):
+            dense[index] = value
+        return dense
+
+
+@dataclass(frozen=True)
+class CsrMatrix:
+    """Compressed sparse rows: row `i` is `indices/data[indptr[i]:indptr[i + 1]]`."""
+
+    shape: tuple[int, int]
+    indptr: array
+    indices: array
+    data: array
+
+    def row(self, i: int) -> SparseVector:
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return SparseVector(tuple(self.indices[start:end]), tuple(self.data[start:end]))
+
+    def dot(self, query: SparseVector) -> list[float]:
+        """Dot product of every row with `query` (cosine similarity for normalized vectors)."""
+
+        rows, dimension = self.shape
+        if np is not None:
+            dense_query = np.zeros(dimension, dtype=np.float64)
+            dense_query[list(query.indices)] = query.values
+            products = np.frombuffer(self.data, dtype=np.float64) * dense_query[
+                np.frombuffer(self.indices, dtype=np.int64)
+            ]
+            row_lengths = np.diff(np.frombuffer(self.indptr, dtype=np.int64))
+            row_ids = np.repeat(np.arange(rows), row_lengths)
+            return np.bincount(row_ids, weights=products, minlength=rows).tolist()
+
+        lookup = dict(zip(query.indices, query.values, strict=True))
+        scores: list[float] = []
+        for i in range(rows):
+            start, end = self.indptr[i], self.indptr[i + 1]
+            scores.append(
+                sum(
+                    value * lookup.get(index, 0.0)
+                    for index, value in zip(
+                        self.indices[start:end], self.data[start:end], strict=True
+                    )
+                )
+            )
+        return scores
+
+
+@dataclass(frozen=True)
+class HashingFeatureEmbedder:
+    """Local `EmbeddingProvider` built on feature hashing with TF-IDF weights.
+
+    Profile text is tokenized into `field=value` features, hashed into `dimension` signed buckets,
+    weighted by `(1 + log tf) * idf` and L2-normalized, so dot products are cosine similarities
+    over shared hobbies, tags, cuisines, restaurants, neighborhood and budget bands. Without
+    `fit` every bucket has idf 1. No model download, GPU or network call is involved.
+    """
+
+    dimension: int = DEFAULT_HASHING_DIMENSION
+    idf: tuple[float, ...] | None = None
+    model_name: str = HASHING_EMBEDDING_MODEL
+
+    def fit(self, texts: list[str]) -> HashingFeatureEmbedder:
+        """Return a copy with smoothed idf weights learned from one pass over `texts`.
+
+        The model name gains a fingerprint of the weights, so vectors cached or stored under one
+        fit are never mixed with another's.
+        """
+
+        if self.dimension <= 0:
+            raise ValueError("HashingFeatureEmbedder dimension must be > 0")
+        document_frequency = [0] * self.dimension
+        for text in texts:
+            tokens = tokenize_profile_text(text)
+            for index in {_hash_token(token, self.dimension)[0] for token in tokens}:
+                document_frequency[index] += 1
+        documents = len(texts)
+        idf = tuple(math.log((1 + documents) / (1 + df)) + 1.0 for df in document_frequency)
+        digest = hashlib.sha256(struct.pack(f"<{len(idf)}d", *idf)).hexdigest()[:12]
+        return replace(self, idf=idf, model_name=f"{HASHING_EMBEDDING_MODEL}-{digest}")
+
+    def encode(self, text: str) -> SparseVector:
+        if self.dimension <= 0:
+            raise ValueError("HashingFeatureEmbedder dimension must be > 0")
+        weights: dict[int, float] = {}
+        for token, count in Counter(tokenize_profile_text(text)).items():
+            index, sign = _hash_token(token, self.dimension)
+            weight = 1.0 + math.log(count)
+            if self.idf is not None:
+                weight *= self.idf[index]
+            weights[index] = weights.get(index, 0.0) + sign * weight
+
+        norm = math.sqrt(sum(value * value for value in weights.values()))
+        indices = sorted(index for index, value in weights.items() if value != 0.0)
+        return SparseVector(
+            tuple(indices),
+            tuple(weights[index] / norm for index in indices),
+        )
+
+    def encode_batch(self, texts: list[str]) -> CsrMatrix:
+        indptr = array("q", [0])
+        indices = array("q")
+        data = array("d")
+        for text in texts:
+            vector = self.encode(text)
+            indices.extend(vector.indices)
+            data.extend(vector.values)
+            indptr.append(len(indices))
+        return CsrMatrix(
+            shape=(len(texts), self.dimension), indptr=indptr, indices=indices, data=data
+        )
+
+    def embed_text(self, text: str) -> list[float]:
+        return self.encode(text).to_dense(self.dimension)
+
+    def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        return [self.embed_text(text) for text in texts]
+
+    def save(self, path: str | Path) -> None:
+        """Write the dimension, idf weights and model name as JSON for `load_hashing_embedder`."""
+
+        state = {
+            "dimension": self.dimension,
+            "idf": list(self.idf) if self.idf is not None else None,
+            "model_name": self.model_name,
+        }
+        Path(path).write_text(json.dumps(state), encoding="utf-8")
+
+
+@lru_cache(maxsize=8)
+def load_hashing_embedder(path: str | None, *, dimension: int) -> HashingFeatureEmbedder:
+    """The embedder saved at `path` by `HashingFeatureEmbedder.save`, unfitted when `path` is None.
+
+    Loaded once per `(path, dimension)`; refitting takes a restart. Raises ValueError when the
+    saved weights were fitted for another dimension.
+    """
+
+    if path is None:
+        return HashingFeatureEmbedder(dimension=dimension)
+    state = json.loads(Path(path).read_text(encoding="utf-8"))
+    if state["dimension"] != dimension:
+        raise ValueError(
+            f"Hashing embedder at {path} was fitted for dimension {state['dimension']}, "
+            f"not {dimension}"
+        )
+    idf = tuple(float(value) for value in state["idf"]) if state["idf"] is not None else None
+    return HashingFeatureEmbedder(dimension=dimension, idf=idf, model_name=state["model_name"])
@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+import heapq
+import threading
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable
+from dataclasses import dataclass
+from itertools import groupby
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.hobby import HobbyCatalog, UserHobby
+from app.models.user import User
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    np = None  # type: ignore[assignment]
+
+# Packs (score, hobby_overlap) into one sortable integer; same_neighborhood = score - overlap.
+_OVERLAP_SLOTS = 1 << 16
+
+# (score, hobby_overlap, same_neighborhood, user_id), compared descending like the SQL feed.
+MatchKey = tuple[int, int, int, UUID]
+
+
+@dataclass(frozen=True, slots=True)
+class IndexedMatch:
+    user_id: UUID
+    score: int
+    hobby_overlap: int
+    same_neighborhood: bool
+
+
+@dataclass(frozen=True, slots=True)
+class _IndexedUser:
+    discoverable: bool
+    neighborhood: str
+    hobbies: tuple[str, ...]
+    hobby_bits: int
+
+
+def _normalized_neighborhood(value: str | None) -> str:
+    return (value or "").strip().lower()
+
+
+def hobby_bitsets(hobby_map: dict[UUID, list[str]]) -> dict[UUID, int]:
+    """Per-user hobby bitsets for an ad-hoc hobby map; overlap is `(a & b).bit_count()`."""
+
+    bits: dict[str, int] = {}
+    return {
+        user_id: sum(1 << bits.setdefault(code, len(bits)) for code in set(codes))
+        for user_id, codes in hobby_map.items()
+    }
+
+
+class HobbyInvertedIndex:
+    """Process-level inverted index over user hobbies and neighborhoods.
+
+    Each hobby code (and each normalized neighborhood) maps to a sorted array of discoverable user
+    ordinals; every indexed user also has a hobby bitset. Match candidates for a user are found by
+    counting ordinals across that user's posting lists, so the score is hobby overlap plus one for
+    a shared neighborhood, exactly as in `crud.social.list_scored_match_candidates`.
+
+    The index starts empty and unready; `build_hobby_index` loads it in bulk and write paths keep
+    it current through `refresh_hobby_index_users`. Callers fall back to SQL while it is unready.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._ready = False
+        self._ordinals: dict[UUID, int] = {}
+        self._user_ids: list[UUID] = []
+        self._entries: list[_IndexedUser | None] = []
+        self._hobby_bit: dict[str, int] = {}
+        self._hobby_postings: dict[str, array] = {}
+        self._neighborhood_postings: dict[str, array] = {}
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    def __len__(self) -> int:
+        return len(self._ordinals)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reset()
+
+    def load(self, rows: Iterable[tuple[UUID, bool, str | None, Iterable[str]]]) -> None:
+        """Replace the index with `(user_id, discoverable, neighborhood, hobby_codes)` rows."""
+
+        with self._lock:
+            self.clear()
+            for user_id, discoverable, neighborhood, hobby_codes in rows:
+                ordinal = self._ordinal_for(user_id)
+                entry = self._entry(discoverable, neighborhood, hobby_codes)
+                self._entries[ordinal] = entry
+                if entry.discoverable:
+                    # Ordinals are handed out in increasing order, so appends keep postings sorted.
+                    for posting in self._postings_for(entry):
+                        posting.append(ordinal)
+            self._ready = True
+
+    def upsert_user(
+        self,
+        user_id: UUID,
+        *,
+        discoverable: bool,
+        neighborhood: str | None,
+        hobby_codes: Iterable[str],
+    ) -> None:
+        with self._lock:
+            ordinal = self._ordinal_for(user_id)
+            old = self._entries[ordinal]
+            new = self._entry(discoverable, neighborhood, hobby_codes)
+            if old is not None and old.discoverable:
+                for posting in self._postings_for(old):
+                    index = bisect_left(posting, ordinal)
+                    if index < len(posting) and posting[index] == ordinal:
+                        posting.pop(index)
+            self._entries[ordinal] = new
+            if new.discoverable:
+                for posting in self._postings_for(new):
+                    posting.insert(bisect_left(posting, ordinal), ordinal)
+
+    def remove_user(self, user_id: UUID) -> None:
+        with self._lock:
+            if user_id in self._ordinals:
+                self.upsert_user(user_id, discoverable=False, neighborhood=None, hobby_codes=())
+                self._entries[self._ordinals[user_id]] = None
+
+    def hobby_bits(self, user_id: UUID) -> int | None:
+        ordinal = self._ordinals.get(user_id)
+        entry = self._entries[ordinal] if ordinal is not None else None
+        return entry.hobby_bits if entry is not None else None
+
+    def hobby_overlap(self, user_id: UUID, other_user_id: UUID) -> int:
+        shared = (self.hobby_bits(user_id) or 0) & (self.hobby_bits(other_user_id) or 0)
+        return shared.bit_count()
+
+    def top_candidates(
+        self,
+        user_id: UUID,
+        *,
+        limit: int,
+        exclude: Iterable[UUID] = (),
+        after: MatchKey | None = None,
+    ) -> list[IndexedMatch] | None:
+        """Best-scoring discoverable users for `user_id`, or None if the user is not indexed.
+
+        Ordered by `(score, hobby_overlap, same_neighborhood, user_id)` descending; `after` is the
+        last key of the previous page. Zero scores never appear.
+        """
+
+        with self._lock:
+            ordinal = self._ordinals.get(user_id)
+            entry = self._entries[ordinal] if ordinal is not None else None
+            if entry is None:
+                return None
+            excluded = {ordinal, *(self._ordinals[u] for u in exclude if u in self._ordinals)}
+            hobby_postings = [
+                self._hobby_postings[code] for code in entry.hobbies if code in self._hobby_postings
+            ]
+            neighborhood_posting = (
+                self._neighborhood_postings.get(entry.neighborhood, array("q"))
+                if entry.neighborhood
+                else array("q")
+            )
+            ranked = self._ranked(hobby_postings, neighborhood_posting, excluded, after, limit)
+            return [
+                IndexedMatch(
+                    user_id=self._user_ids[candidate],
+                    score=rank // _OVERLAP_SLOTS,
+                    hobby_overlap=rank % _OVERLAP_SLOTS,
+                    same_neighborhood=rank // _OVERLAP_SLOTS > rank % _OVERLAP_SLOTS,
+                )
+                for rank, _user_key, candidate in ranked
+            ]
+
+    def _ranked(
+        self,
+        hobby_postings: list[array],
+        neighborhood_posting: array,
+        excluded: set[int],
+        after: MatchKey | None,
+        limit: int,
+    ) -> list[tuple[int, int, int]]:
+        after_rank = after_user = None
+        if after is not None:
+            after_rank = after[0] * _OVERLAP_SLOTS + after[1]
+            after_user = after[3].int
+
+        if np is not None:
+            arrays = [np.frombuffer(p, dtype=np.int64) for p in hobby_postings if len(p)]
+            if len(neighborhood_posting):
+                arrays.append(np.frombuffer(neighborhood_posting, dtype=np.int64))
+            if not arrays:
+                return []
+            ordinals, scores = np.unique(np.concatenate(arrays), return_counts=True)
+            overlaps = scores - np.isin(ordinals, arrays[-1] if len(neighborhood_posting) else [])
+            ranks = scores * _OVERLAP_SLOTS + overlaps
+            keep = ~np.isin(ordinals, np.fromiter(excluded, dtype=np.int64))
+            if after_rank is not None:
+                # Drop the previous pages before thresholding, ties on rank included.
+                keep &= ranks <= after_rank
+                for i in np.flatnonzero(keep & (ranks == after_rank)).tolist():
+                    keep[i] = self._user_ids[int(ordinals[i])].int < after_user
+            ordinals, ranks = ordinals[keep], ranks[keep]
+            if len(ranks) > limit:
+                # Everything strictly below the limit-th best rank can never make the page.
+                threshold = np.partition(ranks, len(ranks) - limit)[len(ranks) - limit]
+                keep = ranks >= threshold
+                ordinals, ranks = ordinals[keep], ranks[keep]
+            counted = zip(ordinals.tolist(), ranks.tolist(), strict=True)
+        else:
+            # k-way merge of the sorted posting lists; runs of one ordinal count its matches.
+            neighbors = set(neighborhood_posting)
+            merged = heapq.merge(*hobby_postings, neighborhood_posting)
+            counted = (
+                (candidate, score * _OVERLAP_SLOTS + score - (candidate in neighbors))
+                for candidate, score in (
+                    (candidate, sum(1 for _ in run)) for candidate, run in groupby(merged)
+                )
+                if candidate not in excluded
+            )
+
+        keys = (
+            (rank, self._user_ids[candidate].int, candidate)
+            for candidate, rank in counted
+            if after_rank is None
+            or rank < after_rank
+            or (rank == after_rank and self._user_ids[candidate].int < after_user)
+        )
+        return heapq.nlargest(limit, keys)
+
+    def _ordinal_for(self, user_id: UUID) -> int:
+        ordinal = self._ordinals.get(user_id)
+        if ordinal is None:
+            ordinal = len(self._user_ids)
+            self._ordinals[user_id] = ordinal
+            self._user_ids.append(user_id)
+            self._entries.append(None)
+        return ordinal
+
+    def _entry(
+        self, discoverable: bool, neighborhood: str | None, hobby_codes: Iterable[str]
+    ) -> _IndexedUser:
+        hobbies = tuple(sorted(set(hobby_codes)))
+        bits = 0
+        for code in hobbies:
+            bits |= 1 << self._hobby_bit.setdefault(code, len(self._hobby_bit))
+        return _IndexedUser(
+            discoverable=bool(discoverable),
+            neighborhood=_normalized_neighborhood(neighborhood),
+            hobbies=hobbies,
+            hobby_bits=bits,
+        )
+
+    def _postings_for(self, entry: _IndexedUser) -> list[array]:
+        postings = [self._hobby_postings.setdefault(code, array("q")) for code in entry.hobbies]
+        if entry.neighborhood:
+            postings.append(self._neighborhood_postings.setdefault(entry.neighborhood, array("q")))
+        return postings
+
+
+hobby_index = HobbyInvertedIndex()
+
+
+def _index_rows(
+    db: Session, user_ids: list[UUID] | None = None
+) -> list[tuple[UUID, bool, str | None, list[str]]]:
+    users_stmt = select(User.id, User.discoverable, User.neighborhood).order_by(User.id.asc())
+    hobbies_stmt = select(UserHobby.user_id, HobbyCatalog.code).join(
+        HobbyCatalog, HobbyCatalog.id == UserHobby.hobby_id
+    )
+    if user_ids is not None:
+        users_stmt = users_stmt.where(User.id.in_(user_ids))
+        hobbies_stmt = hobbies_stmt.where(UserHobby.user_id.in_(user_ids))
+    codes: dict[UUID, list[str]] = {}
+    for user_id, code in db.execute(hobbies_stmt):
+        codes.setdefault(user_id, []).append(code)
+    return [
+        (user_id, discoverable, neighborhood, codes.get(user_id, []))
+        for user_id, discoverable, neighborhood in db.execute(users_stmt)
+    ]
+
+
+def build_hobby_index(db: Session, index: HobbyInvertedIndex = hobby_index) -> HobbyInvertedIndex:
+    """Bulk-load the index from two full scans (users, user hobbies joined to codes)."""
+
+    index.load(_index_rows(db))
+    return index
+
+
+def refresh_hobby_index_users(
+    db: Session,
+    user_ids: list[UUID],
+    index: HobbyInvertedIndex = hobby_index,
+) -> None:
+    """Re-read `user_ids` into the index after a committed write. No-op until the index is built."""
+
+    if not index.ready or not user_ids:
+        return
+    rows = _index_rows(db, list(dict.fromkeys(user_ids)))
+    for user_id, discoverable, neighborhood, codes in rows:
+        index.upsert_user(
+            user_id, discoverable=discoverable, neighborhood=neighborhood, hobby_codes=codes
+        )
+    for user_id in set(user_ids) - {row[0] for row in rows}:
+        index.remove_user(user_id)
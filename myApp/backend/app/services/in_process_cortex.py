@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import math
+import threading
+from bisect import bisect_left
+from collections.abc import Callable
+from typing import Any
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    np = None  # type: ignore[assignment]
+
+
+class InProcessCortexClient:
+    """Single-collection, in-memory stand-in for the Cortex SDK client.
+
+    Implements the call shapes `ActianVectorStoreAdapter` uses (upsert, batch_upsert, search, get,
+    delete, batch_delete, scroll, flush). Search is exact cosine similarity, vectorized with NumPy
+    when it is installed. Meant for benchmarks, local dev and tests, not production.
+    """
+
+    def __init__(self, *, dimension: int | None = None) -> None:
+        self.dimension = dimension
+        self._points: dict[int, tuple[list[float], dict | None]] = {}
+        self._lock = threading.RLock()
+        self._matrix: Any = None
+        self._matrix_ids: list[int] = []
+
+    # Collection management -------------------------------------------------------------------
+
+    def list_collections(self) -> list[str]:
+        return ["in_process"]
+
+    def collection_exists(self, *_args: Any, **_kwargs: Any) -> bool:
+        return True
+
+    def create_collection(self, *_args: Any, dimension: int | None = None, **_kwargs: Any) -> None:
+        if dimension is not None:
+            self.dimension = dimension
+
+    def flush(self, *_args: Any, **_kwargs: Any) -> None:
+        return None
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._points)
+
+    # Writes ----------------------------------------------------------------------------------
+
+    def upsert(self, *, id: int, vector: list[float], payload: dict | None = None) -> None:
+        with self._lock:
+            self._points[int(id)] = (list(vector), payload)
+            self._matrix = None
+
+    def batch_upsert(self, points: list[dict] | None = None, **kwargs: Any) -> None:
+        values = points if points is not None else kwargs["points"]
+        with self._lock:
+            for point in values:
+                self._points[int(point["id"])] = (list(point["vector"]), point.get("payload"))
+            self._matrix = None
+
+    def delete(self, *, id: int) -> None:
+        with self._lock:
+            self._points.pop(int(id), None)
+            self._matrix = None
+
+    def batch_delete(self, *, ids: list[int]) -> None:
+        with self._lock:
+            for point_id in ids:
+                self._points.pop(int(point_id), None)
+            self._matrix = None
+
+    # Reads -----------------------------------------------------------------------------------
+
+    def get(
+        self, collection_name: str | None = None, id: int | None = None
+    ) -> tuple[list[float], dict | None]:
+        with self._lock:
+            if id is None or int(id) not in self._points:
+                raise KeyError(f"Point not found: {id}")
+            vector, payload = self._points[int(id)]
+            return list(vector), payload
+
+    def batch_get(self, *, ids: list[int], with_payload: bool = True) -> list[dict]:
+        with self._lock:
+            return [
+                {"id": point_id, "payload": self._points[point_id][1] if with_payload else None}
+                for point_id in (int(value) for value in ids)
+                if point_id in self._points
+            ]
+
+    def scroll(
+        self, *, offset: int | None = None, limit: int = 100, with_payload: bool = True
+    ) -> tuple[list[dict], int | None]:
+        with self._lock:
+            ids = sorted(self._points)
+            start = 0 if offset is None else bisect_left(ids, int(offset))
+            page_ids = ids[start : start + limit]
+            next_offset = ids[start + limit] if start + limit < len(ids) else None
+            page = [
+                {"id": point_id, "payload": self._points[point_id][1] if with_payload else None}
+                for point_id in page_ids
+            ]
+        return page, next_offset
+
+    def search(
+        self,
+        *,
+        query: list[float] | None = None,
+        vector: list[float] | None = None,
+        top_k: int = 10,
+        filter: dict | Callable[[dict | None], bool] | None = None,
+        with_payload: bool = True,
+    ) -> list[dict]:
+        query_vector = query if query is not None else vector
+        if query_vector is None:
+            raise TypeError("search() requires query or vector")
+        with self._lock:
+            if filter is None and np is not None:
+                scored = self._search_numpy(query_vector, top_k)
+            else:
+                scored = self._search_python(query_vector, top_k, filter)
+            return [
+                {
+                    "id": point_id,
+                    "score": score,
+                    "payload": self._points[point_id][1] if with_payload else None,
+                }
+                for point_id, score in scored
+            ]
+
+    def _search_numpy(self, query_vector: list[float], top_k: int) -> list[tuple[int, float]]:
+        if not self._points:
+            return []
+        if self._matrix is None:
+            self._matrix_ids = list(self._points)
+            matrix = np.asarray([self._points[i][0] for i in self._matrix_ids], dtype=np.float32)
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            self._matrix = matrix / norms
+        query_arr = np.asarray(query_vector, dtype=np.float32)
+        query_norm = float(np.linalg.norm(query_arr)) or 1.0
+        scores = self._matrix @ (query_arr / query_norm)
+        k = min(top_k, len(self._matrix_ids))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self._matrix_ids[i], float(scores[i])) for i in top]
+
+    def _search_python(
+        self,
+        query_vector: list[float],
+        top_k: int,
+        filter: dict | Callable[[dict | None], bool] | None,
+    ) -> list[tuple[int, float]]:
+        scored: list[tuple[int, float]] = []
+        for point_id, (point_vector, payload) in self._points.items():
+            if filter is not None and not _matches_filter(payload, filter):
+                continue
+            scored.append((point_id, cosine_similarity(query_vector, point_vector)))
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:top_k]
+
+
+def cosine_similarity(left: list[float], right: list[float]) -> float:
+    dot = sum(a * b for a, b in zip(left, right, strict=True))
+    left_norm = math.sqrt(sum(a * a for a in left))
+    right_norm = math.sqrt(sum(b * b for b in right))
+    if left_norm == 0.0 or right_norm == 0.0:
+        return 0.0
+    return dot / (left_norm * right_norm)
+
+
+def _matches_filter(payload: dict | None, filter: dict | Callable[[dict | None], bool]) -> bool:
+    if callable(filter):
+        return bool(filter(payload))
+    if not isinstance(filter, dict):
+        raise ValueError(f"Unsupported filter type for in-process client: {type(filter).__name__}")
+    if not isinstance(payload, dict):
+        return False
+    return all(payload.get(key) == value for key, value in filter.items())
+
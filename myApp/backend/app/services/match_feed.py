@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import logging
+import math
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.core.config import Settings
+from app.crud import social as crud_social
+from app.models.user import User
+from app.schemas.vector_store import UserProfileVectorQuery
+from app.services.embedding_migration import build_target_adapter, resolve_serving_embedding_target
+from app.services.hobby_index import HobbyInvertedIndex, IndexedMatch, MatchKey, hobby_index
+from app.services.match_feed_cache import MatchFeed, MatchFeedCache, match_feed_cache
+
+logger = logging.getLogger(__name__)
+
+# Weight of each heuristic point (shared hobby, same neighborhood) on top of cosine similarity.
+VECTOR_FEED_SIGNAL_WEIGHT = 0.1
+# ANN hits are cut into blocks of this size in similarity order and blended only within a block,
+# so the blend never moves a user across a page boundary between requests.
+VECTOR_FEED_WINDOW = 100
+# Upper bound on extra ANN hits requested to make room for excluded users (friends, pending).
+VECTOR_FEED_MAX_OVERFETCH = 100
+
+
+def rank_match_candidates(
+    db: Session,
+    user: User,
+    *,
+    limit: int,
+    after: MatchKey | None = None,
+    index: HobbyInvertedIndex = hobby_index,
+) -> list[IndexedMatch]:
+    """Live ranking for `user`: the in-memory hobby index when it is ready, SQL otherwise."""
+
+    if index.ready:
+        excluded = crud_social.get_match_excluded_user_ids(db, user.id)
+        matches = index.top_candidates(user.id, limit=limit, exclude=excluded, after=after)
+        if matches is not None:
+            return matches
+    rows = crud_social.list_scored_match_candidates(db, user, limit=limit, after=after)
+    return [
+        IndexedMatch(
+            user_id=candidate.id,
+            score=score,
+            hobby_overlap=overlap,
+            same_neighborhood=same_neighborhood,
+        )
+        for candidate, score, overlap, same_neighborhood in rows
+    ]
+
+
+def refresh_match_feed(
+    db: Session,
+    user: User,
+    *,
+    feed_size: int,
+    cache: MatchFeedCache = match_feed_cache,
+    index: HobbyInvertedIndex = hobby_index,
+) -> MatchFeed:
+    # One extra row tells a feed that holds every candidate apart from a truncated one.
+    token = cache.begin()
+    matches = rank_match_candidates(db, user, limit=feed_size + 1, index=index)
+    return cache.store(
+        user.id, matches[:feed_size], complete=len(matches) <= feed_size, token=token
+    )
+
+
+def get_match_feed_page(
+    db: Session,
+    user: User,
+    *,
+    limit: int,
+    offset: int = 0,
+    after: MatchKey | None = None,
+    feed_size: int,
+    cache: MatchFeedCache = match_feed_cache,
+    index: HobbyInvertedIndex = hobby_index,
+) -> list[IndexedMatch]:
+    """One page of `user`'s feed, served from the cache and rebuilt only when missing or stale.
+
+    Pages that reach past the end of a truncated feed are ranked live.
+    """
+
+    feed = cache.get(user.id)
+    if feed is None:
+        feed = refresh_match_feed(db, user, feed_size=feed_size, cache=cache, index=index)
+    page = feed.page(limit=limit, offset=offset, after=after)
+    if page is None:
+        page = rank_match_candidates(db, user, limit=offset + limit, after=after, index=index)
+        page = page[offset:]
+    return page
+
+
+@dataclass(frozen=True, slots=True)
+class VectorMatch:
+    user: User
+    hobbies: list[str]
+    overlap_hobbies: list[str]
+    score: int
+    same_neighborhood: bool
+    vector_similarity: float
+    blended_score: float
+
+
+def _normalized_neighborhood(value: str | None) -> str:
+    return (value or "").strip().lower()
+
+
+def rank_vector_match_candidates(
+    db: Session,
+    user: User,
+    *,
+    limit: int,
+    offset: int = 0,
+    settings: Settings,
+) -> list[VectorMatch] | None:
+    """Rank `user`'s feed by profile-embedding similarity blended with the heuristic signals.
+
+    The caller's stored vector (serving embedding version) is the ANN query; friends and users
+    with a pending request are passed as `exclude_user_ids`. The hits are hydrated with one batched
+    user query and one hobby query, then re-ranked by
+    `similarity + VECTOR_FEED_SIGNAL_WEIGHT * (hobby_overlap + same_neighborhood)` within fixed
+    blocks of `VECTOR_FEED_WINDOW` similarity-ordered hits, so that consecutive pages do not
+    overlap or skip users.
+
+    Returns None when vector search is disabled, the caller has no stored vector yet or the vector
+    store fails, so the route can fall back to the heuristic feed.
+    """
+
+    if not settings.vectorai_enabled:
+        return None
+    try:
+        target = resolve_serving_embedding_target(db, settings=settings)
+        if not target.dimension:
+            return None
+        adapter = build_target_adapter(db, settings=settings, target=target)
+        query_vector = adapter.get_user_profile_vector(
+            user_id=str(user.id), embedding_version=target.embedding_version
+        )
+        if query_vector is None:
+            return None
+        excluded = crud_social.get_match_excluded_user_ids(db, user.id)
+        excluded.add(user.id)
+        window = VECTOR_FEED_WINDOW * math.ceil((offset + limit) / VECTOR_FEED_WINDOW)
+        # Exclusions are applied to the ANN results, so over-fetch by their count
+        # (capped: a page may come back short for users with very many friends).
+        top_k = window + min(len(excluded), VECTOR_FEED_MAX_OVERFETCH)
+        hits = adapter.query_similar_user_profiles(
+            UserProfileVectorQuery(
+                query_vector=query_vector,
+                top_k=top_k,
+                embedding_version=target.embedding_version,
+                exclude_user_ids=[str(user_id) for user_id in excluded],
+                include_metadata=False,
+            )
+        )
+    except Exception:
+        logger.warning("Vector match feed unavailable, using heuristic ranking", exc_info=True)
+        return None
+
+    similarity: dict[UUID, float] = {}
+    for hit in hits:
+        hit_user_id = UUID(hit.user_id)
+        if hit_user_id not in excluded:
+            similarity[hit_user_id] = max(similarity.get(hit_user_id, float("-inf")), hit.score)
+    users = crud_social.get_users_by_ids(db, list(similarity))
+    hobby_map = crud_social.get_user_hobby_codes_map(db, [user.id, *users])
+    my_hobbies = set(hobby_map.get(user.id, []))
+    my_neighborhood = _normalized_neighborhood(user.neighborhood)
+
+    matches: list[VectorMatch] = []
+    for candidate_id, candidate in users.items():
+        if not candidate.discoverable:
+            continue
+        hobbies = hobby_map.get(candidate_id, [])
+        overlap_hobbies = sorted(my_hobbies.intersection(hobbies))
+        same_hood = bool(my_neighborhood) and (
+            _normalized_neighborhood(candidate.neighborhood) == my_neighborhood
+        )
+        score = len(overlap_hobbies) + int(same_hood)
+        matches.append(
+            VectorMatch(
+                user=candidate,
+                hobbies=hobbies,
+                overlap_hobbies=overlap_hobbies,
+                score=score,
+                same_neighborhood=same_hood,
+                vector_similarity=similarity[candidate_id],
+                blended_score=similarity[candidate_id] + VECTOR_FEED_SIGNAL_WEIGHT * score,
+            )
+        )
+    if len(hits) >= top_k:
+        # The store breaks ties at its cut-off in its own order, so users tied with the last hit
+        # may differ between a short and a long fetch. Leave them to a later window when the
+        # windows asked for can be filled without them.
+        cutoff = min(hit.score for hit in hits)
+        above_cutoff = [match for match in matches if match.vector_similarity > cutoff]
+        if len(above_cutoff) >= window:
+            matches = above_cutoff
+    return _blend_in_windows(matches)[offset : offset + limit]
+
+
+def _blend_in_windows(matches: list[VectorMatch]) -> list[VectorMatch]:
+    """Similarity order, re-sorted by blended score inside each `VECTOR_FEED_WINDOW` block.
+
+    Blocks are cut from the similarity order before blending, so a block holds the same users
+    whichever page asked for it.
+    """
+
+    matches = sorted(matches, key=lambda m: (m.vector_similarity, m.user.id.int), reverse=True)
+    ranked: list[VectorMatch] = []
+    for start in range(0, len(matches), VECTOR_FEED_WINDOW):
+        block = matches[start : start + VECTOR_FEED_WINDOW]
+        block.sort(
+            key=lambda m: (m.blended_score, m.vector_similarity, m.user.id.int), reverse=True
+        )
+        ranked.extend(block)
+    return ranked
+
+
+@dataclass(frozen=True)
+class MatchFeedWarmerConfig:
+    interval_seconds: float = 15.0
+    # Only users who opened /matches this recently are kept warm.
+    recent_seconds: float = 900.0
+    batch_size: int = 100
+    feed_size: int = 200
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> MatchFeedWarmerConfig:
+        return cls(
+            interval_seconds=settings.match_feed_warmer_interval_seconds,
+            recent_seconds=settings.match_feed_warm_recent_seconds,
+            batch_size=settings.match_feed_warmer_batch_size,
+            feed_size=settings.match_feed_size,
+        )
+
+
+def warm_match_feeds(
+    db: Session,
+    *,
+    config: MatchFeedWarmerConfig,
+    cache: MatchFeedCache = match_feed_cache,
+    index: HobbyInvertedIndex = hobby_index,
+) -> int:
+    """Rebuild feeds for recently active users whose feed is missing or expires before next run."""
+
+    user_ids = cache.recently_read(
+        within_seconds=config.recent_seconds, refresh_before_seconds=config.interval_seconds
+    )[: config.batch_size]
+    users = crud_social.get_users_by_ids(db, user_ids)
+    for user_id in user_ids:
+        user = users.get(user_id)
+        if user is not None:
+            refresh_match_feed(db, user, feed_size=config.feed_size, cache=cache, index=index)
+    return len(users)
+
+
+class MatchFeedWarmer:
+    """Daemon thread that runs `warm_match_feeds` every `interval_seconds`."""
+
+    def __init__(
+        self,
+        *,
+        session_factory: Callable[[], Session],
+        config: MatchFeedWarmerConfig,
+        cache: MatchFeedCache = match_feed_cache,
+    ) -> None:
+        self._session_factory = session_factory
+        self._config = config
+        self._cache = cache
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def run_once(self) -> int:
+        with self._session_factory() as db:
+            return warm_match_feeds(db, config=self._config, cache=self._cache)
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("Match feed warm-up failed")
+            self._stop.wait(self._config.interval_seconds)
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="match-feed-warmer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 10.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_right
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from uuid import UUID
+
+from app.core.config import settings
+from app.services.hobby_index import IndexedMatch, MatchKey
+
+DEFAULT_FEED_MAX_ENTRIES = 10_000
+DEFAULT_FEED_TTL_SECONDS = 60.0
+# Remembered invalidations; older ones collapse into a floor that rejects any earlier token.
+_MAX_TRACKED_INVALIDATIONS = 50_000
+
+
+def _sort_key(key: MatchKey) -> tuple[int, int, int, int]:
+    # Feeds are ordered by MatchKey descending; negating gives an ascending list for bisect.
+    score, overlap, same_hood, user_id = key
+    return (-score, -overlap, -same_hood, -user_id.int)
+
+
+@dataclass(frozen=True, slots=True)
+class MatchFeed:
+    """One user's ranked candidates, best first, as computed at `built_at` (monotonic seconds).
+
+    `complete` means the feed holds every scoring candidate; otherwise it was cut at the feed size
+    and pages past its end must be computed live.
+    """
+
+    items: tuple[IndexedMatch, ...]
+    complete: bool
+    built_at: float
+    _sort_keys: list[tuple[int, int, int, int]] = field(repr=False, compare=False)
+
+    @classmethod
+    def build(cls, items: Iterable[IndexedMatch], *, complete: bool, built_at: float) -> MatchFeed:
+        items = tuple(items)
+        return cls(
+            items=items,
+            complete=complete,
+            built_at=built_at,
+            _sort_keys=[
+                _sort_key((m.score, m.hobby_overlap, int(m.same_neighborhood), m.user_id))
+                for m in items
+            ],
+        )
+
+    def page(
+        self, *, limit: int, offset: int = 0, after: MatchKey | None = None
+    ) -> list[IndexedMatch] | None:
+        """Slice out one page, or None if it runs past the end of a truncated feed."""
+
+        start = bisect_right(self._sort_keys, _sort_key(after)) if after is not None else 0
+        start += offset
+        if start + limit > len(self.items) and not self.complete:
+            return None
+        return list(self.items[start : start + limit])
+
+
+class MatchFeedCache:
+    """Process-level LRU of precomputed match feeds with event-driven invalidation.
+
+    `invalidate_users` drops the feeds of the given users and every feed that lists one of them as
+    a candidate, so friend requests, hobby and profile edits and discoverability toggles are seen
+    on the next read. A user who starts to score for someone else only shows up in that feed once
+    it expires, which `ttl_seconds` bounds.
+
+    Feeds are computed outside the lock. `begin` hands out a token before the computation and
+    `store` drops the result if the owner or any listed candidate was invalidated since then, the
+    same compare-and-set idea as the materialized preference profiles.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = DEFAULT_FEED_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_FEED_TTL_SECONDS,
+        clock=time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._feeds: OrderedDict[UUID, MatchFeed] = OrderedDict()
+        # candidate id -> owners whose cached feed lists that candidate.
+        self._listed_in: dict[UUID, set[UUID]] = {}
+        self._tick = 0
+        self._invalidated: OrderedDict[UUID, int] = OrderedDict()
+        self._invalidated_floor = 0
+        self._last_read: OrderedDict[UUID, float] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._feeds)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reset()
+
+    def get(self, user_id: UUID) -> MatchFeed | None:
+        """Fresh cached feed for `user_id`; also records the read for the warmer."""
+
+        now = self._clock()
+        with self._lock:
+            self._last_read[user_id] = now
+            self._last_read.move_to_end(user_id)
+            while len(self._last_read) > self.max_entries:
+                self._last_read.popitem(last=False)
+            feed = self._feeds.get(user_id)
+            if feed is None or now - feed.built_at >= self.ttl_seconds:
+                self.misses += 1
+                return None
+            self._feeds.move_to_end(user_id)
+            self.hits += 1
+            return feed
+
+    def begin(self) -> int:
+        with self._lock:
+            return self._tick
+
+    def store(
+        self,
+        user_id: UUID,
+        items: Iterable[IndexedMatch],
+        *,
+        complete: bool,
+        token: int,
+    ) -> MatchFeed:
+        """Cache a feed computed after `begin()` returned `token`; stale results are not kept."""
+
+        feed = MatchFeed.build(items, complete=complete, built_at=self._clock())
+        with self._lock:
+            if not self._valid_since(token, [user_id, *(m.user_id for m in feed.items)]):
+                return feed
+            self._drop(user_id)
+            self._feeds[user_id] = feed
+            for match in feed.items:
+                self._listed_in.setdefault(match.user_id, set()).add(user_id)
+            while len(self._feeds) > self.max_entries:
+                self._drop(next(iter(self._feeds)))
+        return feed
+
+    def invalidate_users(self, user_ids: Iterable[UUID], *, listing_feeds: bool = True) -> None:
+        """Drop the users' own feeds and, with `listing_feeds`, every feed that lists them."""
+
+        with self._lock:
+            self._tick += 1
+            for user_id in set(user_ids):
+                self._invalidated[user_id] = self._tick
+                self._invalidated.move_to_end(user_id)
+                self._drop(user_id)
+                if listing_feeds:
+                    for owner in self._listed_in.pop(user_id, set()):
+                        self._drop(owner)
+            while len(self._invalidated) > _MAX_TRACKED_INVALIDATIONS:
+                _user_id, tick = self._invalidated.popitem(last=False)
+                self._invalidated_floor = tick
+
+    def recently_read(self, *, within_seconds: float, refresh_before_seconds: float) -> list[UUID]:
+        """Recently read users (newest first) whose feed is missing or about to expire."""
+
+        now = self._clock()
+        stale_after = self.ttl_seconds - refresh_before_seconds
+        with self._lock:
+            due: list[UUID] = []
+            for user_id, read_at in reversed(self._last_read.items()):
+                if now - read_at > within_seconds:
+                    break
+                feed = self._feeds.get(user_id)
+                if feed is None or now - feed.built_at >= stale_after:
+                    due.append(user_id)
+            return due
+
+    def _valid_since(self, token: int, user_ids: list[UUID]) -> bool:
+        if token < self._invalidated_floor:
+            return False
+        return all(self._invalidated.get(user_id, 0) <= token for user_id in user_ids)
+
+    def _drop(self, user_id: UUID) -> None:
+        feed = self._feeds.pop(user_id, None)
+        if feed is None:
+            return
+        for match in feed.items:
+            owners = self._listed_in.get(match.user_id)
+            if owners is not None:
+                owners.discard(user_id)
+                if not owners:
+                    del self._listed_in[match.user_id]
+
+
+match_feed_cache = MatchFeedCache(
+    max_entries=settings.match_feed_max_entries, ttl_seconds=settings.match_feed_ttl_seconds
+)
+
+
+def invalidate_match_feeds(
+    user_ids: Iterable[UUID],
+    *,
+    listing_feeds: bool = True,
+    cache: MatchFeedCache = match_feed_cache,
+) -> None:
+    """Post-commit hook for writes that change who matches whom (see `MatchFeedCache`).
+
+    Friend requests only change the two parties' own exclusions, so they pass
+    `listing_feeds=False`; profile and hobby edits change how the user scores for everyone.
+    """
+
+    cache.invalidate_users(user_ids, listing_feeds=listing_feeds)
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass
+import hashlib
+from collections import defaultdict
+from dataclasses import dataclass
 from statistics import mean
 from uuid import UUID
 
@@ -13,9 +15,11 @@ from app.models.restaurant_rating import RestaurantRating
 from app.models.user import User
 
 PREFERENCE_PROFILE_EMBEDDING_VERSION = "preference_profile_v1"
+# Users per chunk in the batch builder; keeps `IN (...)` lists well under driver parameter limits.
+PROFILE_BATCH_CHUNK_SIZE = 500
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RatedRestaurantSignal:
     restaurant_id: int
     name: str
@@ -24,7 +28,7 @@ class RatedRestaurantSignal:
     would_return: bool | None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PreferenceProfileFeatures:
     hobbies: list[str]
     diet_tags: list[str]
@@ -39,7 +43,7 @@ class PreferenceProfileFeatures:
     negative_rating_count: int
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PreferenceProfileMetadata:
     user_id: UUID
     discoverable: bool
@@ -52,7 +56,7 @@ class PreferenceProfileMetadata:
     birth_year: int | None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PreferenceProfile:
     user_id: UUID
     embedding_version: str
@@ -61,22 +65,126 @@ class PreferenceProfile:
     text_for_embedding: str
 
     def as_dict(self) -> dict:
+        # Built field by field: `dataclasses.asdict` deep-copies every nested list and signal.
+        features = self.features
         return {
             "user_id": str(self.user_id),
             "embedding_version": self.embedding_version,
-            "metadata": asdict(self.metadata),
+            "metadata": _metadata_dict(self.metadata),
             "features": {
-                **{
-                    k: v
-                    for k, v in asdict(self.features).items()
-                    if k not in {"liked_restaurants", "disliked_restaurants"}
-                },
-                "liked_restaurants": [asdict(item) for item in self.features.liked_restaurants],
-                "disliked_restaurants": [asdict(item) for item in self.features.disliked_restaurants],
+                "hobbies": list(features.hobbies),
+                "diet_tags": list(features.diet_tags),
+                "vibe_tags": list(features.vibe_tags),
+                "liked_cuisines": list(features.liked_cuisines),
+                "disliked_cuisines": list(features.disliked_cuisines),
+                "liked_restaurants": [_signal_dict(item) for item in features.liked_restaurants],
+                "disliked_restaurants": [
+                    _signal_dict(item) for item in features.disliked_restaurants
+                ],
+                "rating_count": features.rating_count,
+                "avg_rating": features.avg_rating,
+                "positive_rating_count": features.positive_rating_count,
+                "negative_rating_count": features.negative_rating_count,
             },
             "text_for_embedding": self.text_for_embedding,
         }
 
+    def embedding_input(self) -> PreferenceProfileEmbeddingInput:
+        return PreferenceProfileEmbeddingInput(
+            user_id=self.user_id,
+            embedding_version=self.embedding_version,
+            metadata=self.metadata,
+            hobbies=self.features.hobbies,
+            diet_tags=self.features.diet_tags,
+            vibe_tags=self.features.vibe_tags,
+            text_for_embedding=self.text_for_embedding,
+            content_hash=source_content_hash(self.text_for_embedding),
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict) -> PreferenceProfile:
+        """Inverse of `as_dict`, used to load materialized profiles."""
+
+        features = dict(data["features"])
+        for key in ("liked_restaurants", "disliked_restaurants"):
+            features[key] = [RatedRestaurantSignal(**item) for item in features[key]]
+        return cls(
+            user_id=UUID(data["user_id"]),
+            embedding_version=data["embedding_version"],
+            metadata=_metadata_from_dict(data["metadata"]),
+            features=PreferenceProfileFeatures(**features),
+            text_for_embedding=data["text_for_embedding"],
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class PreferenceProfileEmbeddingInput:
+    """What the embedding pipeline needs from a profile: text, hash and vector metadata.
+
+    Loading this from a materialized profile skips the restaurant signal lists entirely.
+    """
+
+    user_id: UUID
+    embedding_version: str
+    metadata: PreferenceProfileMetadata
+    hobbies: list[str]
+    diet_tags: list[str]
+    vibe_tags: list[str]
+    text_for_embedding: str
+    content_hash: str
+
+    @classmethod
+    def from_profile_dict(
+        cls, data: dict, *, content_hash: str | None = None
+    ) -> PreferenceProfileEmbeddingInput:
+        """Read the embedding fields of a `PreferenceProfile.as_dict()` payload."""
+
+        features = data["features"]
+        text = data["text_for_embedding"]
+        return cls(
+            user_id=UUID(data["user_id"]),
+            embedding_version=data["embedding_version"],
+            metadata=_metadata_from_dict(data["metadata"]),
+            hobbies=features["hobbies"],
+            diet_tags=features["diet_tags"],
+            vibe_tags=features["vibe_tags"],
+            text_for_embedding=text,
+            content_hash=content_hash or source_content_hash(text),
+        )
+
+
+def _signal_dict(signal: RatedRestaurantSignal) -> dict:
+    return {
+        "restaurant_id": signal.restaurant_id,
+        "name": signal.name,
+        "cuisine": signal.cuisine,
+        "rating": signal.rating,
+        "would_return": signal.would_return,
+    }
+
+
+def _metadata_dict(metadata: PreferenceProfileMetadata) -> dict:
+    return {
+        "user_id": str(metadata.user_id),
+        "discoverable": metadata.discoverable,
+        "open_to_meetups": metadata.open_to_meetups,
+        "neighborhood": metadata.neighborhood,
+        "geohash": metadata.geohash,
+        "budget_min": metadata.budget_min,
+        "budget_max": metadata.budget_max,
+        "gender": metadata.gender,
+        "birth_year": metadata.birth_year,
+    }
+
+
+def _metadata_from_dict(data: dict) -> PreferenceProfileMetadata:
+    return PreferenceProfileMetadata(**{**data, "user_id": UUID(data["user_id"])})
+
+
+def source_content_hash(text: str) -> str:
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return f"sha256:{digest}"
+
 
 def _normalize_list(values: list[str] | None) -> list[str]:
     seen: set[str] = set()
@@ -139,12 +247,14 @@ def _build_features(user: User, rating_rows: list[tuple[RestaurantRating, Restau
     disliked_cuisines: set[str] = set()
 
     for rating, restaurant in rating_rows:
-        signal = _restaurant_signal(rating, restaurant)
+        # Neutral ratings only count towards the summary, so skip building their signal.
         if _is_positive_rating(rating):
+            signal = _restaurant_signal(rating, restaurant)
             liked_restaurants.append(signal)
             if signal.cuisine:
                 liked_cuisines.add(signal.cuisine)
         elif _is_negative_rating(rating):
+            signal = _restaurant_signal(rating, restaurant)
             disliked_restaurants.append(signal)
             if signal.cuisine:
                 disliked_cuisines.add(signal.cuisine)
@@ -215,14 +325,11 @@ def _build_text_for_embedding(metadata: PreferenceProfileMetadata, features: Pre
     return "\n".join(lines)
 
 
-def build_preference_profile(db: Session, user_id: UUID) -> PreferenceProfile:
-    user = db.get(User, user_id)
-    if user is None:
-        raise ValueError(f"User not found: {user_id}")
-
-    hobby_codes = _load_user_hobby_codes(db, user.id)
-    rating_rows = _load_restaurant_ratings_with_restaurants(db, user.id)
-
+def _build_profile(
+    user: User,
+    hobby_codes: list[str],
+    rating_rows: list[tuple[RestaurantRating, Restaurant]],
+) -> PreferenceProfile:
     metadata = _build_metadata(user)
     features = _build_features(user, rating_rows, hobby_codes)
     text_for_embedding = _build_text_for_embedding(metadata, features)
@@ -234,3 +341,82 @@ def build_preference_profile(db: Session, user_id: UUID) -> PreferenceProfile:
         features=features,
         text_for_embedding=text_for_embedding,
     )
+
+
+def build_preference_profile(db: Session, user_id: UUID) -> PreferenceProfile:
+    user = db.get(User, user_id)
+    if user is None:
+        raise ValueError(f"User not found: {user_id}")
+
+    hobby_codes = _load_user_hobby_codes(db, user.id)
+    rating_rows = _load_restaurant_ratings_with_restaurants(db, user.id)
+    return _build_profile(user, hobby_codes, rating_rows)
+
+
+def _load_hobby_codes_by_user(db: Session, user_ids: list[UUID]) -> dict[UUID, list[str]]:
+    stmt = (
+        select(UserHobby.user_id, HobbyCatalog.code)
+        .join(HobbyCatalog, HobbyCatalog.id == UserHobby.hobby_id)
+        .where(UserHobby.user_id.in_(user_ids))
+        .order_by(UserHobby.user_id.asc(), HobbyCatalog.code.asc())
+    )
+    grouped: dict[UUID, list[str]] = defaultdict(list)
+    for user_id, code in db.execute(stmt):
+        grouped[user_id].append(code)
+    return grouped
+
+
+def _load_rating_rows_by_user(
+    db: Session, user_ids: list[UUID]
+) -> dict[UUID, list[tuple[RestaurantRating, Restaurant]]]:
+    # Same per-user ordering as `_load_restaurant_ratings_with_restaurants`.
+    stmt = (
+        select(RestaurantRating, Restaurant)
+        .join(Restaurant, Restaurant.id == RestaurantRating.restaurant_id)
+        .where(RestaurantRating.user_id.in_(user_ids))
+        .order_by(
+            RestaurantRating.user_id.asc(),
+            RestaurantRating.updated_at.desc(),
+            RestaurantRating.id.asc(),
+        )
+    )
+    grouped: dict[UUID, list[tuple[RestaurantRating, Restaurant]]] = defaultdict(list)
+    for rating, restaurant in db.execute(stmt):
+        grouped[rating.user_id].append((rating, restaurant))
+    return grouped
+
+
+def build_preference_profiles_batch(
+    db: Session,
+    user_ids: list[UUID],
+    *,
+    chunk_size: int = PROFILE_BATCH_CHUNK_SIZE,
+) -> list[PreferenceProfile]:
+    """Set-based `build_preference_profile` for many users.
+
+    Each chunk costs three `IN` queries (users, hobbies, ratings joined to restaurants) instead of
+    three queries per user. Output order follows `user_ids`, and each profile is identical to what
+    the single-user builder returns. Raises `ValueError` if any user is missing.
+    """
+
+    profiles: list[PreferenceProfile] = []
+    step = max(1, chunk_size)
+    for start in range(0, len(user_ids), step):
+        chunk = user_ids[start : start + step]
+        unique_ids = list(dict.fromkeys(chunk))
+
+        users = {user.id: user for user in db.scalars(select(User).where(User.id.in_(unique_ids)))}
+        missing = [user_id for user_id in unique_ids if user_id not in users]
+        if missing:
+            raise ValueError(f"User not found: {missing[0]}")
+
+        hobby_codes = _load_hobby_codes_by_user(db, unique_ids)
+        rating_rows = _load_rating_rows_by_user(db, unique_ids)
+        built = {
+            user_id: _build_profile(
+                users[user_id], hobby_codes.get(user_id, []), rating_rows.get(user_id, [])
+            )
+            for user_id in unique_ids
+        }
+        profiles.extend(built[user_id] for user_id in chunk)
+    return profiles
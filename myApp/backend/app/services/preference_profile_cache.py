@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime, timezone
+from typing import TypeVar
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.crud.preference_profile import (
+    list_user_preference_profiles,
+    store_user_preference_profiles,
+)
+from app.models.preference_profile import UserPreferenceProfile
+from app.services.preference_profile_builder import (
+    PREFERENCE_PROFILE_EMBEDDING_VERSION,
+    PROFILE_BATCH_CHUNK_SIZE,
+    PreferenceProfile,
+    PreferenceProfileEmbeddingInput,
+    build_preference_profiles_batch,
+    source_content_hash,
+)
+
+T = TypeVar("T")
+
+
+def _is_fresh(row: UserPreferenceProfile) -> bool:
+    return row.profile is not None and row.profile_version == PREFERENCE_PROFILE_EMBEDDING_VERSION
+
+
+def _stored_row(profile: PreferenceProfile, *, now: datetime) -> dict:
+    return {
+        "user_id": profile.user_id,
+        "profile_version": profile.embedding_version,
+        "profile": profile.as_dict(),
+        "text_for_embedding": profile.text_for_embedding,
+        "content_hash": source_content_hash(profile.text_for_embedding),
+        "built_at": now,
+    }
+
+
+def _load_materialized_batch(
+    db: Session,
+    user_ids: list[UUID],
+    *,
+    chunk_size: int,
+    from_row: Callable[[UserPreferenceProfile], T],
+    from_profile: Callable[[PreferenceProfile], T],
+) -> list[T]:
+    items: list[T] = []
+    step = max(1, chunk_size)
+    for start in range(0, len(user_ids), step):
+        chunk = user_ids[start : start + step]
+        unique_ids = list(dict.fromkeys(chunk))
+
+        rows = {row.user_id: row for row in list_user_preference_profiles(db, user_ids=unique_ids)}
+        loaded = {user_id: from_row(row) for user_id, row in rows.items() if _is_fresh(row)}
+        stale_ids = [user_id for user_id in unique_ids if user_id not in loaded]
+        if stale_ids:
+            # Read generations before building so a write landing mid-build makes the store a no-op.
+            generations = {
+                user_id: rows[user_id].generation for user_id in stale_ids if user_id in rows
+            }
+            built = build_preference_profiles_batch(db, stale_ids, chunk_size=step)
+            now = datetime.now(timezone.utc)
+            # Flush only: the rows ride the caller's transaction instead of committing its
+            # pending changes halfway through a request.
+            store_user_preference_profiles(
+                db,
+                rows=[_stored_row(profile, now=now) for profile in built],
+                generations=generations,
+                commit=False,
+            )
+            db.flush()
+            loaded.update((profile.user_id, from_profile(profile)) for profile in built)
+        items.extend(loaded[user_id] for user_id in chunk)
+    return items
+
+
+def get_preference_profiles_batch(
+    db: Session,
+    user_ids: list[UUID],
+    *,
+    chunk_size: int = PROFILE_BATCH_CHUNK_SIZE,
+) -> list[PreferenceProfile]:
+    """`build_preference_profiles_batch` backed by the `user_preference_profiles` table.
+
+    Materialized rows are served with one primary-key `IN` query per chunk; only users whose row is
+    missing, invalidated or built by an older profile version go through the builder, and their
+    results are written back (flushed, persisted when the caller commits). Output order follows
+    `user_ids`; raises `ValueError` if any user is missing.
+    """
+
+    return _load_materialized_batch(
+        db,
+        user_ids,
+        chunk_size=chunk_size,
+        from_row=lambda row: PreferenceProfile.from_dict(row.profile),
+        from_profile=lambda profile: profile,
+    )
+
+
+def get_preference_profile(db: Session, user_id: UUID) -> PreferenceProfile:
+    return get_preference_profiles_batch(db, [user_id])[0]
+
+
+def get_preference_profile_embedding_inputs_batch(
+    db: Session,
+    user_ids: list[UUID],
+    *,
+    chunk_size: int = PROFILE_BATCH_CHUNK_SIZE,
+) -> list[PreferenceProfileEmbeddingInput]:
+    """Embedding-only view of `get_preference_profiles_batch`.
+
+    Materialized rows are read straight into `PreferenceProfileEmbeddingInput` with the stored
+    content hash, without rebuilding restaurant signals or `PreferenceProfile` objects.
+    """
+
+    return _load_materialized_batch(
+        db,
+        user_ids,
+        chunk_size=chunk_size,
+        from_row=lambda row: PreferenceProfileEmbeddingInput.from_profile_dict(
+            row.profile, content_hash=row.content_hash
+        ),
+        from_profile=lambda profile: profile.embedding_input(),
+    )
@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import heapq
+import threading
+from collections.abc import Iterable
+from math import cos, floor, radians
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.restaurant import Restaurant
+from app.services.geo import haversine_km_many
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    np = None  # type: ignore[assignment]
+
+# ~5.5 km cells: a city-sized radius touches a handful of cells.
+DEFAULT_CELL_DEGREES = 0.05
+_KM_PER_DEGREE_LAT = 110.574
+_KM_PER_DEGREE_LON_EQUATOR = 111.320
+
+Cell = tuple[int, int]
+
+
+def _bounding_box(
+    latitude: float, longitude: float, radius_km: float
+) -> tuple[float, float, float | None, float | None]:
+    """`(lat_min, lat_max, lon_min, lon_max)` around a circle; no longitude bounds near a pole
+    or across the antimeridian."""
+
+    d_lat = radius_km / _KM_PER_DEGREE_LAT
+    lat_min, lat_max = max(-90.0, latitude - d_lat), min(90.0, latitude + d_lat)
+    lon_scale = _KM_PER_DEGREE_LON_EQUATOR * cos(radians(max(abs(lat_min), abs(lat_max))))
+    if lon_scale <= 0 or radius_km / lon_scale >= 180.0:
+        return lat_min, lat_max, None, None
+    d_lon = radius_km / lon_scale
+    if longitude - d_lon < -180.0 or longitude + d_lon > 180.0:
+        return lat_min, lat_max, None, None
+    return lat_min, lat_max, longitude - d_lon, longitude + d_lon
+
+
+class RestaurantSpatialIndex:
+    """Process-level uniform lat/lon grid over restaurant coordinates.
+
+    Radius and k-nearest queries walk rings of grid cells outwards from the query point and
+    compute exact distances for the gathered points in one vectorized haversine pass, stopping as
+    soon as the ring walk provably covers the answer. Restaurants without coordinates are not
+    indexed. Like the hobby index it starts unready: `build_restaurant_spatial_index` loads it and
+    `refresh_restaurant_spatial_index` keeps it current after restaurant writes.
+    """
+
+    def __init__(self, *, cell_degrees: float = DEFAULT_CELL_DEGREES) -> None:
+        self.cell_degrees = cell_degrees
+        self._lon_cells = max(1, round(360.0 / cell_degrees))
+        self._lat_cells = max(1, round(180.0 / cell_degrees))
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._ready = False
+        self._cells: dict[Cell, list[int]] = {}
+        self._slot_of: dict[int, int] = {}
+        self._ids: list[int] = []
+        self._lats: list[float] = []
+        self._lons: list[float] = []
+        self._free: list[int] = []
+        self._coords = None  # Lazily built (lats, lons) float64 arrays.
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reset()
+
+    def load(self, rows: Iterable[tuple[int, float | None, float | None]]) -> None:
+        """Replace the index with `(restaurant_id, latitude, longitude)` rows."""
+
+        with self._lock:
+            self._reset()
+            for restaurant_id, latitude, longitude in rows:
+                self._insert(restaurant_id, latitude, longitude)
+            self._ready = True
+
+    def upsert(self, restaurant_id: int, latitude: float | None, longitude: float | None) -> None:
+        with self._lock:
+            self.remove(restaurant_id)
+            self._insert(restaurant_id, latitude, longitude)
+
+    def remove(self, restaurant_id: int) -> None:
+        with self._lock:
+            slot = self._slot_of.pop(restaurant_id, None)
+            if slot is None:
+                return
+            cell = self._cell(self._lats[slot], self._lons[slot])
+            self._cells[cell].remove(slot)
+            if not self._cells[cell]:
+                del self._cells[cell]
+            self._ids[slot] = -1
+            self._free.append(slot)
+
+    def nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        *,
+        limit: int,
+        radius_km: float | None = None,
+    ) -> list[tuple[int, float]]:
+        """Up to `limit` `(restaurant_id, distance_km)` pairs, closest first."""
+
+        with self._lock:
+            if not self._slot_of or limit <= 0:
+                return []
+            center_x, center_y = self._cell(latitude, longitude)
+            best: list[tuple[float, int]] = []  # min-heap of (-distance, restaurant_id)
+            ring = 0
+            while True:
+                if 8 * ring > len(self._cells):
+                    # The next ring has more cells than the grid has occupied ones: scan them all.
+                    best = []
+                    self._collect(
+                        list(self._slot_of.values()),
+                        latitude,
+                        longitude,
+                        best=best,
+                        limit=limit,
+                        radius_km=radius_km,
+                    )
+                    break
+                slots = [
+                    slot
+                    for cell in self._ring_cells(center_x, center_y, ring)
+                    for slot in self._cells.get(cell, ())
+                ]
+                self._collect(
+                    slots, latitude, longitude, best=best, limit=limit, radius_km=radius_km
+                )
+                # Everything closer than `covered` lies inside the rings walked so far.
+                covered = self._covered_radius_km(latitude, ring)
+                if radius_km is not None and covered >= radius_km:
+                    break
+                if len(best) == limit and -best[0][0] <= covered:
+                    break
+                ring += 1
+            return [(restaurant_id, -neg) for neg, restaurant_id in sorted(best, reverse=True)]
+
+    def _collect(
+        self,
+        slots: list[int],
+        latitude: float,
+        longitude: float,
+        *,
+        best: list[tuple[float, int]],
+        limit: int,
+        radius_km: float | None,
+    ) -> None:
+        if not slots:
+            return
+        lats, lons = self._coordinate_arrays()
+        if np is not None:
+            index = np.fromiter(slots, dtype=np.int64, count=len(slots))
+            distances = haversine_km_many(latitude, longitude, lats[index], lons[index])
+        else:
+            distances = haversine_km_many(
+                latitude, longitude, [lats[slot] for slot in slots], [lons[slot] for slot in slots]
+            )
+        for slot, distance in zip(slots, distances, strict=True):
+            if radius_km is not None and distance > radius_km:
+                continue
+            item = (-distance, self._ids[slot])
+            if len(best) < limit:
+                heapq.heappush(best, item)
+            elif item > best[0]:
+                heapq.heapreplace(best, item)
+
+    def _insert(self, restaurant_id: int, latitude: float | None, longitude: float | None) -> None:
+        if latitude is None or longitude is None:
+            return
+        if not -90.0 <= latitude <= 90.0 or not -180.0 <= longitude <= 180.0:
+            return
+        if self._free:
+            slot = self._free.pop()
+            self._ids[slot], self._lats[slot], self._lons[slot] = restaurant_id, latitude, longitude
+        else:
+            slot = len(self._ids)
+            self._ids.append(restaurant_id)
+            self._lats.append(latitude)
+            self._lons.append(longitude)
+        self._slot_of[restaurant_id] = slot
+        self._cells.setdefault(self._cell(latitude, longitude), []).append(slot)
+        self._coords = None
+
+    def _coordinate_arrays(self):
+        if np is None:
+            return self._lats, self._lons
+        if self._coords is None:
+            self._coords = (
+                np.asarray(self._lats, dtype=np.float64),
+                np.asarray(self._lons, dtype=np.float64),
+            )
+        return self._coords
+
+    def _cell(self, latitude: float, longitude: float) -> Cell:
+        x = floor((longitude + 180.0) / self.cell_degrees) % self._lon_cells
+        y = min(floor((latitude + 90.0) / self.cell_degrees), self._lat_cells - 1)
+        return x, y
+
+    def _ring_cells(self, center_x: int, center_y: int, ring: int) -> list[Cell]:
+        if ring == 0:
+            return [(center_x, center_y)]
+        cells: set[Cell] = set()
+        for dx in range(-ring, ring + 1):
+            for dy in (-ring, ring) if abs(dx) != ring else range(-ring, ring + 1):
+                y = center_y + dy
+                if 0 <= y < self._lat_cells:
+                    cells.add(((center_x + dx) % self._lon_cells, y))
+        return list(cells)
+
+    def _covered_radius_km(self, latitude: float, ring: int) -> float:
+        # Lower bound on the distance from the query point to the edge of the walked block.
+        span = ring * self.cell_degrees
+        edge_latitude = min(90.0, abs(latitude) + span + self.cell_degrees)
+        height = span * _KM_PER_DEGREE_LAT
+        width = span * _KM_PER_DEGREE_LON_EQUATOR * cos(radians(edge_latitude))
+        return min(height, width)
+
+
+restaurant_spatial_index = RestaurantSpatialIndex()
+
+
+def _coordinate_rows(
+    db: Session, bounds: tuple[float, float, float | None, float | None] | None = None
+) -> list[tuple[int, float, float]]:
+    stmt = select(Restaurant.id, Restaurant.latitude, Restaurant.longitude).where(
+        Restaurant.latitude.is_not(None), Restaurant.longitude.is_not(None)
+    )
+    if bounds is not None:
+        lat_min, lat_max, lon_min, lon_max = bounds
+        stmt = stmt.where(Restaurant.latitude.between(lat_min, lat_max))
+        if lon_min is not None and lon_max is not None:
+            stmt = stmt.where(Restaurant.longitude.between(lon_min, lon_max))
+    return [(row[0], row[1], row[2]) for row in db.execute(stmt)]
+
+
+def build_restaurant_spatial_index(
+    db: Session, index: RestaurantSpatialIndex = restaurant_spatial_index
+) -> RestaurantSpatialIndex:
+    index.load(_coordinate_rows(db))
+    return index
+
+
+def restaurant_index_for_regions(
+    db: Session,
+    regions: Iterable[tuple[float, float, float]],
+    index: RestaurantSpatialIndex = restaurant_spatial_index,
+) -> RestaurantSpatialIndex:
+    """An index that can answer queries inside every `(latitude, longitude, radius_km)` region.
+
+    That is the process-level index when it is ready; otherwise a throwaway index loaded by one
+    query over the bounding box that encloses all regions, so a batch of lookups costs one scan.
+    """
+
+    if index.ready:
+        return index
+    boxes = [_bounding_box(latitude, longitude, radius) for latitude, longitude, radius in regions]
+    local = RestaurantSpatialIndex(cell_degrees=index.cell_degrees)
+    if not boxes:
+        local.load(())
+        return local
+    unbounded_lon = any(box[2] is None for box in boxes)
+    bounds = (
+        min(box[0] for box in boxes),
+        max(box[1] for box in boxes),
+        None if unbounded_lon else min(box[2] for box in boxes),
+        None if unbounded_lon else max(box[3] for box in boxes),
+    )
+    local.load(_coordinate_rows(db, bounds=bounds))
+    return local
+
+
+def refresh_restaurant_spatial_index(
+    restaurant_id: int,
+    latitude: float | None,
+    longitude: float | None,
+    index: RestaurantSpatialIndex = restaurant_spatial_index,
+) -> None:
+    """Post-commit hook for restaurant writes. No-op until the index is built."""
+
+    if index.ready:
+        index.upsert(restaurant_id, latitude, longitude)
+
+
+def find_nearby_restaurants(
+    db: Session,
+    *,
+    latitude: float,
+    longitude: float,
+    radius_km: float,
+    limit: int,
+    index: RestaurantSpatialIndex = restaurant_spatial_index,
+) -> list[tuple[int, float]]:
+    """`(restaurant_id, distance_km)` within `radius_km`, closest first.
+
+    Served by the spatial index when it is ready, otherwise by a bounding-box query refined with
+    the same vectorized haversine.
+    """
+
+    if index.ready:
+        return index.nearest(latitude, longitude, limit=limit, radius_km=radius_km)
+    rows = _coordinate_rows(db, bounds=_bounding_box(latitude, longitude, radius_km))
+    distances = haversine_km_many(
+        latitude, longitude, [row[1] for row in rows], [row[2] for row in rows]
+    )
+    within = [
+        (distance, row[0])
+        for row, distance in zip(rows, distances, strict=True)
+        if distance <= radius_km
+    ]
+    return [(restaurant_id, distance) for distance, restaurant_id in heapq.nsmallest(limit, within)]
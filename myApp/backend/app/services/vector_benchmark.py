@@ -0,0 +1,397 @@
+from __future__ import annotations
+
+import math
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from app.core.config import Settings
+from app.services.actian_vector_store import ActianVectorStoreAdapter, ActianVectorStoreConfig
+from app.services.in_process_cortex import InProcessCortexClient, cosine_similarity
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    np = None  # type: ignore[assignment]
+
+
+BACKEND_ADAPTER = "adapter"
+BACKEND_IN_PROCESS = "in_process"
+
+BENCHMARK_ENTITY_TYPE = "benchmark_probe"
+# Far above IDs handed out by the mapping allocator and the diagnostics probe range.
+BENCHMARK_POINT_ID_BASE = 4_000_000_000
+
+
+@dataclass(frozen=True)
+class VectorBenchmarkConfig:
+    dimension: int
+    num_points: int = 1000
+    batch_sizes: tuple[int, ...] = (100,)
+    num_searches: int = 100
+    search_concurrency: int = 4
+    top_k: int = 10
+    filter_queries: bool = False
+    filter_shards: int = 4
+    compute_recall: bool = True
+    cleanup: bool = True
+    seed: int = 42
+
+
+@dataclass(frozen=True)
+class LatencySummary:
+    count: int
+    mean_ms: float | None
+    p50_ms: float | None
+    p95_ms: float | None
+    p99_ms: float | None
+    max_ms: float | None
+
+
+@dataclass(frozen=True)
+class UpsertSweepResult:
+    batch_size: int
+    points: int
+    batches: int
+    elapsed_ms: float
+    points_per_second: float
+    batch_latency: LatencySummary
+
+
+@dataclass(frozen=True)
+class SearchBenchmarkResult:
+    label: str
+    queries: int
+    concurrency: int
+    top_k: int
+    errors: int
+    elapsed_ms: float
+    queries_per_second: float
+    latency: LatencySummary
+    recall_at_k: float | None
+
+
+@dataclass
+class VectorBenchmarkReport:
+    dimension: int
+    num_points: int
+    upserts: list[UpsertSweepResult] = field(default_factory=list)
+    searches: list[SearchBenchmarkResult] = field(default_factory=list)
+    cleanup_deleted: int = 0
+    warnings: list[str] = field(default_factory=list)
+
+
+def build_benchmark_adapter(
+    db: Session,
+    *,
+    settings: Settings,
+    backend: str,
+    dimension: int | None = None,
+) -> ActianVectorStoreAdapter:
+    """Adapter for a benchmark run: the configured Cortex server, or an in-process fake client.
+
+    The in-process backend still goes through `ActianVectorStoreAdapter`, so both backends pay the
+    same adapter overhead and only the client differs.
+    """
+
+    cfg = ActianVectorStoreConfig.from_settings(settings)
+    resolved_dimension = dimension or cfg.dimension
+    if resolved_dimension is None or resolved_dimension <= 0:
+        raise ValueError(
+            "Vector dimension is required. Set VECTORAI_DIMENSION or pass a dimension."
+        )
+    cfg = replace(cfg, dimension=resolved_dimension)
+    if backend == BACKEND_IN_PROCESS:
+        return ActianVectorStoreAdapter(
+            db=db,
+            config=replace(cfg, collection_name="in_process"),
+            client=InProcessCortexClient(dimension=resolved_dimension),
+        )
+    if backend != BACKEND_ADAPTER:
+        raise ValueError(f"Unknown benchmark backend: {backend!r}")
+    return ActianVectorStoreAdapter(db=db, config=cfg)
+
+
+def summarize_latencies(samples_ms: list[float]) -> LatencySummary:
+    if not samples_ms:
+        return LatencySummary(0, None, None, None, None, None)
+    ordered = sorted(samples_ms)
+
+    def pct(value: float) -> float:
+        # Nearest-rank percentile.
+        rank = max(1, math.ceil(value / 100.0 * len(ordered)))
+        return ordered[rank - 1]
+
+    return LatencySummary(
+        count=len(ordered),
+        mean_ms=sum(ordered) / len(ordered),
+        p50_ms=pct(50),
+        p95_ms=pct(95),
+        p99_ms=pct(99),
+        max_ms=ordered[-1],
+    )
+
+
+def _synthetic_vectors(count: int, dimension: int, seed: int) -> list[list[float]]:
+    if np is not None:
+        rng = np.random.default_rng(seed)
+        return rng.standard_normal((count, dimension), dtype=np.float32).tolist()
+    rng_py = random.Random(seed)
+    return [[rng_py.gauss(0.0, 1.0) for _ in range(dimension)] for _ in range(count)]
+
+
+def _exact_top_k(
+    vectors: list[list[float]],
+    queries: list[list[float]],
+    *,
+    top_k: int,
+    candidate_indexes: list[list[int]] | None = None,
+) -> list[list[int]]:
+    """Brute-force cosine baseline; returns benchmark point indexes per query."""
+
+    results: list[list[int]] = []
+    if np is not None:
+        matrix = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix = matrix / norms
+        for qi, query in enumerate(queries):
+            q = np.asarray(query, dtype=np.float32)
+            q = q / (float(np.linalg.norm(q)) or 1.0)
+            if candidate_indexes is None:
+                idx = np.arange(len(vectors))
+            else:
+                idx = np.asarray(candidate_indexes[qi], dtype=np.int64)
+            if idx.size == 0:
+                results.append([])
+                continue
+            scores = matrix[idx] @ q
+            order = np.argsort(-scores, kind="stable")[:top_k]
+            results.append([int(idx[i]) for i in order])
+        return results
+
+    for qi, query in enumerate(queries):
+        idx = range(len(vectors)) if candidate_indexes is None else candidate_indexes[qi]
+        scored = sorted(idx, key=lambda i: -cosine_similarity(query, vectors[i]))
+        results.append(list(scored[:top_k]))
+    return results
+
+
+def _search(
+    adapter: ActianVectorStoreAdapter, query: list[float], top_k: int, search_filter: Any
+) -> list:
+    return adapter.search_points(query, top_k=top_k, search_filter=search_filter)
+
+
+def _result_point_id(item: Any) -> int | None:
+    if isinstance(item, dict):
+        value = item.get("id", item.get("point_id"))
+    else:
+        value = getattr(item, "id", None)
+        if value is None:
+            value = getattr(item, "point_id", None)
+    return int(value) if value is not None else None
+
+
+def _shard_filter(shard: int) -> Any:
+    try:
+        from cortex.filters.dsl import Field, Filter  # type: ignore
+    except Exception:
+        # The in-process client accepts plain equality dicts.
+        return {"benchmark_shard": shard}
+    return Filter().must(Field("benchmark_shard").eq(shard))
+
+
+def _run_search_phase(
+    adapter: ActianVectorStoreAdapter,
+    *,
+    label: str,
+    queries: list[list[float]],
+    filters: list[Any] | None,
+    expected: list[list[int]] | None,
+    config: VectorBenchmarkConfig,
+) -> SearchBenchmarkResult:
+    def _one(index: int) -> tuple[float, list | None]:
+        started = time.perf_counter()
+        try:
+            raw = _search(
+                adapter,
+                queries[index],
+                config.top_k,
+                filters[index] if filters is not None else None,
+            )
+        except Exception:
+            return (time.perf_counter() - started) * 1000.0, None
+        return (time.perf_counter() - started) * 1000.0, raw
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, config.search_concurrency)) as pool:
+        outcomes = list(pool.map(_one, range(len(queries))))
+    elapsed_ms = (time.perf_counter() - started) * 1000.0
+
+    latencies = [latency for latency, raw in outcomes if raw is not None]
+    errors = sum(1 for _latency, raw in outcomes if raw is None)
+
+    recall: float | None = None
+    if expected is not None:
+        hits = 0
+        possible = 0
+        for (_latency, raw), exact in zip(outcomes, expected, strict=True):
+            if raw is None:
+                continue
+            returned = {
+                point_id - BENCHMARK_POINT_ID_BASE
+                for point_id in (_result_point_id(item) for item in raw)
+                if point_id is not None
+            }
+            hits += len(returned.intersection(exact))
+            possible += len(exact)
+        recall = (hits / possible) if possible else None
+
+    completed = len(queries) - errors
+    return SearchBenchmarkResult(
+        label=label,
+        queries=len(queries),
+        concurrency=config.search_concurrency,
+        top_k=config.top_k,
+        errors=errors,
+        elapsed_ms=elapsed_ms,
+        queries_per_second=(completed / (elapsed_ms / 1000.0)) if elapsed_ms > 0 else 0.0,
+        latency=summarize_latencies(latencies),
+        recall_at_k=recall,
+    )
+
+
+def _run_phases(
+    adapter: ActianVectorStoreAdapter,
+    config: VectorBenchmarkConfig,
+    report: VectorBenchmarkReport,
+    *,
+    vectors: list[list[float]],
+    points: list[dict[str, Any]],
+) -> None:
+    """Upsert sweep plus search phases; fills `report` in place."""
+
+    shards = max(1, config.filter_shards)
+    for batch_size in config.batch_sizes:
+        batch_size = max(1, batch_size)
+        batch_latencies: list[float] = []
+        started = time.perf_counter()
+        for start in range(0, len(points), batch_size):
+            batch_started = time.perf_counter()
+            adapter.upsert_points(points[start : start + batch_size])
+            batch_latencies.append((time.perf_counter() - batch_started) * 1000.0)
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        report.upserts.append(
+            UpsertSweepResult(
+                batch_size=batch_size,
+                points=len(points),
+                batches=len(batch_latencies),
+                elapsed_ms=elapsed_ms,
+                points_per_second=(len(points) / (elapsed_ms / 1000.0)) if elapsed_ms > 0 else 0.0,
+                batch_latency=summarize_latencies(batch_latencies),
+            )
+        )
+    adapter.flush()
+
+    queries = _synthetic_vectors(config.num_searches, config.dimension, config.seed + 1)
+    expected = (
+        _exact_top_k(vectors, queries, top_k=config.top_k) if config.compute_recall else None
+    )
+    report.searches.append(
+        _run_search_phase(
+            adapter,
+            label="unfiltered",
+            queries=queries,
+            filters=None,
+            expected=expected,
+            config=config,
+        )
+    )
+
+    if config.filter_queries:
+        query_shards = [index % shards for index in range(len(queries))]
+        candidate_indexes = [
+            [i for i in range(len(vectors)) if i % shards == shard] for shard in query_shards
+        ]
+        filtered_expected = (
+            _exact_top_k(vectors, queries, top_k=config.top_k, candidate_indexes=candidate_indexes)
+            if config.compute_recall
+            else None
+        )
+        filtered = _run_search_phase(
+            adapter,
+            label="filtered",
+            queries=queries,
+            filters=[_shard_filter(shard) for shard in query_shards],
+            expected=filtered_expected,
+            config=config,
+        )
+        report.searches.append(filtered)
+        if filtered.errors == filtered.queries:
+            report.warnings.append(
+                "All filtered searches failed; server-side filtering may be unsupported."
+            )
+
+    if any(
+        result.recall_at_k is not None and result.recall_at_k < 1.0 for result in report.searches
+    ):
+        report.warnings.append(
+            "Recall is measured over benchmark points only; other points in the collection can "
+            "push them out of top_k. Use an empty collection for exact recall numbers."
+        )
+
+
+def run_vector_benchmark(
+    adapter: ActianVectorStoreAdapter,
+    config: VectorBenchmarkConfig,
+) -> VectorBenchmarkReport:
+    """Synthetic load test against whatever client the adapter wraps.
+
+    Writes `num_points` synthetic points (payload `entity_type=benchmark_probe`) once per batch
+    size in the sweep, runs concurrent searches, and scores recall@k against an exact brute-force
+    baseline over the synthetic points only. Points are removed afterwards unless `cleanup` is off.
+    """
+
+    report = VectorBenchmarkReport(dimension=config.dimension, num_points=config.num_points)
+    vectors = _synthetic_vectors(config.num_points, config.dimension, config.seed)
+    shards = max(1, config.filter_shards)
+    points = [
+        {
+            "id": BENCHMARK_POINT_ID_BASE + index,
+            "vector": vector,
+            "payload": {"entity_type": BENCHMARK_ENTITY_TYPE, "benchmark_shard": index % shards},
+        }
+        for index, vector in enumerate(vectors)
+    ]
+
+    try:
+        _run_phases(adapter, config, report, vectors=vectors, points=points)
+    finally:
+        # Points are written before anything is measured; a failed phase must not leak them.
+        if config.cleanup:
+            ids = [point["id"] for point in points]
+            adapter.delete_points(ids)
+            report.cleanup_deleted = len(ids)
+
+    return report
+
+
+__all__ = [
+    "BACKEND_ADAPTER",
+    "BACKEND_IN_PROCESS",
+    "BENCHMARK_ENTITY_TYPE",
+    "BENCHMARK_POINT_ID_BASE",
+    "LatencySummary",
+    "SearchBenchmarkResult",
+    "UpsertSweepResult",
+    "VectorBenchmarkConfig",
+    "VectorBenchmarkReport",
+    "build_benchmark_adapter",
+    "run_vector_benchmark",
+    "summarize_latencies",
+]
@@ -0,0 +1,373 @@
+from __future__ import annotations
+
+import time
+from array import array
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.crud.vector_index import (
+    create_user_vector_point_ids_bulk,
+    list_user_vector_point_ids_page,
+)
+from app.models.user import User
+from app.services.actian_vector_store import ActianVectorStoreAdapter
+from app.services.embeddings import EmbeddingProvider, upsert_user_profile_embeddings_batch
+
+RECONCILE_DEFAULT_PAGE_SIZE = 1000
+
+SCAN_MODE_SCROLL = "scroll"
+SCAN_MODE_BATCH_GET = "batch_get"
+SCAN_MODE_GET = "get"
+
+
+@dataclass(frozen=True)
+class RemotePointInfo:
+    user_id: str | None
+    embedding_version: str | None
+    source_content_hash: str | None
+
+
+@dataclass(frozen=True)
+class ReupsertItem:
+    user_id: str
+    embedding_version: str
+    reason: str
+
+
+@dataclass(frozen=True)
+class MappingFix:
+    point_id: int
+    user_id: str
+    embedding_version: str
+
+
+@dataclass
+class ReconciliationPlan:
+    provider: str
+    collection_name: str
+    embedding_version: str | None
+    scan_mode: str
+    mapping_count: int = 0
+    remote_count: int = 0
+    reupserts: list[ReupsertItem] = field(default_factory=list)
+    orphan_point_ids: list[int] = field(default_factory=list)
+    mapping_fixes: list[MappingFix] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+    @property
+    def is_clean(self) -> bool:
+        return not (self.reupserts or self.orphan_point_ids or self.mapping_fixes)
+
+
+@dataclass(frozen=True)
+class ReconciliationApplyResult:
+    deleted_orphans: int
+    fixed_mappings: int
+    reupserted: int
+
+
+def _result_as_dict(item: Any) -> dict | None:
+    if isinstance(item, dict):
+        return item
+    if hasattr(item, "model_dump"):
+        try:
+            return item.model_dump()
+        except Exception:
+            return None
+    return None
+
+
+def _parse_point(item: Any) -> tuple[int | None, dict | None]:
+    item_dict = _result_as_dict(item)
+    point_id = getattr(item, "id", None)
+    if point_id is None:
+        point_id = getattr(item, "point_id", None)
+    if point_id is None and item_dict is not None:
+        point_id = item_dict.get("id", item_dict.get("point_id"))
+    payload = getattr(item, "payload", None)
+    if payload is None and item_dict is not None:
+        payload = item_dict.get("payload")
+    return (int(point_id) if point_id is not None else None), payload
+
+
+def _remote_info(payload: dict | None) -> RemotePointInfo:
+    if not isinstance(payload, dict):
+        return RemotePointInfo(user_id=None, embedding_version=None, source_content_hash=None)
+    return RemotePointInfo(
+        user_id=payload.get("user_id"),
+        embedding_version=payload.get("embedding_version"),
+        source_content_hash=payload.get("source_content_hash"),
+    )
+
+
+def _scroll_remote_points(
+    adapter: ActianVectorStoreAdapter, *, page_size: int
+) -> Iterator[tuple[int, dict | None]]:
+    """Page through the whole collection with the SDK `scroll` call.
+
+    Accepts `(points, next_offset)` tuples or `{"points": ..., "next_offset": ...}` dicts. A plain
+    list is treated as the final page.
+    """
+
+    offset: Any = None
+    while True:
+        raw = adapter.scroll_points(offset=offset, limit=page_size)
+        if isinstance(raw, tuple) and len(raw) == 2:
+            points, next_offset = raw
+        elif isinstance(raw, dict):
+            points, next_offset = raw.get("points", []), raw.get("next_offset")
+        else:
+            points, next_offset = raw, None
+        points = list(points or [])
+        for item in points:
+            point_id, payload = _parse_point(item)
+            if point_id is not None:
+                yield point_id, payload
+        if next_offset is None or not points:
+            return
+        offset = next_offset
+
+
+def _get_remote_points(
+    adapter: ActianVectorStoreAdapter, point_ids: list[int]
+) -> tuple[dict[int, dict | None], str]:
+    """Fetch specific points, preferring a batch get over one `get` per point."""
+
+    found: dict[int, dict | None] = {}
+    if adapter.supports("batch_get"):
+        try:
+            raw = adapter.batch_get_points(point_ids)
+        except TypeError:
+            raw = None
+        if raw is not None:
+            for item in raw:
+                point_id, payload = _parse_point(item)
+                if point_id is not None:
+                    found[point_id] = payload
+            return found, SCAN_MODE_BATCH_GET
+
+    if not adapter.supports("get"):
+        raise RuntimeError("Unsupported Cortex client: scroll, batch_get and get not available")
+    for point_id in point_ids:
+        # `fetch_point` maps the SDK's not-found error to None; anything else propagates.
+        point = adapter.fetch_point(point_id)
+        if point is not None:
+            found[point_id] = point[1]
+    return found, SCAN_MODE_GET
+
+
+def _check_pair(
+    plan: ReconciliationPlan,
+    *,
+    mapped: tuple[str, str],
+    stored_content_hash: str | None,
+    remote: RemotePointInfo,
+    expected_content_hashes: Mapping[str, str] | None,
+) -> None:
+    user_id, embedding_version = mapped
+    if (remote.user_id is not None and remote.user_id != user_id) or (
+        remote.embedding_version is not None and remote.embedding_version != embedding_version
+    ):
+        plan.reupserts.append(ReupsertItem(user_id, embedding_version, "payload_mismatch"))
+        return
+    expected = (expected_content_hashes or {}).get(user_id, stored_content_hash)
+    if expected is not None and remote.source_content_hash != expected:
+        plan.reupserts.append(ReupsertItem(user_id, embedding_version, "stale_content_hash"))
+
+
+def build_reconciliation_plan(
+    db: Session,
+    *,
+    adapter: ActianVectorStoreAdapter,
+    embedding_version: str | None = None,
+    expected_content_hashes: Mapping[str, str] | None = None,
+    page_size: int = RECONCILE_DEFAULT_PAGE_SIZE,
+) -> ReconciliationPlan:
+    """Diff `user_vector_point_ids` against the vector collection and return a repair plan.
+
+    Both sides are loaded in large pages into sorted point-ID arrays and merged in one pass. A
+    point whose payload `source_content_hash` differs from its mapping row's (or from
+    `expected_content_hashes`, when given for that user) is re-upserted as stale.
+    Without SDK `scroll` support the remote side is fetched per mapping page, so orphaned points
+    (present remotely but never mapped) cannot be detected.
+    """
+
+    started = time.monotonic()
+    use_scroll = adapter.supports("scroll")
+    plan = ReconciliationPlan(
+        provider=adapter.provider,
+        collection_name=adapter.collection_name,
+        embedding_version=embedding_version,
+        scan_mode=SCAN_MODE_SCROLL if use_scroll else SCAN_MODE_BATCH_GET,
+    )
+
+    mapped_ids = array("q")
+    mapped_info: dict[int, tuple[str, str]] = {}
+    mapped_hashes: dict[int, str | None] = {}
+    remote_ids = array("q")
+    remote_info: dict[int, RemotePointInfo] = {}
+
+    after_point_id: int | None = None
+    while True:
+        rows = list_user_vector_point_ids_page(
+            db,
+            provider=adapter.provider,
+            collection_name=adapter.collection_name,
+            embedding_version=embedding_version,
+            after_point_id=after_point_id,
+            limit=page_size,
+        )
+        if not rows:
+            break
+        after_point_id = int(rows[-1].point_id)
+        page_ids = [int(row.point_id) for row in rows]
+        for row, point_id in zip(rows, page_ids, strict=True):
+            mapped_ids.append(point_id)
+            mapped_info[point_id] = (str(row.user_id), row.embedding_version)
+            mapped_hashes[point_id] = row.source_content_hash
+        if not use_scroll:
+            found, plan.scan_mode = _get_remote_points(adapter, page_ids)
+            for point_id, payload in found.items():
+                remote_ids.append(point_id)
+                remote_info[point_id] = _remote_info(payload)
+
+    if use_scroll:
+        for point_id, payload in _scroll_remote_points(adapter, page_size=page_size):
+            info = _remote_info(payload)
+            in_scope = (
+                embedding_version is None
+                or point_id in mapped_info
+                or info.embedding_version in (None, embedding_version)
+            )
+            if in_scope:
+                remote_ids.append(point_id)
+                remote_info[point_id] = info
+    remote_ids = array("q", sorted(remote_ids))
+
+    plan.mapping_count = len(mapped_ids)
+    plan.remote_count = len(remote_ids)
+
+    # Mapped (user, version) keys, used to tell fixable unmapped points from duplicates.
+    claimed_keys = set(mapped_info.values())
+    i = j = 0
+    while i < len(mapped_ids) or j < len(remote_ids):
+        mapped_id = mapped_ids[i] if i < len(mapped_ids) else None
+        remote_id = remote_ids[j] if j < len(remote_ids) else None
+        if remote_id is None or (mapped_id is not None and mapped_id < remote_id):
+            user_id, version = mapped_info[mapped_id]
+            plan.reupserts.append(ReupsertItem(user_id, version, "missing_point"))
+            i += 1
+        elif mapped_id is None or remote_id < mapped_id:
+            info = remote_info[remote_id]
+            key = (info.user_id, info.embedding_version)
+            attributable = info.user_id is not None and info.embedding_version is not None
+            if attributable and key not in claimed_keys:
+                claimed_keys.add(key)
+                plan.mapping_fixes.append(
+                    MappingFix(remote_id, info.user_id, info.embedding_version)
+                )
+            else:
+                plan.orphan_point_ids.append(remote_id)
+            j += 1
+        else:
+            _check_pair(
+                plan,
+                mapped=mapped_info[mapped_id],
+                stored_content_hash=mapped_hashes[mapped_id],
+                remote=remote_info[remote_id],
+                expected_content_hashes=expected_content_hashes,
+            )
+            i += 1
+            j += 1
+
+    plan.elapsed_ms = (time.monotonic() - started) * 1000.0
+    return plan
+
+
+def apply_reconciliation_plan(
+    db: Session,
+    *,
+    adapter: ActianVectorStoreAdapter,
+    plan: ReconciliationPlan,
+    embedder: EmbeddingProvider,
+) -> ReconciliationApplyResult:
+    """Apply a repair plan in bulk: batch delete, bulk mapping insert, batch re-upsert."""
+
+    orphan_point_ids = list(plan.orphan_point_ids)
+
+    # One fix per (user, version): the mapping table is unique on it, so extra points are orphans.
+    fixes: dict[tuple[UUID, str], MappingFix] = {}
+    for fix in plan.mapping_fixes:
+        try:
+            key = (UUID(fix.user_id), fix.embedding_version)
+        except ValueError:
+            orphan_point_ids.append(fix.point_id)
+            continue
+        if key in fixes:
+            orphan_point_ids.append(fix.point_id)
+        else:
+            fixes[key] = fix
+    existing_users: set[UUID] = set()
+    if fixes:
+        fix_user_ids = list({user_uuid for user_uuid, _version in fixes})
+        existing_users = set(db.scalars(select(User.id).where(User.id.in_(fix_user_ids))).all())
+    mapping_rows: list[dict] = []
+    for (user_uuid, version), fix in fixes.items():
+        if user_uuid not in existing_users:
+            # Points for deleted users can't be re-mapped (FK); drop them instead.
+            orphan_point_ids.append(fix.point_id)
+            continue
+        mapping_rows.append(
+            {
+                "user_id": user_uuid,
+                "provider": plan.provider,
+                "collection_name": plan.collection_name,
+                "embedding_version": version,
+                "point_id": fix.point_id,
+            }
+        )
+    # Mappings written since the plan was built win; their points are left for the next run.
+    fixed = create_user_vector_point_ids_bulk(db, rows=mapping_rows)
+
+    adapter.delete_points(orphan_point_ids)
+
+    user_ids_by_version: dict[str, list[UUID]] = {}
+    for item in plan.reupserts:
+        user_ids = user_ids_by_version.setdefault(item.embedding_version, [])
+        user_uuid = UUID(item.user_id)
+        if user_uuid not in user_ids:
+            user_ids.append(user_uuid)
+    reupserted = 0
+    upsert_chunk = max(1, adapter.config.batch_upsert_size)
+    for version, user_ids in user_ids_by_version.items():
+        for start in range(0, len(user_ids), upsert_chunk):
+            results = upsert_user_profile_embeddings_batch(
+                db,
+                user_ids=user_ids[start : start + upsert_chunk],
+                vector_store=adapter,
+                embedder=embedder,
+                embedding_version=version,
+            )
+            reupserted += len(results)
+
+    return ReconciliationApplyResult(
+        deleted_orphans=len(orphan_point_ids),
+        fixed_mappings=fixed,
+        reupserted=reupserted,
+    )
+
+
+__all__ = [
+    "MappingFix",
+    "RECONCILE_DEFAULT_PAGE_SIZE",
+    "ReconciliationApplyResult",
+    "ReconciliationPlan",
+    "ReupsertItem",
+    "apply_reconciliation_plan",
+    "build_reconciliation_plan",
+]
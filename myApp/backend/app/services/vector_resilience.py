@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+LATENCY_WINDOW_SIZE = 512
+HEDGE_MIN_SAMPLES = 20
+# Shared pool for deadline-bounded and hedged calls. Timed-out calls can't be cancelled, so the
+# pool is sized to absorb a few stuck calls without starving new ones.
+_CALL_POOL_WORKERS = 32
+
+_call_pool: ThreadPoolExecutor | None = None
+_call_pool_lock = threading.Lock()
+
+
+class VectorStoreUnavailableError(RuntimeError):
+    """Base error for calls rejected or abandoned by the resilience layer."""
+
+
+class VectorCallTimeoutError(VectorStoreUnavailableError):
+    pass
+
+
+class VectorCircuitOpenError(VectorStoreUnavailableError):
+    pass
+
+
+@dataclass(frozen=True)
+class VectorResilienceConfig:
+    request_timeout_seconds: float | None = None
+    breaker_failure_threshold: int = 5
+    breaker_reset_seconds: float = 30.0
+    hedge_search: bool = False
+    hedge_delay_ms: float = 50.0
+
+
+def _get_call_pool() -> ThreadPoolExecutor:
+    global _call_pool
+    with _call_pool_lock:
+        if _call_pool is None:
+            _call_pool = ThreadPoolExecutor(
+                max_workers=_CALL_POOL_WORKERS, thread_name_prefix="vector-call"
+            )
+        return _call_pool
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker: closed -> open -> half-open (single trial) -> closed."""
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int,
+        reset_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._failure_threshold = max(1, failure_threshold)
+        self._reset_seconds = reset_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = BREAKER_CLOSED
+        self._consecutive_failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+        self._open_count = 0
+        self._rejected_count = 0
+
+    def _refresh_locked(self) -> None:
+        if (
+            self._state == BREAKER_OPEN
+            and self._opened_at is not None
+            and self._clock() - self._opened_at >= self._reset_seconds
+        ):
+            self._state = BREAKER_HALF_OPEN
+            self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh_locked()
+            return self._state
+
+    def allow(self) -> bool:
+        with self._lock:
+            self._refresh_locked()
+            if self._state == BREAKER_CLOSED:
+                return True
+            if self._state == BREAKER_HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self._rejected_count += 1
+            return False
+
+    def release_trial(self) -> None:
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = BREAKER_CLOSED
+            self._consecutive_failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._consecutive_failures += 1
+            tripped = self._consecutive_failures >= self._failure_threshold
+            if self._state == BREAKER_HALF_OPEN or tripped:
+                if self._state != BREAKER_OPEN:
+                    self._open_count += 1
+                self._state = BREAKER_OPEN
+                self._opened_at = self._clock()
+                self._trial_in_flight = False
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            self._refresh_locked()
+            return {
+                "state": self._state,
+                "consecutive_failures": self._consecutive_failures,
+                "failure_threshold": self._failure_threshold,
+                "reset_seconds": self._reset_seconds,
+                "open_count": self._open_count,
+                "rejected_count": self._rejected_count,
+            }
+
+
+class LatencyWindow:
+    """Rolling latency sample per operation, with error/timeout counters."""
+
+    def __init__(self, size: int = LATENCY_WINDOW_SIZE) -> None:
+        self._samples: deque[float] = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.hedges = 0
+
+    def record(self, elapsed_ms: float) -> None:
+        with self._lock:
+            self.calls += 1
+            self._samples.append(elapsed_ms)
+
+    def percentile(self, pct: float) -> float | None:
+        with self._lock:
+            if not self._samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, round(pct / 100.0 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def sample_count(self) -> int:
+        with self._lock:
+            return len(self._samples)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "hedges": self.hedges,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+        }
+
+
+class VectorCallGuard:
+    """Per-backend deadlines, circuit breaking and hedged reads for vector store calls.
+
+    `TypeError` is treated as an SDK signature mismatch (the adapter retries other call shapes),
+    so it neither trips the breaker nor counts as an error.
+    """
+
+    def __init__(
+        self,
+        config: VectorResilienceConfig,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._config = config
+        self._clock = clock
+        self.breaker = CircuitBreaker(
+            failure_threshold=config.breaker_failure_threshold,
+            reset_seconds=config.breaker_reset_seconds,
+            clock=clock,
+        )
+        self._latency: dict[str, LatencyWindow] = {}
+        self._latency_lock = threading.Lock()
+
+    @property
+    def config(self) -> VectorResilienceConfig:
+        return self._config
+
+    def _window(self, operation: str) -> LatencyWindow:
+        with self._latency_lock:
+            window = self._latency.get(operation)
+            if window is None:
+                window = LatencyWindow()
+                self._latency[operation] = window
+            return window
+
+    def hedge_delay_seconds(self, operation: str) -> float:
+        window = self._window(operation)
+        floor_ms = self._config.hedge_delay_ms
+        p95 = window.percentile(95) if window.sample_count() >= HEDGE_MIN_SAMPLES else None
+        return max(floor_ms, p95 or floor_ms) / 1000.0
+
+    def call(self, operation: str, func: Callable[[], T], *, hedge: bool = False) -> T:
+        if not self.breaker.allow():
+            raise VectorCircuitOpenError(f"Vector store circuit is open; rejected {operation}")
+
+        window = self._window(operation)
+        started = self._clock()
+        try:
+            result = self._run(operation, func, hedge=hedge and self._config.hedge_search)
+        except TypeError:
+            # Signature probing, not a backend failure. Free a half-open trial slot if we held it.
+            self.breaker.release_trial()
+            raise
+        except VectorCallTimeoutError:
+            window.timeouts += 1
+            self.breaker.record_failure()
+            raise
+        except Exception:
+            window.errors += 1
+            self.breaker.record_failure()
+            raise
+        window.record((self._clock() - started) * 1000.0)
+        self.breaker.record_success()
+        return result
+
+    def _run(self, operation: str, func: Callable[[], T], *, hedge: bool) -> T:
+        timeout = self._config.request_timeout_seconds
+        if timeout is None and not hedge:
+            return func()
+
+        pool = _get_call_pool()
+        deadline = None if timeout is None else self._clock() + timeout
+        primary = pool.submit(func)
+        futures: list[Future] = [primary]
+
+        if hedge:
+            hedge_delay = self.hedge_delay_seconds(operation)
+            if deadline is not None:
+                hedge_delay = min(hedge_delay, max(0.0, deadline - self._clock()))
+            done, _pending = wait(futures, timeout=hedge_delay)
+            if not done and (deadline is None or self._clock() < deadline):
+                self._window(operation).hedges += 1
+                futures.append(pool.submit(func))
+
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - self._clock())
+            done, pending = wait(futures, timeout=remaining, return_when=FIRST_COMPLETED)
+            if not done:
+                raise VectorCallTimeoutError(
+                    f"Vector store {operation} exceeded {timeout:.3f}s deadline"
+                )
+            failed: BaseException | None = None
+            for future in done:
+                try:
+                    return future.result(timeout=0)
+                except FutureTimeoutError:  # pragma: no cover - done futures never time out
+                    continue
+                except BaseException as exc:
+                    failed = exc
+            if not pending:
+                assert failed is not None
+                raise failed
+            # One hedge leg failed; keep waiting for the other.
+            futures = list(pending)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._latency_lock:
+            operations = dict(self._latency)
+        return {
+            "breaker": self.breaker.snapshot(),
+            "request_timeout_seconds": self._config.request_timeout_seconds,
+            "hedge_search": self._config.hedge_search,
+            "hedge_delay_ms": self._config.hedge_delay_ms,
+            "operations": {name: window.snapshot() for name, window in sorted(operations.items())},
+        }
+
+
+_guards: dict[tuple[str, str], VectorCallGuard] = {}
+_guards_lock = threading.Lock()
+
+
+def get_vector_call_guard(
+    key: tuple[str, str], config: VectorResilienceConfig
+) -> VectorCallGuard:
+    """Process-wide guard per (address, collection) so breaker state survives across requests."""
+
+    with _guards_lock:
+        guard = _guards.get(key)
+        if guard is None or guard.config != config:
+            guard = VectorCallGuard(config)
+            _guards[key] = guard
+        return guard
+
+
+def peek_vector_call_guard(key: tuple[str, str]) -> VectorCallGuard | None:
+    with _guards_lock:
+        return _guards.get(key)
@@ -41,6 +41,12 @@ class VectorStoreAdapter(Protocol):
     def delete_user_profile_embeddings_for_user(self, *, user_id: str) -> int:
         ...
 
+    def delete_user_profile_embeddings_for_users(self, *, user_ids: list[str]) -> int:
+        ...
+
+    def delete_user_profile_embeddings_for_version(self, *, embedding_version: str) -> int:
+        ...
+
     def healthcheck(self) -> bool:
         ...
 
@@ -69,6 +75,12 @@ class NotImplementedVectorStoreAdapter:
     def delete_user_profile_embeddings_for_user(self, *, user_id: str) -> int:
         raise NotImplementedError("Vector store adapter not configured")
 
+    def delete_user_profile_embeddings_for_users(self, *, user_ids: list[str]) -> int:
+        raise NotImplementedError("Vector store adapter not configured")
+
+    def delete_user_profile_embeddings_for_version(self, *, embedding_version: str) -> int:
+        raise NotImplementedError("Vector store adapter not configured")
+
     def healthcheck(self) -> bool:
         raise NotImplementedError("Vector store adapter not configured")
 
@@ -2,9 +2,14 @@ from __future__ import annotations
 
 from uuid import UUID, uuid4
 
+from sqlalchemy import event
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import Settings
+from app.crud.vector_index import (
+    create_user_vector_point_id,
+    list_user_vector_point_ids_for_user,
+)
 from app.models.user import User
 from app.schemas.vector_store import UserProfileVectorQuery
 from app.services.actian_vector_store import ActianVectorStoreAdapter, ActianVectorStoreConfig
@@ -163,6 +168,42 @@ def test_actian_adapter_batch_upsert_assigns_unique_point_ids(test_engine):
     db.close()
 
 
+def test_actian_adapter_resolves_payloadless_hits_in_one_query(test_engine):
+    SessionLocal = sessionmaker(bind=test_engine)
+    db = SessionLocal()
+    fake = FakeCortexClient()
+    adapter = _make_adapter(db, fake)
+
+    user_ids = [str(uuid4()) for _ in range(4)]
+    for idx, user_id in enumerate(user_ids):
+        _create_user(db, user_id, f"actian-payloadless-{idx}@example.com")
+    adapter.upsert_user_profile_embeddings([_record(user_id) for user_id in user_ids])
+
+    statements: list[str] = []
+
+    def _record_statement(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(test_engine, "before_cursor_execute", _record_statement)
+    try:
+        matches = adapter.query_similar_user_profiles(
+            UserProfileVectorQuery(
+                query_vector=[0.1, 0.2, 0.3],
+                top_k=10,
+                embedding_version="user_profile_embed_v1",
+                exclude_user_ids=[user_ids[0]],
+                include_metadata=False,
+            )
+        )
+    finally:
+        event.remove(test_engine, "before_cursor_execute", _record_statement)
+
+    assert fake.last_search_kwargs["with_payload"] is False
+    assert sorted(match.user_id for match in matches) == sorted(user_ids[1:])
+    assert len(statements) == 1
+    db.close()
+
+
 def test_actian_config_from_settings():
     settings = Settings(
         vectorai_enabled=True,
@@ -217,3 +258,93 @@ def test_probe_metadata_filtering_support_false_when_search_rejects_filter(test_
     )
     assert adapter.probe_metadata_filtering_support() is False
     db.close()
+
+
+class FakeCortexClientBatchDelete(FakeCortexClient):
+    def __init__(self) -> None:
+        super().__init__()
+        self.batch_delete_calls: list[list[int]] = []
+
+    def batch_delete(self, *, ids: list[int]) -> None:
+        self.batch_delete_calls.append(list(ids))
+        for point_id in ids:
+            self.points.pop(point_id, None)
+
+
+def test_actian_adapter_bulk_delete_for_users_uses_batch_delete(test_engine):
+    SessionLocal = sessionmaker(bind=test_engine)
+    db = SessionLocal()
+    fake = FakeCortexClientBatchDelete()
+    adapter = _make_adapter(db, fake)
+
+    user_ids = [str(uuid4()) for _ in range(3)]
+    for idx, user_id in enumerate(user_ids):
+        _create_user(db, user_id, f"actian-bulk-delete-{idx}@example.com")
+    adapter.upsert_user_profile_embeddings([_record(user_id) for user_id in user_ids])
+    adapter.upsert_user_profile_embeddings(
+        [_record(user_ids[0], embedding_version="user_profile_embed_v2")]
+    )
+    assert len(fake.points) == 4
+
+    deleted = adapter.delete_user_profile_embeddings_for_users(user_ids=user_ids[:2])
+
+    assert deleted == 3
+    assert len(fake.batch_delete_calls) == 1
+    assert len(fake.points) == 1
+    assert fake.deleted_ids == []
+    db.close()
+
+
+def test_actian_adapter_single_user_purge_is_scoped_to_its_collection(test_engine):
+    SessionLocal = sessionmaker(bind=test_engine)
+    db = SessionLocal()
+    fake = FakeCortexClient()
+    adapter = _make_adapter(db, fake)
+
+    user_id = str(uuid4())
+    _create_user(db, user_id, "actian-scoped-purge@example.com")
+    adapter.upsert_user_profile_embedding(_record(user_id))
+    create_user_vector_point_id(
+        db,
+        user_id=UUID(user_id),
+        provider=adapter.provider,
+        collection_name="user_profiles_embed_v2",
+        embedding_version="user_profile_embed_v2",
+        point_id=987654321,
+    )
+
+    assert adapter.delete_user_profile_embeddings_for_user(user_id=user_id) == 1
+    remaining = list_user_vector_point_ids_for_user(
+        db, user_id=UUID(user_id), provider=adapter.provider
+    )
+    assert [row.collection_name for row in remaining] == ["user_profiles_embed_v2"]
+    assert 987654321 not in fake.deleted_ids
+    db.close()
+
+
+def test_actian_adapter_delete_for_version_falls_back_to_single_deletes(test_engine):
+    SessionLocal = sessionmaker(bind=test_engine)
+    db = SessionLocal()
+    fake = FakeCortexClient()
+    adapter = ActianVectorStoreAdapter(
+        db=db,
+        config=ActianVectorStoreConfig(
+            address="localhost:50051",
+            collection_name="user_profiles_embed_v1",
+            batch_delete_size=2,
+        ),
+        client=fake,
+    )
+
+    user_ids = [str(uuid4()) for _ in range(5)]
+    for idx, user_id in enumerate(user_ids):
+        _create_user(db, user_id, f"actian-version-purge-{idx}@example.com")
+    adapter.upsert_user_profile_embeddings([_record(user_id, "old_v") for user_id in user_ids])
+    adapter.upsert_user_profile_embeddings([_record(user_ids[0], "new_v")])
+
+    deleted = adapter.delete_user_profile_embeddings_for_version(embedding_version="old_v")
+
+    assert deleted == 5
+    assert len(fake.deleted_ids) == 5
+    assert [point["payload"]["embedding_version"] for point in fake.points.values()] == ["new_v"]
+    db.close()
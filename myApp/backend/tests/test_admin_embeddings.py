@@ -191,7 +191,62 @@ def test_admin_embedding_upsert_batch_by_explicit_emails(client, monkeypatch):
     body = response.json()
     assert body["selected_count"] == 2
     assert body["upserted_count"] == 2
+    assert (body["embedded_count"], body["skipped_count"], body["failed_count"]) == (2, 0, 0)
     assert body["embedding_version"] == "user_profile_embed_v1"
     assert len(body["results"]) == 2
     assert {row["email"] for row in body["results"]} == {"batch-on-a@example.com", "batch-on-b@example.com"}
     assert all(isinstance(row["point_id"], int) for row in body["results"])
+
+
+def test_admin_embedding_batch_stream_emits_ndjson_per_user_and_summary(client, monkeypatch):
+    import json
+
+    from app.api.v1.routes import admin_embeddings as route_mod
+    from app.services.actian_vector_store import ActianVectorStoreAdapter
+    from app.services.in_process_cortex import InProcessCortexClient
+
+    cortex = InProcessCortexClient(dimension=4)
+    monkeypatch.setattr(settings, "vectorai_enabled", True)
+    monkeypatch.setattr(settings, "vectorai_collection_name", "user_profiles_embed_v1_stream")
+    monkeypatch.setattr(settings, "vectorai_dimension", 4)
+    monkeypatch.setattr(
+        route_mod,
+        "ActianVectorStoreAdapter",
+        lambda *, db, config: ActianVectorStoreAdapter(db=db, config=config, client=cortex),
+    )
+
+    for idx in range(5):
+        _register_user(
+            client, email=f"stream-{idx}@example.com", firebase_uid=f"firebase-stream-{idx}"
+        )
+
+    def _run(**extra) -> list[dict]:
+        response = client.post(
+            "/api/v1/admin/embeddings/upsert-batch/stream",
+            headers=_admin_headers(),
+            json={"chunk_size": 2, **extra},
+        )
+        assert response.status_code == 200, response.text
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        return [json.loads(line) for line in response.text.splitlines()]
+
+    first = _run()
+    results = [line for line in first if line["type"] == "result"]
+    assert [line["chunk"] for line in results] == [1, 1, 2, 2, 3]
+    assert {line["status"] for line in results} == {"embedded"}
+    assert all(isinstance(line["point_id"], int) for line in results)
+    assert first[-1]["type"] == "summary"
+    summary = first[-1]
+    assert (summary["selected_count"], summary["embedded_count"], summary["chunks"]) == (5, 5, 3)
+    assert cortex.count() == 5
+
+    second = _run(limit=3)
+    assert [line["status"] for line in second if line["type"] == "result"] == ["skipped"] * 3
+    assert second[-1]["skipped_count"] == 3
+
+    missing = client.post(
+        "/api/v1/admin/embeddings/upsert-batch/stream",
+        headers=_admin_headers(),
+        json={"emails": ["stream-0@example.com", "nobody@example.com"]},
+    )
+    assert missing.status_code == 404, missing.text
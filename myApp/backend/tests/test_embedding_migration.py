@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.crud.vector_index import mark_users_embedding_dirty
+from app.models.vector_index import UserVectorPointId
+from app.services.actian_vector_store import ActianVectorStoreAdapter, ActianVectorStoreConfig
+from app.services.embedding_migration import (
+    MIGRATION_STATUS_BACKFILLING,
+    MIGRATION_STATUS_COMPLETED,
+    MIGRATION_STATUS_CUT_OVER,
+    EmbeddingTarget,
+    drop_source_embeddings,
+    embedding_write_targets,
+    resolve_serving_embedding_target,
+    run_embedding_migration_chunk,
+    start_embedding_migration,
+)
+from app.services.embedding_refresh import EmbeddingRefreshConfig, refresh_dirty_user_embeddings
+from app.services.embeddings import USER_PROFILE_EMBEDDING_VERSION, FakeEmbedder
+from app.services.in_process_cortex import InProcessCortexClient
+
+
+def _admin_headers() -> dict[str, str]:
+    return {"X-Admin-Key": settings.admin_api_key}
+
+
+def _register_user(client, *, suffix: str) -> UUID:
+    response = client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": f"{suffix}@example.com",
+            "password": "password123",
+            "firebase_uid": f"firebase-{suffix}",
+            "neighborhood": "Downtown",
+        },
+    )
+    assert response.status_code == 201, response.text
+    return UUID(response.json()["id"])
+
+
+class _Collections:
+    """One in-process client per collection name, shared across sessions."""
+
+    def __init__(self) -> None:
+        self.clients: dict[str, InProcessCortexClient] = {}
+
+    def adapter(self, db: Session, target: EmbeddingTarget) -> ActianVectorStoreAdapter:
+        client = self.clients.setdefault(target.collection_name, InProcessCortexClient(dimension=4))
+        return ActianVectorStoreAdapter(
+            db=db,
+            config=ActianVectorStoreConfig(
+                address="in-process", collection_name=target.collection_name, dimension=4
+            ),
+            client=client,
+        )
+
+
+def _versions(db: Session) -> dict[str, int]:
+    counts: dict[str, int] = {}
+    for row in db.scalars(select(UserVectorPointId)):
+        counts[row.embedding_version] = counts.get(row.embedding_version, 0) + 1
+    return counts
+
+
+def test_migration_backfills_dual_writes_then_cuts_over_and_drops_source(client, test_engine):
+    user_ids = [_register_user(client, suffix=f"migrate-{i}") for i in range(3)]
+    cfg = settings.model_copy(
+        update={"vectorai_collection_name": "mig_v1", "vectorai_dimension": 4}
+    )
+    collections = _Collections()
+    embedder = FakeEmbedder(dimension=4)
+    refresh = EmbeddingRefreshConfig(debounce_seconds=0.0)
+
+    with sessionmaker(bind=test_engine)() as db:
+        # Serve v1 first: the refresh worker writes only the serving target.
+        targets = embedding_write_targets(db, settings=cfg, adapter_factory=collections.adapter)
+        assert [t.embedding_version for t in targets] == [USER_PROFILE_EMBEDDING_VERSION]
+        mark_users_embedding_dirty(db, user_ids=user_ids)
+        refresh_dirty_user_embeddings(
+            db, vector_store=targets[0].vector_store, embedder=embedder, config=refresh
+        )
+        assert collections.clients["mig_v1"].count() == 3
+
+        migration = start_embedding_migration(
+            db,
+            settings=cfg,
+            target_version="user_profile_embed_v2",
+            target_collection="mig_v2",
+            coverage_threshold=1.0,
+            chunk_size=2,
+        )
+        assert migration.status == MIGRATION_STATUS_BACKFILLING
+        target = EmbeddingTarget("user_profile_embed_v2", "mig_v2", 4)
+
+        first = run_embedding_migration_chunk(
+            db, migration, vector_store=collections.adapter(db, target), embedder=embedder
+        )
+        assert (first.processed, first.status) == (2, MIGRATION_STATUS_BACKFILLING)
+        assert resolve_serving_embedding_target(db, settings=cfg).collection_name == "mig_v1"
+
+        # An edit mid-backfill lands in both versions.
+        primary, shadow = embedding_write_targets(
+            db, settings=cfg, adapter_factory=collections.adapter
+        )
+        mark_users_embedding_dirty(db, user_ids=[user_ids[0]])
+        refreshed = refresh_dirty_user_embeddings(
+            db,
+            vector_store=primary.vector_store,
+            embedder=embedder,
+            config=refresh,
+            shadow_targets=[shadow],
+        )
+        assert refreshed.cleared == 1
+
+        second = run_embedding_migration_chunk(
+            db, migration, vector_store=collections.adapter(db, target), embedder=embedder
+        )
+        assert second.status == MIGRATION_STATUS_CUT_OVER
+        assert migration.cut_over_at is not None
+        serving = resolve_serving_embedding_target(db, settings=cfg)
+        assert serving == EmbeddingTarget("user_profile_embed_v2", "mig_v2", 4)
+        assert _versions(db) == {USER_PROFILE_EMBEDDING_VERSION: 3, "user_profile_embed_v2": 3}
+
+        source = EmbeddingTarget(USER_PROFILE_EMBEDDING_VERSION, "mig_v1", 4)
+        drop_source_embeddings(db, migration, vector_store=collections.adapter(db, source))
+        assert migration.status == MIGRATION_STATUS_COMPLETED
+        assert migration.dropped_points == 3
+        assert collections.clients["mig_v1"].count() == 0
+        assert collections.clients["mig_v2"].count() == 3
+        assert _versions(db) == {"user_profile_embed_v2": 3}
+
+
+def test_admin_migration_endpoints_report_progress_and_cut_over(client, monkeypatch):
+    from app.api.v1.routes import admin_embedding_migrations as route_mod
+
+    collections = _Collections()
+    monkeypatch.setattr(settings, "vectorai_enabled", True)
+    monkeypatch.setattr(settings, "vectorai_collection_name", "api_v1")
+    monkeypatch.setattr(settings, "vectorai_dimension", 4)
+    monkeypatch.setattr(
+        route_mod,
+        "build_target_adapter",
+        lambda db, *, settings, target: collections.adapter(db, target),
+    )
+    for i in range(3):
+        _register_user(client, suffix=f"migrate-api-{i}")
+
+    started = client.post(
+        "/api/v1/admin/embeddings/migrations",
+        headers=_admin_headers(),
+        json={
+            "target_version": "user_profile_embed_v2",
+            "coverage_threshold": 1.0,
+            "chunk_size": 2,
+            "run_in_background": False,
+        },
+    )
+    assert started.status_code == 201, started.text
+    body = started.json()
+    assert body["status"] == "backfilling"
+    assert body["target_collection"] == "user_profile_embed_v2"
+    assert (body["total_users"], body["covered_users"]) == (3, 0)
+
+    conflict = client.post(
+        "/api/v1/admin/embeddings/migrations",
+        headers=_admin_headers(),
+        json={"target_version": "user_profile_embed_v3"},
+    )
+    assert conflict.status_code == 409, conflict.text
+
+    early = client.post(
+        f"/api/v1/admin/embeddings/migrations/{body['id']}/cutover",
+        headers=_admin_headers(),
+        json={},
+    )
+    assert early.status_code == 409, early.text
+
+    step_url = f"/api/v1/admin/embeddings/migrations/{body['id']}/step"
+    step = client.post(step_url, headers=_admin_headers())
+    assert step.status_code == 200, step.text
+    assert step.json()["processed_users"] == 2
+    step = client.post(step_url, headers=_admin_headers())
+    assert step.json()["status"] == "cut_over"
+
+    current = client.get("/api/v1/admin/embeddings/migrations/current", headers=_admin_headers())
+    assert current.status_code == 200, current.text
+    assert current.json()["coverage"] == 1.0
+    assert current.json()["users_per_second"] is not None
+
+    done = client.post(
+        f"/api/v1/admin/embeddings/migrations/{body['id']}/cutover",
+        headers=_admin_headers(),
+        json={"drop_source": True},
+    )
+    assert done.status_code == 200, done.text
+    assert done.json()["status"] == "completed"
+    assert collections.clients["user_profile_embed_v2"].count() == 3
@@ -3,17 +3,29 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from uuid import UUID, uuid4
 
+import pytest
 from sqlalchemy.orm import Session, sessionmaker
 
+from app.crud.preference_profile import invalidate_user_preference_profiles
 from app.models.user import User
-from app.schemas.vector_store import UserProfileEmbeddingRecord
+from app.schemas.vector_store import UserProfileEmbeddingRecord, coerce_float32_vector
+from app.services.actian_vector_store import ActianVectorStoreAdapter, ActianVectorStoreConfig
+from app.services.embedding_cache import (
+    CachedEmbedder,
+    DiskEmbeddingStore,
+    EmbeddingCache,
+    embedding_cache_key,
+)
 from app.services.embeddings import (
     FakeEmbedder,
     USER_PROFILE_EMBEDDING_VERSION,
     build_user_profile_embedding_record,
+    embed_texts,
+    sync_user_profile_embeddings_batch,
     upsert_user_profile_embedding,
     upsert_user_profile_embeddings_batch,
 )
+from app.services.in_process_cortex import InProcessCortexClient
 
 
 @dataclass
@@ -133,3 +145,183 @@ def test_upsert_user_profile_embeddings_batch_uses_batch_call(test_engine):
     assert {UUID(record.user_id) for record in vector_store.records} == {user1, user2}
     db.close()
 
+
+
+@dataclass(frozen=True)
+class FailingEmbedder:
+    fail_on: str
+    dimension: int = 4
+    model_name: str = "failing-test-embedder"
+
+    def embed_text(self, text: str) -> list[float]:
+        if self.fail_on in text:
+            raise RuntimeError("embedder unavailable")
+        return FakeEmbedder(dimension=self.dimension).embed_text(text)
+
+
+def test_sync_batch_skips_unchanged_profiles_and_reports_counts(test_engine):
+    SessionLocal = sessionmaker(bind=test_engine)
+    db = SessionLocal()
+    client = InProcessCortexClient(dimension=4)
+    adapter = ActianVectorStoreAdapter(
+        db=db,
+        config=ActianVectorStoreConfig(
+            address="in-process", collection_name="sync_test", dimension=4
+        ),
+        client=client,
+    )
+    user_ids = [_create_user(db, email=f"sync-{idx}@example.com") for idx in range(3)]
+    embedder = FakeEmbedder(dimension=4)
+
+    first = sync_user_profile_embeddings_batch(
+        db, user_ids=user_ids, vector_store=adapter, embedder=embedder
+    )
+    assert (first.embedded_count, first.skipped_count, first.failed_count) == (3, 0, 0)
+
+    second = sync_user_profile_embeddings_batch(
+        db, user_ids=user_ids, vector_store=adapter, embedder=embedder
+    )
+    assert (second.embedded_count, second.skipped_count, second.failed_count) == (0, 3, 0)
+
+    changed = db.get(User, user_ids[1])
+    changed.neighborhood = "Uptown"
+    # Direct ORM edit bypasses the crud write path, so invalidate the materialized profile here.
+    invalidate_user_preference_profiles(db, user_ids=[changed.id], commit=False)
+    db.commit()
+    third = sync_user_profile_embeddings_batch(
+        db, user_ids=user_ids, vector_store=adapter, embedder=embedder
+    )
+    assert [result.user_id for result in third.results] == [user_ids[1]]
+    assert third.skipped_count == 2
+
+    # A different embedding model invalidates stored hashes; per-user failures don't abort.
+    failing = FailingEmbedder(fail_on="Uptown")
+    fourth = sync_user_profile_embeddings_batch(
+        db, user_ids=user_ids, vector_store=adapter, embedder=failing
+    )
+    assert fourth.embedded_count == 2
+    assert [failure.user_id for failure in fourth.failures] == [user_ids[1]]
+
+    forced = sync_user_profile_embeddings_batch(
+        db, user_ids=user_ids, vector_store=adapter, embedder=embedder, skip_unchanged=False
+    )
+    assert forced.embedded_count == 3
+    assert client.count() == 3
+
+    # Mappings stored for another collection don't count as already synced.
+    other_client = InProcessCortexClient(dimension=4)
+    other = ActianVectorStoreAdapter(
+        db=db,
+        config=ActianVectorStoreConfig(
+            address="in-process", collection_name="sync_other", dimension=4
+        ),
+        client=other_client,
+    )
+    fresh = sync_user_profile_embeddings_batch(
+        db, user_ids=user_ids, vector_store=other, embedder=embedder
+    )
+    assert (fresh.embedded_count, fresh.skipped_count) == (3, 0)
+    assert other_client.count() == 3
+    db.close()
+
+
+def test_sync_batch_reembeds_when_only_the_dimension_changes(test_engine):
+    db = sessionmaker(bind=test_engine)()
+    user_ids = [_create_user(db, email=f"dim-{idx}@example.com") for idx in range(2)]
+
+    def _adapter(dimension: int) -> ActianVectorStoreAdapter:
+        # Same collection name, as after recreating the collection at a new size.
+        return ActianVectorStoreAdapter(
+            db=db,
+            config=ActianVectorStoreConfig(
+                address="in-process", collection_name="dim_test", dimension=dimension
+            ),
+            client=InProcessCortexClient(dimension=dimension),
+        )
+
+    small = sync_user_profile_embeddings_batch(
+        db, user_ids=user_ids, vector_store=_adapter(4), embedder=FakeEmbedder(dimension=4)
+    )
+    assert small.embedded_count == 2
+
+    resized = _adapter(8)
+    wide = FakeEmbedder(dimension=8)
+    assert wide.model_name == FakeEmbedder(dimension=4).model_name
+    first = sync_user_profile_embeddings_batch(
+        db, user_ids=user_ids, vector_store=resized, embedder=wide
+    )
+    assert (first.embedded_count, first.skipped_count) == (2, 0)
+    assert {result.vector_dimension for result in first.results} == {8}
+    again = sync_user_profile_embeddings_batch(
+        db, user_ids=user_ids, vector_store=resized, embedder=wide
+    )
+    assert (again.embedded_count, again.skipped_count) == (0, 2)
+    db.close()
+
+
+def test_fake_embedder_batch_matches_single_text_path():
+    embedder = FakeEmbedder(dimension=13)
+    texts = ["alpha", "", "Proximity user preference profile\nhobbies: café", "alpha"]
+    assert embedder.embed_texts(texts) == [embedder.embed_text(text) for text in texts]
+    fallback = FailingEmbedder(fail_on="never", dimension=13)
+    assert embed_texts(fallback, texts) == embedder.embed_texts(texts)
+
+
+def test_cached_embedder_embeds_each_distinct_text_once(tmp_path):
+    calls: list[str] = []
+
+    @dataclass(frozen=True)
+    class CountingEmbedder:
+        dimension: int = 6
+        model_name: str = "counting"
+
+        def embed_text(self, text: str) -> list[float]:
+            calls.append(text)
+            return FakeEmbedder(dimension=self.dimension).embed_text(text)
+
+    cache = EmbeddingCache(max_entries=2, disk_dir=tmp_path)
+    embedder = CachedEmbedder(embedder=CountingEmbedder(), cache=cache)
+    texts = ["new user", "new user", "other", "new user"]
+    vectors = embedder.embed_texts(texts)
+    assert sorted(calls) == ["new user", "other"]
+    assert vectors[0] == vectors[1] == vectors[3]
+
+    # A fresh in-memory tier still finds vectors on disk (float32 round-trip).
+    reloaded = CachedEmbedder(
+        embedder=CountingEmbedder(), cache=EmbeddingCache(max_entries=2, disk_dir=tmp_path)
+    )
+    from_disk = reloaded.embed_texts(["other", "third"])
+    assert sorted(calls) == ["new user", "other", "third"]
+    assert from_disk[0] == pytest.approx(vectors[2], abs=1e-7)
+    assert coerce_float32_vector(from_disk[0]) == coerce_float32_vector(vectors[2])
+
+    with pytest.raises(ValueError):
+        CachedEmbedder(embedder=CountingEmbedder(dimension=0), cache=cache)
+
+
+def test_disk_store_rejects_bad_batches_whole_and_repairs_torn_writes(tmp_path):
+    def digest(text: str) -> str:
+        return embedding_cache_key("m", 2, text)[2]
+
+    store = DiskEmbeddingStore(tmp_path, model_name="m", dimension=2)
+    store.put_many([(digest("a"), [1.0, 2.0])])
+    with pytest.raises(ValueError):
+        store.put_many([(digest("b"), [3.0, 4.0]), (digest("bad"), [5.0])])
+    store.put_many([(digest("c"), [6.0, 7.0])])
+    assert store.get(digest("b")) is None
+    assert store.get(digest("c")) == [6.0, 7.0]
+    store.close()
+
+    # A torn write: a record reached the vectors file but its key never did.
+    vectors_path = tmp_path / "m-2" / "vectors.f32"
+    with vectors_path.open("ab") as fh:
+        fh.write(b"\0" * 8)
+    reloaded = DiskEmbeddingStore(tmp_path, model_name="m", dimension=2)
+    reloaded.put_many([(digest("d"), [8.0, 9.0])])
+    assert reloaded.get(digest("a")) == [1.0, 2.0]
+    assert reloaded.get(digest("c")) == [6.0, 7.0]
+    assert reloaded.get(digest("d")) == [8.0, 9.0]
+    assert DiskEmbeddingStore(tmp_path, model_name="m", dimension=2).get(digest("d")) == [8.0, 9.0]
+
+    with pytest.raises(ValueError):
+        DiskEmbeddingStore(tmp_path, model_name="m", dimension=0)
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.security import create_access_token
+from app.crud.vector_index import clear_dirty_users, mark_users_embedding_dirty
+from app.models.vector_index import EmbeddingDirtyUser
+from app.services.actian_vector_store import ActianVectorStoreAdapter, ActianVectorStoreConfig
+from app.services.embedding_refresh import (
+    EmbeddingRefreshConfig,
+    EmbeddingRefreshResult,
+    EmbeddingRefreshWorker,
+    refresh_dirty_user_embeddings,
+)
+from app.services.embeddings import FakeEmbedder
+from app.services.in_process_cortex import InProcessCortexClient
+
+
+def _register_user(client, *, suffix: str) -> tuple[UUID, dict[str, str]]:
+    firebase_uid = f"firebase-{suffix}"
+    response = client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": f"{suffix}@example.com",
+            "password": "password123",
+            "firebase_uid": firebase_uid,
+            "neighborhood": "Downtown",
+        },
+    )
+    assert response.status_code == 201, response.text
+    headers = {"Authorization": f"Bearer {create_access_token(subject=firebase_uid)}"}
+    return UUID(response.json()["id"]), headers
+
+
+def _adapter(db, client: InProcessCortexClient) -> ActianVectorStoreAdapter:
+    return ActianVectorStoreAdapter(
+        db=db,
+        config=ActianVectorStoreConfig(
+            address="in-process", collection_name="refresh_test", dimension=4
+        ),
+        client=client,
+    )
+
+
+class _DownCortexClient:
+    def batch_upsert(self, *args, **kwargs):
+        raise ConnectionError("vector store unavailable")
+
+    def upsert(self, *args, **kwargs):
+        raise ConnectionError("vector store unavailable")
+
+
+def test_profile_and_rating_writes_mark_user_dirty_and_coalesce(client, test_engine):
+    user_id, headers = _register_user(client, suffix="dirty-writes")
+    restaurant = client.post(
+        "/api/v1/restaurants", json={"name": "Dirty Diner", "cuisine": "Diner"}
+    )
+    assert restaurant.status_code == 201, restaurant.text
+
+    patched = client.patch(
+        "/api/v1/me/profile", json={"vibe_tags": ["Cozy"], "hobbies": []}, headers=headers
+    )
+    assert patched.status_code == 200, patched.text
+    rated = client.post(
+        f"/api/v1/restaurants/{restaurant.json()['id']}/rating",
+        json={"rating": 5, "visited": True},
+        headers=headers,
+    )
+    assert rated.status_code in (200, 201), rated.text
+
+    with sessionmaker(bind=test_engine)() as db:
+        rows = list(db.scalars(select(EmbeddingDirtyUser)).all())
+    assert [row.user_id for row in rows] == [user_id]
+    # Profile update + hobby replace + rating: one row, bumped on each write.
+    assert rows[0].version == 3
+
+
+def test_refresh_drains_debounced_users_and_keeps_remarked_rows(client, test_engine):
+    user_id, headers = _register_user(client, suffix="dirty-refresh")
+    client.patch("/api/v1/me/profile", json={"vibe_tags": ["Lively"]}, headers=headers)
+
+    SessionLocal = sessionmaker(bind=test_engine)
+    cortex = InProcessCortexClient(dimension=4)
+    config = EmbeddingRefreshConfig(debounce_seconds=60.0, batch_size=10)
+    with SessionLocal() as db:
+        adapter = _adapter(db, cortex)
+        embedder = FakeEmbedder(dimension=4)
+
+        # Still inside the debounce window.
+        waiting = refresh_dirty_user_embeddings(
+            db, vector_store=adapter, embedder=embedder, config=config
+        )
+        assert waiting.claimed == 0
+
+        later = datetime.now(timezone.utc) + timedelta(seconds=61)
+        drained = refresh_dirty_user_embeddings(
+            db, vector_store=adapter, embedder=embedder, config=config, now=later
+        )
+        assert (drained.claimed, drained.embedded, drained.cleared) == (1, 1, 1)
+        assert cortex.count() == 1
+        assert db.scalar(select(EmbeddingDirtyUser)) is None
+
+        # A mark that lands after the claim survives the clear.
+        mark_users_embedding_dirty(db, user_ids=[user_id])
+        row = db.scalar(select(EmbeddingDirtyUser))
+        claimed_version = row.version
+        mark_users_embedding_dirty(db, user_ids=[user_id])
+        assert clear_dirty_users(db, claimed=[(user_id, claimed_version)]) == 0
+        db.expire_all()
+        assert db.scalar(select(EmbeddingDirtyUser)) is not None
+
+
+def test_refresh_leaves_queue_intact_when_vector_store_is_down(client, test_engine):
+    user_id, _headers = _register_user(client, suffix="dirty-down")
+    with sessionmaker(bind=test_engine)() as db:
+        mark_users_embedding_dirty(db, user_ids=[user_id])
+
+        with pytest.raises(ConnectionError):
+            refresh_dirty_user_embeddings(
+                db,
+                vector_store=_adapter(db, _DownCortexClient()),
+                embedder=FakeEmbedder(dimension=4),
+                config=EmbeddingRefreshConfig(debounce_seconds=0.0),
+                now=datetime.now(timezone.utc) + timedelta(seconds=1),
+            )
+        db.rollback()
+        assert list(db.scalars(select(EmbeddingDirtyUser.user_id))) == [user_id]
+
+
+def test_worker_backoff_grows_on_errors_and_is_capped():
+    worker = EmbeddingRefreshWorker(
+        session_factory=lambda: None,  # type: ignore[arg-type, return-value]
+        vector_store_factory=lambda db: None,  # type: ignore[arg-type, return-value]
+        embedder=FakeEmbedder(dimension=4),
+        config=EmbeddingRefreshConfig(interval_seconds=2.0, batch_size=5, max_backoff_seconds=10.0),
+    )
+    idle = EmbeddingRefreshResult(claimed=1, embedded=1, skipped=0, failed=0, cleared=1)
+    full = EmbeddingRefreshResult(claimed=5, embedded=5, skipped=0, failed=0, cleared=5)
+    assert worker.next_delay_seconds(idle) == 2.0
+    assert worker.next_delay_seconds(full) == 0.0
+
+    worker._consecutive_errors = 1
+    assert worker.next_delay_seconds(None) == 4.0
+    worker._consecutive_errors = 10
+    assert worker.next_delay_seconds(None) == 10.0
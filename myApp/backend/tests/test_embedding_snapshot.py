@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.models.user import User
+from app.models.vector_index import UserVectorPointId
+from app.services.actian_vector_store import ActianVectorStoreAdapter, ActianVectorStoreConfig
+from app.services.embedding_snapshot import (
+    EmbeddingSnapshotReader,
+    export_embedding_snapshot,
+    import_embedding_snapshot,
+)
+from app.services.embeddings import (
+    USER_PROFILE_EMBEDDING_VERSION,
+    FakeEmbedder,
+    sync_user_profile_embeddings_batch,
+)
+from app.services.in_process_cortex import InProcessCortexClient
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    np = None  # type: ignore[assignment]
+
+
+def _create_user(db: Session, *, email: str) -> UUID:
+    user = User(
+        id=uuid4(),
+        email=email,
+        firebase_uid=f"firebase-{uuid4().hex[:8]}",
+        display_name=email.split("@")[0],
+        neighborhood="Midtown",
+        discoverable=True,
+        open_to_meetups=True,
+    )
+    db.add(user)
+    db.commit()
+    return user.id
+
+
+def _adapter(
+    db: Session, client: InProcessCortexClient, collection: str
+) -> ActianVectorStoreAdapter:
+    return ActianVectorStoreAdapter(
+        db=db,
+        config=ActianVectorStoreConfig(
+            address="in-process", collection_name=collection, dimension=4, batch_upsert_size=2
+        ),
+        client=client,
+    )
+
+
+def test_snapshot_round_trip_restores_vectors_and_mappings(test_engine, tmp_path):
+    db = sessionmaker(bind=test_engine)()
+    user_ids = [_create_user(db, email=f"snapshot-{i}@example.com") for i in range(3)]
+    source = InProcessCortexClient(dimension=4)
+    sync_user_profile_embeddings_batch(
+        db,
+        user_ids=user_ids,
+        vector_store=_adapter(db, source, "snap_src"),
+        embedder=FakeEmbedder(dimension=4),
+        embedding_version=USER_PROFILE_EMBEDDING_VERSION,
+    )
+
+    exported = export_embedding_snapshot(
+        db,
+        _adapter(db, source, "snap_src"),
+        tmp_path / "snap",
+        embedding_version=USER_PROFILE_EMBEDDING_VERSION,
+        chunk_size=2,
+    )
+    assert exported.manifest.count == 3
+    assert exported.manifest.dimension == 4
+    assert exported.missing_point_ids == []
+    if np is not None:
+        matrix = np.load(tmp_path / "snap" / "vectors.npy", mmap_mode="r")
+        assert matrix.shape == (3, 4) and matrix.dtype == np.float32
+
+    target = InProcessCortexClient(dimension=4)
+    result = import_embedding_snapshot(db, _adapter(db, target, "snap_dst"), tmp_path / "snap")
+    assert (result.imported, result.chunks, result.skipped_missing_users) == (3, 2, 0)
+    assert result.reassigned_point_ids == 0
+    assert target.count() == 3
+
+    rows = db.scalars(select(UserVectorPointId).order_by(UserVectorPointId.point_id)).all()
+    assert {row.collection_name for row in rows} == {"snap_dst"}
+    assert all(row.source_content_hash and row.embedding_model for row in rows)
+    for row in rows:
+        source_vector, source_payload = source.get(id=row.point_id)
+        target_vector, target_payload = target.get(id=row.point_id)
+        # Records are float32 already, so the snapshot round trip is exact.
+        assert target_vector == source_vector
+        assert target_payload == source_payload
+    db.close()
+
+
+def test_snapshot_import_skips_unknown_users_and_rejects_dimension_mismatch(test_engine, tmp_path):
+    db = sessionmaker(bind=test_engine)()
+    user_ids = [_create_user(db, email=f"snapshot-skip-{i}@example.com") for i in range(2)]
+    source = InProcessCortexClient(dimension=4)
+    sync_user_profile_embeddings_batch(
+        db,
+        user_ids=user_ids,
+        vector_store=_adapter(db, source, "snap_src"),
+        embedder=FakeEmbedder(dimension=4),
+        embedding_version=USER_PROFILE_EMBEDDING_VERSION,
+    )
+    export_embedding_snapshot(
+        db,
+        _adapter(db, source, "snap_src"),
+        tmp_path / "snap",
+        embedding_version=USER_PROFILE_EMBEDDING_VERSION,
+    )
+    db.delete(db.get(User, user_ids[0]))
+    db.commit()
+
+    with EmbeddingSnapshotReader(tmp_path / "snap") as reader:
+        assert [len(chunk) for chunk in reader.iter_chunks(1)] == [1, 1]
+
+    target = InProcessCortexClient(dimension=4)
+    result = import_embedding_snapshot(db, _adapter(db, target, "snap_dst"), tmp_path / "snap")
+    assert (result.imported, result.skipped_missing_users) == (1, 1)
+    assert target.count() == 1
+
+    wide = ActianVectorStoreAdapter(
+        db=db,
+        config=ActianVectorStoreConfig(address="in-process", collection_name="wide", dimension=8),
+        client=InProcessCortexClient(dimension=8),
+    )
+    with pytest.raises(ValueError, match="dimension"):
+        import_embedding_snapshot(db, wide, tmp_path / "snap")
+    db.close()
@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+from app.services import geo
+from app.services.geo import (
+    decode_geohash,
+    encode_geohash,
+    geohash_bounds,
+    geohash_neighbors,
+    geohash_precision_for_radius,
+    geohash_prefix_ranges,
+    haversine_km,
+    haversine_km_many,
+    spherical_centroid,
+)
+
+
+def test_encode_decode_round_trip():
+    assert encode_geohash(42.605, -5.603, 5) == "ezs42"
+    lat, lon = decode_geohash("ezs42")
+    assert lat == pytest.approx(42.605, abs=0.03)
+    assert lon == pytest.approx(-5.603, abs=0.03)
+    lat_min, lat_max, lon_min, lon_max = geohash_bounds("EZS42")
+    assert lat_min <= 42.605 <= lat_max and lon_min <= -5.603 <= lon_max
+    with pytest.raises(ValueError):
+        decode_geohash("ezs4a")
+
+
+def test_neighbors_surround_the_cell_and_wrap_the_antimeridian():
+    neighbors = geohash_neighbors("9q8yy")
+    assert len(neighbors) == 8
+    center_lat, center_lon = decode_geohash("9q8yy")
+    for cell in neighbors:
+        lat, lon = decode_geohash(cell)
+        assert 0 < haversine_km(center_lat, center_lon, lat, lon) < 10
+
+    east = encode_geohash(0.1, 179.99, 4)
+    assert any(decode_geohash(cell)[1] < 0 for cell in geohash_neighbors(east))
+    assert len(geohash_neighbors(encode_geohash(89.99, 0.0, 3))) == 5
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_prefix_ranges_cover_every_point_within_the_radius(monkeypatch, use_numpy):
+    if not use_numpy:
+        monkeypatch.setattr(geo, "np", None)
+    rng = random.Random(7)
+    origin = (37.7749, -122.4194)
+    radius_km = 5.0
+    ranges = geohash_prefix_ranges(*origin, radius_km)
+    assert geohash_precision_for_radius(origin[0], radius_km) == len(ranges[0][0]) == 4
+
+    points = [
+        (origin[0] + rng.uniform(-0.1, 0.1), origin[1] + rng.uniform(-0.1, 0.1))
+        for _ in range(500)
+    ]
+    distances = haversine_km_many(*origin, [p[0] for p in points], [p[1] for p in points])
+    for (lat, lon), distance in zip(points, distances, strict=True):
+        assert distance == pytest.approx(haversine_km(*origin, lat, lon))
+        if distance <= radius_km:
+            cell = encode_geohash(lat, lon, 9)
+            assert any(low <= cell and (high is None or cell < high) for low, high in ranges)
+
+
+def test_huge_radius_scans_everything():
+    assert geohash_prefix_ranges(0.0, 0.0, 20_000) == [("", None)]
+    assert geohash_prefix_ranges(0.0, 0.0, 100)[-1][1] is not None
+
+
+def test_spherical_centroid_handles_the_antimeridian():
+    lat, lon = spherical_centroid([(10.0, 20.0), (20.0, 20.0)])
+    assert lat == pytest.approx(15.0, abs=0.05) and lon == pytest.approx(20.0)
+    lat, lon = spherical_centroid([(0.0, 179.0), (0.0, -179.0)])
+    assert lat == pytest.approx(0.0) and abs(lon) == pytest.approx(180.0)
+    with pytest.raises(ValueError):
+        spherical_centroid([])
@@ -3,6 +3,7 @@ from uuid import UUID, uuid4
 from sqlalchemy.orm import sessionmaker
 
 from app.core.security import create_access_token
+from app.crud.group_chat import backfill_group_chat_activity
 from app.models.group_chat import GroupChatMessage
 from app.models.group_match import GroupMatch, GroupMatchMember, GroupMatchVenue
 
@@ -64,6 +65,8 @@ def _seed_confirmed_group_chat(test_engine, *, member_user_ids: list[str]) -> st
             )
         )
         db.commit()
+        # Messages were inserted directly, so fill the denormalized activity columns.
+        backfill_group_chat_activity(db)
         return str(group.id)
 
 
@@ -131,3 +134,143 @@ def test_group_chat_disallows_forming_groups(client, test_engine):
 
     response = client.get(f"/api/v1/chats/{group_id}/messages", headers=headers)
     assert response.status_code == 404
+
+
+def test_group_chat_inbox_orders_by_latest_activity_in_one_query(client, test_engine):
+    from datetime import datetime, timezone
+
+    from sqlalchemy import event
+
+    suffix = uuid4().hex[:8]
+    user_a, headers_a = _register_user(client, suffix=f"inbox-a-{suffix}")
+    others = [_register_user(client, suffix=f"inbox-{idx}-{suffix}")[0] for idx in range(3)]
+
+    def at(day: int) -> datetime:
+        return datetime(2026, 1, day, 12, tzinfo=timezone.utc)
+
+    # (updated_at day, message days, extra accepted members, extra invited members)
+    layout = {"quiet": (3, [], 1, 0), "chatty": (1, [5], 1, 0), "busy": (2, [2, 4], 2, 1)}
+    group_ids: dict[str, str] = {}
+    Session = sessionmaker(bind=test_engine, autocommit=False, autoflush=False)
+    with Session() as db:
+        for name, (updated_day, message_days, accepted, invited) in layout.items():
+            group = GroupMatch(
+                status="confirmed",
+                group_match_mode="chat_only",
+                created_source="system",
+                created_at=at(1),
+                updated_at=at(updated_day),
+            )
+            db.add(group)
+            db.flush()
+            members = [
+                (user_a["id"], "accepted"),
+                *((other["id"], "accepted") for other in others[:accepted]),
+                *((other["id"], "invited") for other in others[accepted : accepted + invited]),
+            ]
+            for slot, (member_id, member_status) in enumerate(members, start=1):
+                db.add(
+                    GroupMatchMember(
+                        group_match_id=group.id,
+                        user_id=UUID(member_id),
+                        status=member_status,
+                        slot_number=slot,
+                    )
+                )
+            for day in message_days:
+                db.add(
+                    GroupChatMessage(
+                        group_match_id=group.id,
+                        sender_user_id=UUID(user_a["id"]),
+                        body=f"{name} day {day}",
+                        created_at=at(day),
+                    )
+                )
+            group_ids[name] = str(group.id)
+        db.commit()
+        backfill_group_chat_activity(db)
+
+    statements: list[str] = []
+
+    def _record(_conn, _cursor, statement, _parameters, _context, _executemany):
+        statements.append(statement)
+
+    event.listen(test_engine, "before_cursor_execute", _record)
+    try:
+        first = client.get("/api/v1/chats", params={"limit": 2}, headers=headers_a)
+    finally:
+        event.remove(test_engine, "before_cursor_execute", _record)
+    second = client.get("/api/v1/chats", params={"limit": 2, "offset": 2}, headers=headers_a)
+    assert first.status_code == 200 and second.status_code == 200
+
+    chats = [*first.json(), *second.json()]
+    assert [chat["id"] for chat in chats] == [
+        group_ids["chatty"],
+        group_ids["busy"],
+        group_ids["quiet"],
+    ]
+    assert [chat["member_count"] for chat in chats] == [2, 3, 2]
+    assert chats[1]["last_message"]["body_preview"] == "busy day 4"
+    assert chats[2]["last_message"] is None and chats[2]["venue_name"] is None
+    assert len([s for s in statements if "group_matches" in s]) == 1
+
+
+def test_sending_a_message_updates_group_activity(client, test_engine):
+    suffix = uuid4().hex[:8]
+    user_a, headers_a = _register_user(client, suffix=f"act-a-{suffix}")
+    user_b, headers_b = _register_user(client, suffix=f"act-b-{suffix}")
+    older_id = _seed_confirmed_group_chat(test_engine, member_user_ids=[user_a["id"], user_b["id"]])
+    newer_id = _seed_confirmed_group_chat(test_engine, member_user_ids=[user_a["id"], user_b["id"]])
+
+    long_body = "x" * 300
+    sent = client.post(
+        f"/api/v1/chats/{older_id}/messages", json={"body": long_body}, headers=headers_b
+    )
+    assert sent.status_code == 201, sent.text
+
+    chats = client.get("/api/v1/chats", headers=headers_a).json()
+    assert [chat["id"] for chat in chats] == [older_id, newer_id]
+    last_message = chats[0]["last_message"]
+    assert last_message["id"] == sent.json()["id"]
+    assert last_message["sender_user_id"] == user_b["id"]
+    assert last_message["body_preview"] == "x" * 120
+
+    Session = sessionmaker(bind=test_engine, autocommit=False, autoflush=False)
+    with Session() as db:
+        group = db.get(GroupMatch, UUID(older_id))
+        assert group.message_count == 2
+        written = (group.last_message_id, group.last_message_at, group.last_message_preview)
+        # Rerunning the backfill agrees with what the write path maintained.
+        backfill_group_chat_activity(db)
+        db.refresh(group)
+        assert (group.last_message_id, group.last_message_at, group.last_message_preview) == written
+        assert group.message_count == 2
+
+
+def test_inbox_read_leaves_a_deleted_latest_message_to_the_backfill(client, test_engine):
+    suffix = uuid4().hex[:8]
+    user_a, headers_a = _register_user(client, suffix=f"del-a-{suffix}")
+    user_b, headers_b = _register_user(client, suffix=f"del-b-{suffix}")
+    group_id = _seed_confirmed_group_chat(test_engine, member_user_ids=[user_a["id"], user_b["id"]])
+    latest = client.post(
+        f"/api/v1/chats/{group_id}/messages", json={"body": "soon deleted"}, headers=headers_b
+    )
+    assert latest.status_code == 201, latest.text
+
+    Session = sessionmaker(bind=test_engine, autocommit=False, autoflush=False)
+    with Session() as db:
+        db.delete(db.get(GroupChatMessage, UUID(latest.json()["id"])))
+        # What the ON DELETE SET NULL foreign key does on PostgreSQL.
+        db.get(GroupMatch, UUID(group_id)).last_message_id = None
+        db.commit()
+
+    chats = client.get("/api/v1/chats", headers=headers_a).json()
+    assert chats[0]["last_message"] is None
+    with Session() as db:
+        # The read wrote nothing back.
+        assert db.get(GroupMatch, UUID(group_id)).message_count == 2
+        backfill_group_chat_activity(db, group_match_ids=[UUID(group_id)])
+        assert db.get(GroupMatch, UUID(group_id)).message_count == 1
+
+    chats = client.get("/api/v1/chats", headers=headers_a).json()
+    assert chats[0]["last_message"]["body_preview"] == "hello group"
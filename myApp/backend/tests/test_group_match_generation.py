@@ -1,7 +1,11 @@
-from uuid import uuid4
+from uuid import UUID, uuid4
+
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
 from app.core.security import create_access_token
+from app.models.group_match import GroupMatch, GroupMatchMember
 
 
 def _register_user(
@@ -33,7 +37,7 @@ def _admin_headers() -> dict[str, str]:
     return {"X-Admin-Key": settings.admin_api_key}
 
 
-def test_admin_group_match_generation_dry_run_and_create(client):
+def test_admin_group_match_generation_dry_run_and_create(client, test_engine):
     suffix = uuid4().hex[:8]
     users = []
     for idx in range(8):
@@ -70,6 +74,16 @@ def test_admin_group_match_generation_dry_run_and_create(client):
     assert created_body["created_groups"] == 2
     assert len(created_body["groups"]) == 2
     assert all(group["group_match_id"] is not None for group in created_body["groups"])
+    # Invited members get an inbox position from the group, not a NULL the databases sort apart.
+    with sessionmaker(bind=test_engine)() as db:
+        for group in created_body["groups"]:
+            group_row = db.get(GroupMatch, UUID(group["group_match_id"]))
+            activity = db.scalars(
+                select(GroupMatchMember.inbox_activity_at).where(
+                    GroupMatchMember.group_match_id == group_row.id
+                )
+            ).all()
+            assert activity == [group_row.updated_at] * 4
 
     # Rerun should skip because users are already in active generated groups.
     rerun = client.post("/api/v1/admin/group-matches/generate", json=payload, headers=_admin_headers())
@@ -237,3 +251,96 @@ def test_admin_group_match_generation_vector_hybrid_uses_vector_scores(client, m
     # Vector scores should pull the group toward the preferred cluster even when anchor ordering varies.
     assert max(preferred_count, other_count) == 4 or preferred_count == 3
     assert preferred_count >= other_count
+
+
+def test_admin_group_match_generation_max_distance_groups_nearby_users(client):
+    from app.services.geo import encode_geohash
+
+    suffix = uuid4().hex[:8]
+    cities = {"sf": (37.7749, -122.4194), "nyc": (40.7128, -74.0060)}
+    members: dict[str, set[str]] = {"sf": set(), "nyc": set()}
+    # Interleave registration so the heuristic alone would mix the two cities.
+    for idx in range(4):
+        for city, (lat, lon) in cities.items():
+            user, headers = _register_user(client, suffix=f"geo-{city}-{idx}-{suffix}")
+            geohash = encode_geohash(lat + idx * 0.005, lon, 7)
+            patched = client.patch("/api/v1/me/profile", json={"geohash": geohash}, headers=headers)
+            assert patched.status_code == 200, patched.text
+            members[city].add(user["id"])
+    lonely, headers = _register_user(client, suffix=f"geo-lonely-{suffix}")
+    client.patch(
+        "/api/v1/me/profile", json={"geohash": encode_geohash(51.5, -0.12)}, headers=headers
+    )
+
+    response = client.post(
+        "/api/v1/admin/group-matches/generate",
+        json={"mode": "in_person", "max_groups": 5, "max_distance_km": 10, "dry_run": True},
+        headers=_admin_headers(),
+    )
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert {frozenset(group["member_ids"]) for group in body["groups"]} == {
+        frozenset(members["sf"]),
+        frozenset(members["nyc"]),
+    }
+    assert body["skip_reasons"] == {"insufficient_candidates": 1}
+    assert lonely["id"] not in {m for group in body["groups"] for m in group["member_ids"]}
+
+
+def test_admin_group_match_generation_picks_nearby_restaurant_venue(client, test_engine):
+    from sqlalchemy import select
+    from sqlalchemy.orm import sessionmaker
+
+    from app.models.group_match import GroupMatchVenue
+    from app.services.geo import encode_geohash
+
+    suffix = uuid4().hex[:8]
+    member_headers = []
+    for idx in range(4):
+        _user, headers = _register_user(client, suffix=f"venue-{idx}-{suffix}")
+        geohash = encode_geohash(37.7749 + idx * 0.005, -122.4194, 8)
+        patched = client.patch("/api/v1/me/profile", json={"geohash": geohash}, headers=headers)
+        assert patched.status_code == 200, patched.text
+        member_headers.append(headers)
+
+    def _restaurant(name, cuisine, lat, lon):
+        response = client.post(
+            "/api/v1/restaurants",
+            json={"name": name, "cuisine": cuisine, "latitude": lat, "longitude": lon},
+        )
+        assert response.status_code == 201, response.text
+        return response.json()["id"]
+
+    _restaurant("Corner Diner", "Diner", 37.7824, -122.4194)
+    ramen_id = _restaurant("Ramen House", "Ramen", 37.79, -122.41)
+    # Liked, but across the country: its cuisine counts, the restaurant itself is out of range.
+    far_ramen_id = _restaurant("Ramen Far", "Ramen", 40.7128, -74.0060)
+    _restaurant("No Location", "Ramen", None, None)
+    for headers in member_headers[:2]:
+        rate = client.post(
+            f"/api/v1/restaurants/{far_ramen_id}/rating",
+            json={"rating": 5, "visited": True, "would_return": True},
+            headers=headers,
+        )
+        assert rate.status_code in (200, 201), rate.text
+
+    payload = {"mode": "in_person", "max_groups": 1, "dry_run": True}
+    dry_run = client.post(
+        "/api/v1/admin/group-matches/generate", json=payload, headers=_admin_headers()
+    )
+    assert dry_run.status_code == 200, dry_run.text
+    group = dry_run.json()["groups"][0]
+    assert (group["venue_name"], group["venue_restaurant_id"]) == ("Ramen House", ramen_id)
+
+    payload["dry_run"] = False
+    created = client.post(
+        "/api/v1/admin/group-matches/generate", json=payload, headers=_admin_headers()
+    )
+    assert created.status_code == 200, created.text
+    with sessionmaker(bind=test_engine)() as db:
+        venue = db.scalar(select(GroupMatchVenue))
+    assert venue.source == "internal_restaurants"
+    assert venue.restaurant_id == ramen_id
+    assert (venue.latitude, venue.longitude) == (37.79, -122.41)
+    assert venue.metadata_json["cuisine_matches"] == 2
+    assert venue.metadata_json["liked_by_members"] == 0
@@ -110,6 +110,11 @@ def test_list_and_accept_group_match_invite_promotes_confirmed(client, test_engi
     assert detail_response.status_code == 200
     assert detail_response.json()["status"] == "confirmed"
 
+    # Accepting keeps the denormalized inbox columns current for every member.
+    for headers in (h1, h4):
+        chats = client.get("/api/v1/chats", headers=headers).json()
+        assert [(chat["id"], chat["member_count"]) for chat in chats] == [(group_id, 4)]
+
 
 def test_decline_and_leave_group_match_membership_flows(client, test_engine):
     suffix = uuid4().hex[:8]
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import math
+
+import pytest
+
+from app.core.config import Settings
+from app.services.embeddings import FakeEmbedder, build_embedder, embed_texts
+from app.services.hashing_embedder import (
+    HASHING_EMBEDDING_MODEL,
+    HashingFeatureEmbedder,
+    load_hashing_embedder,
+    tokenize_profile_text,
+)
+
+
+def _profile_text(
+    *,
+    hobbies: str,
+    cuisines: str,
+    neighborhood: str = "Downtown",
+    budget: str = "10-35",
+) -> str:
+    return "\n".join(
+        [
+            "Proximity user preference profile",
+            "meetup_mode_preference: in_person",
+            f"neighborhood: {neighborhood}",
+            f"budget_range: {budget}",
+            f"hobbies: {hobbies}",
+            "diet_tags: none",
+            "vibe_tags: cozy",
+            f"liked_cuisines: {cuisines}",
+            "disliked_cuisines: none",
+            "liked_restaurants: Cafe Uno",
+            "disliked_restaurants: none",
+            "rating_summary: count=1, avg=5, positive=1, negative=0",
+        ]
+    )
+
+
+def test_tokenize_profile_text_extracts_field_features():
+    tokens = tokenize_profile_text(_profile_text(hobbies="coffee, hiking", cuisines="cafe"))
+    assert tokens == [
+        "meetup=in_person",
+        "neighborhood=downtown",
+        "budget=10",
+        "budget=20",
+        "budget=30",
+        "hobby=coffee",
+        "hobby=hiking",
+        "vibe=cozy",
+        "liked_cuisine=cafe",
+        "liked_restaurant=cafe uno",
+    ]
+    assert tokenize_profile_text("Likes Coffee") == ["word=likes", "word=coffee"]
+
+
+def test_hashing_embedder_similarity_tracks_shared_features():
+    texts = [
+        _profile_text(hobbies="coffee, hiking", cuisines="cafe, japanese"),
+        _profile_text(hobbies="coffee, hiking", cuisines="cafe"),
+        _profile_text(hobbies="gaming", cuisines="burgers", neighborhood="Uptown", budget="50-80"),
+    ]
+    embedder = HashingFeatureEmbedder(dimension=512).fit(texts)
+    assert embedder.model_name.startswith(f"{HASHING_EMBEDDING_MODEL}-")
+    assert embedder.model_name != HashingFeatureEmbedder(dimension=512).fit(texts[:2]).model_name
+
+    matrix = embedder.encode_batch(texts)
+    assert matrix.shape == (3, 512)
+    anchor = embedder.encode(texts[0])
+    assert math.isclose(anchor.dot(anchor), 1.0)
+    self_score, similar, different = matrix.dot(anchor)
+    assert math.isclose(self_score, 1.0)
+    assert similar > different
+
+    # CSR rows, sparse dot and the dense provider path all agree.
+    dense = embed_texts(embedder, texts)
+    for i, text in enumerate(texts):
+        assert matrix.row(i) == embedder.encode(text)
+        assert dense[i] == embedder.encode(text).to_dense(512)
+        expected = sum(a * b for a, b in zip(dense[0], dense[i], strict=True))
+        assert math.isclose(matrix.row(i).dot(anchor), expected, abs_tol=1e-12)
+
+
+def test_idf_downweights_features_shared_by_every_profile():
+    texts = [
+        _profile_text(hobbies="coffee", cuisines="cafe"),
+        _profile_text(hobbies="hiking", cuisines="thai"),
+    ]
+    unfitted = HashingFeatureEmbedder(dimension=512)
+    fitted = unfitted.fit(texts)
+    # Meetup, neighborhood, budget, vibe and restaurant are shared; idf discounts them.
+    assert fitted.encode(texts[0]).dot(fitted.encode(texts[1])) < unfitted.encode(texts[0]).dot(
+        unfitted.encode(texts[1])
+    )
+    assert unfitted.encode("").indices == ()
+
+
+def test_saved_idf_loads_through_the_provider_setting(tmp_path):
+    texts = [
+        _profile_text(hobbies="coffee", cuisines="cafe"),
+        _profile_text(hobbies="hiking", cuisines="thai"),
+    ]
+    fitted = HashingFeatureEmbedder(dimension=64).fit(texts)
+    path = tmp_path / "hashing_idf.json"
+    fitted.save(path)
+
+    embedder = build_embedder(
+        Settings(embedding_provider="hashing", embedding_hashing_idf_path=str(path)), dimension=64
+    )
+    assert isinstance(embedder, HashingFeatureEmbedder)
+    assert embedder.model_name == fitted.model_name
+    assert embedder.embed_texts(texts) == fitted.embed_texts(texts)
+
+    with pytest.raises(ValueError):
+        load_hashing_embedder(str(path), dimension=32)
+    assert isinstance(build_embedder(Settings(), dimension=64), FakeEmbedder)
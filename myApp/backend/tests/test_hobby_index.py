@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.services import hobby_index as hobby_index_module
+from app.services.hobby_index import HobbyInvertedIndex, build_hobby_index, hobby_index
+
+
+def _uuid(n: int) -> UUID:
+    return UUID(int=n)
+
+
+def _index() -> HobbyInvertedIndex:
+    index = HobbyInvertedIndex()
+    index.load(
+        [
+            (_uuid(1), True, "Downtown", ["coffee", "hiking", "movies"]),
+            (_uuid(2), True, "Uptown", ["coffee", "hiking"]),
+            (_uuid(3), True, " downtown", ["coffee"]),
+            (_uuid(4), True, "Uptown", ["coffee"]),
+            (_uuid(5), True, "Downtown", []),
+            (_uuid(6), False, "Downtown", ["coffee", "hiking", "movies"]),
+            (_uuid(7), True, "Elsewhere", ["chess"]),
+        ]
+    )
+    return index
+
+
+def _keys(matches):
+    return [(m.user_id.int, m.score, m.hobby_overlap, m.same_neighborhood) for m in matches]
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_top_candidates_rank_exclude_and_page(monkeypatch, use_numpy):
+    if not use_numpy:
+        monkeypatch.setattr(hobby_index_module, "np", None)
+    index = _index()
+
+    assert _keys(index.top_candidates(_uuid(1), limit=10)) == [
+        (2, 2, 2, False),
+        (3, 2, 1, True),
+        (4, 1, 1, False),
+        (5, 1, 0, True),
+    ]
+    assert _keys(index.top_candidates(_uuid(1), limit=2, exclude=[_uuid(3)])) == [
+        (2, 2, 2, False),
+        (4, 1, 1, False),
+    ]
+
+    first = index.top_candidates(_uuid(1), limit=2)
+    last = first[-1]
+    after = (last.score, last.hobby_overlap, int(last.same_neighborhood), last.user_id)
+    assert _keys(index.top_candidates(_uuid(1), limit=2, after=after)) == [
+        (4, 1, 1, False),
+        (5, 1, 0, True),
+    ]
+    assert index.top_candidates(uuid4(), limit=5) is None
+
+
+def test_upsert_moves_postings_and_bitsets_count_overlap():
+    index = _index()
+    assert index.hobby_overlap(_uuid(1), _uuid(2)) == 2
+
+    index.upsert_user(_uuid(7), discoverable=True, neighborhood="Downtown", hobby_codes=["movies"])
+    index.upsert_user(_uuid(2), discoverable=False, neighborhood="Uptown", hobby_codes=["coffee"])
+    index.remove_user(_uuid(4))
+
+    keys = _keys(index.top_candidates(_uuid(1), limit=10))
+    assert keys == [(7, 2, 1, True), (3, 2, 1, True), (5, 1, 0, True)]
+    assert index.hobby_overlap(_uuid(1), _uuid(2)) == 1
+    assert index.hobby_bits(_uuid(4)) is None
+
+
+def _register(client, suffix: str, neighborhood: str) -> tuple[str, dict[str, str]]:
+    response = client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": f"{suffix}@example.com",
+            "password": "password123",
+            "firebase_uid": f"firebase-{suffix}",
+            "neighborhood": neighborhood,
+        },
+    )
+    assert response.status_code == 201, response.text
+    token = create_access_token(subject=f"firebase-{suffix}")
+    return response.json()["id"], {"Authorization": f"Bearer {token}"}
+
+
+def _feed(client, headers) -> list[tuple[str, int, int, bool]]:
+    feed: list[tuple[str, int, int, bool]] = []
+    cursor = None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/api/v1/matches", params=params, headers=headers)
+        assert response.status_code == 200, response.text
+        feed += [
+            (
+                m["user"]["id"],
+                m["score"],
+                m["signals"]["hobby_overlap_count"],
+                m["signals"]["same_neighborhood"],
+            )
+            for m in response.json()
+        ]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return feed
+
+
+def test_matches_feed_from_index_matches_sql_and_follows_writes(client, test_engine):
+    admin = {"X-Admin-Key": settings.admin_api_key}
+    codes = [f"idx{i}_{uuid4().hex[:6]}" for i in range(3)]
+    for code in codes:
+        created = client.post(
+            "/api/v1/admin/hobbies", json={"code": code, "label": code}, headers=admin
+        )
+        assert created.status_code == 201, created.text
+
+    _me, me_headers = _register(client, "idx-me", "Downtown")
+    client.patch("/api/v1/me/profile", json={"hobbies": codes}, headers=me_headers)
+    for i, (hood, hobbies) in enumerate(
+        [("Downtown", codes[:2]), ("Uptown", codes), ("Uptown", codes[:1]), ("Downtown", [])]
+    ):
+        _user_id, headers = _register(client, f"idx-{i}", hood)
+        client.patch("/api/v1/me/profile", json={"hobbies": hobbies}, headers=headers)
+
+    sql_feed = _feed(client, me_headers)
+    try:
+        with sessionmaker(bind=test_engine)() as db:
+            build_hobby_index(db)
+        assert _feed(client, me_headers) == sql_feed
+
+        # Write hooks keep the index current: a newcomer and a hobby change show up immediately.
+        newcomer, newcomer_headers = _register(client, "idx-new", "Uptown")
+        patched = client.patch(
+            "/api/v1/me/profile", json={"hobbies": codes}, headers=newcomer_headers
+        )
+        assert patched.status_code == 200, patched.text
+        indexed_feed = _feed(client, me_headers)
+        # Ties with the other full-overlap user on score, so only the top two are fixed.
+        assert (newcomer, 3, 3, False) in indexed_feed[:2]
+    finally:
+        hobby_index.clear()
+    assert _feed(client, me_headers) == indexed_feed
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from uuid import UUID, uuid4
+
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.services.hobby_index import IndexedMatch
+from app.services.match_feed import MatchFeedWarmerConfig, warm_match_feeds
+from app.services.match_feed_cache import MatchFeedCache, match_feed_cache
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _match(n: int, score: int, overlap: int) -> IndexedMatch:
+    return IndexedMatch(UUID(int=n), score, overlap, score > overlap)
+
+
+def test_feed_pages_by_cursor_and_reports_truncation():
+    cache = MatchFeedCache(ttl_seconds=60.0)
+    owner = uuid4()
+    items = [_match(9, 3, 3), _match(8, 2, 1), _match(7, 2, 1), _match(3, 1, 1)]
+    feed = cache.store(owner, items, complete=False, token=cache.begin())
+
+    assert feed.page(limit=2) == items[:2]
+    assert feed.page(limit=2, after=(2, 1, 1, UUID(int=8))) == items[2:]
+    assert feed.page(limit=1, offset=1, after=(3, 3, 0, UUID(int=9))) == items[2:3]
+    assert feed.page(limit=3, after=(2, 1, 1, UUID(int=8))) is None
+    assert cache.get(owner) is feed
+
+
+def test_invalidation_drops_listing_feeds_and_rejects_stale_stores():
+    clock = _Clock()
+    cache = MatchFeedCache(ttl_seconds=60.0, clock=clock)
+    owner, other, candidate = uuid4(), uuid4(), uuid4()
+    listed = [IndexedMatch(candidate, 1, 1, False)]
+    cache.store(owner, listed, complete=True, token=cache.begin())
+    cache.store(other, [], complete=True, token=cache.begin())
+
+    cache.invalidate_users([candidate], listing_feeds=False)
+    assert cache.get(owner) is not None
+    cache.invalidate_users([candidate])
+    assert cache.get(owner) is None
+    assert cache.get(other) is not None
+
+    # A feed computed before an invalidation of anyone it lists is not cached.
+    token = cache.begin()
+    cache.invalidate_users([candidate])
+    cache.store(owner, listed, complete=True, token=token)
+    assert cache.get(owner) is None
+
+    cache.store(owner, listed, complete=True, token=cache.begin())
+    clock.now += 50.0
+    assert cache.recently_read(within_seconds=100.0, refresh_before_seconds=15.0) == [
+        owner,
+        other,
+    ]
+    clock.now += 10.0
+    assert cache.get(owner) is None
+
+
+def _register(client, suffix: str, neighborhood: str, hobbies: list[str]) -> tuple[str, dict]:
+    response = client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": f"{suffix}@example.com",
+            "password": "password123",
+            "firebase_uid": f"firebase-{suffix}",
+            "neighborhood": neighborhood,
+        },
+    )
+    assert response.status_code == 201, response.text
+    headers = {"Authorization": f"Bearer {create_access_token(subject=f'firebase-{suffix}')}"}
+    patched = client.patch("/api/v1/me/profile", json={"hobbies": hobbies}, headers=headers)
+    assert patched.status_code == 200, patched.text
+    return response.json()["id"], headers
+
+
+def _feed_ids(client, headers, **params) -> list[str]:
+    response = client.get("/api/v1/matches", params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    return [match["user"]["id"] for match in response.json()]
+
+
+def test_matches_served_from_cached_feed_and_invalidated_by_writes(
+    client, test_engine, monkeypatch
+):
+    admin = {"X-Admin-Key": settings.admin_api_key}
+    codes = [f"feed{i}_{uuid4().hex[:6]}" for i in range(3)]
+    for code in codes:
+        created = client.post(
+            "/api/v1/admin/hobbies", json={"code": code, "label": code}, headers=admin
+        )
+        assert created.status_code == 201, created.text
+
+    me, me_headers = _register(client, "feed-me", "Downtown", codes)
+    best, best_headers = _register(client, "feed-best", "Downtown", codes)
+    mid, _ = _register(client, "feed-mid", "Uptown", codes[:2])
+    low, _ = _register(client, "feed-low", "Uptown", codes[:1])
+    sql_feed = _feed_ids(client, me_headers)
+    assert sql_feed == [best, mid, low]
+
+    monkeypatch.setattr(settings, "match_feed_cache_enabled", True)
+    match_feed_cache.clear()
+    try:
+        assert _feed_ids(client, me_headers) == sql_feed
+        assert _feed_ids(client, me_headers, limit=2, offset=1) == sql_feed[1:]
+        assert match_feed_cache.hits == 1 and match_feed_cache.misses == 1
+
+        # A candidate's hobby edit drops every feed that lists them.
+        client.patch("/api/v1/me/profile", json={"hobbies": []}, headers=best_headers)
+        assert _feed_ids(client, me_headers) == [mid, low, best]
+
+        # A friend request removes the addressee on the requester's next read.
+        sent = client.post(f"/api/v1/friends/requests/{mid}", headers=me_headers)
+        assert sent.status_code == 201, sent.text
+        assert _feed_ids(client, me_headers) == [low, best]
+
+        with sessionmaker(bind=test_engine)() as db:
+            match_feed_cache.invalidate_users([UUID(low)])
+            assert warm_match_feeds(db, config=MatchFeedWarmerConfig()) == 1
+        misses = match_feed_cache.misses
+        assert _feed_ids(client, me_headers) == [low, best]
+        assert match_feed_cache.misses == misses
+    finally:
+        match_feed_cache.clear()
@@ -1,5 +1,6 @@
 from uuid import UUID, uuid4
 
+from sqlalchemy import event
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
@@ -7,6 +8,7 @@ from app.core.security import create_access_token
 from app.services.preference_profile_builder import (
     PREFERENCE_PROFILE_EMBEDDING_VERSION,
     build_preference_profile,
+    build_preference_profiles_batch,
 )
 
 
@@ -138,3 +140,68 @@ def test_build_preference_profile_handles_missing_user(client, test_engine):
             assert "User not found" in str(exc)
         else:
             raise AssertionError("Expected ValueError for missing user")
+
+
+def test_build_preference_profiles_batch_matches_single_user_builder(client, test_engine):
+    suffix = uuid4().hex[:8]
+    code = f"climbing_{suffix}"
+    created = client.post(
+        "/api/v1/admin/hobbies",
+        json={"code": code, "label": "Climbing", "is_active": True},
+        headers=_admin_headers(),
+    )
+    assert created.status_code == 201, created.text
+    restaurant = client.post(
+        "/api/v1/restaurants",
+        json={"name": f"Noodles {suffix}", "cuisine": "Thai", "address": "4 Main"},
+    )
+    assert restaurant.status_code == 201, restaurant.text
+
+    user_ids: list[UUID] = []
+    for idx in range(3):
+        user, headers = _register_user(client, suffix=f"batch-{idx}-{suffix}")
+        user_ids.append(UUID(user["id"]))
+        if idx == 2:
+            continue  # No hobbies or ratings.
+        patch = client.patch(
+            "/api/v1/me/profile",
+            json={"hobbies": [code], "vibe_tags": ["Lively"]},
+            headers=headers,
+        )
+        assert patch.status_code == 200, patch.text
+        rated = client.post(
+            f"/api/v1/restaurants/{restaurant.json()['id']}/rating",
+            json={"rating": 5 - idx * 3, "visited": True},
+            headers=headers,
+        )
+        assert rated.status_code in (200, 201), rated.text
+
+    Session = sessionmaker(bind=test_engine, autocommit=False, autoflush=False)
+    requested = [user_ids[2], user_ids[0], user_ids[1], user_ids[0]]
+    with Session() as db:
+        statements: list[str] = []
+
+        def _count(_conn, _cursor, statement, *_args):
+            statements.append(statement)
+
+        event.listen(test_engine, "before_cursor_execute", _count)
+        try:
+            batch = build_preference_profiles_batch(db, requested)
+        finally:
+            event.remove(test_engine, "before_cursor_execute", _count)
+        single = [build_preference_profile(db, user_id) for user_id in requested]
+
+        try:
+            build_preference_profiles_batch(
+                db, [user_ids[0], UUID("00000000-0000-0000-0000-000000000002")]
+            )
+        except ValueError as exc:
+            assert "User not found" in str(exc)
+        else:
+            raise AssertionError("Expected ValueError for missing user")
+
+    assert len(statements) == 3
+    assert [profile.as_dict() for profile in batch] == [profile.as_dict() for profile in single]
+    assert batch[1].features.liked_restaurants[0].name == f"Noodles {suffix}"
+    assert batch[2].features.disliked_cuisines == ["thai"]
+    assert batch[0].features.hobbies == []
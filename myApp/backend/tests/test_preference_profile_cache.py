@@ -0,0 +1,175 @@
+from uuid import UUID, uuid4
+
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.crud.preference_profile import (
+    invalidate_user_preference_profiles,
+    list_user_preference_profiles,
+    store_user_preference_profiles,
+)
+from app.models.preference_profile import UserPreferenceProfile
+from app.models.user import User
+from app.services.preference_profile_builder import PreferenceProfile, build_preference_profile
+from app.services.preference_profile_cache import (
+    get_preference_profile_embedding_inputs_batch,
+    get_preference_profiles_batch,
+)
+
+
+def _register_user(client, *, suffix: str):
+    firebase_uid = f"firebase-{suffix}"
+    response = client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": f"{suffix}@example.com",
+            "password": "password123",
+            "firebase_uid": firebase_uid,
+            "neighborhood": "Downtown",
+        },
+    )
+    assert response.status_code == 201, response.text
+    headers = {"Authorization": f"Bearer {create_access_token(subject=firebase_uid)}"}
+    return UUID(response.json()["id"]), headers
+
+
+def _admin_headers() -> dict[str, str]:
+    return {"X-Admin-Key": settings.admin_api_key}
+
+
+def test_cached_profiles_match_builder_and_are_invalidated_by_writes(client, test_engine):
+    suffix = uuid4().hex[:8]
+    user_id, headers = _register_user(client, suffix=f"cache-{suffix}")
+    patch = client.patch("/api/v1/me/profile", json={"vibe_tags": ["Cozy"]}, headers=headers)
+    assert patch.status_code == 200, patch.text
+
+    Session = sessionmaker(bind=test_engine, autocommit=False, autoflush=False)
+    with Session() as db:
+        first = get_preference_profiles_batch(db, [user_id])
+        row = db.get(UserPreferenceProfile, user_id)
+        assert row is not None and row.profile is not None
+        assert row.content_hash.startswith("sha256:")
+
+        statements: list[str] = []
+
+        def _count(_conn, _cursor, statement, *_args):
+            statements.append(statement)
+
+        event.listen(test_engine, "before_cursor_execute", _count)
+        try:
+            cached = get_preference_profiles_batch(db, [user_id, user_id])
+        finally:
+            event.remove(test_engine, "before_cursor_execute", _count)
+        assert len(statements) == 1
+        assert cached == [first[0], first[0]]
+        assert cached[0] == build_preference_profile(db, user_id)
+        generation = row.generation
+
+    restaurant = client.post(
+        "/api/v1/restaurants",
+        json={"name": f"Bistro {suffix}", "cuisine": "French", "address": "5 Main"},
+    )
+    assert restaurant.status_code == 201, restaurant.text
+    rated = client.post(
+        f"/api/v1/restaurants/{restaurant.json()['id']}/rating",
+        json={"rating": 5, "visited": True},
+        headers=headers,
+    )
+    assert rated.status_code in (200, 201), rated.text
+
+    with Session() as db:
+        row = db.get(UserPreferenceProfile, user_id)
+        assert row.profile is None
+        assert row.generation == generation + 1
+        refreshed = get_preference_profiles_batch(db, [user_id])[0]
+        assert refreshed.features.liked_cuisines == ["french"]
+        assert refreshed == build_preference_profile(db, user_id)
+
+
+def test_embedding_inputs_from_materialized_rows_match_built_profiles(client, test_engine):
+    user_id, headers = _register_user(client, suffix=f"cache-inputs-{uuid4().hex[:8]}")
+    patch = client.patch(
+        "/api/v1/me/profile",
+        json={"diet_tags": ["Vegan"], "budget_min": 5, "budget_max": 20},
+        headers=headers,
+    )
+    assert patch.status_code == 200, patch.text
+
+    Session = sessionmaker(bind=test_engine, autocommit=False, autoflush=False)
+    with Session() as db:
+        # First call builds and stores; the second reads the stored row.
+        built = get_preference_profile_embedding_inputs_batch(db, [user_id])
+        cached = get_preference_profile_embedding_inputs_batch(db, [user_id])
+        expected = build_preference_profile(db, user_id)
+
+    assert built == cached == [expected.embedding_input()]
+    assert cached[0].diet_tags == ["vegan"]
+    assert not hasattr(cached[0], "__dict__")
+    assert PreferenceProfile.from_dict(expected.as_dict()) == expected
+
+
+def test_profile_read_does_not_commit_the_callers_pending_changes(client, test_engine):
+    user_id, _headers = _register_user(client, suffix=f"cache-txn-{uuid4().hex[:8]}")
+    Session = sessionmaker(bind=test_engine, autocommit=False, autoflush=False)
+    with Session() as db:
+        db.get(User, user_id).neighborhood = "Uncommitted"
+        get_preference_profiles_batch(db, [user_id])
+        assert db.get(UserPreferenceProfile, user_id).profile is not None
+        db.rollback()
+
+    with Session() as db:
+        assert db.get(User, user_id).neighborhood == "Downtown"
+        row = db.get(UserPreferenceProfile, user_id)
+        assert row is None or row.profile is None
+
+
+def test_stale_profile_write_back_loses_to_invalidation(client, test_engine):
+    user_id, _headers = _register_user(client, suffix=f"cache-race-{uuid4().hex[:8]}")
+    Session = sessionmaker(bind=test_engine, autocommit=False, autoflush=False)
+    with Session() as db:
+        invalidate_user_preference_profiles(db, user_ids=[user_id])
+        [row] = list_user_preference_profiles(db, user_ids=[user_id])
+        read_generation = row.generation
+        profile = build_preference_profile(db, user_id)
+
+        # A profile write commits between the read and the write-back.
+        invalidate_user_preference_profiles(db, user_ids=[user_id])
+        stored = store_user_preference_profiles(
+            db,
+            rows=[{"user_id": user_id, "profile": profile.as_dict()}],
+            generations={user_id: read_generation},
+        )
+        assert stored == 0
+        [row] = list_user_preference_profiles(db, user_ids=[user_id])
+        assert row.profile is None
+        assert row.generation == read_generation + 1
+
+
+def test_admin_bulk_preference_profiles_reports_missing_users(client):
+    user_ids = [_register_user(client, suffix=f"cache-bulk-{i}")[0] for i in range(2)]
+    missing = UUID("00000000-0000-0000-0000-000000000003")
+
+    response = client.post(
+        "/api/v1/admin/preference-profiles/bulk",
+        headers=_admin_headers(),
+        json={"user_ids": [str(user_ids[1]), str(missing), str(user_ids[0])]},
+    )
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert [item["user_id"] for item in body["profiles"]] == [str(user_ids[1]), str(user_ids[0])]
+    assert body["missing_user_ids"] == [str(missing)]
+    assert body["profiles"][0]["profile"]["text_for_embedding"] == body["profiles"][0][
+        "text_for_embedding"
+    ]
+
+    single = client.get(
+        f"/api/v1/admin/preference-profiles/{user_ids[0]}", headers=_admin_headers()
+    )
+    assert single.status_code == 200, single.text
+    assert single.json() == body["profiles"][1]
+    not_found = client.get(
+        f"/api/v1/admin/preference-profiles/{missing}", headers=_admin_headers()
+    )
+    assert not_found.status_code == 404
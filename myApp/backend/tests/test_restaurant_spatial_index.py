@@ -0,0 +1,124 @@
+import random
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.services import geo
+from app.services import restaurant_spatial_index as spatial_module
+from app.services.geo import haversine_km
+from app.services.restaurant_spatial_index import (
+    RestaurantSpatialIndex,
+    build_restaurant_spatial_index,
+    restaurant_index_for_regions,
+    restaurant_spatial_index,
+)
+
+
+def _points(count, *, seed=7):
+    rng = random.Random(seed)
+    points = [
+        (i, 30.2 + rng.uniform(-0.5, 0.5), -97.7 + rng.uniform(-0.5, 0.5)) for i in range(count)
+    ]
+    # A few far-away outliers, including both sides of the antimeridian.
+    points += [(count, 51.5, -0.1), (count + 1, 10.0, 179.99), (count + 2, 10.0, -179.99)]
+    return points
+
+
+def _brute_force(points, lat, lon, *, limit, radius_km=None):
+    distances = sorted(
+        (haversine_km(lat, lon, p_lat, p_lon), restaurant_id)
+        for restaurant_id, p_lat, p_lon in points
+    )
+    if radius_km is not None:
+        distances = [item for item in distances if item[0] <= radius_km]
+    return [restaurant_id for _distance, restaurant_id in distances[:limit]]
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_nearest_matches_brute_force(monkeypatch, use_numpy):
+    if not use_numpy:
+        monkeypatch.setattr(spatial_module, "np", None)
+        monkeypatch.setattr(geo, "np", None)
+    points = _points(500)
+    index = RestaurantSpatialIndex()
+    index.load([*points, (9999, None, None)])
+    assert len(index) == len(points)
+
+    for lat, lon in [(30.2, -97.7), (30.61, -98.15), (10.0, 179.95), (-33.9, 151.2)]:
+        for limit in (1, 5, 40):
+            nearest = index.nearest(lat, lon, limit=limit)
+            assert [rid for rid, _d in nearest] == _brute_force(points, lat, lon, limit=limit)
+            for rid, distance in nearest:
+                assert distance == pytest.approx(haversine_km(lat, lon, *points[rid][1:]))
+        within = index.nearest(lat, lon, limit=1000, radius_km=12.0)
+        assert [rid for rid, _d in within] == _brute_force(
+            points, lat, lon, limit=1000, radius_km=12.0
+        )
+
+
+def test_upsert_and_remove_keep_the_grid_current():
+    index = RestaurantSpatialIndex()
+    index.load([(1, 30.0, -97.0), (2, 30.01, -97.0)])
+
+    index.upsert(1, 45.0, 7.0)
+    assert [rid for rid, _d in index.nearest(30.0, -97.0, limit=1)] == [2]
+    assert [rid for rid, _d in index.nearest(45.0, 7.0, limit=1)] == [1]
+
+    index.remove(2)
+    index.upsert(3, 30.02, -97.0)
+    index.upsert(4, None, None)
+    assert len(index) == 2
+    assert [rid for rid, _d in index.nearest(30.0, -97.0, limit=5, radius_km=10)] == [3]
+
+
+def test_nearby_endpoint_uses_sql_fallback_and_index(client, test_engine):
+    for name, lat, lon in [
+        ("Close", 30.2672, -97.7431),
+        ("Across Town", 30.3072, -97.7431),
+        ("Far", 32.7767, -96.797),
+    ]:
+        response = client.post(
+            "/api/v1/restaurants", json={"name": name, "latitude": lat, "longitude": lon}
+        )
+        assert response.status_code == 201
+    client.post("/api/v1/restaurants", json={"name": "Nowhere"})
+
+    params = {"lat": 30.2672, "lon": -97.7431, "radius_km": 10}
+    fallback = client.get("/api/v1/restaurants/nearby", params=params)
+    assert fallback.status_code == 200
+    assert [r["name"] for r in fallback.json()] == ["Close", "Across Town"]
+    assert fallback.json()[0]["distance_km"] == 0
+    assert fallback.json()[1]["distance_km"] == pytest.approx(4.45, abs=0.01)
+
+    try:
+        with sessionmaker(bind=test_engine)() as db:
+            build_restaurant_spatial_index(db)
+        created = client.post(
+            "/api/v1/restaurants", json={"name": "New Spot", "latitude": 30.27, "longitude": -97.74}
+        )
+        assert created.status_code == 201
+        indexed = client.get("/api/v1/restaurants/nearby", params={**params, "limit": 2})
+        assert indexed.status_code == 200
+        assert [r["name"] for r in indexed.json()] == ["Close", "New Spot"]
+    finally:
+        restaurant_spatial_index.clear()
+
+    assert client.get("/api/v1/restaurants/nearby", params={"lat": 91, "lon": 0}).status_code == 422
+
+
+def test_index_for_regions_loads_only_the_enclosing_box(client, test_engine):
+    cities = [("Austin", 30.27, -97.74), ("Dallas", 32.78, -96.8), ("Oslo", 59.9, 10.7)]
+    for name, lat, lon in cities:
+        response = client.post(
+            "/api/v1/restaurants", json={"name": name, "latitude": lat, "longitude": lon}
+        )
+        assert response.status_code == 201
+
+    with sessionmaker(bind=test_engine)() as db:
+        local = restaurant_index_for_regions(db, [(30.27, -97.74, 5), (32.78, -96.8, 5)])
+        assert local is not restaurant_spatial_index and len(local) == 2
+        try:
+            build_restaurant_spatial_index(db)
+            assert restaurant_index_for_regions(db, []) is restaurant_spatial_index
+        finally:
+            restaurant_spatial_index.clear()
@@ -138,6 +138,64 @@ def test_matches_scores_and_excludes_pending_and_friends(client):
     assert matches[0]["user"]["id"] == top_match_user["id"]
 
 
+def test_matches_are_ranked_in_sql_and_paged_with_keyset_cursor(client):
+    suffix = uuid4().hex[:8]
+    _me, me_headers = _register_user(client, suffix=f"feed-me-{suffix}", neighborhood="Downtown")
+    codes = [f"feed{idx}_{suffix}" for idx in range(3)]
+    for code in codes:
+        _create_hobby(client, code, code)
+    _patch_me_profile(client, me_headers, {"hobbies": codes})
+
+    # (neighborhood, hobbies) -> expected score
+    expected_scores: dict[str, int] = {}
+    for idx, (neighborhood, hobbies) in enumerate(
+        [
+            ("Downtown", codes),
+            ("Uptown", codes[:2]),
+            ("downtown ", codes[:1]),
+            ("Uptown", codes[:1]),
+            ("Downtown", []),
+        ]
+    ):
+        user, headers = _register_user(
+            client, suffix=f"feed-{idx}-{suffix}", neighborhood=neighborhood
+        )
+        _patch_me_profile(client, headers, {"hobbies": hobbies})
+        expected_scores[user["id"]] = len(hobbies) + (neighborhood.strip().lower() == "downtown")
+    # Zero-score users registered last no longer push real matches off the first page.
+    for idx in range(3):
+        _register_user(client, suffix=f"feed-zero-{idx}-{suffix}", neighborhood="Elsewhere")
+
+    pages: list[list[dict]] = []
+    cursor = None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/api/v1/matches", params=params, headers=me_headers)
+        assert response.status_code == 200, response.text
+        pages.append(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    feed = [match for page in pages for match in page]
+    assert {match["user"]["id"]: match["score"] for match in feed} == expected_scores
+    keys = [
+        (
+            match["score"],
+            match["signals"]["hobby_overlap_count"],
+            match["signals"]["same_neighborhood"],
+            match["user"]["id"],
+        )
+        for match in feed
+    ]
+    assert keys == sorted(keys, reverse=True)
+    assert feed[0]["signals"]["overlap_hobbies"] == sorted(codes)
+
+    bad = client.get("/api/v1/matches", params={"cursor": "not-a-cursor"}, headers=me_headers)
+    assert bad.status_code == 400
+
+
 def test_incoming_outgoing_and_decline_cancel_flows(client):
     suffix = uuid4().hex[:8]
     sender, sender_headers = _register_user(client, suffix=f"sender-{suffix}", neighborhood="Downtown")
@@ -195,3 +253,101 @@ def test_incoming_outgoing_and_decline_cancel_flows(client):
     assert other_outgoing.status_code == 200
     assert other_incoming.json() == []
     assert other_outgoing.json() == []
+
+
+def test_matches_radius_filter_uses_geohash_proximity(client):
+    from app.services.geo import encode_geohash
+
+    suffix = uuid4().hex[:8]
+    code = f"near_{suffix}"
+    _create_hobby(client, code, code)
+    me, me_headers = _register_user(client, suffix=f"geo-me-{suffix}", neighborhood="Mission")
+    _patch_me_profile(
+        client, me_headers, {"hobbies": [code], "geohash": encode_geohash(37.7599, -122.4148)}
+    )
+
+    placed: dict[str, str] = {}
+    for name, geohash in [
+        ("close", encode_geohash(37.7690, -122.4300)),  # ~1.7 km
+        ("coarse", encode_geohash(37.7599, -122.4148, 5)),  # stored at lower precision
+        ("across-bay", encode_geohash(37.8044, -122.2712)),  # ~13.5 km
+        ("nowhere", None),
+    ]:
+        user, headers = _register_user(client, suffix=f"geo-{name}-{suffix}")
+        _patch_me_profile(client, headers, {"hobbies": [code], "geohash": geohash})
+        placed[name] = user["id"]
+
+    def _ids(radius_km: float) -> set[str]:
+        response = client.get(
+            "/api/v1/matches", params={"radius_km": radius_km}, headers=me_headers
+        )
+        assert response.status_code == 200, response.text
+        return {match["user"]["id"] for match in response.json()}
+
+    assert _ids(5) == {placed["close"], placed["coarse"]}
+    assert _ids(20) == {placed["close"], placed["coarse"], placed["across-bay"]}
+    assert me["id"] not in _ids(20)
+
+    # Users inside the geohash cells but outside the circle are refined away without short pages.
+    paged: list[str] = []
+    params: dict = {"radius_km": 5, "limit": 1}
+    for _ in range(2):
+        page = client.get("/api/v1/matches", params=params, headers=me_headers)
+        assert page.status_code == 200, page.text
+        assert len(page.json()) == 1
+        paged.append(page.json()[0]["user"]["id"])
+        params["cursor"] = page.headers["X-Next-Cursor"]
+    assert set(paged) == {placed["close"], placed["coarse"]}
+    offset_page = client.get(
+        "/api/v1/matches", params={"radius_km": 5, "limit": 1, "offset": 1}, headers=me_headers
+    )
+    assert [match["user"]["id"] for match in offset_page.json()] == paged[1:]
+
+    _patch_me_profile(client, me_headers, {"geohash": None})
+    missing = client.get("/api/v1/matches", params={"radius_km": 5}, headers=me_headers)
+    assert missing.status_code == 400
+
+
+def test_matches_page_is_one_query_regardless_of_friend_count(client, test_engine):
+    from uuid import UUID
+
+    from sqlalchemy import event
+    from sqlalchemy.orm import sessionmaker
+
+    from app.models.social import Friendship
+
+    suffix = uuid4().hex[:8]
+    me, me_headers = _register_user(client, suffix=f"one-trip-me-{suffix}", neighborhood="Downtown")
+    code = f"onetrip_{suffix}"
+    _create_hobby(client, code, code)
+    _patch_me_profile(client, me_headers, {"hobbies": [code]})
+    match, match_headers = _register_user(client, suffix=f"one-trip-match-{suffix}")
+    _patch_me_profile(client, match_headers, {"hobbies": [code]})
+
+    statements: list[tuple[str, int]] = []
+
+    def _record(_conn, _cursor, statement, parameters, _context, _executemany):
+        statements.append((statement, len(parameters or ())))
+
+    def _page() -> list[tuple[str, int]]:
+        statements.clear()
+        event.listen(test_engine, "before_cursor_execute", _record)
+        try:
+            response = client.get("/api/v1/matches", headers=me_headers)
+        finally:
+            event.remove(test_engine, "before_cursor_execute", _record)
+        assert response.status_code == 200, response.text
+        body = response.json()
+        assert [m["user"]["id"] for m in body] == [match["id"]]
+        assert body[0]["user"]["hobbies"] == [code]
+        assert body[0]["signals"]["overlap_hobbies"] == [code]
+        return [item for item in statements if "friendships" in item[0]]
+
+    few = _page()
+    with sessionmaker(bind=test_engine)() as db:
+        db.add_all(Friendship(user_id=UUID(me["id"]), friend_id=uuid4()) for _ in range(200))
+        db.commit()
+    many = _page()
+
+    assert len(few) == 1 and "hobby_catalog" in few[0][0]
+    assert many == few
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.services.actian_vector_store import ActianVectorStoreAdapter, ActianVectorStoreConfig
+from app.services.in_process_cortex import InProcessCortexClient
+from app.services.vector_benchmark import (
+    VectorBenchmarkConfig,
+    run_vector_benchmark,
+    summarize_latencies,
+)
+
+
+def _admin_headers() -> dict[str, str]:
+    return {"X-Admin-Key": settings.admin_api_key}
+
+
+def test_summarize_latencies_uses_nearest_rank():
+    summary = summarize_latencies([float(value) for value in range(1, 101)])
+    assert summary.count == 100
+    assert summary.p50_ms == 50.0
+    assert summary.p95_ms == 95.0
+    assert summary.p99_ms == 99.0
+    assert summary.max_ms == 100.0
+    assert summarize_latencies([]).p50_ms is None
+
+
+def test_in_process_benchmark_sweeps_batches_and_reports_exact_recall(test_engine):
+    db = sessionmaker(bind=test_engine)()
+    client = InProcessCortexClient(dimension=8)
+    adapter = ActianVectorStoreAdapter(
+        db=db,
+        config=ActianVectorStoreConfig(address="in-process", collection_name="bench", dimension=8),
+        client=client,
+    )
+
+    report = run_vector_benchmark(
+        adapter,
+        VectorBenchmarkConfig(
+            dimension=8,
+            num_points=120,
+            batch_sizes=(1, 50),
+            num_searches=12,
+            search_concurrency=3,
+            top_k=5,
+            filter_queries=True,
+            filter_shards=3,
+        ),
+    )
+    db.close()
+
+    assert [item.batch_size for item in report.upserts] == [1, 50]
+    assert [item.batches for item in report.upserts] == [120, 3]
+    assert all(item.points_per_second > 0 for item in report.upserts)
+    assert [item.label for item in report.searches] == ["unfiltered", "filtered"]
+    for search in report.searches:
+        assert search.errors == 0
+        assert search.latency.count == 12
+        assert search.recall_at_k == 1.0
+    assert report.warnings == []
+    assert report.cleanup_deleted == 120
+    assert client.count() == 0
+
+
+def test_benchmark_deletes_its_points_when_a_phase_fails(test_engine, monkeypatch):
+    db = sessionmaker(bind=test_engine)()
+    client = InProcessCortexClient(dimension=4)
+    adapter = ActianVectorStoreAdapter(
+        db=db,
+        config=ActianVectorStoreConfig(address="in-process", collection_name="bench", dimension=4),
+        client=client,
+    )
+
+    def _flush_fails() -> None:
+        assert client.count() == 30
+        raise RuntimeError("flush failed")
+
+    monkeypatch.setattr(adapter, "flush", _flush_fails)
+    with pytest.raises(RuntimeError, match="flush failed"):
+        run_vector_benchmark(
+            adapter, VectorBenchmarkConfig(dimension=4, num_points=30, num_searches=2)
+        )
+    db.close()
+
+    assert client.count() == 0
+
+
+def test_admin_benchmark_endpoint_in_process_backend(client):
+    response = client.post(
+        "/api/v1/admin/vector/benchmark",
+        headers=_admin_headers(),
+        json={
+            "backend": "in_process",
+            "dimension": 4,
+            "num_points": 40,
+            "batch_sizes": [10, 40],
+            "num_searches": 5,
+            "top_k": 3,
+        },
+    )
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["collection_name"] == "in_process"
+    assert [item["batch_size"] for item in body["upserts"]] == [10, 40]
+    assert body["searches"][0]["recall_at_k"] == 1.0
+    assert body["searches"][0]["latency"]["p99_ms"] is not None
+
+
+def test_admin_benchmark_adapter_backend_requires_vectorai(client, monkeypatch):
+    monkeypatch.setattr(settings, "vectorai_enabled", False)
+    response = client.post(
+        "/api/v1/admin/vector/benchmark",
+        headers=_admin_headers(),
+        json={"backend": "adapter", "dimension": 4},
+    )
+    assert response.status_code == 503, response.text
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from uuid import UUID, uuid4
+
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.crud.vector_index import mark_users_embedding_dirty
+from app.services import match_feed as match_feed_module
+from app.services.actian_vector_store import ActianVectorStoreAdapter, ActianVectorStoreConfig
+from app.services.embedding_migration import default_embedding_target
+from app.services.embedding_refresh import EmbeddingRefreshConfig, refresh_dirty_user_embeddings
+from app.services.embeddings import FakeEmbedder
+from app.services.in_process_cortex import InProcessCortexClient
+from app.services.match_feed import VECTOR_FEED_SIGNAL_WEIGHT
+
+
+def _register(client, suffix: str, neighborhood: str, hobbies: list[str]) -> tuple[str, dict]:
+    response = client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": f"{suffix}@example.com",
+            "password": "password123",
+            "firebase_uid": f"firebase-{suffix}",
+            "neighborhood": neighborhood,
+        },
+    )
+    assert response.status_code == 201, response.text
+    headers = {"Authorization": f"Bearer {create_access_token(subject=f'firebase-{suffix}')}"}
+    patched = client.patch("/api/v1/me/profile", json={"hobbies": hobbies}, headers=headers)
+    assert patched.status_code == 200, patched.text
+    return response.json()["id"], headers
+
+
+def _serve_vector_feed(monkeypatch, test_engine, user_ids: list[str]) -> None:
+    """Embed `user_ids` into an in-process store and point the vector feed at it."""
+
+    cortex = InProcessCortexClient(dimension=4)
+    monkeypatch.setattr(settings, "vectorai_enabled", True)
+    monkeypatch.setattr(settings, "vectorai_dimension", 4)
+    monkeypatch.setattr(
+        match_feed_module,
+        "build_target_adapter",
+        lambda db, *, settings, target: ActianVectorStoreAdapter(
+            db=db,
+            config=ActianVectorStoreConfig(
+                address="in-process", collection_name=target.collection_name, dimension=4
+            ),
+            client=cortex,
+        ),
+    )
+    with sessionmaker(bind=test_engine)() as db:
+        adapter = match_feed_module.build_target_adapter(
+            db, settings=settings, target=default_embedding_target(settings)
+        )
+        mark_users_embedding_dirty(db, user_ids=[UUID(user_id) for user_id in user_ids])
+        refresh_dirty_user_embeddings(
+            db,
+            vector_store=adapter,
+            embedder=FakeEmbedder(dimension=4),
+            config=EmbeddingRefreshConfig(debounce_seconds=0.0),
+        )
+
+
+def test_vector_strategy_blends_similarity_and_falls_back(client, test_engine, monkeypatch):
+    admin = {"X-Admin-Key": settings.admin_api_key}
+    codes = [f"vec{i}_{uuid4().hex[:6]}" for i in range(3)]
+    for code in codes:
+        created = client.post(
+            "/api/v1/admin/hobbies", json={"code": code, "label": code}, headers=admin
+        )
+        assert created.status_code == 201, created.text
+
+    me, me_headers = _register(client, "vec-me", "Downtown", codes)
+    others = [
+        _register(client, f"vec-{i}", hood, hobbies)[0]
+        for i, (hood, hobbies) in enumerate(
+            [("Downtown", codes[:1]), ("Uptown", codes), ("Uptown", []), ("Elsewhere", codes[2:])]
+        )
+    ]
+
+    heuristic = client.get("/api/v1/matches", params={"strategy": "vector"}, headers=me_headers)
+    assert heuristic.status_code == 200, heuristic.text
+    assert heuristic.headers["X-Match-Strategy"] == "heuristic"
+
+    _serve_vector_feed(monkeypatch, test_engine, [me, *others])
+
+    response = client.get("/api/v1/matches", params={"strategy": "vector"}, headers=me_headers)
+    assert response.status_code == 200, response.text
+    assert response.headers["X-Match-Strategy"] == "vector"
+    matches = response.json()
+    assert {m["user"]["id"] for m in matches} == set(others)
+    blended = [
+        m["signals"]["vector_similarity"] + VECTOR_FEED_SIGNAL_WEIGHT * m["score"] for m in matches
+    ]
+    assert blended == sorted(blended, reverse=True)
+    by_id = {m["user"]["id"]: m for m in matches}
+    assert by_id[others[1]]["signals"]["hobby_overlap_count"] == 3
+    assert by_id[others[0]]["signals"]["same_neighborhood"] is True
+
+    params = {"strategy": "vector", "limit": 2, "offset": 1}
+    page = client.get("/api/v1/matches", params=params, headers=me_headers)
+    assert [m["user"]["id"] for m in page.json()] == [m["user"]["id"] for m in matches[1:3]]
+
+    sent = client.post(f"/api/v1/friends/requests/{others[1]}", headers=me_headers)
+    assert sent.status_code == 201, sent.text
+    response = client.get("/api/v1/matches", params={"strategy": "vector"}, headers=me_headers)
+    assert others[1] not in {m["user"]["id"] for m in response.json()}
+
+
+def test_vector_feed_pages_across_window_boundaries(client, test_engine, monkeypatch):
+    admin = {"X-Admin-Key": settings.admin_api_key}
+    codes = [f"win{i}_{uuid4().hex[:6]}" for i in range(3)]
+    for code in codes:
+        created = client.post(
+            "/api/v1/admin/hobbies", json={"code": code, "label": code}, headers=admin
+        )
+        assert created.status_code == 201, created.text
+
+    me, me_headers = _register(client, "win-me", "Downtown", codes)
+    # Distinct profiles, so no two users tie on similarity.
+    others = [
+        _register(client, f"win-{i}", hood, hobbies)[0]
+        for i, (hood, hobbies) in enumerate(
+            [("Downtown", codes[:n]) for n in range(4)]
+            + [(f"Hood {n}", codes[n : n + 1]) for n in range(3)]
+        )
+    ]
+    _serve_vector_feed(monkeypatch, test_engine, [me, *others])
+    monkeypatch.setattr(match_feed_module, "VECTOR_FEED_WINDOW", 3)
+    # Let the hobby/neighborhood signals dominate, so blending reorders users within a window.
+    monkeypatch.setattr(match_feed_module, "VECTOR_FEED_SIGNAL_WEIGHT", 10.0)
+
+    paged: list[str] = []
+    for offset in range(0, 8, 2):
+        params = {"strategy": "vector", "limit": 2, "offset": offset}
+        response = client.get("/api/v1/matches", params=params, headers=me_headers)
+        assert response.status_code == 200, response.text
+        assert response.headers["X-Match-Strategy"] == "vector"
+        paged.extend(m["user"]["id"] for m in response.json())
+
+    assert len(paged) == len(set(paged))
+    assert set(paged) == set(others)
+    full = client.get(
+        "/api/v1/matches", params={"strategy": "vector", "limit": 50}, headers=me_headers
+    )
+    assert [m["user"]["id"] for m in full.json()] == paged
@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.models.user import User
+from app.services.actian_vector_store import ActianVectorStoreAdapter, ActianVectorStoreConfig
+from app.services.embeddings import FakeEmbedder, upsert_user_profile_embeddings_batch
+from app.services.hashing_embedder import HASHING_EMBEDDING_MODEL
+from app.services.vector_reconciliation import (
+    MappingFix,
+    apply_reconciliation_plan,
+    build_reconciliation_plan,
+)
+
+
+class FakeScrollCortexClient:
+    def __init__(self) -> None:
+        self.points: dict[int, dict] = {}
+
+    def upsert(self, *, id: int, vector: list[float], payload: dict | None = None) -> None:
+        self.points[id] = {"id": id, "vector": vector, "payload": payload}
+
+    def batch_upsert(self, points=None, **kwargs) -> None:
+        for point in points if points is not None else kwargs["points"]:
+            self.points[int(point["id"])] = point
+
+    def scroll(self, *, offset=None, limit: int = 100, with_payload: bool = True):
+        ids = sorted(self.points)
+        start = 0 if offset is None else ids.index(offset)
+        page = [self.points[point_id] for point_id in ids[start : start + limit]]
+        next_offset = ids[start + limit] if start + limit < len(ids) else None
+        return page, next_offset
+
+    def batch_delete(self, *, ids: list[int]) -> None:
+        for point_id in ids:
+            self.points.pop(point_id, None)
+
+
+def _create_user(db: Session, email: str) -> str:
+    user = User(
+        id=uuid4(),
+        email=email,
+        firebase_uid=f"firebase-{uuid4().hex[:8]}",
+        neighborhood="Midtown",
+    )
+    db.add(user)
+    db.commit()
+    return str(user.id)
+
+
+def test_reconciliation_plan_detects_drift_and_apply_repairs_it(test_engine):
+    SessionLocal = sessionmaker(bind=test_engine)
+    db = SessionLocal()
+    fake = FakeScrollCortexClient()
+    adapter = ActianVectorStoreAdapter(
+        db=db,
+        config=ActianVectorStoreConfig(
+            address="localhost:50051", collection_name="reconcile_test"
+        ),
+        client=fake,
+    )
+    embedder = FakeEmbedder(dimension=4)
+
+    user_ids = [_create_user(db, f"reconcile-{idx}@example.com") for idx in range(4)]
+    upsert_user_profile_embeddings_batch(
+        db,
+        user_ids=[UUID(user_id) for user_id in user_ids[:3]],
+        vector_store=adapter,
+        embedder=embedder,
+    )
+    point_ids = sorted(fake.points)
+
+    fake.points.pop(point_ids[0])  # mapped but missing remotely
+    fake.points[point_ids[1]]["payload"]["user_id"] = user_ids[3]  # payload disagrees with mapping
+    fake.points[9000] = {"id": 9000, "vector": [0.0] * 4, "payload": None}  # orphan
+    fake.points[9001] = {
+        "id": 9001,
+        "vector": [0.0] * 4,
+        "payload": {"user_id": user_ids[3], "embedding_version": "user_profile_embed_v1"},
+    }  # unmapped but attributable
+
+    plan = build_reconciliation_plan(db, adapter=adapter, page_size=2)
+
+    assert plan.scan_mode == "scroll"
+    assert plan.mapping_count == 3
+    assert {(item.user_id, item.reason) for item in plan.reupserts} == {
+        (user_ids[0], "missing_point"),
+        (user_ids[1], "payload_mismatch"),
+    }
+    assert plan.orphan_point_ids == [9000]
+    assert [(fix.point_id, fix.user_id) for fix in plan.mapping_fixes] == [(9001, user_ids[3])]
+
+    result = apply_reconciliation_plan(db, adapter=adapter, plan=plan, embedder=embedder)
+
+    assert (result.deleted_orphans, result.fixed_mappings, result.reupserted) == (1, 1, 2)
+    assert build_reconciliation_plan(db, adapter=adapter, page_size=2).is_clean
+    db.close()
+
+
+def test_reconciliation_flags_stale_content_hashes(test_engine):
+    SessionLocal = sessionmaker(bind=test_engine)
+    db = SessionLocal()
+    fake = FakeScrollCortexClient()
+    adapter = ActianVectorStoreAdapter(
+        db=db,
+        config=ActianVectorStoreConfig(
+            address="localhost:50051", collection_name="reconcile_hash_test"
+        ),
+        client=fake,
+    )
+
+    user_id = _create_user(db, "reconcile-hash@example.com")
+    upsert_user_profile_embeddings_batch(
+        db, user_ids=[UUID(user_id)], vector_store=adapter, embedder=FakeEmbedder(dimension=4)
+    )
+
+    plan = build_reconciliation_plan(
+        db, adapter=adapter, expected_content_hashes={user_id: "sha256:changed"}
+    )
+
+    assert [(item.user_id, item.reason) for item in plan.reupserts] == [
+        (user_id, "stale_content_hash")
+    ]
+    db.close()
+
+
+def test_reconcile_endpoint_reports_points_stale_against_their_mapping(
+    client, test_engine, monkeypatch
+):
+    from app.api.v1.routes import admin_vector as route_mod
+
+    fake = FakeScrollCortexClient()
+    monkeypatch.setattr(settings, "vectorai_enabled", True)
+    monkeypatch.setattr(settings, "vectorai_collection_name", "reconcile_endpoint_test")
+    monkeypatch.setattr(settings, "vectorai_dimension", 4)
+    monkeypatch.setattr(
+        route_mod,
+        "ActianVectorStoreAdapter",
+        lambda *, db, config: ActianVectorStoreAdapter(db=db, config=config, client=fake),
+    )
+
+    with sessionmaker(bind=test_engine)() as db:
+        user_ids = [_create_user(db, f"reconcile-endpoint-{idx}@example.com") for idx in range(2)]
+        adapter = route_mod.ActianVectorStoreAdapter(
+            db=db, config=ActianVectorStoreConfig.from_settings(settings)
+        )
+        upsert_user_profile_embeddings_batch(
+            db,
+            user_ids=[UUID(user_id) for user_id in user_ids],
+            vector_store=adapter,
+            embedder=FakeEmbedder(dimension=4),
+        )
+    stale = next(
+        point for point in fake.points.values() if point["payload"]["user_id"] == user_ids[0]
+    )
+    stale["payload"]["source_content_hash"] = "sha256:written-by-an-older-profile"
+
+    response = client.post(
+        "/api/v1/admin/vector/reconcile",
+        json={},
+        headers={"X-Admin-Key": settings.admin_api_key},
+    )
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["reupsert_count"] == 1
+    assert body["reupsert_sample"] == [
+        {
+            "user_id": user_ids[0],
+            "embedding_version": "user_profile_embed_v1",
+            "reason": "stale_content_hash",
+        }
+    ]
+
+    # Repairs re-embed with the configured provider, not the fake test embedder.
+    monkeypatch.setattr(settings, "embedding_provider", "hashing")
+    applied = client.post(
+        "/api/v1/admin/vector/reconcile",
+        json={"apply": True},
+        headers={"X-Admin-Key": settings.admin_api_key},
+    )
+    assert applied.status_code == 200, applied.text
+    assert applied.json()["applied"]["reupserted"] == 1
+    repaired = next(
+        point for point in fake.points.values() if point["payload"]["user_id"] == user_ids[0]
+    )
+    assert repaired["payload"]["embedding_model"] == HASHING_EMBEDDING_MODEL
+
+
+class FakeGetOnlyCortexClient(FakeScrollCortexClient):
+    scroll = None  # type: ignore[assignment]
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.unavailable = False
+
+    def get(self, *, id: int):
+        if self.unavailable:
+            raise ConnectionError("cortex unavailable")
+        point = self.points.get(int(id))
+        if point is None:
+            raise KeyError(id)
+        return point["vector"], point["payload"]
+
+
+def test_reconciliation_apply_skips_mappings_that_already_exist(test_engine):
+    SessionLocal = sessionmaker(bind=test_engine)
+    db = SessionLocal()
+    fake = FakeScrollCortexClient()
+    adapter = ActianVectorStoreAdapter(
+        db=db,
+        config=ActianVectorStoreConfig(
+            address="localhost:50051", collection_name="reconcile_dup_test"
+        ),
+        client=fake,
+    )
+    embedder = FakeEmbedder(dimension=4)
+    user_id = _create_user(db, "reconcile-dup@example.com")
+    payload = {"user_id": user_id, "embedding_version": "user_profile_embed_v1"}
+    fake.points[9001] = {"id": 9001, "vector": [0.0] * 4, "payload": payload}
+
+    plan = build_reconciliation_plan(db, adapter=adapter)
+    assert [fix.point_id for fix in plan.mapping_fixes] == [9001]
+    plan.mapping_fixes.append(MappingFix(9002, user_id, "user_profile_embed_v1"))
+    # The user is embedded (and mapped) between planning and applying.
+    upsert_user_profile_embeddings_batch(
+        db, user_ids=[UUID(user_id)], vector_store=adapter, embedder=embedder
+    )
+
+    result = apply_reconciliation_plan(db, adapter=adapter, plan=plan, embedder=embedder)
+
+    assert (result.deleted_orphans, result.fixed_mappings) == (1, 0)
+    assert 9001 in fake.points
+    assert build_reconciliation_plan(db, adapter=adapter).orphan_point_ids == [9001]
+    db.close()
+
+
+def test_reconciliation_get_mode_only_treats_not_found_as_missing(test_engine):
+    SessionLocal = sessionmaker(bind=test_engine)
+    db = SessionLocal()
+    fake = FakeGetOnlyCortexClient()
+    adapter = ActianVectorStoreAdapter(
+        db=db,
+        config=ActianVectorStoreConfig(
+            address="localhost:50051", collection_name="reconcile_get_test"
+        ),
+        client=fake,
+    )
+    user_ids = [_create_user(db, f"reconcile-get-{idx}@example.com") for idx in range(2)]
+    upsert_user_profile_embeddings_batch(
+        db,
+        user_ids=[UUID(user_id) for user_id in user_ids],
+        vector_store=adapter,
+        embedder=FakeEmbedder(dimension=4),
+    )
+    fake.points.pop(min(fake.points))
+
+    plan = build_reconciliation_plan(db, adapter=adapter)
+    assert plan.scan_mode == "get"
+    assert [(item.user_id, item.reason) for item in plan.reupserts] == [
+        (user_ids[0], "missing_point")
+    ]
+
+    fake.unavailable = True
+    with pytest.raises(ConnectionError):
+        build_reconciliation_plan(db, adapter=adapter)
+    db.close()
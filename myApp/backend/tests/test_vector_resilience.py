@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from app.services.actian_vector_store import ActianVectorStoreAdapter, ActianVectorStoreConfig
+from app.services.in_process_cortex import InProcessCortexClient
+from app.services.vector_resilience import (
+    BREAKER_CLOSED,
+    BREAKER_HALF_OPEN,
+    BREAKER_OPEN,
+    CircuitBreaker,
+    VectorCallGuard,
+    VectorCallTimeoutError,
+    VectorCircuitOpenError,
+    VectorResilienceConfig,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_circuit_breaker_opens_after_threshold_and_half_opens_after_reset():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=10.0, clock=clock)
+
+    breaker.record_failure()
+    assert breaker.state == BREAKER_CLOSED
+    breaker.record_failure()
+    assert breaker.state == BREAKER_OPEN
+    assert breaker.allow() is False
+
+    clock.now = 10.0
+    assert breaker.state == BREAKER_HALF_OPEN
+    assert breaker.allow() is True
+    assert breaker.allow() is False  # only one trial call while half-open
+    breaker.record_success()
+    assert breaker.state == BREAKER_CLOSED
+
+
+def test_guard_fails_fast_once_circuit_is_open():
+    guard = VectorCallGuard(
+        VectorResilienceConfig(breaker_failure_threshold=2, breaker_reset_seconds=60)
+    )
+    calls = 0
+
+    def failing():
+        nonlocal calls
+        calls += 1
+        raise RuntimeError("backend down")
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            guard.call("search", failing)
+    with pytest.raises(VectorCircuitOpenError):
+        guard.call("search", failing)
+    assert calls == 2
+    assert guard.snapshot()["operations"]["search"]["errors"] == 2
+
+
+def test_guard_type_errors_do_not_trip_breaker():
+    guard = VectorCallGuard(VectorResilienceConfig(breaker_failure_threshold=1))
+
+    def bad_signature():
+        raise TypeError("unexpected keyword")
+
+    with pytest.raises(TypeError):
+        guard.call("upsert", bad_signature)
+    assert guard.breaker.state == BREAKER_CLOSED
+
+
+def test_guard_enforces_deadline():
+    guard = VectorCallGuard(VectorResilienceConfig(request_timeout_seconds=0.05))
+    release = threading.Event()
+
+    started = time.monotonic()
+    with pytest.raises(VectorCallTimeoutError):
+        guard.call("search", lambda: release.wait(2.0))
+    release.set()
+
+    assert time.monotonic() - started < 1.0
+    assert guard.snapshot()["operations"]["search"]["timeouts"] == 1
+
+
+def test_guard_hedges_slow_search_with_duplicate_request():
+    guard = VectorCallGuard(
+        VectorResilienceConfig(request_timeout_seconds=2.0, hedge_search=True, hedge_delay_ms=20)
+    )
+    release = threading.Event()
+    attempts = 0
+    lock = threading.Lock()
+
+    def search():
+        nonlocal attempts
+        with lock:
+            attempts += 1
+            attempt = attempts
+        if attempt == 1:
+            release.wait(2.0)  # first request hangs
+            return ["slow"]
+        return ["fast"]
+
+    started = time.monotonic()
+    assert guard.call("search", search, hedge=True) == ["fast"]
+    release.set()
+
+    assert time.monotonic() - started < 1.0
+    assert guard.snapshot()["operations"]["search"]["hedges"] == 1
+
+
+def test_fetch_point_misses_do_not_trip_breaker():
+    guard = VectorCallGuard(VectorResilienceConfig(breaker_failure_threshold=2))
+    adapter = ActianVectorStoreAdapter(
+        db=None,
+        config=ActianVectorStoreConfig(address="in-process", collection_name="miss", dimension=4),
+        client=InProcessCortexClient(dimension=4),
+        guard=guard,
+    )
+
+    for point_id in range(5):
+        assert adapter.fetch_point(1000 + point_id) is None
+    assert guard.breaker.state == BREAKER_CLOSED
@@ -1,9 +1,14 @@
+from array import array
 from datetime import datetime, timezone
 
+import pytest
+from pydantic import ValidationError
+
 from app.schemas.vector_store import (
     UserProfileEmbeddingRecord,
     UserProfileVectorMetadata,
     UserProfileVectorQuery,
+    vector_to_list,
 )
 from app.services.vector_store import user_profile_embedding_record_id
 
@@ -60,3 +65,23 @@ def test_user_profile_vector_query_contract():
     assert query.filters.hobbies_any == []
     assert query.include_metadata is True
 
+
+def test_vector_fields_are_stored_as_compact_float32_buffers():
+    from_list = UserProfileVectorQuery(query_vector=[0.5, -1.0, 2.0], embedding_version="v1")
+    from_bytes = UserProfileVectorQuery(
+        query_vector=array("f", [0.5, -1.0, 2.0]).tobytes(),
+        embedding_version="v1",
+    )
+
+    assert isinstance(from_list.query_vector, array)
+    assert from_list.query_vector.typecode == "f"
+    assert from_list.query_vector == from_bytes.query_vector
+    assert vector_to_list(from_bytes.query_vector) == [0.5, -1.0, 2.0]
+    assert from_list.model_dump()["query_vector"] == [0.5, -1.0, 2.0]
+
+
+def test_vector_fields_reject_non_numeric_and_misaligned_input():
+    with pytest.raises(ValidationError):
+        UserProfileVectorQuery(query_vector=["a", "b"], embedding_version="v1")
+    with pytest.raises(ValidationError):
+        UserProfileVectorQuery(query_vector=b"\x00\x00\x00", embedding_version="v1")